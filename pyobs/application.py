@@ -7,7 +7,7 @@ import signal
 import warnings
 from collections.abc import Awaitable, Callable
 from io import StringIO
-from typing import Any, TypedDict
+from typing import Any, NotRequired, TypedDict
 
 import yaml
 
@@ -80,6 +80,10 @@ class InfluxLogConfig(TypedDict):
     token: str
     org: str
     bucket: str
+    queue_size: NotRequired[int]
+    batch_size: NotRequired[int]
+    flush_interval: NotRequired[float]
+    overflow: NotRequired[str]
 
 
 class Application:
@@ -190,12 +194,13 @@ class Application:
             journal_handler.addFilter(module_name_filter)
             handlers.append(journal_handler)
 
-        # influx handler?
+        # influx handler? writes from a background thread, so it needs to be closed on shutdown
+        self._influx_handler: logging.Handler | None = None
         if influx_log is not None:
             from pyobs.utils.influxdb import InfluxHandler
 
-            influx_logging_handler = InfluxHandler(**influx_log, module=config_base)
-            handlers.append(influx_logging_handler)
+            self._influx_handler = InfluxHandler(**influx_log, module=config_base)  # type: ignore[arg-type]
+            handlers.append(self._influx_handler)
 
         # basic setup
         logging.basicConfig(handlers=handlers, level=logging.getLevelName(log_level.upper()))
@@ -339,6 +344,11 @@ class Application:
         log.info("Closing loop...")
         self._loop.close()
 
+        # write remaining log records to influx, all other handlers write synchronously anyway
+        if self._influx_handler is not None:
+            logging.getLogger().removeHandler(self._influx_handler)
+            self._influx_handler.close()
+
     def _signal_handler(self, sig: int) -> None:
         """React to signals and quit the module."""
 
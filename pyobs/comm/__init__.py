@@ -36,6 +36,8 @@ There is currently one one implementation of the Comm interface:
 """
 
 from .comm import Comm
+from .eventqueue import EventPolicy
 from .proxy import Proxy
+from .statepolicy import StatePolicy
 
-__all__ = ["Comm", "Proxy"]
+__all__ = ["Comm", "EventPolicy", "Proxy", "StatePolicy"]
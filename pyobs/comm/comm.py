@@ -2,18 +2,23 @@ from __future__ import annotations
 
 import asyncio
 import functools
-import inspect
 import logging
+import math
+import time
 from collections.abc import Callable, Coroutine
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any, overload
 
-from pyobs.events import Event, LogEvent, ModuleClosedEvent
-from pyobs.interfaces import Interface
+from pyobs.events import Event, LogBatchEvent, LogEvent, ModuleClosedEvent
+from pyobs.events.event import derived_events
+from pyobs.interfaces import EventHandlerStatistics, Interface
 from pyobs.interfaces.interface import get_registered_interface
 from pyobs.utils.enums import ModuleState
 
-from .commlogging import CommLoggingHandler
+from .commlogging import CommLoggingHandler, LogRateLimiter
+from .eventqueue import EventHandler, EventPolicy, EventPredicate, EventQueue
 from .proxy import Proxy, ProxyType, _ProxyContext
+from .statepolicy import StatePolicy
 
 if TYPE_CHECKING:
     from pyobs.modules import Module
@@ -23,27 +28,76 @@ PresenceCallback = Callable[["ModuleState", str], None]
 
 log = logging.getLogger(__name__)
 
+# log records are sent as LogBatchEvent (or LogEvent to older peers), handlers can be registered for both, see
+# Comm.register_event
+_LOG_EVENTS: dict[type[Event], type[Event]] = {LogEvent: LogBatchEvent, LogBatchEvent: LogEvent}
+
 
 class Comm:
     """Base class for all Comm modules in pyobs."""
 
     __module__ = "pyobs.comm"
 
-    def __init__(self) -> None:
-        """Creates a comm module."""
+    def __init__(
+        self,
+        state_policy: dict[str, Any] | StatePolicy | None = None,
+        state_policies: dict[str, dict[str, Any] | StatePolicy] | None = None,
+        event_policy: dict[str, Any] | EventPolicy | None = None,
+        event_policies: dict[str, dict[str, Any] | EventPolicy] | None = None,
+        log_queue_size: int = 10000,
+        log_batch_size: int = 100,
+        log_rate: float | None = 50.0,
+        log_burst: int = 200,
+    ) -> None:
+        """Creates a comm module.
+
+        Args:
+            state_policy: Default policy for publishing states, see StatePolicy.
+            state_policies: Policies for publishing the states of specific interfaces, by interface name.
+            event_policy: Default policy for delivering events to handlers, see EventPolicy.
+            event_policies: Policies for delivering specific events to handlers, by event name.
+            log_queue_size: Maximum number of log records waiting to be forwarded.
+            log_batch_size: Maximum number of log records forwarded in a single message.
+            log_rate: Maximum number of log records forwarded per second on average for each source file and level,
+                None for no limit.
+            log_burst: Maximum number of log records forwarded at once for each source file and level.
+        """
 
         self._proxies: dict[str, Proxy] = {}
         self._state_subscriptions: dict[str, list[tuple[type[Interface], StateCallback]]] = {}
         self._presence_subscriptions: dict[str, list[PresenceCallback]] = {}
         self._module: Module | None = None
-        self._log_queue: asyncio.Queue[LogEvent] = asyncio.Queue()
+        self._log_queue: asyncio.Queue[LogEvent] = asyncio.Queue(maxsize=log_queue_size)
+        self._log_batch_size = log_batch_size
+        self._log_limiter = LogRateLimiter(log_rate, log_burst) if log_rate is not None else None
+        self._log_dropped = 0
+        self._log_adapters: dict[EventHandler, EventHandler] = {}
         self._logging_task: asyncio.Task[Any] | None = None
         self._event_handlers: dict[type[Event], list[Callable[[Event, str], Coroutine[Any, Any, bool]]]] = {}
         self._events_sent: set[type[Event]] = set()
         self._events_subscribed: set[type[Event]] = set()
+        self._event_predicates: dict[tuple[type[Event], EventHandler], EventPredicate] = {}
+        self._event_dispatch: dict[type[Event], list[tuple[EventHandler, EventPredicate | None]]] = {}
         self._closing = asyncio.Event()
         self._published_state: set[type[Interface]] = set()
 
+        # policies for publishing states, and what has been published when, or is waiting for it
+        self._state_policy = StatePolicy() if state_policy is None else StatePolicy.from_config(state_policy)
+        self._state_policies: dict[str, StatePolicy] = {
+            name: StatePolicy.from_config(policy) for name, policy in (state_policies or {}).items()
+        }
+        self._state_snapshots: dict[type[Interface], dict[str, Any] | None] = {}
+        self._state_published_at: dict[type[Interface], float] = {}
+        self._pending_states: dict[type[Interface], Any] = {}
+        self._pending_state_tasks: dict[type[Interface], asyncio.Task[None]] = {}
+
+        # policies for delivering events and a queue for each handler
+        self._event_policy = EventPolicy() if event_policy is None else EventPolicy.from_config(event_policy)
+        self._event_policies: dict[str, EventPolicy] = {
+            name: EventPolicy.from_config(policy) for name, policy in (event_policies or {}).items()
+        }
+        self._event_queues: dict[EventHandler, EventQueue] = {}
+
     @property
     def has_module(self) -> bool:
         return self._module is not None
@@ -90,11 +144,19 @@ class Comm:
 
         self._closing.set()
 
+        # publish states that are still waiting for it
+        await self._flush_pending_states()
+
         # close thread
         if self._logging_task:
             self._logging_task.cancel()
         self._logging_task = None
 
+        # stop delivering events
+        for queue in self._event_queues.values():
+            queue.close()
+        self._event_queues.clear()
+
     def _get_full_client_name(self, name: str) -> str:
         """Returns full name for given client.
 
@@ -367,17 +429,32 @@ class Comm:
         raise NotImplementedError
 
     async def _logging(self) -> None:
-        """Background thread for handling the logging."""
+        """Background thread for forwarding log records in batches."""
         # run until closing
         while True:
-            # get item (maybe wait for it) and send it
             try:
-                entry = self._log_queue.get_nowait()
-                await self.send_event(entry)
-
-            except asyncio.QueueEmpty:
-                # if queue is empty, sleep a little
-                await asyncio.sleep(1)
+                # wait for a record, but not forever, if suppressed records need to be reported
+                batch: list[LogEvent] = []
+                if self._log_dropped > 0 or (self._log_limiter is not None and self._log_limiter.has_suppressed):
+                    try:
+                        batch.append(await asyncio.wait_for(self._log_queue.get(), 1.0))
+                    except TimeoutError:
+                        pass
+                else:
+                    batch.append(await self._log_queue.get())
+
+                # add everything else that is waiting, which piles up while the last batch is being sent
+                while len(batch) < self._log_batch_size and not self._log_queue.empty():
+                    batch.append(self._log_queue.get_nowait())
+
+                # add summaries of suppressed records and send it -- or its records one by one, while some peers
+                # don't understand batches
+                batch.extend(self._log_summaries())
+                if batch and self._send_single_log_events():
+                    for entry in batch:
+                        await self.send_event(entry)
+                elif batch:
+                    await self.send_event(LogBatchEvent(batch))
 
             except asyncio.CancelledError:
                 return
@@ -387,15 +464,44 @@ class Comm:
                 # itself onto _log_queue, and if the send failure is due to a sustained
                 # outage, every retry generates another one of these, forever
                 log.exception("Something went wrong", extra={"pyobs_no_forward": True})
-                pass
+
+    def _send_single_log_events(self) -> bool:
+        """Whether log records must be sent as single LogEvents, since some peers only subscribe to those."""
+        return False
+
+    def _log_summaries(self) -> list[LogEvent]:
+        """Returns log records summarizing the records that have been suppressed since the last call."""
+        suppressed = self._log_limiter.pop_suppressed() if self._log_limiter is not None else {}
+        if self._log_dropped > 0:
+            suppressed["queue:FULL"] = self._log_dropped
+            self._log_dropped = 0
+        now = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S.%f")
+        summaries = []
+        for source, count in suppressed.items():
+            filename, level = source.rsplit(":", 1)
+            if filename == "queue":
+                message = f"Dropped {count} log record(s), since too many were waiting to be forwarded."
+            else:
+                message = f"Suppressed {count} {level} log record(s) from {filename}."
+            summaries.append(LogEvent(now, "WARNING", filename, "", 0, message))
+        return summaries
 
     def log_message(self, entry: LogEvent) -> None:
         """Send a log message to other clients.
 
+        Records are forwarded in batches, or one by one, while some peers only subscribe to single records, see
+        _send_single_log_events(). Records exceeding the rate limit for their source file and level or the
+        size of the queue are dropped and reported in a summary later.
+
         Args:
             entry (LogEvent): Log event to send.
         """
-        self._log_queue.put_nowait(entry)
+        if self._log_limiter is not None and not self._log_limiter.allow(f"{entry.filename}:{entry.level}"):
+            return
+        try:
+            self._log_queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self._log_dropped += 1
 
     async def send_event(self, event: Event) -> None:
         """Send an event to other clients.
@@ -414,24 +520,72 @@ class Comm:
         Returns:
             list of event classes.
         """
-        import pyobs.events
-
-        event_classes: list[type[Event]] = []
-        for cls in inspect.getmembers(pyobs.events, inspect.isclass):
-            if issubclass(cls[1], event):
-                event_classes.append(cls[1])
-        return event_classes
+        return derived_events(event)
 
     async def register_event(
-        self, event_class: type[Event], handler: Callable[[Event, str], Coroutine[Any, Any, bool]] | None = None
+        self,
+        event_class: type[Event],
+        handler: Callable[[Event, str], Coroutine[Any, Any, bool]] | None = None,
+        predicate: EventPredicate | None = None,
     ) -> None:
         """Register an event type. If a handler is given, we also receive those events, otherwise we just
         send them.
 
+        A handler receives all events of the given class and of all classes derived from it, including events
+        defined in other packages, so registering :class:`~pyobs.events.Event` itself receives every event. If a
+        predicate is given, only events for which it returns True are passed to the handler, e.g.
+        ``lambda event, sender: sender == "telescope"``. Registering the same handler for the same event again
+        replaces its predicate.
+
+        Log records are forwarded as :class:`~pyobs.events.LogBatchEvent`, see log_message(). Therefore, registering
+        :class:`~pyobs.events.LogEvent` also registers LogBatchEvent and vice versa, and events are converted for
+        the handler, i.e. a handler for LogEvent always gets single records and a handler for LogBatchEvent always
+        gets batches.
+
         Args:
             event_class: Class of event to register.
             handler: Event handler method.
+            predicate: Function that gets the event and its sender and returns whether to pass it to the handler.
         """
+        await self._register_event(event_class, handler, predicate)
+
+        # register the other type of log event with a handler that converts it
+        other = _LOG_EVENTS.get(event_class)
+        if other is not None:
+            adapter = None
+            if handler is not None:
+                adapter = self._log_adapters.setdefault(
+                    handler, functools.partial(self._convert_log_event, handler=handler, predicate=predicate)
+                )
+            await self._register_event(other, adapter)
+
+    @staticmethod
+    async def _convert_log_event(
+        event: Event, sender: str, handler: EventHandler, predicate: EventPredicate | None = None
+    ) -> bool:
+        """Passes single log records to a handler for batches and vice versa."""
+        if isinstance(event, LogBatchEvent):
+            for entry in event.entries:
+                try:
+                    if predicate is not None and not predicate(entry, entry.sender or sender):
+                        continue
+                    ret = handler(entry, entry.sender or sender)
+                    if asyncio.iscoroutine(ret):
+                        await ret
+                except Exception:
+                    log.exception("Unhandled exception in log handler %s.", getattr(handler, "__qualname__", handler))
+        elif isinstance(event, LogEvent):
+            batch = LogBatchEvent([event])
+            if predicate is None or predicate(batch, sender):
+                ret = handler(batch, sender)
+                if asyncio.iscoroutine(ret):
+                    await ret
+        return True
+
+    async def _register_event(
+        self, event_class: type[Event], handler: EventHandler | None = None, predicate: EventPredicate | None = None
+    ) -> None:
+        """Register a single event type, see register_event()."""
 
         # we also want to register all events derived from the given one
         event_classes = self._get_derived_events(event_class)
@@ -448,12 +602,22 @@ class Comm:
                 if handler not in self._event_handlers[ev]:
                     # add handler
                     self._event_handlers[ev].append(handler)
+                # set or remove predicate
+                if predicate is None:
+                    self._event_predicates.pop((ev, handler), None)
+                else:
+                    self._event_predicates[(ev, handler)] = predicate
+            self._event_dispatch.clear()
+
+            # queue for delivering events to handler
+            if handler not in self._event_queues:
+                self._event_queues[handler] = EventQueue(handler, self.get_event_policy(event_class))
         else:
             self._events_sent.update(event_classes)
 
-        # if event is not a local one, we also need to do some XMPP stuff
+        # if event is not a local one, we also need to do some XMPP stuff, but only for non-local derived events
         if not event_class.local:
-            await self._register_events(event_classes, handler)
+            await self._register_events([ev for ev in event_classes if not ev.local], handler)
 
     async def unregister_event(
         self, event_class: type[Event], handler: Callable[[Event, str], Coroutine[Any, Any, bool]]
@@ -468,22 +632,46 @@ class Comm:
             event_class: Class of event that was registered.
             handler: The exact handler that was passed to register_event().
         """
+        await self._unregister_event(event_class, handler)
+
+        # remove converting handler for the other type of log event
+        other = _LOG_EVENTS.get(event_class)
+        adapter = self._log_adapters.pop(handler, None) if other is not None else None
+        if other is not None and adapter is not None:
+            await self._unregister_event(other, adapter)
+
+    async def _unregister_event(self, event_class: type[Event], handler: EventHandler) -> None:
+        """Unregister a handler for a single event type, see unregister_event()."""
 
         # same derived-events expansion as register_event(), so this mirrors exactly what was added
         unsubscribed: list[type[Event]] = []
         for ev in self._get_derived_events(event_class):
             handlers = self._event_handlers.get(ev)
+            self._event_predicates.pop((ev, handler), None)
             if handlers is not None and handler in handlers:
                 handlers.remove(handler)
+                self._event_dispatch.clear()
                 if not handlers:
                     self._events_subscribed.discard(ev)
                     unsubscribed.append(ev)
 
+        # drop queue of handler, if it doesn't handle any events anymore
+        if handler in self._event_queues and not any(handler in h for h in self._event_handlers.values()):
+            self._event_queues.pop(handler).close()
+
         # only event classes that just lost their last handler need the comm layer to actually
         # tear anything down (e.g. XmppComm unsubscribing from peers' event nodes)
         if unsubscribed and not event_class.local:
             await self._unregister_events(unsubscribed)
 
+    def get_event_policy(self, event_class: type[Event]) -> EventPolicy:
+        """Returns the policy for delivering events of the given type to handlers."""
+        return self._event_policies.get(event_class.__name__, self._event_policy)
+
+    def event_statistics(self) -> list[EventHandlerStatistics]:
+        """Returns statistics for the delivery of events to all handlers."""
+        return [queue.statistics() for queue in self._event_queues.values()]
+
     async def _register_events(
         self, events: list[type[Event]], handler: Callable[[Event, str], Coroutine[Any, Any, bool]] | None = None
     ) -> None:
@@ -492,16 +680,91 @@ class Comm:
     async def _unregister_events(self, events: list[type[Event]]) -> None:
         pass
 
+    def get_state_policy(self, interface: type[Interface]) -> StatePolicy:
+        """Returns the policy for publishing the state of the given interface."""
+        return self._state_policies.get(interface.__name__, self._state_policy)
+
+    def set_state_policy(self, interface: type[Interface], policy: StatePolicy | None) -> None:
+        """Sets the policy for publishing the state of the given interface.
+
+        Args:
+            interface: Interface to set policy for.
+            policy: New policy, or None to use the default policy.
+        """
+        if policy is None:
+            self._state_policies.pop(interface.__name__, None)
+        else:
+            self._state_policies[interface.__name__] = policy
+
     async def set_state(self, interface: type[Interface], state: Any) -> None:
         """Publish state for this module.
 
+        Depending on the policy for the interface (see StatePolicy), the state is not published if it didn't change
+        since a recent publication, or published later, if the last state has been published too recently.
+
         Args:
             interface: Interface type for the state.
             state: State object to publish.
         """
         self._published_state.add(interface)
+        policy = self.get_state_policy(interface)
+
+        # the new state supersedes any state still waiting for publication
+        self._pending_states.pop(interface, None)
+
+        # unchanged since last publication, which is recent enough?
+        silence = time.monotonic() - self._state_published_at.get(interface, -math.inf)
+        if interface in self._state_snapshots and policy.is_unchanged(self._state_snapshots[interface], state, silence):
+            self._cancel_pending_state(interface)
+            return
+
+        # published too recently? then publish it later
+        wait = policy.min_interval - silence
+        if wait > 0:
+            self._pending_states[interface] = state
+            if interface not in self._pending_state_tasks:
+                self._pending_state_tasks[interface] = asyncio.create_task(self._publish_pending_state(interface, wait))
+            return
+
+        # publish it now
+        self._cancel_pending_state(interface)
+        await self._publish_state(interface, state, policy)
+
+    async def _publish_state(self, interface: type[Interface], state: Any, policy: StatePolicy) -> None:
+        """Actually publish the given state and remember it."""
+        self._state_snapshots[interface] = policy.snapshot(state)
+        self._state_published_at[interface] = time.monotonic()
         await self._set_state(interface, state)
 
+    async def _publish_pending_state(self, interface: type[Interface], delay: float) -> None:
+        """Publish the state waiting for publication after the given delay."""
+        await asyncio.sleep(delay)
+        self._pending_state_tasks.pop(interface, None)
+        if interface in self._pending_states:
+            try:
+                await self._publish_state(
+                    interface, self._pending_states.pop(interface), self.get_state_policy(interface)
+                )
+            except Exception:
+                log.exception("Could not publish state for %s.", interface.__name__)
+
+    def _cancel_pending_state(self, interface: type[Interface]) -> None:
+        """Cancel publication of a state waiting for it."""
+        task = self._pending_state_tasks.pop(interface, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _flush_pending_states(self) -> None:
+        """Immediately publish all states waiting for publication."""
+        for interface in list(self._pending_state_tasks.keys()):
+            self._cancel_pending_state(interface)
+        for interface, state in list(self._pending_states.items()):
+            self._pending_states.pop(interface, None)
+            try:
+                await self._publish_state(interface, state, self.get_state_policy(interface))
+            except Exception:
+                log.exception("Could not publish state for %s.", interface.__name__)
+
     async def _set_state(self, interface: type[Interface], state: Any) -> None:
         pass
 
@@ -583,7 +846,12 @@ class Comm:
         return None
 
     def get_own_state(self, interface: type[Interface]) -> Any:
-        """Return the last state published by this module for the given interface, or None."""
+        """Return the last state published by this module for the given interface, or None.
+
+        States that are still waiting for their publication (see StatePolicy) are returned as well.
+        """
+        if interface in self._pending_states:
+            return self._pending_states[interface]
         return self._get_own_state(interface)
 
     def _get_own_state(self, interface: type[Interface]) -> Any:
@@ -678,38 +946,51 @@ class Comm:
     def _send_event_to_module(self, event: Event, from_client: str) -> None:
         """Send an event to all connected modules.
 
+        The event is queued for each handler and delivered in the background according to its EventPolicy, so that
+        a burst of events never spawns an unbounded number of tasks.
+
         Args:
             event: Event to send.
             from_client: Client that sent the event.
         """
 
         # send it
-        if event.__class__ in self._event_handlers:
-            for handler in self._event_handlers[event.__class__]:
-                # handle it
-                ret = handler(event, from_client)
-                if asyncio.iscoroutine(ret):
-                    task = asyncio.create_task(ret)
-                    task.add_done_callback(functools.partial(self._log_handler_exception, handler=handler, event=event))
+        for handler, predicate in self._get_event_dispatch(event.__class__):
+            if predicate is not None:
+                try:
+                    if not predicate(event, from_client):
+                        continue
+                except Exception:
+                    log.exception("Unhandled exception in event predicate for %s.", event.__class__.__name__)
+                    continue
+            queue = self._event_queues.get(handler)
+            if queue is None:
+                queue = self._event_queues[handler] = EventQueue(handler, self.get_event_policy(event.__class__))
+            queue.put(event, from_client)
+
+    def _get_event_dispatch(self, event_class: type[Event]) -> list[tuple[EventHandler, EventPredicate | None]]:
+        """Returns handlers and their predicates for the given event class.
+
+        Handlers are collected along the MRO of the event class, so that a handler for a base class also gets events
+        of classes that were defined after it had been registered. The result is cached until handlers change.
 
-    @staticmethod
-    def _log_handler_exception(task: asyncio.Task[Any], handler: Callable[..., Any], event: Event) -> None:
-        """Log an event handler's exception with context, instead of leaving it to asyncio's own
-        "Task exception was never retrieved" warning at garbage-collection time, which gives no
-        indication of which handler or event actually failed -- every event handler is dispatched
-        as a fire-and-forget task (see _send_event_to_module), so this is the only place any of
-        them get their exceptions surfaced at all.
+        Args:
+            event_class: Class of event to dispatch.
+
+        Returns:
+            List of handlers with their predicates.
         """
-        if task.cancelled():
-            return
-        exc = task.exception()
-        if exc is not None:
-            log.error(
-                "Unhandled exception in event handler %s for %s.",
-                getattr(handler, "__qualname__", handler),
-                event.__class__.__name__,
-                exc_info=exc,
-            )
+        dispatch = self._event_dispatch.get(event_class)
+        if dispatch is None:
+            dispatch = []
+            seen: set[EventHandler] = set()
+            for cls in event_class.__mro__:
+                for handler in self._event_handlers.get(cls, []):
+                    if handler not in seen:
+                        seen.add(handler)
+                        dispatch.append((handler, self._event_predicates.get((cls, handler))))
+            self._event_dispatch[event_class] = dispatch
+        return dispatch
 
 
 __all__ = ["Comm"]
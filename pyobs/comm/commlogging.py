@@ -1,5 +1,6 @@
 import logging
 import os
+import time
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
@@ -49,4 +50,50 @@ class CommLoggingHandler(logging.Handler):
         self._comm.log_message(entry)
 
 
-__all__ = ["CommLoggingHandler"]
+class LogRateLimiter:
+    """Limits the rate of log records per source with a token bucket, counting suppressed records."""
+
+    def __init__(self, rate: float, burst: int):
+        """Create a new rate limiter.
+
+        Args:
+            rate: Number of records per second allowed for each source on average.
+            burst: Number of records allowed for each source at once.
+        """
+        self._rate = rate
+        self._burst = burst
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._suppressed: dict[str, int] = {}
+
+    def allow(self, source: str, now: float | None = None) -> bool:
+        """Whether a record from the given source may be forwarded.
+
+        Args:
+            source: Source of record, e.g. file and level.
+            now: Current time, defaults to time.monotonic().
+
+        Returns:
+            True, if record may be forwarded.
+        """
+        now = time.monotonic() if now is None else now
+        tokens, last = self._buckets.get(source, (float(self._burst), now))
+        tokens = min(float(self._burst), tokens + (now - last) * self._rate)
+        if tokens >= 1.0:
+            self._buckets[source] = (tokens - 1.0, now)
+            return True
+        self._buckets[source] = (tokens, now)
+        self._suppressed[source] = self._suppressed.get(source, 0) + 1
+        return False
+
+    @property
+    def has_suppressed(self) -> bool:
+        """Whether records have been suppressed since last call to pop_suppressed()."""
+        return len(self._suppressed) > 0
+
+    def pop_suppressed(self) -> dict[str, int]:
+        """Returns and resets number of suppressed records per source."""
+        suppressed, self._suppressed = self._suppressed, {}
+        return suppressed
+
+
+__all__ = ["CommLoggingHandler", "LogRateLimiter"]
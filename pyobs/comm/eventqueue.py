@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from pyobs.events import Event
+from pyobs.interfaces.IModule import EventHandlerStatistics
+
+log = logging.getLogger(__name__)
+
+EventHandler = Callable[[Event, str], Coroutine[Any, Any, bool]]
+EventPredicate = Callable[[Event, str], bool]
+
+
+@dataclass(frozen=True)
+class EventPolicy:
+    """Policy for delivering events to a handler registered via :meth:`~pyobs.comm.Comm.register_event`.
+
+    Every handler gets its own queue, which holds at most capacity events. If it is full, either the oldest queued
+    event or the new one is dropped, depending on overflow. With coalesce, a new event replaces one of the same type
+    from the same sender that is still queued, which is useful for high-rate events, where only the latest one
+    matters. Up to concurrency events are handled at the same time, so with the default of 1, a handler gets its
+    events one after the other in the order they were received.
+    """
+
+    capacity: int = 1000
+    concurrency: int = 1
+    overflow: Literal["drop_oldest", "drop_newest"] = "drop_oldest"
+    coalesce: bool = False
+
+    @staticmethod
+    def from_config(config: dict[str, Any] | EventPolicy) -> EventPolicy:
+        """Create policy from a configuration dictionary.
+
+        Args:
+            config: Dictionary with the parameters of the policy, or policy itself.
+
+        Returns:
+            New policy.
+        """
+        if isinstance(config, EventPolicy):
+            return config
+        policy = EventPolicy(**config)
+        if policy.capacity < 1 or policy.concurrency < 1:
+            raise ValueError("Capacity and concurrency of event policy must be positive.")
+        if policy.overflow not in ("drop_oldest", "drop_newest"):
+            raise ValueError(f"Invalid overflow for event policy: {policy.overflow}")
+        return policy
+
+
+class EventQueue:
+    """Queue for delivering events to a single handler, see :class:`EventPolicy`."""
+
+    def __init__(self, handler: EventHandler, policy: EventPolicy | None = None):
+        """Creates a new queue.
+
+        Args:
+            handler: Handler to deliver events to.
+            policy: Policy for delivery.
+        """
+        self._handler = handler
+        self._policy = EventPolicy() if policy is None else policy
+        self._queue: deque[tuple[Event, str, float]] = deque()
+        self._workers: set[asyncio.Task[None]] = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+        # statistics
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.wait_time_total = 0.0
+        self.handler_time_total = 0.0
+        self.handler_time_max = 0.0
+
+    @property
+    def name(self) -> str:
+        """Name of handler."""
+        return str(getattr(self._handler, "__qualname__", self._handler))
+
+    @property
+    def policy(self) -> EventPolicy:
+        """Policy for delivery."""
+        return self._policy
+
+    def __len__(self) -> int:
+        """Number of queued events."""
+        return len(self._queue)
+
+    def put(self, event: Event, sender: str) -> None:
+        """Queues an event for delivery.
+
+        Args:
+            event: Event to deliver.
+            sender: Client that sent the event.
+        """
+
+        # replace queued event of same type from same sender
+        if self._policy.coalesce:
+            for i, (queued, queued_sender, _) in enumerate(self._queue):
+                if type(queued) is type(event) and queued_sender == sender:
+                    del self._queue[i]
+                    self.coalesced += 1
+                    break
+
+        # nothing waiting and a worker available? then call handler right away, like a direct call would
+        if len(self._queue) == 0 and len(self._workers) < self._policy.concurrency:
+            self._idle.clear()
+            self._start_worker(self._call(event, sender, time.monotonic()))
+            return
+
+        # full?
+        if len(self._queue) >= self._policy.capacity:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                log.warning(
+                    "Event queue for %s is full, dropped %d event(s) so far.",
+                    self.name,
+                    self.dropped,
+                    extra={"pyobs_no_forward": True},
+                )
+            if self._policy.overflow == "drop_newest":
+                return
+            self._queue.popleft()
+
+        # queue it
+        self._queue.append((event, sender, time.monotonic()))
+        self.max_depth = max(self.max_depth, len(self._queue))
+        self._idle.clear()
+
+        # start another worker, if possible
+        if len(self._workers) < self._policy.concurrency:
+            self._start_worker(None)
+
+    def _start_worker(self, first: tuple[Any, Event, float] | None) -> None:
+        """Starts a new worker, optionally with the result of a handler call to await first."""
+        task = asyncio.create_task(self._work(first))
+        self._workers.add(task)
+        task.add_done_callback(self._worker_done)
+
+    def _worker_done(self, task: asyncio.Task[None]) -> None:
+        """Removes a finished worker."""
+        self._workers.discard(task)
+        if len(self._workers) == 0 and len(self._queue) == 0:
+            self._idle.set()
+
+    def _call(self, event: Event, sender: str, start: float) -> tuple[Any, Event, float]:
+        """Calls handler, returning its result, which might be a coroutine, or the exception."""
+        try:
+            return self._handler(event, sender), event, start
+        except Exception as e:
+            return e, event, start
+
+    async def _finish(self, ret: Any, event: Event, start: float) -> None:
+        """Awaits result of handler call and updates statistics."""
+        try:
+            if isinstance(ret, Exception):
+                raise ret
+            if asyncio.iscoroutine(ret):
+                await ret
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.failed += 1
+            log.exception("Unhandled exception in event handler %s for %s.", self.name, event.__class__.__name__)
+        duration = time.monotonic() - start
+        self.delivered += 1
+        self.handler_time_total += duration
+        self.handler_time_max = max(self.handler_time_max, duration)
+
+    async def _work(self, first: tuple[Any, Event, float] | None) -> None:
+        """Delivers events until queue is empty."""
+        try:
+            if first is not None:
+                await self._finish(*first)
+            while self._queue:
+                event, sender, queued = self._queue.popleft()
+                start = time.monotonic()
+                self.wait_time_total += start - queued
+                await self._finish(*self._call(event, sender, start))
+        finally:
+            # remove worker in the same step as the last check of the queue, so that put() never relies on a
+            # worker that is about to finish
+            task = asyncio.current_task()
+            if task is not None:
+                self._worker_done(task)
+
+    async def join(self) -> None:
+        """Waits until all queued events have been handled."""
+        await self._idle.wait()
+
+    def close(self) -> None:
+        """Drops all queued events and stops delivery."""
+        self._queue.clear()
+        for task in list(self._workers):
+            task.cancel()
+        self._workers.clear()
+        self._idle.set()
+
+    def statistics(self) -> EventHandlerStatistics:
+        """Returns statistics for this queue."""
+        return EventHandlerStatistics(
+            handler=self.name,
+            queued=len(self._queue),
+            max_queued=self.max_depth,
+            delivered=self.delivered,
+            dropped=self.dropped,
+            coalesced=self.coalesced,
+            failed=self.failed,
+            avg_wait_time=self.wait_time_total / self.delivered if self.delivered else 0.0,
+            avg_handler_time=self.handler_time_total / self.delivered if self.delivered else 0.0,
+            max_handler_time=self.handler_time_max,
+        )
+
+
+__all__ = ["EventPolicy", "EventQueue", "EventHandler", "EventPredicate"]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import copy
+import dataclasses
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class StatePolicy:
+    """Policy for publishing the state of an interface via :meth:`~pyobs.comm.Comm.set_state`.
+
+    With suppress_unchanged, a state is not published, if it equals the last published state, ignoring the fields in
+    ignore_fields (by default the timestamp, which changes with every new state object), and treating numeric fields
+    as equal, if they differ by no more than their value in tolerances. Since consumers judge the freshness of a
+    state by its timestamp (see max_age in :meth:`~pyobs.interfaces.Interface.wait_for_state`), an unchanged state
+    is still published, if the last publication is more than max_silence seconds ago. Suppression is off by
+    default, and max_silence should be well below the max_age used by any consumer of the state.
+
+    With min_interval, states are published at most once per that many seconds. Newer states replace older ones that
+    are still waiting for publication, and the latest one is always published eventually.
+    """
+
+    min_interval: float = 0.0
+    suppress_unchanged: bool = False
+    max_silence: float | None = 30.0
+    ignore_fields: tuple[str, ...] = ("time",)
+    tolerances: dict[str, float] = field(default_factory=dict)
+
+    @staticmethod
+    def from_config(config: dict[str, Any] | StatePolicy) -> StatePolicy:
+        """Create policy from a configuration dictionary.
+
+        Args:
+            config: Dictionary with the parameters of the policy, or policy itself.
+
+        Returns:
+            New policy.
+        """
+        if isinstance(config, StatePolicy):
+            return config
+        config = dict(config)
+        if "ignore_fields" in config:
+            config["ignore_fields"] = tuple(config["ignore_fields"])
+        return StatePolicy(**config)
+
+    def snapshot(self, state: Any) -> dict[str, Any] | None:
+        """Returns a copy of all compared fields of the given state, or None, if states are never compared.
+
+        The fields are copied, so that states mutated in place after publication still compare as changed.
+
+        Args:
+            state: State dataclass.
+
+        Returns:
+            Dictionary with compared fields.
+        """
+        if not self.suppress_unchanged or not dataclasses.is_dataclass(state):
+            return None
+        return {
+            f.name: copy.deepcopy(getattr(state, f.name))
+            for f in dataclasses.fields(state)
+            if f.name not in self.ignore_fields
+        }
+
+    def is_unchanged(self, snapshot: dict[str, Any] | None, state: Any, silence: float = 0.0) -> bool:
+        """Whether the given state equals the one the given snapshot has been taken from.
+
+        Args:
+            snapshot: Snapshot of last published state, see snapshot().
+            state: New state.
+            silence: Seconds since last publication.
+
+        Returns:
+            True, if new state does not need to be published.
+        """
+        if snapshot is None or not self.suppress_unchanged:
+            return False
+        if self.max_silence is not None and silence >= self.max_silence:
+            return False
+        for name, old in snapshot.items():
+            new = getattr(state, name, None)
+            tolerance = self.tolerances.get(name)
+            if (
+                tolerance is not None
+                and isinstance(old, (int, float))
+                and isinstance(new, (int, float))
+                and not isinstance(old, bool)
+                and not isinstance(new, bool)
+            ):
+                if not math.isclose(old, new, rel_tol=0.0, abs_tol=tolerance):
+                    return False
+            else:
+                try:
+                    if old != new:
+                        return False
+                except ValueError:
+                    # e.g. numpy arrays
+                    return False
+        return True
+
+
+__all__ = ["StatePolicy"]
@@ -15,7 +15,7 @@ from pyobs.modules import Module
 from pyobs.utils.parallel import Future
 
 from .serializer import PYOBS_NS as _PYOBS_NS
-from .serializer import value_to_xml, xml_to_value
+from .serializer import value_to_compact, value_to_xml, xml_to_value
 
 if TYPE_CHECKING:
     from .xmppcomm import XmppComm
@@ -25,15 +25,19 @@ log = logging.getLogger(__name__)
 _NS = "jabber:iq:rpc"
 
 
-def params_to_xml(names: list[str], values: list[Any], types: dict[str, Any]) -> ET.Element:
-    """Serialize a parameter list to <params><param><value><pyobs:value>...</pyobs:value></value></param></params>."""
+def params_to_xml(names: list[str], values: list[Any], types: dict[str, Any], compact: bool = False) -> ET.Element:
+    """Serialize a parameter list to <params><param><value><pyobs:value>...</pyobs:value></value></param></params>.
+
+    With compact=True, values are sent as compact payload where possible, see value_to_compact().
+    """
+    encode = value_to_compact if compact else value_to_xml
     params = ET.Element(f"{{{_NS}}}params")
     for name, value in zip(names, values):
         type_hint = types.get(name, Any)
         param = ET.Element(f"{{{_NS}}}param")
         value_elem = ET.Element(f"{{{_NS}}}value")
         pyobs_value = ET.Element(f"{{{_PYOBS_NS}}}value")
-        pyobs_value.append(value_to_xml(value, type_hint))
+        pyobs_value.append(encode(value, type_hint))
         value_elem.append(pyobs_value)
         param.append(value_elem)
         params.append(param)
@@ -60,15 +64,18 @@ def xml_to_params(params_elem: ET.Element, names: list[str], types: dict[str, An
     return result
 
 
-def return_to_xml(value: Any, type_hint: Any) -> ET.Element:
-    """Serialize a return value to <params><param><value><pyobs:value>...</pyobs:value></value></param></params>."""
+def return_to_xml(value: Any, type_hint: Any, compact: bool = False) -> ET.Element:
+    """Serialize a return value to <params><param><value><pyobs:value>...</pyobs:value></value></param></params>.
+
+    With compact=True, the value is sent as compact payload where possible, see value_to_compact().
+    """
     params = ET.Element(f"{{{_NS}}}params")
     if value is None or type_hint is type(None):
         return params  # void return: empty <params/>
     param = ET.Element(f"{{{_NS}}}param")
     value_elem = ET.Element(f"{{{_NS}}}value")
     pyobs_value = ET.Element(f"{{{_PYOBS_NS}}}value")
-    pyobs_value.append(value_to_xml(value, type_hint))
+    pyobs_value.append(value_to_compact(value, type_hint) if compact else value_to_xml(value, type_hint))
     value_elem.append(pyobs_value)
     param.append(value_elem)
     params.append(param)
@@ -167,8 +174,10 @@ class RPC:
         param_names = [k for k in annotation if k not in ("return", "kwargs")]
         param_types = {k: annotation[k] for k in param_names}
 
+        # only send compact payloads to peers that announced to understand them
+        compact = self._comm.supports_compact(target_jid)
         iq = self._client.plugin["xep_0009"].make_iq_method_call(
-            target_jid, method, params_to_xml(param_names, list(args), param_types)
+            target_jid, method, params_to_xml(param_names, list(args), param_types, compact=compact)
         )
 
         jid: str | slixmpp.JID = iq["id"]
@@ -233,7 +242,9 @@ class RPC:
 
             # Serialize return value
             return_type = hints.get("return", type(None))
-            response_params = return_to_xml(return_value, return_type)
+            response_params = return_to_xml(
+                return_value, return_type, compact=self._comm.supports_compact(str(iq["from"]))
+            )
             self._client.plugin["xep_0009"].make_iq_method_response(iq["id"], iq["from"], response_params).send()
 
         except exc.ForbiddenError as e:
@@ -27,8 +27,11 @@ strip the namespace from the tag before matching (tag.split('}')[-1]).
 from __future__ import annotations
 
 import dataclasses
+import functools
 import inspect
+import json
 import types as _builtin_types
+from collections.abc import Callable
 from enum import StrEnum
 from typing import Annotated, Any, Union, get_args, get_origin, get_type_hints
 
@@ -46,6 +49,16 @@ PYOBS_NS = "urn:pyobs:rpc:1"
 # ---------------------------------------------------------------------------
 # Single-value serialization
 # ---------------------------------------------------------------------------
+#
+# Encoders and decoders are compiled once per type hint and cached, so the
+# get_origin()/get_args()/get_type_hints() analysis of a hint -- most of all
+# the per-dataclass get_type_hints() call -- only happens on first use instead
+# of on every RPC, state publish and capability lookup. The compiled closures
+# still dispatch on the runtime value (encode) or wire tag (decode) wherever
+# the old implementation did, so the wire format is unchanged.
+
+Encoder = Callable[[Any], ET.Element]
+Decoder = Callable[[ET.Element], Any]
 
 
 def value_to_xml(value: Any, type_hint: Any) -> ET.Element:
@@ -62,6 +75,109 @@ def value_to_xml(value: Any, type_hint: Any) -> ET.Element:
     Returns:
         XML element representing the value.
     """
+    return _encoder(type_hint)(value)
+
+
+def xml_to_value(elem: ET.Element, type_hint: Any) -> Any:
+    """Deserialize an XML element (produced by ``value_to_xml``) to a Python value.
+
+    Handles the namespace stripping needed after ejabberd round-trips
+    (plain ``<double>`` may arrive as ``{urn:pyobs:rpc:1}double``).
+
+    Args:
+        elem: XML element to deserialize.
+        type_hint: Expected Python type.
+
+    Returns:
+        Deserialized Python value.
+    """
+    return _decoder(type_hint)(elem)
+
+
+def _encoder(type_hint: Any) -> Encoder:
+    """Returns the cached encoder for the given type hint, falls back to dynamic encoding for unhashable hints."""
+    try:
+        return _compile_encoder(type_hint)
+    except TypeError:
+        return functools.partial(_encode_dynamic, type_hint=type_hint)
+
+
+def _decoder(type_hint: Any) -> Decoder:
+    """Returns the cached decoder for the given type hint, compiles it on every call for unhashable hints."""
+    try:
+        return _compile_decoder(type_hint)
+    except TypeError:
+        return _compile_decoder.__wrapped__(type_hint)
+
+
+def _text_element(tag: str, text: str) -> ET.Element:
+    elem = ET.Element(tag)
+    elem.text = text
+    return elem
+
+
+@functools.cache
+def _compile_encoder(type_hint: Any) -> Encoder:
+    """Compiles an encoder for the given type hint.
+
+    The returned encoder takes a fast path if the runtime type of the value is exactly what the hint promises, and
+    uses the dynamic encoding otherwise, which handles numpy scalars, coercion to str, subclasses, etc.
+    """
+    # Unwrap Annotated[T, ...]
+    if get_origin(type_hint) is Annotated:
+        type_hint = get_args(type_hint)[0]
+    dynamic = functools.partial(_encode_dynamic, type_hint=type_hint)
+
+    if type_hint is bool:
+        return lambda v: _text_element("boolean", "true" if v else "false") if type(v) is bool else dynamic(v)
+    if type_hint is int:
+        return lambda v: _text_element("int", str(v)) if type(v) is int else dynamic(v)
+    if type_hint is float:
+        return lambda v: _text_element("double", repr(v)) if type(v) is float else dynamic(v)
+    if type_hint is str:
+        return lambda v: _text_element("string", v) if type(v) is str else dynamic(v)
+
+    # list[T]
+    if get_origin(type_hint) is list:
+        item_encoder = _encoder(get_args(type_hint)[0] if get_args(type_hint) else Any)
+
+        def encode_list(value: Any) -> ET.Element:
+            if type(value) is not list:
+                return dynamic(value)
+            items = ET.Element("items")
+            for item in value:
+                ET.SubElement(items, "item").append(item_encoder(item))
+            return items
+
+        return encode_list
+
+    # dict[K, V]
+    if get_origin(type_hint) is dict and len(get_args(type_hint)) >= 2:
+        key_encoder, val_encoder = _encoder(get_args(type_hint)[0]), _encoder(get_args(type_hint)[1])
+
+        def encode_dict(value: Any) -> ET.Element:
+            if type(value) is not dict:
+                return dynamic(value)
+            dct = ET.Element("dict")
+            for k, v in value.items():
+                entry = ET.SubElement(dct, "entry")
+                ET.SubElement(entry, "key").append(key_encoder(k))
+                ET.SubElement(entry, "val").append(val_encoder(v))
+            return dct
+
+        return encode_dict
+
+    # dataclass
+    if isinstance(type_hint, type) and dataclasses.is_dataclass(type_hint):
+        dataclass_hint = type_hint
+        return lambda v: _dataclass_to_xml(v) if type(v) is dataclass_hint else dynamic(v)
+
+    # everything else, e.g. Any, unions, tuples, enums
+    return dynamic
+
+
+def _encode_dynamic(value: Any, type_hint: Any) -> ET.Element:
+    """Serialize a value by dispatching on its runtime type, see value_to_xml()."""
     # Unwrap Annotated[T, ...]
     if get_origin(type_hint) is Annotated:
         type_hint = get_args(type_hint)[0]
@@ -87,41 +203,29 @@ def value_to_xml(value: Any, type_hint: Any) -> ET.Element:
 
     # bool (before int — bool is subclass of int)
     if isinstance(value, bool):
-        elem = ET.Element("boolean")
-        elem.text = "true" if value else "false"
-        return elem
+        return _text_element("boolean", "true" if value else "false")
 
     # int
     if isinstance(value, int):
-        elem = ET.Element("int")
-        elem.text = str(value)
-        return elem
+        return _text_element("int", str(value))
 
     # float
     if isinstance(value, float):
-        elem = ET.Element("double")
-        elem.text = repr(value)
-        return elem
+        return _text_element("double", repr(value))
 
     # str
     if isinstance(value, str):
-        elem = ET.Element("string")
-        elem.text = value
-        return elem
+        return _text_element("string", value)
 
     # StrEnum
     if isinstance(value, StrEnum):
-        elem = ET.Element("string")
-        elem.text = value.value
-        return elem
+        return _text_element("string", value.value)
 
     # Time (pyobs's astropy.time.Time subclass) -- serialize as ISO text, reconstructed on
     # decode via type_hint (mirrors the StrEnum pattern above). Without this, Time fell
     # through to the generic stringify fallback below with no way back to a Time object.
     if isinstance(value, _Time):
-        elem = ET.Element("string")
-        elem.text = value.isot
-        return elem
+        return _text_element("string", value.isot)
 
     # dataclass — serialize as <{namespace}state> with plain field children
     if dataclasses.is_dataclass(value) and not isinstance(value, type):
@@ -129,12 +233,10 @@ def value_to_xml(value: Any, type_hint: Any) -> ET.Element:
 
     # list
     if isinstance(value, list):
-        item_type = get_args(type_hint)[0] if type_hint and get_origin(type_hint) is list else Any
+        item_encoder = _encoder(get_args(type_hint)[0] if type_hint and get_origin(type_hint) is list else Any)
         items = ET.Element("items")
         for item in value:
-            item_elem = ET.Element("item")
-            item_elem.append(value_to_xml(item, item_type))
-            items.append(item_elem)
+            ET.SubElement(items, "item").append(item_encoder(item))
         return items
 
     # tuple
@@ -143,138 +245,303 @@ def value_to_xml(value: Any, type_hint: Any) -> ET.Element:
         tup = ET.Element("tuple")
         for i, item in enumerate(value):
             item_type = item_types[i] if i < len(item_types) else Any
-            item_elem = ET.Element("item")
-            item_elem.append(value_to_xml(item, item_type))
-            tup.append(item_elem)
+            ET.SubElement(tup, "item").append(value_to_xml(item, item_type))
         return tup
 
     # dict
     if isinstance(value, dict):
         key_type, val_type = get_args(type_hint)[:2] if type_hint and get_origin(type_hint) is dict else (Any, Any)
+        key_encoder, val_encoder = _encoder(key_type), _encoder(val_type)
         dct = ET.Element("dict")
         for k, v in value.items():
-            entry = ET.Element("entry")
-            key_elem = ET.Element("key")
-            key_elem.append(value_to_xml(k, key_type))
-            val_elem = ET.Element("val")
-            val_elem.append(value_to_xml(v, val_type))
-            entry.append(key_elem)
-            entry.append(val_elem)
-            dct.append(entry)
+            entry = ET.SubElement(dct, "entry")
+            ET.SubElement(entry, "key").append(key_encoder(k))
+            ET.SubElement(entry, "val").append(val_encoder(v))
         return dct
 
     # fallback: stringify
-    elem = ET.Element("string")
-    elem.text = str(value)
-    return elem
+    return _text_element("string", str(value))
 
 
-def xml_to_value(elem: ET.Element, type_hint: Any) -> Any:
-    """Deserialize an XML element (produced by ``value_to_xml``) to a Python value.
+def _strip_ns(tag: str) -> str:
+    """Strip namespace from tag — ejabberd may re-serialize plain children
+    with the parent element's namespace prefix."""
+    return tag.split("}")[-1] if "}" in tag else tag
 
-    Handles the namespace stripping needed after ejabberd round-trips
-    (plain ``<double>`` may arrive as ``{urn:pyobs:rpc:1}double``).
 
-    Args:
-        elem: XML element to deserialize.
-        type_hint: Expected Python type.
+@functools.cache
+def _compile_decoder(type_hint: Any) -> Decoder:
+    """Compiles a decoder for the given type hint.
 
-    Returns:
-        Deserialized Python value.
+    All analysis of the type hint happens here once, the returned decoder only dispatches on the wire tag.
     """
     # Unwrap Annotated[T, ...]
     if get_origin(type_hint) is Annotated:
         type_hint = get_args(type_hint)[0]
 
+    # compact payloads are decoded with the full type hint, see value_to_compact()
+    compact_hint = type_hint
+
     # Unwrap Optional[T] / T | None → T
     args = get_args(type_hint) if type_hint else ()
     if args and type(None) in args:
         non_none = [a for a in args if a is not type(None)]
         type_hint = non_none[0] if non_none else Any
 
-    # Strip namespace from tag — ejabberd may re-serialize plain children
-    # with the parent element's namespace prefix.
-    tag = elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-
-    if tag == "nil":
-        return None
-
     # boolean/int/double coerced to str when the field is declared `str` but a
     # not-yet-upgraded sender is still emitting the wrong wire tag for it (the mirror image
     # of value_to_xml's own str coercion on encode -- see the comment there) -- otherwise a
     # bool/int/float leaks straight into a str-typed field/dict value.
-    if tag == "boolean":
+    as_str = type_hint is str
+
+    def decode_boolean(elem: ET.Element) -> Any:
         value = elem.text == "true"
-        return str(value) if type_hint is str else value
+        return str(value) if as_str else value
 
-    if tag == "int":
+    def decode_int(elem: ET.Element) -> Any:
         value = int(elem.text) if elem.text is not None else 0
-        return str(value) if type_hint is str else value
+        return str(value) if as_str else value
 
-    if tag == "double":
+    def decode_double(elem: ET.Element) -> Any:
         value = float(elem.text) if elem.text is not None else 0.0
-        return str(value) if type_hint is str else value
-
-    if tag == "string":
+        return str(value) if as_str else value
+
+    # cast to enum if type_hint is a StrEnum subclass and to Time if type_hint is a Time subclass
+    # (see the matching encode branch). No explicit format= for Time: astropy auto-detects "isot"
+    # (this serializer's own encoding) as well as "iso" (the plain str(Time) space-separated format
+    # a not-yet-upgraded sender on the old serializer would still be emitting via the stringify
+    # fallback) -- pinning to "isot" would hard-fail on exactly that mixed-version case.
+    string_type: Any = None
+    if type_hint and isinstance(type_hint, type) and (issubclass(type_hint, StrEnum) or issubclass(type_hint, _Time)):
+        string_type = type_hint
+
+    def decode_string(elem: ET.Element) -> Any:
         text = elem.text or ""
-        # cast to enum if type_hint is a StrEnum subclass
-        if type_hint and isinstance(type_hint, type) and issubclass(type_hint, StrEnum):
-            return type_hint(text)
-        # cast to Time if type_hint is a Time subclass (see the matching encode branch).
-        # No explicit format=: astropy auto-detects "isot" (this fix's own encoding) as well
-        # as "iso" (the plain str(Time) space-separated format a not-yet-upgraded sender on
-        # the old serializer would still be emitting via the stringify fallback) -- pinning
-        # to "isot" would hard-fail on exactly that mixed-version case.
-        if type_hint and isinstance(type_hint, type) and issubclass(type_hint, _Time):
-            return type_hint(text)
-        return text
-
-    if tag == "items":
-        item_type = get_args(type_hint)[0] if type_hint and get_origin(type_hint) is list else Any
+        return string_type(text) if string_type is not None else text
+
+    # item decoders are looked up lazily, since they may refer back to this decoder (e.g. list[Any] items)
+    list_item_type = get_args(type_hint)[0] if type_hint and get_origin(type_hint) is list else Any
+    tuple_item_types = get_args(type_hint) if type_hint and get_origin(type_hint) is tuple else ()
+    key_type, val_type = get_args(type_hint)[:2] if type_hint and get_origin(type_hint) is dict else (Any, Any)
+
+    def decode_items(elem: ET.Element) -> Any:
+        item_decoder = _decoder(list_item_type)
         result = []
         # findall with namespace stripping — ejabberd may namespace <item> elements
         for item_elem in elem:
-            if item_elem.tag.split("}")[-1] == "item":
+            if _strip_ns(item_elem.tag) == "item":
                 children = list(item_elem)
                 if children:
-                    result.append(xml_to_value(children[0], item_type))
+                    result.append(item_decoder(children[0]))
         return result
 
-    if tag == "tuple":
-        item_types = get_args(type_hint) if type_hint and get_origin(type_hint) is tuple else []
+    def decode_tuple(elem: ET.Element) -> Any:
         result = []
         i = 0
         for item_elem in elem:
-            if item_elem.tag.split("}")[-1] == "item":
-                item_type = item_types[i] if i < len(item_types) else Any
+            if _strip_ns(item_elem.tag) == "item":
+                item_type = tuple_item_types[i] if i < len(tuple_item_types) else Any
                 children = list(item_elem)
                 if children:
-                    result.append(xml_to_value(children[0], item_type))
+                    result.append(_decoder(item_type)(children[0]))
                 i += 1
         return tuple(result)
 
-    if tag == "dict":
-        key_type, val_type = get_args(type_hint)[:2] if type_hint and get_origin(type_hint) is dict else (Any, Any)
+    def decode_dict(elem: ET.Element) -> Any:
+        key_decoder, val_decoder = _decoder(key_type), _decoder(val_type)
         result = {}
         for entry in elem:
-            if entry.tag.split("}")[-1] != "entry":
+            if _strip_ns(entry.tag) != "entry":
                 continue
-            key_elem = next((c for c in entry if c.tag.split("}")[-1] == "key"), None)
-            val_elem = next((c for c in entry if c.tag.split("}")[-1] == "val"), None)
+            key_elem = next((c for c in entry if _strip_ns(c.tag) == "key"), None)
+            val_elem = next((c for c in entry if _strip_ns(c.tag) == "val"), None)
             key_children = list(key_elem) if key_elem is not None else []
             val_children = list(val_elem) if val_elem is not None else []
             if key_children and val_children:
-                k = xml_to_value(key_children[0], key_type)
-                v = xml_to_value(val_children[0], val_type)
-                result[k] = v
+                result[key_decoder(key_children[0])] = val_decoder(val_children[0])
         return result
 
-    # dataclass / State — the element IS the dataclass root
-    if type_hint and dataclasses.is_dataclass(type_hint):
-        return _xml_to_dataclass(elem, type_hint)
+    def decode_json(elem: ET.Element) -> Any:
+        return _compile_from_plain(compact_hint)(json.loads(elem.text or "null"))
+
+    # dataclass / State — the element IS the dataclass root, anything else falls back to text
+    dataclass_hint = type_hint if type_hint and dataclasses.is_dataclass(type_hint) else None
+
+    def fallback(elem: ET.Element) -> Any:
+        return _xml_to_dataclass(elem, dataclass_hint) if dataclass_hint is not None else elem.text
+
+    handlers: dict[str, Decoder] = {
+        "nil": lambda elem: None,
+        "boolean": decode_boolean,
+        "int": decode_int,
+        "double": decode_double,
+        "string": decode_string,
+        "items": decode_items,
+        "tuple": decode_tuple,
+        "dict": decode_dict,
+        "json": decode_json,
+    }
+
+    def decode(elem: ET.Element) -> Any:
+        return handlers.get(_strip_ns(elem.tag), fallback)(elem)
+
+    return decode
+
+
+# ---------------------------------------------------------------------------
+# Compact payload
+# ---------------------------------------------------------------------------
+#
+# Instead of one element per scalar, list item and dict entry, a value can be
+# sent as a single <json> element with a JSON text, if its type hint fully
+# describes the structure (see compact_supported()) and the peer advertises
+# COMPACT_FEATURE in its disco#info. xml_to_value() always understands it.
+
+COMPACT_FEATURE = "urn:pyobs:codec:json:1"
+
 
-    # fallback
-    return elem.text
+@functools.cache
+def compact_supported(type_hint: Any) -> bool:
+    """Whether values of the given type hint can be sent as a compact payload.
+
+    That's only the case, if the type hint alone (without the value) is enough to reconstruct the value from JSON.
+    """
+    if get_origin(type_hint) is Annotated:
+        return compact_supported(get_args(type_hint)[0])
+    origin, args = get_origin(type_hint), get_args(type_hint)
+
+    # T | None
+    if origin is Union or origin is _builtin_types.UnionType:
+        non_none = [a for a in args if a is not type(None)]
+        return len(non_none) == 1 and len(args) == 2 and compact_supported(non_none[0])
+
+    # containers
+    if origin is list:
+        return len(args) == 1 and compact_supported(args[0])
+    if origin is tuple:
+        return len(args) > 0 and Ellipsis not in args and all(compact_supported(a) for a in args)
+    if origin is dict:
+        return len(args) == 2 and args[0] is str and compact_supported(args[1])
+
+    # scalars
+    if type_hint in (bool, int, float, str):
+        return True
+    if isinstance(type_hint, type) and (issubclass(type_hint, StrEnum) or issubclass(type_hint, _Time)):
+        return True
+
+    # dataclasses with supported fields
+    if isinstance(type_hint, type) and dataclasses.is_dataclass(type_hint):
+        return all(compact_supported(t) for _, t, _ in _dataclass_schema(type_hint))
+    return False
+
+
+def value_to_compact(value: Any, type_hint: Any) -> ET.Element:
+    """Serialize a value to a single ``<json>`` element, which is much cheaper than value_to_xml() for large values.
+
+    Falls back to value_to_xml(), if the type hint is not supported or the value doesn't match it.
+
+    Args:
+        value: Python value to serialize.
+        type_hint: Type annotation for the value.
+
+    Returns:
+        XML element representing the value.
+    """
+    try:
+        if compact_supported(type_hint):
+            return _text_element("json", json.dumps(_compile_to_plain(type_hint)(value), separators=(",", ":")))
+    except (TypeError, ValueError, AttributeError):
+        pass
+    return value_to_xml(value, type_hint)
+
+
+@functools.cache
+def _compile_to_plain(type_hint: Any) -> Callable[[Any], Any]:
+    """Compiles a function that converts a value of the given (supported) type into JSON-serializable types."""
+    if get_origin(type_hint) is Annotated:
+        return _compile_to_plain(get_args(type_hint)[0])
+    origin, args = get_origin(type_hint), get_args(type_hint)
+
+    if origin is Union or origin is _builtin_types.UnionType:
+        inner = _compile_to_plain(next(a for a in args if a is not type(None)))
+        return lambda v: None if v is None else inner(v)
+    if origin is list:
+        item = _compile_to_plain(args[0])
+        return lambda v: [item(x) for x in _check(v, (list, tuple))]
+    if origin is tuple:
+        items = [_compile_to_plain(a) for a in args]
+        return lambda v: [f(x) for f, x in zip(items, _check(v, (list, tuple)), strict=True)]
+    if origin is dict:
+        val = _compile_to_plain(args[1])
+        return lambda v: {_check(k, str): val(x) for k, x in _check(v, dict).items()}
+
+    if type_hint is bool:
+        return lambda v: _check(_native(v), bool)
+    if type_hint is int or type_hint is float:
+        # floats for int hints stay floats, like with value_to_xml()
+        return lambda v: _check(_native(v), (int, float))
+    if type_hint is str:
+        # coerce to str, like value_to_xml()
+        return lambda v: v if isinstance(v, str) else str(_native(v))
+    if isinstance(type_hint, type) and issubclass(type_hint, StrEnum):
+        return lambda v: v.value if isinstance(v, StrEnum) else _check(v, str)
+    if isinstance(type_hint, type) and issubclass(type_hint, _Time):
+        return lambda v: _check(v, _Time).isot
+
+    if isinstance(type_hint, type) and dataclasses.is_dataclass(type_hint):
+        fields = [(name, _compile_to_plain(hint)) for name, hint, _ in _dataclass_schema(type_hint)]
+        cls = type_hint
+        return lambda v: {name: f(getattr(_check(v, cls), name)) for name, f in fields}
+
+    raise TypeError(f"Unsupported type for compact payload: {type_hint}")
+
+
+@functools.cache
+def _compile_from_plain(type_hint: Any) -> Callable[[Any], Any]:
+    """Compiles a function that converts decoded JSON back into a value of the given type."""
+    if get_origin(type_hint) is Annotated:
+        return _compile_from_plain(get_args(type_hint)[0])
+    origin, args = get_origin(type_hint), get_args(type_hint)
+
+    if origin is Union or origin is _builtin_types.UnionType:
+        non_none = [a for a in args if a is not type(None)]
+        if len(non_none) != 1:
+            return lambda v: v
+        inner = _compile_from_plain(non_none[0])
+        return lambda v: None if v is None else inner(v)
+    if origin is list:
+        item = _compile_from_plain(args[0]) if args else (lambda v: v)
+        return lambda v: [item(x) for x in v]
+    if origin is tuple:
+        items = [_compile_from_plain(a) for a in args]
+        return lambda v: tuple(f(x) for f, x in zip(items, v))
+    if origin is dict and len(args) == 2:
+        val = _compile_from_plain(args[1])
+        return lambda v: {k: val(x) for k, x in v.items()}
+
+    if isinstance(type_hint, type) and (issubclass(type_hint, StrEnum) or issubclass(type_hint, _Time)):
+        cls = type_hint
+        return lambda v: cls(v)
+
+    if isinstance(type_hint, type) and dataclasses.is_dataclass(type_hint):
+        fields = [(name, _compile_from_plain(hint)) for name, hint, _ in _dataclass_schema(type_hint)]
+        dcls = type_hint
+        return lambda v: dcls(**{name: f(v[name]) for name, f in fields if name in v})
+
+    # scalars and everything else are passed through
+    return lambda v: v
+
+
+def _native(value: Any) -> Any:
+    """Normalize numpy scalars to native Python types."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _check(value: Any, types: type | tuple[type, ...]) -> Any:
+    """Make sure that value is of given type(s), otherwise it cannot be sent as compact payload."""
+    if not isinstance(value, types):
+        raise TypeError(f"Unexpected type {type(value)} for compact payload.")
+    return value
 
 
 # ---------------------------------------------------------------------------
@@ -282,6 +549,40 @@ def xml_to_value(elem: ET.Element, type_hint: Any) -> Any:
 # ---------------------------------------------------------------------------
 
 
+@functools.cache
+def _dataclass_schema(cls: type) -> list[tuple[str, Any, Any]]:
+    """Returns a list of (name, type, type without Optional) for all fields of the given dataclass.
+
+    Cached, since get_type_hints() is by far the most expensive step in (de)serializing a dataclass.
+    """
+    hints = get_type_hints(cls, include_extras=True)
+    schema = []
+    for f in dataclasses.fields(cls):
+        field_type = hints.get(f.name, Any)
+        # Unwrap Annotated
+        if get_origin(field_type) is Annotated:
+            field_type = get_args(field_type)[0]
+        # Unwrap Optional
+        decode_type = field_type
+        ft_args = get_args(decode_type)
+        if ft_args and type(None) in ft_args:
+            decode_type = next(a for a in ft_args if a is not type(None))
+        schema.append((f.name, field_type, decode_type))
+    return schema
+
+
+@functools.cache
+def _dataclass_encoders(cls: type) -> list[tuple[str, Encoder]]:
+    """Returns a list of (name, encoder) for all fields of the given dataclass."""
+    return [(name, _encoder(field_type)) for name, field_type, _ in _dataclass_schema(cls)]
+
+
+@functools.cache
+def _dataclass_decoders(cls: type) -> list[tuple[str, Any, Decoder]]:
+    """Returns a list of (name, type, decoder) for all fields of the given dataclass."""
+    return [(name, decode_type, _decoder(decode_type)) for name, _, decode_type in _dataclass_schema(cls)]
+
+
 def _dataclass_to_xml(state: Any, namespace: str = PYOBS_NS, tag: str = "state") -> ET.Element:
     """Serialize a dataclass to ``<{namespace}state>`` with plain field children.
 
@@ -296,16 +597,8 @@ def _dataclass_to_xml(state: Any, namespace: str = PYOBS_NS, tag: str = "state")
         ``<{namespace}state>`` element.
     """
     root = ET.Element(f"{{{namespace}}}{tag}")
-    hints = get_type_hints(type(state), include_extras=True)
-    for f in dataclasses.fields(state):
-        field_val = getattr(state, f.name)
-        field_type = hints.get(f.name, Any)
-        # Unwrap Annotated
-        if get_origin(field_type) is Annotated:
-            field_type = get_args(field_type)[0]
-        child = ET.Element(f.name)
-        child.append(value_to_xml(field_val, field_type))
-        root.append(child)
+    for name, encoder in _dataclass_encoders(type(state)):
+        ET.SubElement(root, name).append(encoder(getattr(state, name)))
     return root
 
 
@@ -322,38 +615,28 @@ def _xml_to_dataclass(elem: ET.Element, state_cls: type) -> Any:
     Returns:
         Populated dataclass instance.
     """
-    hints = get_type_hints(state_cls, include_extras=True)
     # Namespace from root tag for namespaced child lookup
     ns = elem.tag[1 : elem.tag.index("}")] if elem.tag.startswith("{") else ""
 
     kwargs = {}
-    for f in dataclasses.fields(state_cls):
+    for name, field_type, decoder in _dataclass_decoders(state_cls):
         # Try namespaced child first (ejabberd round-trip), then plain
-        child = elem.find(f"{{{ns}}}{f.name}") if ns else None
+        child = elem.find(f"{{{ns}}}{name}") if ns else None
         if child is None:
-            child = elem.find(f.name)
+            child = elem.find(name)
         if child is None:
             continue
 
-        field_type = hints.get(f.name, Any)
-        # Unwrap Annotated
-        if get_origin(field_type) is Annotated:
-            field_type = get_args(field_type)[0]
-        # Unwrap Optional
-        ft_args = get_args(field_type)
-        if ft_args and type(None) in ft_args:
-            field_type = next(a for a in ft_args if a is not type(None))
-
         # The child element wraps the value — it may contain a vocabulary
         # element (post-round-trip: the child IS the value element) or
         # have sub-children (new format: child contains value_to_xml output).
         value_elems = list(child)
         if value_elems:
             # New format: child contains a value element
-            kwargs[f.name] = xml_to_value(value_elems[0], field_type)
+            kwargs[name] = decoder(value_elems[0])
         elif child.text is not None:
             # Legacy format: child.text is the raw value string
-            kwargs[f.name] = _parse_scalar(child.text, field_type)
+            kwargs[name] = _parse_scalar(child.text, field_type)
         # else: field absent, keep default
 
     return state_cls(**kwargs)
@@ -548,8 +831,11 @@ def _event_schema_to_xml(event_cls: type) -> ET.Element:
 
 __all__ = [
     "PYOBS_NS",
+    "COMPACT_FEATURE",
     "value_to_xml",
     "xml_to_value",
+    "value_to_compact",
+    "compact_supported",
     "_dataclass_to_xml",
     "_xml_to_dataclass",
     "_interface_schema_to_xml",
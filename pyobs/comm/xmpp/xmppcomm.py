@@ -20,7 +20,7 @@ from slixmpp.xmlstream.handler import Callback
 from slixmpp.xmlstream.matcher import MatchXMLMask
 
 from pyobs.comm import Comm
-from pyobs.events import Event, LogEvent, ModuleClosedEvent, ModuleOpenedEvent
+from pyobs.events import Event, LogBatchEvent, LogEvent, ModuleClosedEvent, ModuleOpenedEvent
 from pyobs.events.event import EventFactory
 from pyobs.interfaces import Interface
 from pyobs.interfaces.interface import get_registered_interface
@@ -28,7 +28,13 @@ from pyobs.utils import exceptions as exc
 from pyobs.utils.enums import ModuleState
 
 from .rpc import RPC
-from .serializer import _dataclass_to_xml, _event_schema_to_xml, _interface_schema_to_xml, _xml_to_dataclass
+from .serializer import (
+    COMPACT_FEATURE,
+    _dataclass_to_xml,
+    _event_schema_to_xml,
+    _interface_schema_to_xml,
+    _xml_to_dataclass,
+)
 from .xmppclient import XmppClient
 
 if TYPE_CHECKING:
@@ -205,7 +211,9 @@ class XmppComm(Comm):
         self._online_clients: list[str] = []
         self._interface_cache: dict[str, asyncio.Future[list[type[Interface]]]] = {}
         self._interface_features: dict[str, list[str]] = {}
+        self._compact_peers: set[str] = set()
         self._peer_sent_events: dict[str, set[tuple[str, int]]] = {}
+        self._peer_subscribed_events: dict[str, set[tuple[str, int]]] = {}
         self._warned_version_mismatches: set[tuple[str, str]] = set()
         self._user = user
         self._password = password
@@ -348,7 +356,8 @@ class XmppComm(Comm):
         elif self._domain is not None:
             server, port = self._domain, 5222
 
-        # add features
+        # add features, we always understand compact payloads
+        self._xmpp.plugin["xep_0030"].add_feature(COMPACT_FEATURE)
         if self._module is not None:
             for i in self._module.interfaces:
                 self._xmpp.plugin["xep_0030"].add_feature(f"urn:pyobs:interface:{i.__name__}:{i.version}")
@@ -460,6 +469,17 @@ class XmppComm(Comm):
         """
         return name if "@" in name else f"{name}@{self._domain}/{self._resource}"
 
+    def supports_compact(self, jid: str) -> bool:
+        """Whether the given JID announced to understand compact RPC payloads.
+
+        Args:
+            jid: Full JID to check.
+
+        Returns:
+            True, if compact payloads can be sent to the JID.
+        """
+        return jid in self._compact_peers
+
     async def get_interfaces(self, client: str) -> list[type[Interface]]:
         """Returns list of interfaces for given client.
 
@@ -515,9 +535,16 @@ class XmppComm(Comm):
                 info = info["disco_info"]
             prefix = "urn:pyobs:interface:"
             features = [i for i in info["features"] if i.startswith(prefix)]
+            compact = COMPACT_FEATURE in info["features"]
         except TypeError:
             raise IndexError()
 
+        # remember whether we can send compact payloads to this JID
+        if compact:
+            self._compact_peers.add(jid)
+        else:
+            self._compact_peers.discard(jid)
+
         # cache raw features for this JID, so a later version-mismatch can be diagnosed
         self._interface_features[jid] = features
 
@@ -529,6 +556,9 @@ class XmppComm(Comm):
         # _register_events).
         self._peer_sent_events[jid] = self._parse_peer_sent_events(info)
 
+        # and which ones it subscribes to, for peers that still expect single log records, see _send_single_log_events
+        self._peer_subscribed_events[jid] = self._parse_peer_sent_events(info, role="subscribe")
+
         # keep only names whose remote-published version matches what this client expects --
         # a mismatch is treated the same as the interface not being there at all, rather than
         # silently using the local (possibly incompatible) class
@@ -552,8 +582,8 @@ class XmppComm(Comm):
         return interface_names
 
     @staticmethod
-    def _parse_peer_sent_events(info: Any) -> set[tuple[str, int]]:
-        """Extract (event class name, version) pairs a peer's disco#info marks role="send" for.
+    def _parse_peer_sent_events(info: Any, role: str = "send") -> set[tuple[str, int]]:
+        """Extract (event class name, version) pairs a peer's disco#info marks role="send" (or the given role) for.
 
         Reads the rich <{urn:pyobs:event:name:version}event role="..."> elements _get_disco_info
         appends (see _event_role), not the plain urn:pyobs:event: feature list -- that list only
@@ -572,7 +602,7 @@ class XmppComm(Comm):
             ns, _, local = tag[1:].partition("}")
             if local != "event" or not ns.startswith(ns_prefix):
                 continue
-            if "send" not in elem.get("role", "").split():
+            if role not in elem.get("role", "").split():
                 continue
             name = elem.get("name")
             _, _, version_str = ns[len(ns_prefix) :].rpartition(":")
@@ -817,6 +847,8 @@ class XmppComm(Comm):
         if jid in self._interface_cache:
             del self._interface_cache[jid]
         self._interface_features.pop(jid, None)
+        self._compact_peers.discard(jid)
+        self._peer_subscribed_events.pop(jid, None)
 
         # send event
         self._send_event_to_module(ModuleClosedEvent(), module_name)
@@ -841,6 +873,13 @@ class XmppComm(Comm):
             raise ValueError("No XMPP client.")
         return self._xmpp
 
+    def _send_single_log_events(self) -> bool:
+        """Whether any peer subscribes to LogEvent, but not to LogBatchEvent, i.e. runs a version of pyobs that
+        doesn't know about batches of log records."""
+        single = (LogEvent.__name__, LogEvent.version)
+        batch = (LogBatchEvent.__name__, LogBatchEvent.version)
+        return any(single in events and batch not in events for events in self._peer_subscribed_events.values())
+
     async def send_event(self, event: Event) -> None:
         """Send an event to other clients.
 
@@ -10,7 +10,7 @@ from .exposurestatuschanged import ExposureStatusChangedEvent
 from .filterchanged import FilterChangedEvent
 from .focusfound import FocusFoundEvent
 from .goodweather import GoodWeatherEvent
-from .log import LogEvent
+from .log import LogBatchEvent, LogEvent
 from .modechanged import ModeChangedEvent
 from .moduleclosed import ModuleClosedEvent
 from .moduleopened import ModuleOpenedEvent
@@ -21,6 +21,7 @@ from .newspectrum import NewSpectrumEvent
 from .offsets import OffsetsAltAzEvent, OffsetsEvent, OffsetsRaDecEvent
 from .roofclosing import RoofClosingEvent
 from .roofopened import RoofOpenedEvent
+from .schedulechanged import ScheduleChangedEvent
 from .taskfailed import TaskFailedEvent
 from .taskfinished import TaskFinishedEvent
 from .taskstarted import TaskStartedEvent
@@ -34,6 +35,7 @@ __all__ = [
     "FocusFoundEvent",
     "GoodWeatherEvent",
     "LogEvent",
+    "LogBatchEvent",
     "ModeChangedEvent",
     "ModuleClosedEvent",
     "ModuleOpenedEvent",
@@ -45,6 +47,7 @@ __all__ = [
     "NewSpectrumEvent",
     "RoofClosingEvent",
     "RoofOpenedEvent",
+    "ScheduleChangedEvent",
     "TaskStartedEvent",
     "TaskFailedEvent",
     "TaskFinishedEvent",
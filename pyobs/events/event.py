@@ -8,6 +8,10 @@ from typing import Any
 
 log = logging.getLogger(__name__)
 
+# all event classes by name, and every event class with all classes derived from it, including itself
+_REGISTRY: dict[str, type[Event]] = {}
+_DERIVED: dict[type[Event], list[type[Event]]] = {}
+
 
 class Event:
     """Base class for all events."""
@@ -16,6 +20,26 @@ class Event:
     local: bool = False
     version: int = 1
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        # events are identified by name only when sent to other modules, so names must be unique, but a class can
+        # be defined again, e.g. when its module is reloaded
+        existing = _REGISTRY.get(cls.__name__)
+        if existing is not None and (existing.__module__, existing.__qualname__) != (cls.__module__, cls.__qualname__):
+            raise TypeError(
+                f"Event name '{cls.__name__}' is already registered by "
+                f"{existing.__module__}.{existing.__qualname__}; "
+                f"choose a distinct name for {cls.__module__}.{cls.__qualname__}."
+            )
+        _REGISTRY[cls.__name__] = cls
+
+        # add it to the derived events of itself and all its base events
+        _DERIVED[cls] = [cls]
+        for base in cls.__mro__[1:]:
+            if base in _DERIVED:
+                _DERIVED[base].append(cls)
+
     def __init__(self, **kwargs: Any):
         self.uuid = str(uuid.uuid4())
         self.timestamp = time.time()
@@ -35,6 +59,35 @@ class Event:
         return cls(**d)
 
 
+_DERIVED[Event] = [Event]
+
+
+def get_registered_event(name: str) -> type[Event] | None:
+    """Look up a registered event class by name, or None if unknown."""
+    return _REGISTRY.get(name)
+
+
+def registered_events() -> dict[str, type[Event]]:
+    """All currently-registered event classes, keyed by name."""
+    return dict(_REGISTRY)
+
+
+def derived_events(event: type[Event]) -> list[type[Event]]:
+    """Returns the given event class and all registered event classes derived from it.
+
+    Every subclass of :class:`Event` is registered when it is defined, no matter in which package, so this includes
+    events from plugins, as long as they have been imported.
+
+    Args:
+        event: Event class to check.
+
+    Returns:
+        List of event classes.
+    """
+    derived = _DERIVED.get(event)
+    return [event] if derived is None else list(derived)
+
+
 class EventFactory:
     packages = [__package__]
 
@@ -49,21 +102,22 @@ class EventFactory:
             Event object containing event.
         """
 
-        # create class
-        cls: Event | None = None
-        for p in EventFactory.packages:
-            if p is None:
-                continue
-            # import package
-            parts = p.split(".")
-            pkg = __import__(parts[0])
-            for comp in parts[1:]:
-                pkg = getattr(pkg, comp)
-
-            # does it have the given type as class?
-            if hasattr(pkg, obj_dict["type"]):
-                cls = getattr(pkg, obj_dict["type"])
-                break
+        # create class, first look in the registry and then in the given packages
+        cls: type[Event] | None = get_registered_event(obj_dict["type"])
+        if cls is None:
+            for p in EventFactory.packages:
+                if p is None:
+                    continue
+                # import package
+                parts = p.split(".")
+                pkg = __import__(parts[0])
+                for comp in parts[1:]:
+                    pkg = getattr(pkg, comp)
+
+                # does it have the given type as class?
+                if hasattr(pkg, obj_dict["type"]):
+                    cls = getattr(pkg, obj_dict["type"])
+                    break
 
         # not found?
         if cls is None:
@@ -84,4 +138,4 @@ class EventFactory:
             return None
 
 
-__all__ = ["Event", "EventFactory"]
+__all__ = ["Event", "EventFactory", "get_registered_event", "registered_events", "derived_events"]
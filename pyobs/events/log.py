@@ -69,4 +69,45 @@ class LogEvent(Event):
         return str(self.data["message"])
 
 
-__all__ = ["LogEvent"]
+class BatchDataType(TypedDict):
+    entries: list[DataType]
+
+
+class LogBatchEvent(Event):
+    """Event for several log entries at once, which is how log entries are forwarded by :class:`~pyobs.comm.Comm`.
+
+    Handlers registered for :class:`LogEvent` still get single entries, see
+    :meth:`~pyobs.comm.Comm.register_event`.
+    """
+
+    __module__ = "pyobs.events"
+
+    def __init__(self, entries: list[LogEvent] | None = None, **kwargs: Any):
+        """Initializes a new batch of log entries.
+
+        Args:
+            entries: Log entries in batch.
+        """
+        Event.__init__(self)
+        self._entries = [] if entries is None else list(entries)
+        self.data: BatchDataType = {"entries": [e.data for e in self._entries]}
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> Event:
+        entries = d.get("entries")
+        if not isinstance(entries, list):
+            raise ValueError("Missing log entries.")
+        try:
+            return LogBatchEvent([LogEvent(**entry) for entry in entries])
+        except TypeError as e:
+            raise ValueError(f"Invalid log entry: {e}") from e
+
+    @property
+    def entries(self) -> list[LogEvent]:
+        return self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ["LogEvent", "LogBatchEvent"]
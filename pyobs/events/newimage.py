@@ -10,6 +10,7 @@ class DataType(TypedDict):
     filename: str
     image_type: str | None
     raw: str | None
+    statistics: dict[str, float] | None
 
 
 class NewImageEvent(Event):
@@ -17,19 +18,28 @@ class NewImageEvent(Event):
 
     __module__ = "pyobs.events"
 
-    def __init__(self, filename: str, image_type: ImageType | None = None, raw: str | None = None, **kwargs: Any):
+    def __init__(
+        self,
+        filename: str,
+        image_type: ImageType | None = None,
+        raw: str | None = None,
+        statistics: dict[str, float] | None = None,
+        **kwargs: Any,
+    ):
         """Initializes new NewImageEvent.
 
         Args:
             filename: Name of new image file.
             image_type: Type of image.
             raw: Only for reduced images, references raw frame.
+            statistics: Statistics of image computed by camera, see IImageStatistics.
         """
         Event.__init__(self)
         self.data: DataType = {
             "filename": filename,
             "image_type": image_type if image_type is not None else None,
             "raw": raw,
+            "statistics": statistics,
         }
 
     @classmethod
@@ -49,8 +59,13 @@ class NewImageEvent(Event):
         if "raw" in d and isinstance(d["raw"], str):
             raw = d["raw"]
 
+        # get statistics
+        statistics: dict[str, float] | None = None
+        if "statistics" in d and isinstance(d["statistics"], dict):
+            statistics = {str(k): float(v) for k, v in d["statistics"].items() if isinstance(v, (int, float))}
+
         # return object
-        return NewImageEvent(filename, image_type, raw)
+        return NewImageEvent(filename, image_type, raw, statistics)
 
     @property
     def filename(self) -> str:
@@ -68,6 +83,10 @@ class NewImageEvent(Event):
     def raw(self) -> str | None:
         return self.data["raw"]
 
+    @property
+    def statistics(self) -> dict[str, float] | None:
+        return self.data["statistics"]
+
     @property
     def is_reduced(self) -> bool:
         return self.raw is not None
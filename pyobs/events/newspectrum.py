@@ -7,6 +7,7 @@ from pyobs.events.event import Event
 
 class DataType(TypedDict):
     filename: str
+    snr: float | None
 
 
 class NewSpectrumEvent(Event):
@@ -14,14 +15,15 @@ class NewSpectrumEvent(Event):
 
     __module__ = "pyobs.events"
 
-    def __init__(self, filename: str, **kwargs: Any):
+    def __init__(self, filename: str, snr: float | None = None, **kwargs: Any):
         """Initializes new NewSpectrumEvent.
 
         Args:
             filename: Name of new image file.
+            snr: S/N of spectrum from quick-look reduction, if available.
         """
         Event.__init__(self)
-        self.data: DataType = {"filename": filename}
+        self.data: DataType = {"filename": filename, "snr": snr}
 
     @classmethod
     def from_dict(cls, d: dict[str, Any]) -> Event:
@@ -30,12 +32,21 @@ class NewSpectrumEvent(Event):
             raise ValueError("Invalid type for filename.")
         filename: str = d["filename"]
 
+        # get S/N
+        snr: float | None = None
+        if "snr" in d and isinstance(d["snr"], (int, float)):
+            snr = float(d["snr"])
+
         # return object
-        return NewSpectrumEvent(filename)
+        return NewSpectrumEvent(filename, snr)
 
     @property
     def filename(self) -> str:
         return self.data["filename"]
 
+    @property
+    def snr(self) -> float | None:
+        return self.data["snr"]
+
 
 __all__ = ["NewSpectrumEvent"]
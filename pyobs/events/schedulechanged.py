@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, TypedDict
+
+from pyobs.events.event import Event
+
+if TYPE_CHECKING:
+    from pyobs.utils.time import Time
+
+
+class DataType(TypedDict):
+    start: str | None
+
+
+class ScheduleChangedEvent(Event):
+    """Event to be sent when the schedule has changed."""
+
+    __module__ = "pyobs.events"
+
+    def __init__(self, start: Time | None = None, **kwargs: Any):
+        """Initializes a new schedule changed event.
+
+        Args:
+            start: Time from which on the schedule has changed
+        """
+        Event.__init__(self)
+        self.data: DataType = {"start": start.isot if start is not None else None}
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> Event:
+        from pyobs.utils.time import Time
+
+        # get start
+        start: Time | None = None
+        if "start" in d and isinstance(d["start"], str):
+            start = Time(d["start"])
+
+        # return object
+        return ScheduleChangedEvent(start=start)
+
+    @property
+    def start(self) -> Time | None:
+        from pyobs.utils.time import Time
+
+        return Time(self.data["start"]) if self.data["start"] is not None else None
+
+
+__all__ = ["ScheduleChangedEvent"]
@@ -1,6 +1,7 @@
 __title__ = "Astrometry"
 
 from .astrometry import Astrometry
+from .catalog import CatalogAstrometry
 from .dotnet import AstrometryDotNet
 
-__all__ = ["Astrometry", "AstrometryDotNet"]
+__all__ = ["Astrometry", "AstrometryDotNet", "CatalogAstrometry"]
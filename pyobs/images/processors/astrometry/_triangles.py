@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+from scipy.spatial import cKDTree
+
+NDArrayF = npt.NDArray[np.float64]
+
+
+@dataclass
+class _TriangleMatch:
+    """Affine transform from source to reference positions and the matched pairs of stars."""
+
+    matrix: NDArrayF
+    offset: NDArrayF
+    source: npt.NDArray[np.int_]
+    reference: npt.NDArray[np.int_]
+    rms: float
+
+    def __call__(self, xy: NDArrayF) -> NDArrayF:
+        return np.asarray(xy) @ self.matrix.T + self.offset
+
+
+def _triangles(xy: NDArrayF) -> tuple[npt.NDArray[np.int_], NDArrayF]:
+    """Returns all triangles of the given points with their vertices in canonical order and their invariants.
+
+    Vertices are ordered by the length of the opposite side, starting with the longest, and the invariants are the
+    ratios of the two shorter sides to the longest one, so both are independent of translation, rotation, scale
+    and parity.
+    """
+    if len(xy) < 3:
+        return np.zeros((0, 3), dtype=int), np.zeros((0, 2))
+    idx = np.array(list(itertools.combinations(range(len(xy)), 3)), dtype=int)
+    p = xy[idx]
+
+    # length of side opposite of each vertex
+    sides = np.stack(
+        [
+            np.hypot(*(p[:, 1] - p[:, 2]).T),
+            np.hypot(*(p[:, 0] - p[:, 2]).T),
+            np.hypot(*(p[:, 0] - p[:, 1]).T),
+        ],
+        axis=1,
+    )
+    order = np.argsort(-sides, axis=1)
+    sides = np.take_along_axis(sides, order, axis=1)
+    idx = np.take_along_axis(idx, order, axis=1)
+
+    # skip degenerate triangles
+    valid = sides[:, 2] > 1e-3 * np.maximum(sides[:, 0], 1e-9)
+    return idx[valid], sides[valid, 1:] / sides[valid, :1]
+
+
+def _fit_affine(src: NDArrayF, dst: NDArrayF) -> tuple[NDArrayF, NDArrayF]:
+    """Fits an affine transform dst = matrix @ src + offset with least squares."""
+    design = np.hstack([src, np.ones((len(src), 1))])
+    solution, *_ = np.linalg.lstsq(design, dst, rcond=None)
+    return solution[:2].T, solution[2]
+
+
+def match_triangles(
+    source: npt.ArrayLike,
+    reference: npt.ArrayLike,
+    tolerance: float = 3.0,
+    min_matches: int = 5,
+    scale_tolerance: float = 0.1,
+    invariant_tolerance: float = 0.005,
+    max_hypotheses: int = 500,
+) -> _TriangleMatch | None:
+    """Finds the transform from source to reference positions by matching similar triangles.
+
+    Every pair of similar triangles is a hypothesis for the transform, which is accepted if it is close to a
+    similarity with a scale of 1, i.e. the positions are given in the same pixel scale. The hypothesis that brings
+    most source positions within tolerance of a reference position wins and is refined with all of them.
+
+    Args:
+        source: Nx2 array of positions, e.g. detected stars in pixels, brightest first.
+        reference: Mx2 array of positions, e.g. catalog stars projected into the image, brightest first.
+        tolerance: Maximum distance between matched positions.
+        min_matches: Minimum number of matched positions for a valid result.
+        scale_tolerance: Maximum relative deviation of scale from 1.
+        invariant_tolerance: Maximum difference of triangle invariants for similar triangles.
+        max_hypotheses: Maximum number of pairs of triangles to test, starting with the most similar ones.
+
+    Returns:
+        Transform with matched positions, or None, if no match was found.
+    """
+    src = np.asarray(source, dtype=float).reshape(-1, 2)
+    ref = np.asarray(reference, dtype=float).reshape(-1, 2)
+    if len(src) < 3 or len(ref) < 3:
+        return None
+
+    # find similar triangles
+    src_idx, src_inv = _triangles(src)
+    ref_idx, ref_inv = _triangles(ref)
+    if len(src_idx) == 0 or len(ref_idx) == 0:
+        return None
+    dist, nearest = cKDTree(ref_inv).query(src_inv, distance_upper_bound=invariant_tolerance)
+    candidates = np.flatnonzero(np.isfinite(dist))
+    candidates = candidates[np.argsort(dist[candidates])][:max_hypotheses]
+
+    # test hypotheses
+    ref_tree = cKDTree(ref)
+    best: tuple[int, NDArrayF, NDArrayF] | None = None
+    for c in candidates:
+        matrix, offset = _fit_affine(src[src_idx[c]], ref[ref_idx[nearest[c]]])
+        scales = np.linalg.svd(matrix, compute_uv=False)
+        if np.any(np.abs(scales - 1.0) > scale_tolerance):
+            continue
+        d, _ = ref_tree.query(src @ matrix.T + offset, distance_upper_bound=tolerance)
+        count = int(np.sum(np.isfinite(d)))
+        if best is None or count > best[0]:
+            best = (count, matrix, offset)
+    if best is None or best[0] < min_matches:
+        return None
+
+    # refine with all matches
+    _, matrix, offset = best
+    for _ in range(3):
+        d, j = ref_tree.query(src @ matrix.T + offset, distance_upper_bound=tolerance)
+        i = np.flatnonzero(np.isfinite(d))
+        if len(i) < min_matches:
+            return None
+        matrix, offset = _fit_affine(src[i], ref[j[i]])
+
+    # final matches, each reference star only once
+    d, j = ref_tree.query(src @ matrix.T + offset, distance_upper_bound=tolerance)
+    i = np.flatnonzero(np.isfinite(d))
+    i = i[np.argsort(d[i])]
+    _, first = np.unique(j[i], return_index=True)
+    i = np.sort(i[first])
+    if len(i) < min_matches:
+        return None
+    residuals = src[i] @ matrix.T + offset - ref[j[i]]
+    rms = float(np.sqrt(np.mean(np.sum(residuals**2, axis=1))))
+    return _TriangleMatch(matrix=matrix, offset=offset, source=i, reference=j[i], rms=rms)
+
+
+__all__ = ["match_triangles"]
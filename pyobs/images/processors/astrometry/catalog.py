@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import logging
+import math
+import warnings
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from astropy.wcs import WCS, FITSFixedWarning
+
+import pyobs.utils.exceptions as exc
+from pyobs.images import Image
+from pyobs.object import get_object
+from pyobs.utils.catalog import ReferenceCatalog
+
+from ._triangles import match_triangles
+from .astrometry import Astrometry
+
+log = logging.getLogger(__name__)
+
+
+class CatalogAstrometry(Astrometry):
+    """
+    Perform astrometric calibration by matching detected sources against a locally cached reference catalog.
+
+    Instead of a blind plate solve, this processor starts from the approximate WCS in the FITS header, which is
+    built from the telescope pointing, the plate scale and the reference pixel (see
+    :class:`pyobs.mixins.FitsHeaderMixin`). Reference stars around the pointing are taken from a
+    :class:`pyobs.utils.catalog.ReferenceCatalog`, projected into the image with the approximate WCS, and matched
+    to the brightest detected sources via similar triangles. The resulting transform gives the true position of the
+    reference pixel and the rotation of the image, so the full pointing offset is known from a single frame. The
+    catalog is cached locally, so no network access is required for fields that have been observed before.
+
+    :param catalog: Reference catalog, either an object or its configuration. Default: Gaia with in-memory cache.
+    :param int source_count: Number of brightest detected sources to match. Default: ``20``.
+    :param int reference_count: Number of brightest reference stars to match. Default: ``100``.
+    :param float max_offset: Maximum expected pointing error in arcsec. Default: ``300``.
+    :param float tolerance: Maximum distance in pixels between matched stars. Default: ``3``.
+    :param int min_matches: Minimum number of matched stars. Default: ``5``.
+    :param str on_error: How the pipeline should handle a failed match, see
+                         :class:`pyobs.images.processors.astrometry.AstrometryDotNet`.
+    :param kwargs: Additional keyword arguments forwarded to
+                   :class:`pyobs.images.processors.astrometry.Astrometry`.
+
+    Behavior
+    --------
+    - Selects the brightest sources from the image catalog (columns x, y, flux, and peak if available).
+    - Queries reference stars within the field of view plus max_offset around its center.
+    - Matches both sets of positions with triangles, allowing for a shift, a rotation and a small change of scale.
+    - Writes a TAN WCS with a CD matrix into the FITS header, keeping CRPIX1/CRPIX2, so CRVAL1/CRVAL2 become the true
+      sky position of the reference pixel, adds ra/dec to the catalog, and sets ``WCSERR=0``.
+
+    Input/Output
+    ------------
+    - Input: :class:`pyobs.images.Image` with a source catalog and an approximate WCS in the FITS header.
+    - Output: :class:`pyobs.images.Image` (copied) with the WCS solution written to the FITS header.
+
+    Configuration (YAML)
+    --------------------
+    Replace astrometry.net in an acquisition pipeline:
+
+    .. code-block:: yaml
+
+       pipeline:
+         - class: pyobs.images.processors.detection.SepSourceDetection
+         - class: pyobs.images.processors.astrometry.CatalogAstrometry
+           catalog:
+             class: pyobs.utils.catalog.ReferenceCatalog
+             cache_dir: /var/cache/pyobs/catalog
+         - class: pyobs.images.processors.offsets.AstrometryOffsets
+    """
+
+    __module__ = "pyobs.images.processors.astrometry"
+
+    def __init__(
+        self,
+        catalog: dict[str, Any] | ReferenceCatalog | None = None,
+        source_count: int = 20,
+        reference_count: int = 100,
+        max_offset: float = 300.0,
+        tolerance: float = 3.0,
+        min_matches: int = 5,
+        on_error: str = "raise",
+        **kwargs: Any,
+    ):
+        """Init new catalog astrometry.
+
+        Args:
+            catalog: Reference catalog.
+            source_count: Number of brightest detected sources to match.
+            reference_count: Number of brightest reference stars to match.
+            max_offset: Maximum expected pointing error in arcsec.
+            tolerance: Maximum distance in pixels between matched stars.
+            min_matches: Minimum number of matched stars.
+            on_error: How to handle a failed match. One of "raise", "error", "info", "ignore".
+                On "error", handle_error() marks the image with WCSERR=1 and logs a warning.
+        """
+        Astrometry.__init__(self, on_error=on_error, **kwargs)
+
+        self._catalog = ReferenceCatalog() if catalog is None else get_object(catalog, ReferenceCatalog)
+        self._source_count = source_count
+        self._reference_count = reference_count
+        self._max_offset = max_offset
+        self._tolerance = tolerance
+        self._min_matches = min_matches
+
+    def _get_sources(self, image: Image) -> npt.NDArray[np.float64]:
+        """Returns positions of the brightest sources in the image."""
+        if image.catalog is None or len(image.catalog) < 3:
+            raise exc.ImageError("Not enough sources for astrometry.")
+        cat = image.catalog
+        x, y, flux = (np.asarray(cat[c], dtype=float) for c in ("x", "y", "flux"))
+        valid = np.isfinite(x) & np.isfinite(y) & np.isfinite(flux)
+        if "peak" in cat.colnames:
+            valid &= np.asarray(cat["peak"], dtype=float) < 60000
+        idx = np.flatnonzero(valid)
+        idx = idx[np.argsort(-flux[idx])][: self._source_count]
+        if len(idx) < 3:
+            raise exc.ImageError("Not enough sources for astrometry.")
+        return np.column_stack([x[idx], y[idx]])
+
+    @staticmethod
+    def _get_wcs(image: Image) -> WCS:
+        """Returns approximate WCS from header."""
+        for key in ["CRVAL1", "CRVAL2", "CRPIX1", "CRPIX2", "NAXIS1", "NAXIS2"]:
+            if key not in image.header:
+                raise exc.ImageError(f"No {key} found in header.")
+        if "CDELT1" not in image.header and "CD1_1" not in image.header:
+            raise exc.ImageError("No CDELT1 found in header.")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FITSFixedWarning)
+            wcs = WCS(image.header)
+        if not wcs.has_celestial:
+            raise exc.ImageError("No celestial WCS found in header.")
+        return wcs.celestial
+
+    async def _get_references(self, image: Image, wcs: WCS) -> npt.NDArray[np.float64]:
+        """Returns pixel positions of the brightest reference stars in and around the image."""
+        nx, ny = image.header["NAXIS1"], image.header["NAXIS2"]
+        scale = float(np.sqrt(abs(np.linalg.det(wcs.pixel_scale_matrix))))
+        margin = self._max_offset / 3600.0 / scale
+
+        # query stars around center
+        center = wcs.all_pix2world([[(nx + 1) / 2.0, (ny + 1) / 2.0]], 1)[0]
+        radius = 0.5 * math.hypot(nx, ny) * scale + self._max_offset / 3600.0
+        stars = await self._catalog.query(float(center[0]), float(center[1]), radius)
+        if len(stars) < 3:
+            raise exc.ImageError("Not enough reference stars for astrometry.")
+
+        # project into image and keep brightest that might be visible
+        xy = wcs.all_world2pix(np.column_stack([stars["ra"], stars["dec"]]), 1)
+        inside = (xy[:, 0] > -margin) & (xy[:, 0] < nx + margin) & (xy[:, 1] > -margin) & (xy[:, 1] < ny + margin)
+        return xy[np.flatnonzero(inside)[: self._reference_count]]
+
+    async def _process(self, image: Image) -> Image:
+        wcs = self._get_wcs(image)
+        sources = self._get_sources(image)
+        references = await self._get_references(image, wcs)
+
+        # match them
+        match = match_triangles(sources, references, tolerance=self._tolerance, min_matches=self._min_matches)
+        if match is None:
+            raise exc.ImageError("Could not match sources to reference catalog.")
+
+        # true sky position of reference pixel and CD matrix; the tangent point of the approximate WCS is
+        # usually close enough that a linear correction is sufficient
+        crpix = np.array([image.header["CRPIX1"], image.header["CRPIX2"]], dtype=float)
+        crval = wcs.all_pix2world([match(crpix)], 1)[0]
+        cd = wcs.pixel_scale_matrix @ match.matrix
+
+        # write WCS
+        result = image.copy()
+        for keyword in ["PC1_1", "PC1_2", "PC2_1", "PC2_2", "CDELT1", "CDELT2"]:
+            if keyword in result.header:
+                del result.header[keyword]
+        result.header["CTYPE1"] = "RA---TAN"
+        result.header["CTYPE2"] = "DEC--TAN"
+        result.header["CRVAL1"] = float(crval[0])
+        result.header["CRVAL2"] = float(crval[1])
+        for i in range(2):
+            for j in range(2):
+                result.header[f"CD{i + 1}_{j + 1}"] = float(cd[i, j])
+        result.header["WCSERR"] = 0
+
+        # add sky coordinates to catalog
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FITSFixedWarning)
+            solution = WCS(result.header)
+        if result.catalog is not None:
+            ras, decs = solution.all_pix2world(result.catalog["x"], result.catalog["y"], 1)
+            result.catalog["ra"] = ras
+            result.catalog["dec"] = decs
+
+        log.info(
+            "Matched %d of %d sources to reference catalog with an rms of %.2f px, found center at %.5f, %.5f.",
+            len(match.source),
+            len(sources),
+            match.rms,
+            crval[0],
+            crval[1],
+        )
+        return result
+
+    def handle_error(self, image: Image, error: exc.ImageError) -> Image:
+        image.header["WCSERR"] = 1
+
+        log.warning(error.message)
+
+        return image
+
+    async def __call__(self, image: Image) -> Image:
+        """Find astrometric solution on given image.
+
+        Args:
+            image: Image to analyse.
+        """
+
+        return await self._process(image)
+
+
+__all__ = ["CatalogAstrometry"]
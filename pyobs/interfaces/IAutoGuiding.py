@@ -17,6 +17,10 @@ class GuidingState:  # live open/closed-loop status, separate from the per-sessi
     offset_frame: OffsetFrame | None = None
     offset_lon: Annotated[float, Unit.DEGREES] | None = None
     offset_lat: Annotated[float, Unit.DEGREES] | None = None
+    # rolling summaries over recent images: RMS of the configured guiding statistic (in its unit, e.g. pixels or
+    # degrees), and percentage of time the loop was closed
+    rms: float | None = None
+    uptime: Annotated[float, Unit.PERCENT] | None = None
     time: Time = field(default_factory=Time.now)
 
 
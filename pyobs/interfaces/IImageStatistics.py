@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from abc import ABCMeta
+from dataclasses import dataclass, field
+
+from ..utils.time import Time
+from .interface import Interface
+
+
+@dataclass
+class ImageStatisticsState:
+    filename: str  # empty, if no image has been taken yet
+    statistics: dict[str, float] = field(default_factory=dict)
+    time: Time = field(default_factory=Time.now)
+
+
+class IImageStatistics(Interface, metaclass=ABCMeta):
+    """The module computes statistics like median or maximum of each image right after readout, so that clients
+    can adjust exposure times without downloading the image, usually combined with :class:`~pyobs.interfaces.IData`.
+    Statistics of the latest image are published in the pushed ImageStatisticsState, also for images that are not
+    broadcast."""
+
+    __module__ = "pyobs.interfaces"
+
+    state = ImageStatisticsState
+
+
+__all__ = ["IImageStatistics", "ImageStatisticsState"]
@@ -22,6 +22,22 @@ class ModuleCapabilities:
     location: ModuleLocation | None = None
 
 
+@dataclass
+class EventHandlerStatistics:
+    """Statistics for the delivery of events to a handler. Times are in seconds."""
+
+    handler: str = ""
+    queued: int = 0
+    max_queued: int = 0
+    delivered: int = 0
+    dropped: int = 0
+    coalesced: int = 0
+    failed: int = 0
+    avg_wait_time: float = 0.0
+    avg_handler_time: float = 0.0
+    max_handler_time: float = 0.0
+
+
 class IModule(Interface, metaclass=ABCMeta):
     """The module is actually a module. Implemented by all modules."""
 
@@ -39,5 +55,10 @@ class IModule(Interface, metaclass=ABCMeta):
         """Returns names of all methods the calling module is allowed to invoke on this module."""
         ...
 
+    @abstractmethod
+    async def get_event_statistics(self, **kwargs: Any) -> list[EventHandlerStatistics]:
+        """Returns statistics for the delivery of events to the handlers of this module."""
+        ...
+
 
-__all__ = ["IModule", "ModuleCapabilities", "ModuleLocation"]
+__all__ = ["EventHandlerStatistics", "IModule", "ModuleCapabilities", "ModuleLocation"]
@@ -35,9 +35,10 @@ from .IFocuser import FocuserState, IFocuser
 from .IFocusModel import IFocusModel, OptimalFocusState
 from .IGain import GainState, IGain
 from .IImageFormat import IImageFormat, ImageFormatCapabilities, ImageFormatState
+from .IImageStatistics import IImageStatistics, ImageStatisticsState
 from .IImageType import IImageType, ImageTypeState
 from .IMode import IMode, ModeCapabilities, ModeState
-from .IModule import IModule, ModuleCapabilities, ModuleLocation
+from .IModule import EventHandlerStatistics, IModule, ModuleCapabilities, ModuleLocation
 from .IMotion import DeviceMotionStatus, IMotion, MotionState
 from .IMultiFiber import IMultiFiber, MultiFiberCapabilities, MultiFiberState
 from .interface import Interface
@@ -118,6 +119,8 @@ __all__ = [
     "IImageFormat",
     "ImageFormatCapabilities",
     "ImageFormatState",
+    "IImageStatistics",
+    "ImageStatisticsState",
     "IData",
     "IImageType",
     "ImageTypeState",
@@ -125,6 +128,7 @@ __all__ = [
     "ModeCapabilities",
     "ModeState",
     "IModule",
+    "EventHandlerStatistics",
     "ModuleCapabilities",
     "ModuleLocation",
     "IMotion",
@@ -13,6 +13,7 @@ from pyobs.images import Image
 from pyobs.interfaces import IFitsHeaderAfter, IFitsHeaderBefore
 from pyobs.modules import Module
 from pyobs.utils import exceptions as exc
+from pyobs.utils.counter import NightlyCounter
 from pyobs.utils.fits import format_filename
 from pyobs.utils.time import Time
 
@@ -32,6 +33,7 @@ class FitsHeaderMixin:
         frame_number: bool = True,
         night_obs: bool = True,
         fits_header_timeout: float = 15.0,
+        frame_counter: str | None = None,
         **kwargs: Any,
     ):
         """Initialise the mixin.
@@ -45,6 +47,8 @@ class FitsHeaderMixin:
             fits_header_timeout: Maximum seconds to wait for a peer's FITS headers before skipping
                 them. A peer that never answers (e.g. a laptop put to sleep without closing its
                 client) would otherwise stall the frame for the full XMPP IQ timeout.
+            frame_counter: Local file for persisting the frame number, see :class:`~pyobs.utils.counter.NightlyCounter`.
+                If None, it is stored in the VFS, but only read once and written in the background.
         """
         # store
         self._fitsheadermixin_fits_namespaces = fits_namespaces
@@ -58,6 +62,8 @@ class FitsHeaderMixin:
         # night exposure number
         self._fitsheadermixin_enable_frame_number = frame_number
         self._fitsheadermixin_frame_number = 0
+        self._fitsheadermixin_frame_counter_file = frame_counter
+        self._fitsheadermixin_frame_counter: NightlyCounter | None = None
 
         super().__init__(**kwargs)
 
@@ -183,7 +189,7 @@ class FitsHeaderMixin:
         # cheap, local half
         self.add_local_fits_headers(image)
 
-        # persistent nightly frame-sequence number (VFS I/O -- not per-frame safe)
+        # persistent nightly frame-sequence number
         if self._fitsheadermixin_enable_frame_number:
             await self._fitsheadermixin_add_framenum(image)
 
@@ -253,41 +259,27 @@ class FitsHeaderMixin:
             log.warning("No DAY-OBS found in FITS header, cannot add FRAMENUM.")
             return
 
-        # get night from header
-        night = hdr["DAY-OBS"]
+        # create counter on first use, since VFS and module name are not available before
+        if self._fitsheadermixin_frame_counter is None:
+            self._fitsheadermixin_frame_counter = NightlyCounter(
+                filename=self._fitsheadermixin_frame_counter_file,
+                vfs=module.vfs,
+                vfs_filename=self._fitsheadermixin_cache,
+                key="framenum",
+            )
 
         # increase night exp
-        self._fitsheadermixin_frame_number += 1
-
-        # do we have a cache?
-        if self._fitsheadermixin_cache is not None:
-            # try to load it
-            try:
-                # load cache
-                cache = await module.vfs.read_yaml(self._fitsheadermixin_cache)
-
-                # get new number
-                if cache is not None and "framenum" in cache:
-                    self._fitsheadermixin_frame_number = cache["framenum"] + 1
-
-                # if nights differ, reset count
-                if cache is not None and "night" in cache and night != cache["night"]:
-                    self._fitsheadermixin_frame_number = 1
-
-            except (FileNotFoundError, ValueError):
-                pass
-
-            # write file
-            try:
-                await module.vfs.write_yaml(
-                    self._fitsheadermixin_cache, {"night": night, "framenum": self._fitsheadermixin_frame_number}
-                )
-            except (FileNotFoundError, ValueError):
-                log.warning("Could not write camera cache file.")
+        self._fitsheadermixin_frame_number = await self._fitsheadermixin_frame_counter.next(hdr["DAY-OBS"])
 
         # set it
         hdr["FRAMENUM"] = self._fitsheadermixin_frame_number
 
+    async def close(self) -> None:
+        """Close mixin."""
+        # write pending frame number
+        if self._fitsheadermixin_frame_counter is not None:
+            await self._fitsheadermixin_frame_counter.close()
+
     def format_filename(self, image: Image | fits.PrimaryHDU) -> str | None:
         """Format filename according to given pattern and store in header of image.
 
@@ -6,7 +6,8 @@ from typing import TYPE_CHECKING, Any
 
 from pyobs.images import Image, ImageProcessor
 from pyobs.object import Object, get_class_from_string
-from pyobs.utils.exceptions import ImageError
+from pyobs.spectra import Spectrum, SpectrumProcessor
+from pyobs.utils.exceptions import ImageError, SpectrumError
 
 if TYPE_CHECKING:
     from pyobs.robotic.utils.archive import Archive
@@ -119,4 +120,64 @@ class PipelineMixin:
         return image
 
 
-__all__ = ["PipelineMixin"]
+class SpectrumPipelineMixin:
+    """Mixin for a module that needs to implement a spectrum pipeline."""
+
+    __module__ = "pyobs.mixins"
+
+    def __init__(self, steps: list[dict[str, Any] | SpectrumProcessor] | None = None, **kwargs: Any):
+        """Initializes the mixin.
+
+        Args:
+            steps: Pipeline steps to run on spectra.
+        """
+
+        # store
+        if isinstance(self, Object):
+            steps = [] if steps is None else steps
+            self.__pipeline_steps = [self.add_child_object(step, SpectrumProcessor) for step in steps]
+
+        else:
+            raise ValueError("This class is no Object.")
+
+        super().__init__(**kwargs)
+
+    @property
+    def has_spectrum_pipeline(self) -> bool:
+        """Whether any pipeline steps are configured."""
+        return len(self.__pipeline_steps) > 0
+
+    async def reset_spectrum_pipeline(self) -> None:
+        """Resets all previous state of the involved spectrum processors."""
+        for step in self.__pipeline_steps:
+            await step.reset()
+
+    async def run_spectrum_pipeline(self, spectrum: Spectrum) -> Spectrum:
+        """Run the pipeline on the given spectrum.
+
+        A SpectrumError raised by a step is handled according to the step's on_error setting, just like in
+        :meth:`PipelineMixin.run_pipeline`.
+
+        Args:
+            spectrum: Spectrum to run pipeline on.
+
+        Returns:
+            Spectrum after pipeline run.
+        """
+
+        for step in self.__pipeline_steps:
+            try:
+                spectrum = await step(spectrum)
+            except SpectrumError as e:
+                if step.on_error == "raise":
+                    raise
+                elif step.on_error == "error":
+                    spectrum = step.handle_error(spectrum, e)
+                elif step.on_error == "info":
+                    log.info("Step %s: %s", type(step).__name__, e)
+
+        # finished
+        return spectrum
+
+
+__all__ = ["PipelineMixin", "SpectrumPipelineMixin"]
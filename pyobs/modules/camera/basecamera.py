@@ -19,13 +19,16 @@ from pyobs.interfaces import (
     IDataSequence,
     IExposure,
     IExposureTime,
+    IImageStatistics,
     IImageType,
+    ImageStatisticsState,
     ImageTypeState,
 )
 from pyobs.mixins.fitsheader import ImageFitsHeaderMixin
 from pyobs.modules import Module, timeout
 from pyobs.utils import exceptions as exc
 from pyobs.utils.enums import ExposureStatus, ImageType
+from pyobs.utils.imagestatistics import ImageStatistics
 
 log = logging.getLogger(__name__)
 
@@ -43,7 +46,15 @@ async def calc_expose_timeout(camera: BaseCamera, *args: Any, **kwargs: Any) ->
 
 
 class BaseCamera(
-    Module, ImageFitsHeaderMixin, ICamera, IExposure, IExposureTime, IImageType, IDataSequence, metaclass=ABCMeta
+    Module,
+    ImageFitsHeaderMixin,
+    ICamera,
+    IExposure,
+    IExposureTime,
+    IImageType,
+    IDataSequence,
+    IImageStatistics,
+    metaclass=ABCMeta,
 ):
     """Base class for all camera modules."""
 
@@ -61,6 +72,8 @@ class BaseCamera(
         fits_namespaces: list[str] | None = None,
         meridian_flip_on: str | None = None,
         fits_header_timeout: float = 15.0,
+        statistics: list[str] | None = None,
+        statistics_frame: tuple[float, float, float, float] | None = None,
         **kwargs: Any,
     ):
         """Creates a new BaseCamera.
@@ -75,6 +88,11 @@ class BaseCamera(
             filenames: Template for file naming.
             fits_namespaces: List of namespaces for FITS headers that this camera should request
             fits_header_timeout: Maximum seconds to wait for a peer's FITS headers before skipping them.
+            statistics: Statistics to compute for each image right after readout, e.g. ["median", "max", "p90"],
+                see ImageStatistics. They are written to the FITS header and published via IImageStatistics and
+                NewImageEvent.
+            statistics_frame: Tuple (left, top, width, height) in percent of the trimmed image to compute
+                statistics in.
         """
         super().__init__(
             fits_namespaces=fits_namespaces,
@@ -96,6 +114,7 @@ class BaseCamera(
         self._exposure_time: float = 0.0
         self._image_type = ImageType.OBJECT
         self._meridian_flip_on = meridian_flip_on
+        self._statistics = ImageStatistics(statistics or [], frame=statistics_frame)
 
         # init camera
         self._exposure: ExposureInfo | None = None
@@ -139,6 +158,12 @@ class BaseCamera(
             ),
         )
         await self.comm.set_state(IDataSequence, DataSequenceState(count_total=0, count_left=0))
+        await self.comm.set_state(IImageStatistics, ImageStatisticsState(filename=""))
+
+    async def close(self) -> None:
+        """Close module."""
+        await ImageFitsHeaderMixin.close(self)
+        await Module.close(self)
 
     async def set_exposure_time(self, exposure_time: float, **kwargs: Any) -> None:
         """Set the exposure time in seconds.
@@ -332,6 +357,11 @@ class BaseCamera(
         await self.add_requested_fits_headers(image, header_futures_after)
         await self.add_fits_headers(image)
         await self.apply_meridian_flip(image)
+
+        # compute statistics, so that clients don't need to download the image for them
+        statistics = await asyncio.get_running_loop().run_in_executor(None, self._statistics, image)
+        self._statistics.add_fits_headers(image, statistics)
+
         filename = self.format_filename(image)
 
         # don't want to save?
@@ -346,10 +376,14 @@ class BaseCamera(
         except FileNotFoundError:
             raise ValueError("Could not upload image.")
 
+        # publish statistics, also for images that are not broadcast
+        if self._comm:
+            await self.comm.set_state(IImageStatistics, ImageStatisticsState(filename=filename, statistics=statistics))
+
         # broadcast image path
         if broadcast and self._comm:
             log.info("Broadcasting image ID...")
-            await self.comm.send_event(NewImageEvent(filename, image_type))
+            await self.comm.send_event(NewImageEvent(filename, image_type, statistics=statistics or None))
 
         # return image and unique
         self._exposure = None
@@ -11,7 +11,10 @@ from astropy.io import fits
 from pyobs.events import ExposureStatusChangedEvent, NewSpectrumEvent
 from pyobs.interfaces import ExposureState, IExposure, ISpectrograph
 from pyobs.mixins.fitsheader import SpectrumFitsHeaderMixin
+from pyobs.mixins.pipeline import SpectrumPipelineMixin
 from pyobs.modules import Module, timeout
+from pyobs.spectra import Spectrum, SpectrumProcessor
+from pyobs.spectra.meta import SignalToNoise
 from pyobs.utils import exceptions as exc
 from pyobs.utils.enums import ExposureStatus
 
@@ -24,16 +27,22 @@ class ExposureInfo(NamedTuple):
     start: datetime
 
 
-class BaseSpectrograph(Module, SpectrumFitsHeaderMixin, ISpectrograph, IExposure, metaclass=ABCMeta):
+class BaseSpectrograph(
+    Module, SpectrumFitsHeaderMixin, SpectrumPipelineMixin, ISpectrograph, IExposure, metaclass=ABCMeta
+):
     """Base class for all spectrograph modules."""
 
     __module__ = "pyobs.modules.camera"
 
+    # headers that are never copied from the quick-look reduction
+    _QUICKLOOK_SKIP_HEADERS = frozenset(("SIMPLE", "BITPIX", "EXTEND", "COMMENT", "HISTORY", ""))
+
     def __init__(
         self,
         fits_headers: dict[str, Any] | None = None,
         filenames: str = "/cache/pyobs-{DAY-OBS|date:}-{FRAMENUM|string:04d}.fits.gz",
         fits_namespaces: list[str] | None = None,
+        quicklook: list[dict[str, Any] | SpectrumProcessor] | None = None,
         **kwargs: Any,
     ):
         """Creates a new BaseCamera.
@@ -43,8 +52,16 @@ class BaseSpectrograph(Module, SpectrumFitsHeaderMixin, ISpectrograph, IExposure
             flip: Whether or not to flip the image along its first axis.
             filenames: Template for file naming.
             fits_namespaces: List of namespaces for FITS headers that this camera should request
+            quicklook: Spectrum processors for a quick-look reduction of every spectrum, see
+                       :mod:`pyobs.spectra.processors`. Its results are stored in the FITS file.
         """
-        super().__init__(fits_namespaces=fits_namespaces, fits_headers=fits_headers, filenames=filenames, **kwargs)
+        super().__init__(
+            fits_namespaces=fits_namespaces,
+            fits_headers=fits_headers,
+            filenames=filenames,
+            steps=quicklook,
+            **kwargs,
+        )
 
         # init camera
         self._exposure: ExposureInfo | None = None
@@ -67,6 +84,11 @@ class BaseSpectrograph(Module, SpectrumFitsHeaderMixin, ISpectrograph, IExposure
             IExposure, ExposureState(status=self._spectrograph_status, progress=0.0, exposure_time_left=0.0)
         )
 
+    async def close(self) -> None:
+        """Close module."""
+        await SpectrumFitsHeaderMixin.close(self)
+        await Module.close(self)
+
     @abstractmethod
     async def _expose(self, abort_event: asyncio.Event) -> fits.HDUList:
         """Actually do the exposure, should be implemented by derived classes.
@@ -122,6 +144,9 @@ class BaseSpectrograph(Module, SpectrumFitsHeaderMixin, ISpectrograph, IExposure
         await self.add_requested_fits_headers(hdulist[0], header_futures_after)
         await self.add_fits_headers(hdulist[0])
 
+        # quick-look reduction
+        snr = await self._quicklook(hdulist) if self.has_spectrum_pipeline else None
+
         # format filename
         filename = self.format_filename(hdulist[0])
 
@@ -130,14 +155,51 @@ class BaseSpectrograph(Module, SpectrumFitsHeaderMixin, ISpectrograph, IExposure
             return hdulist, None
 
         # store spectrum
-        await self.store_spectrum(hdulist, filename, broadcast)
+        await self.store_spectrum(hdulist, filename, broadcast, snr=snr)
 
         # return spectrum and unique
         self._exposure = None
         log.info("Finished spectrum %s.", filename)
         return hdulist, filename
 
-    async def store_spectrum(self, hdulist: fits.HDUList, filename: str, broadcast: bool) -> None:
+    async def _quicklook(self, hdulist: fits.HDUList) -> float | None:
+        """Runs the quick-look pipeline on a spectrum and adds its results to the HDU list.
+
+        The raw frame is kept, new header keywords are added to the primary HDU and the extracted spectrum is
+        stored in a SPECTRUM extension.
+
+        Args:
+            hdulist: HDU list with spectrum.
+
+        Returns:
+            S/N of spectrum, if estimated by the pipeline.
+        """
+        try:
+            spectrum = await self.run_spectrum_pipeline(Spectrum.from_hdulist(hdulist))
+        except Exception as e:
+            log.warning("Quick-look reduction of spectrum failed: %s", e)
+            return None
+
+        # copy new and changed headers, but keep structure of primary HDU
+        header = hdulist[0].header
+        for card in spectrum.header.cards:
+            if card.keyword in self._QUICKLOOK_SKIP_HEADERS or card.keyword.startswith("NAXIS"):
+                continue
+            if card.keyword not in header or header[card.keyword] != card.value:
+                header[card.keyword] = (card.value, card.comment)
+
+        # store extracted spectrum
+        if spectrum.safe_flux is not None:
+            if "SPECTRUM" in hdulist:
+                del hdulist["SPECTRUM"]
+            hdulist.append(spectrum.to_table_hdu())
+
+        meta = spectrum.get_meta_safe(SignalToNoise)
+        return None if meta is None else meta.snr
+
+    async def store_spectrum(
+        self, hdulist: fits.HDUList, filename: str, broadcast: bool, snr: float | None = None
+    ) -> None:
         """Store spectrum at given destination.
         Can be overwritten by derived classes to custom store a file. In those cases, this version should be called!
 
@@ -145,6 +207,7 @@ class BaseSpectrograph(Module, SpectrumFitsHeaderMixin, ISpectrograph, IExposure
             hdulist: HDU list with spectrum.
             filename: Name to store file with.
             broadcast: Whether to broadcast new spectrum.
+            snr: S/N of spectrum from quick-look reduction, if available.
         """
 
         # upload file
@@ -157,7 +220,7 @@ class BaseSpectrograph(Module, SpectrumFitsHeaderMixin, ISpectrograph, IExposure
         # broadcast image path
         if broadcast and self._comm:
             log.info("Broadcasting spectrum ID...")
-            await self.comm.send_event(NewSpectrumEvent(filename))
+            await self.comm.send_event(NewSpectrumEvent(filename, snr=snr))
 
     @timeout(10)
     async def grab_data(self, broadcast: bool = True, **kwargs: Any) -> str:
@@ -186,6 +186,7 @@ class BaseVideo(Module, ImageFitsHeaderMixin, IVideo, IImageType, metaclass=ABCM
 
     async def close(self) -> None:
         """Close server"""
+        await ImageFitsHeaderMixin.close(self)
         await Module.close(self)
 
         # stop server
@@ -3,14 +3,14 @@ from __future__ import annotations
 import asyncio
 import glob
 import logging
+import time
 from datetime import UTC, datetime
-from typing import Any, NamedTuple
+from typing import Any, Literal, NamedTuple
 
 import astropy.units as u
 import numpy as np
 from astropy.coordinates import SkyCoord
 from astropy.io import fits
-from astropy.modeling import models
 from astropy.table import Table
 from astropy.wcs import WCS
 from numpy.typing import NDArray
@@ -40,6 +40,7 @@ from pyobs.interfaces import (
 from pyobs.modules.camera.basecamera import BaseCamera
 from pyobs.utils import exceptions as exc
 from pyobs.utils.enums import ExposureStatus, ImageFormat, ImageType
+from pyobs.utils.simulation import SkyRenderer, SyntheticStarCatalog
 from pyobs.utils.time import Time
 
 log = logging.getLogger(__name__)
@@ -67,6 +68,11 @@ class DummyCamera(BaseCamera, IWindow, IBinning, ICooling, IGain, IImageFormat):
         max_mag: float = 20.0,
         seeing: float = 3.0,
         telescope: str | None = None,
+        catalog: Literal["gaia", "synthetic"] = "gaia",
+        seed: int | None = None,
+        seeing_jitter: float = 0.0,
+        drift: tuple[float, float] = (0.0, 0.0),
+        vignetting: float = 0.0,
         **kwargs: Any,
     ):
         """Creates a new dummy camera.
@@ -80,6 +86,12 @@ class DummyCamera(BaseCamera, IWindow, IBinning, ICooling, IGain, IImageFormat):
             max_mag: Maximum magnitude of simulated stars.
             seeing: Seeing in arcsec FWHM.
             telescope: Name of telescope module to read pointing from (for star simulation).
+            catalog: Source of simulated stars, either "gaia" for querying the Gaia archive (falling back to the
+                synthetic catalog on errors), or "synthetic" for a procedurally generated catalog that works offline.
+            seed: Seed for the synthetic catalog and the noise.
+            seeing_jitter: Relative standard deviation of the seeing from frame to frame.
+            drift: Tracking drift in RA/Dec in arcsec/s, accumulating since the last telescope move.
+            vignetting: Fraction of light lost in the corners of the image, for a simulated flat-field illumination.
         """
         BaseCamera.__init__(self, **kwargs)
         self.add_background_task(self._cooling_thread, True)
@@ -114,13 +126,26 @@ class DummyCamera(BaseCamera, IWindow, IBinning, ICooling, IGain, IImageFormat):
         self._image_format = ImageFormat.INT16
         self._image_type = ImageType.OBJECT
 
-        # GAIA catalog cache
+        # star catalog and cache
+        self._catalog_source = catalog
+        self._synthetic_catalog = SyntheticStarCatalog(max_mag=max_mag, seed=0 if seed is None else seed)
         self._catalog: Table | None = None
         self._catalog_coords: SkyCoord | None = None
 
+        # renderer and simulated observing conditions
+        self._renderer = SkyRenderer(seed=seed)
+        self._rng = np.random.default_rng(seed)
+        self._seeing_jitter = seeing_jitter
+        self._drift = drift
+        self._drift_start = time.monotonic()
+        self._vignetting = vignetting
+
     def _on_telescope_state(self, state: RaDecState) -> None:
         """Update cached telescope position from IPointingRaDec state."""
-        self._telescope_pos = SkyCoord(ra=state.ra * u.deg, dec=state.dec * u.deg, frame="icrs")
+        pos = SkyCoord(ra=state.ra * u.deg, dec=state.dec * u.deg, frame="icrs")
+        if pos.separation(self._telescope_pos) > 1.0 * u.arcsec:
+            self._drift_start = time.monotonic()
+        self._telescope_pos = pos
 
     async def open(self) -> None:
         """Opens camera."""
@@ -193,28 +218,38 @@ class DummyCamera(BaseCamera, IWindow, IBinning, ICooling, IGain, IImageFormat):
         return -18.0
 
     def _simulate_image(self, exp_time: float, open_shutter: bool) -> NDArray[Any]:
-        from photutils.datasets import make_model_image, make_noise_image
-
         shape = (int(self._window[3]), int(self._window[2]))
-        data = make_noise_image(shape, distribution="gaussian", mean=10, stddev=1.0)
 
+        # bias and dark current, and for open shutter sky background, all in a single draw from the noise pool
+        mean, variance = 10.0, 1.0
+        illumination = None
         if exp_time > 0:
-            data += make_noise_image(shape, distribution="gaussian", mean=exp_time / 1e4, stddev=exp_time / 1e5)
+            mean += exp_time / 1e4
+            variance += (exp_time / 1e5) ** 2
             if open_shutter:
                 sun_alt = self._sun_alt()
                 flat_counts = 30000 / np.exp(-1.28 * (4.209 + sun_alt)) * exp_time
-                data += make_noise_image(shape, distribution="gaussian", mean=flat_counts, stddev=flat_counts / 10.0)
-                sources = self._get_sources_table(exp_time)
-                sources = sources[
-                    (sources["x_mean"] > 0)
-                    & (sources["x_mean"] < shape[1])
-                    & (sources["y_mean"] > 0)
-                    & (sources["y_mean"] < shape[0])
-                ]
-                model = models.Moffat2D()
-                data += make_model_image(shape, model, sources, model_shape=(15, 15))
-
-        data[data > 65535] = 65535
+                variance += (flat_counts / 10.0) ** 2
+                if self._vignetting > 0:
+                    illumination = self._renderer.illumination(shape, self._vignetting)
+                    mean = mean + flat_counts * illumination
+                else:
+                    mean += flat_counts
+        data = self._renderer.noise(shape, mean, float(np.sqrt(variance)))
+
+        # stars
+        if exp_time > 0 and open_shutter:
+            sources = self._get_sources_table(exp_time)
+            self._renderer.add_stars(
+                data,
+                np.asarray(sources["x_mean"]),
+                np.asarray(sources["y_mean"]),
+                np.asarray(sources["flux"]),
+                float(sources.meta["fwhm"]),
+                illumination,
+            )
+
+        np.clip(data, 0, 65535, out=data)
         return data.astype(np.uint16)
 
     def _create_header(self, exp_time: float, time: Time, data: NDArray[Any]) -> fits.Header:
@@ -235,10 +270,15 @@ class DummyCamera(BaseCamera, IWindow, IBinning, ICooling, IGain, IImageFormat):
         return hdr
 
     def _get_catalog(self, fov: float) -> Table:
+        ra, dec = self._telescope_pos.ra.degree, self._telescope_pos.dec.degree
+
+        # synthetic catalog is fast enough to be queried for every image
+        if self._catalog_source == "synthetic":
+            return self._synthetic_catalog.query(ra, dec, fov * 1.5, max_mag=self._max_mag)
+
         if self._catalog_coords is None or self._catalog_coords.separation(self._telescope_pos) > 10.0 * u.arcmin:
             from astroquery.utils.tap import TapPlus
 
-            ra, dec = self._telescope_pos.ra.degree, self._telescope_pos.dec.degree
             tap = TapPlus(url="https://gea.esac.esa.int/tap-server/tap")
             query = f"""
                 SELECT TOP 1000
@@ -249,10 +289,14 @@ class DummyCamera(BaseCamera, IWindow, IBinning, ICooling, IGain, IImageFormat):
                   AND phot_g_mean_mag < {self._max_mag}
                 ORDER BY phot_g_mean_mag ASC
             """
-            job = tap.launch_job(query)
-            self._catalog = job.get_results()
+            try:
+                job = tap.launch_job(query)
+                self._catalog = job.get_results()
+            except Exception as e:
+                log.warning("Could not query Gaia archive (%s), using synthetic catalog instead.", e)
+                self._catalog = self._synthetic_catalog.query(ra, dec, fov * 1.5, max_mag=self._max_mag)
             self._catalog_coords = self._telescope_pos
-        return self._catalog  # type: ignore[return-value]
+        return self._catalog.copy()  # type: ignore[union-attr]
 
     def _get_sources_table(self, exp_time: float) -> Table:
         tmp = 360.0 / (2.0 * np.pi) * self._pixel_size / self._focal_length
@@ -260,20 +304,29 @@ class DummyCamera(BaseCamera, IWindow, IBinning, ICooling, IGain, IImageFormat):
         fov = np.max(cdelt2 * np.array(self._full_frame[2:]))
         cat = self._get_catalog(fov)
 
+        # tracking drift since last telescope move
+        elapsed = time.monotonic() - self._drift_start
+        pos = self._telescope_pos.spherical_offsets_by(
+            self._drift[0] * elapsed * u.arcsec, self._drift[1] * elapsed * u.arcsec
+        )
+
         w = WCS(naxis=2)
         w.wcs.crpix = [self._window[3] / 2.0, self._window[2] / 2.0]
         w.wcs.cdelt = np.array([-cdelt1, cdelt2])
-        w.wcs.crval = [self._telescope_pos.ra.degree, self._telescope_pos.dec.degree]
+        w.wcs.crval = [pos.ra.degree, pos.dec.degree]
         w.wcs.ctype = ["RA---TAN", "DEC--TAN"]
 
-        fwhm = self._seeing / 3600.0 / cdelt1 / 2.3548
+        # seeing, varying from frame to frame
+        seeing = self._seeing
+        if self._seeing_jitter > 0:
+            seeing *= float(np.exp(self._rng.normal(0.0, self._seeing_jitter)))
+        fwhm = seeing / 3600.0 / cdelt1
         cat["x"], cat["y"] = w.wcs_world2pix(cat["ra"], cat["dec"], 0)
 
         sources = cat["x", "y", "phot_g_mean_flux", "phot_g_mean_mag"]
         sources.rename_columns(["x", "y", "phot_g_mean_flux"], ["x_mean", "y_mean", "flux"])
-        sources.add_column([fwhm] * len(sources), name="x_stddev")
-        sources.add_column([fwhm] * len(sources), name="y_stddev")
         sources["flux"] *= exp_time
+        sources.meta["fwhm"] = fwhm
         return sources
 
     def _get_image(self, exp_time: float, open_shutter: bool) -> Image:
@@ -22,6 +22,11 @@ class PipelineCamera(Module, ICamera, ImageFitsHeaderMixin, PipelineMixin):
         """Creates a new pipeline cammera."""
         super().__init__(**kwargs)
 
+    async def close(self) -> None:
+        """Close module."""
+        await ImageFitsHeaderMixin.close(self)
+        await Module.close(self)
+
     async def grab_data(self, broadcast: bool = True, **kwargs: Any) -> str:
         """Grabs an image and returns reference.
 
@@ -15,6 +15,7 @@ from pyobs.events import Event, ModuleOpenedEvent
 from pyobs.interfaces import (
     ConfigCapabilities,
     ConfigValue,
+    EventHandlerStatistics,
     IConfig,
     IModule,
     Interface,
@@ -218,7 +219,7 @@ class Module(Object, IModule, IConfig):
     # only, nothing that touches a device that may not be initialized yet. get_version/get_label
     # are deliberately not listed: they aren't declared on IModule, so they never appear in
     # self._methods and can't be called via execute() at all, in any state.
-    _STARTING_WHITELIST: tuple[str, ...] = ("get_permitted_methods", "reset_error")
+    _STARTING_WHITELIST: tuple[str, ...] = ("get_permitted_methods", "reset_error", "get_event_statistics")
 
     def _disable_exception_logging(self, *exceptions: type[exc.PyobsError]) -> None:
         """Declare that the given PyobsError types (and their subclasses) fire often enough that even the
@@ -877,6 +878,10 @@ class Module(Object, IModule, IConfig):
         sender = kwargs.get("sender", "")
         return [name for name in self._methods if not self._acl_denied(sender, name)]
 
+    async def get_event_statistics(self, **kwargs: Any) -> list[EventHandlerStatistics]:
+        """Returns statistics for the delivery of events to the handlers of this module."""
+        return self.comm.event_statistics()
+
     async def _default_remote_error_callback(self, exception: exc.PyobsError) -> None:
         """Called on severe errors.
 
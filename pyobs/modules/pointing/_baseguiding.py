@@ -173,6 +173,8 @@ class BaseGuiding(BasePointing, IAutoGuiding, IFitsHeaderBefore, IFitsHeaderAfte
                 offset_frame=self._last_offset_frame,
                 offset_lon=self._last_offset_lon,
                 offset_lat=self._last_offset_lat,
+                rms=self._statistics.summary(),
+                uptime=self._uptime.summary(),
             ),
         )
 
@@ -25,6 +25,7 @@ from pyobs.interfaces import (
     OffsetFrame,
     RaDecOffsetState,
     RaDecState,
+    WindowCapabilities,
 )
 from pyobs.interfaces.IRunning import RunningState
 from pyobs.mixins import CameraSettingsMixin
@@ -39,6 +40,7 @@ from ...interfaces import (
     IExposureTime,
     IImageType,
     ITelescope,
+    IWindow,
 )
 from ._base import BasePointing
 
@@ -60,6 +62,7 @@ class Acquisition(BasePointing, CameraSettingsMixin, IAcquisition):
         log_file: str | None = None,
         oneshot: bool = False,
         broadcast: bool = False,
+        window: int | None = None,
         **kwargs: Any,
     ):
         """Create a new acquisition.
@@ -74,6 +77,10 @@ class Acquisition(BasePointing, CameraSettingsMixin, IAcquisition):
             oneshot: For a oneshot the number of attempts is automatically set to 1 and the method finishes whether
                      successful or not.
             broadcast: Whether to broadcast acquisition images.
+            window: Size in unbinned pixels of a square window around the target pixel that is read out instead of
+                    the full frame once offsets have been applied, if the camera supports windowing. Since the first
+                    offset is usually exact, later images are only needed for checking, which is a lot faster with
+                    a smaller window. The full frame is restored afterwards.
         """
         super().__init__(**kwargs)
 
@@ -87,6 +94,8 @@ class Acquisition(BasePointing, CameraSettingsMixin, IAcquisition):
         self._abort_event = asyncio.Event()
         self._oneshot = oneshot
         self._broadcast = broadcast
+        self._window = window
+        self._windowed = False
         self._attempts_log: list[AcquisitionAttempt] = []
 
         # init log file
@@ -123,6 +132,8 @@ class Acquisition(BasePointing, CameraSettingsMixin, IAcquisition):
             return await self._acquire(self._default_exposure_time)
         finally:
             self._is_running = False
+            if self._windowed:
+                await self._set_window(full_frame=True)
             await self.comm.set_state(IRunning, RunningState(running=False))
 
     async def _acquire(self, exposure_time: float) -> AcquisitionResult:
@@ -217,6 +228,10 @@ class Acquisition(BasePointing, CameraSettingsMixin, IAcquisition):
                 log.info("Finishing acquisition after oneshot.")
                 return await self._create_log_and_return()
 
+            # only read out a window around the target for checking the offset
+            if self._window is not None and not self._windowed and result.applied:
+                await self._set_window()
+
             # new exposure time?
             if image.has_meta(ExpTime):
                 exposure_time = image.get_meta(ExpTime).exptime
@@ -224,6 +239,39 @@ class Acquisition(BasePointing, CameraSettingsMixin, IAcquisition):
         # could not acquire target
         raise exc.AcquisitionError("Could not acquire target within given tolerance.")
 
+    async def _set_window(self, full_frame: bool = False) -> None:
+        """Sets a window around the target pixel or back to full frame, if the camera supports it.
+
+        Args:
+            full_frame: Whether to set full frame.
+        """
+        async with self.safe_proxy(self._camera, IWindow) as camera:
+            if camera is None:
+                return
+            cap: WindowCapabilities | None = await camera.wait_for_capabilities(IWindow)
+            if cap is None or cap.full_frame_width == 0 or cap.full_frame_height == 0:
+                log.warning("Could not get full frame size, not using a window.")
+                return
+
+            # full frame?
+            if full_frame or self._window is None:
+                log.info("Set window to full frame...")
+                await camera.set_window(cap.full_frame_x, cap.full_frame_y, cap.full_frame_width, cap.full_frame_height)
+                self._windowed = False
+                return
+
+            # window around target pixel, but within full frame
+            cx, cy = self._target_pixel or (
+                cap.full_frame_x + cap.full_frame_width / 2.0,
+                cap.full_frame_y + cap.full_frame_height / 2.0,
+            )
+            width, height = min(self._window, cap.full_frame_width), min(self._window, cap.full_frame_height)
+            left = int(min(max(cx - width / 2.0, cap.full_frame_x), cap.full_frame_x + cap.full_frame_width - width))
+            top = int(min(max(cy - height / 2.0, cap.full_frame_y), cap.full_frame_y + cap.full_frame_height - height))
+            log.info("Set window to %dx%d pixels at %d,%d...", width, height, left, top)
+            await camera.set_window(left, top, width, height)
+            self._windowed = True
+
     async def _get_offsets(self) -> tuple[OffsetFrame | None, float | None, float | None]:
         """Fetch the telescope's current RA/Dec or Alt/Az offset, whichever it supports.
 
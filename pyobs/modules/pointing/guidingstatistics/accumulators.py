@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import math
+
+
+class P2Quantile:
+    """Streaming estimate of a quantile with constant memory, using the P² algorithm by Jain & Chlamtac (1985)."""
+
+    def __init__(self, p: float):
+        """Creates a new quantile estimator.
+
+        Args:
+            p: Quantile to estimate, between 0 and 1.
+        """
+        self.p = p
+        self._heights: list[float] = []
+        self._positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1.0 + 2.0 * p, 1.0 + 4.0 * p, 3.0 + 2.0 * p, 5.0]
+        self._increments = [0.0, p / 2.0, p, (1.0 + p) / 2.0, 1.0]
+
+    def add(self, x: float) -> None:
+        """Adds a new value."""
+
+        # collect first five values
+        h = self._heights
+        if len(h) < 5:
+            h.append(x)
+            h.sort()
+            return
+
+        # find cell of new value and update extreme markers
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = next(i for i in range(4) if h[i] <= x < h[i + 1])
+
+        # increment positions of markers above it, and all desired positions
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1.0
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        # adjust heights of middle markers
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1.0 and n[i + 1] - n[i] > 1.0) or (d <= -1.0 and n[i - 1] - n[i] < -1.0):
+                s = 1.0 if d > 0 else -1.0
+                # parabolic prediction, or linear one, if that's not monotonic
+                q = h[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not h[i - 1] < q < h[i + 1]:
+                    j = i + int(s)
+                    q = h[i] + s * (h[j] - h[i]) / (n[j] - n[i])
+                h[i] = q
+                n[i] += s
+
+    @property
+    def value(self) -> float | None:
+        """Current estimate of the quantile, or None, if no values have been added."""
+        h = self._heights
+        if len(h) == 0:
+            return None
+        if len(h) < 5:
+            # exact quantile with linear interpolation
+            pos = self.p * (len(h) - 1)
+            lo = int(math.floor(pos))
+            hi = min(lo + 1, len(h) - 1)
+            return h[lo] + (h[hi] - h[lo]) * (pos - lo)
+        return h[2]
+
+
+class RunningStats:
+    """Streaming mean, standard deviation (Welford), RMS, minimum, maximum, and quantiles of a series of values."""
+
+    def __init__(self, quantiles: tuple[float, ...] = ()):
+        """Creates new statistics.
+
+        Args:
+            quantiles: Quantiles to estimate, see P2Quantile.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._sum_squares = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._quantiles = {q: P2Quantile(q) for q in quantiles}
+
+    def add(self, x: float) -> None:
+        """Adds a new value."""
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        self._sum_squares += x * x
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        for q in self._quantiles.values():
+            q.add(x)
+
+    @property
+    def std(self) -> float:
+        """Standard deviation of values."""
+        return math.sqrt(self._m2 / self.count) if self.count > 0 else math.nan
+
+    @property
+    def rms(self) -> float:
+        """Root mean square of values."""
+        return math.sqrt(self._sum_squares / self.count) if self.count > 0 else math.nan
+
+    def quantile(self, p: float) -> float | None:
+        """Returns estimate for given quantile, which must have been requested in the constructor."""
+        return self._quantiles[p].value
+
+
+class ExponentialMovingAverage:
+    """Average of values sampled at given times, with older values decaying with a time constant of window seconds."""
+
+    def __init__(self, window: float):
+        self._window = window
+        self._value: float | None = None
+        self._time: float | None = None
+
+    def add(self, x: float, time: float) -> None:
+        """Adds a new value at the given time in seconds."""
+        if self._value is None or self._time is None:
+            self._value = x
+        else:
+            alpha = 1.0 - math.exp(-max(time - self._time, 0.0) / self._window)
+            self._value += alpha * (x - self._value)
+        self._time = time
+
+    @property
+    def value(self) -> float | None:
+        """Current average, or None, if no values have been added."""
+        return self._value
+
+
+class TimeWeightedAverage:
+    """Average of a piecewise constant signal over time, with older values decaying with a time constant of window
+    seconds. Each value is in effect from the time it is added until the next one."""
+
+    def __init__(self, window: float):
+        self._window = window
+        self._average: float | None = None
+        self._current: float | None = None
+        self._time: float | None = None
+
+    def _advance(self, time: float) -> float | None:
+        if self._current is None or self._time is None:
+            return self._average
+        if self._average is None:
+            return self._current
+        alpha = 1.0 - math.exp(-max(time - self._time, 0.0) / self._window)
+        return self._average + alpha * (self._current - self._average)
+
+    def add(self, x: float, time: float) -> None:
+        """Sets a new value from the given time in seconds onwards."""
+        self._average = self._advance(time)
+        self._current = x
+        self._time = time
+
+    def value(self, time: float) -> float | None:
+        """Average at given time, or None, if no values have been added."""
+        return self._advance(time)
+
+
+__all__ = ["P2Quantile", "RunningStats", "ExponentialMovingAverage", "TimeWeightedAverage"]
@@ -1,5 +1,5 @@
+import time
 from abc import ABCMeta, abstractmethod
-from collections import defaultdict
 from typing import Any, Generic, TypeVar
 
 from pyobs.interfaces import FitsHeaderEntry
@@ -9,10 +9,21 @@ OUT = TypeVar("OUT")
 
 
 class GuidingStatistics(Generic[IN, OUT], metaclass=ABCMeta):
-    """Calculates statistics for guiding."""
+    """Calculates statistics for guiding.
 
-    def __init__(self) -> None:
-        self._sessions: dict[str, list[Any]] = defaultdict(list)
+    Each client session keeps an accumulator, which is updated with every new sample in constant time and memory, so
+    neither long sessions nor building the header get more expensive with the number of samples. Additionally, a
+    rolling summary over the last live_window seconds is kept for publishing as live state.
+    """
+
+    def __init__(self, live_window: float = 300.0) -> None:
+        """Creates new guiding statistics.
+
+        Args:
+            live_window: Time constant in seconds for the rolling summary.
+        """
+        self._sessions: dict[str, Any] = {}
+        self._live_window = live_window
 
     def init_stats(self, client: str, default: Any = None) -> None:
         """
@@ -23,13 +34,25 @@ class GuidingStatistics(Generic[IN, OUT], metaclass=ABCMeta):
             default: first entry in session
         """
 
-        self._sessions[client] = []
+        self._sessions[client] = self._create_accumulator()
 
         if default is not None:
-            self._sessions[client].append(self._get_session_data(default))
+            data = self._get_session_data(default)
+            if data is not None:
+                self._add_to_accumulator(self._sessions[client], data)
+
+    @abstractmethod
+    def _create_accumulator(self) -> Any:
+        """Returns a new accumulator for a session."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _add_to_accumulator(self, accumulator: Any, data: OUT) -> None:
+        """Adds session data to an accumulator."""
+        raise NotImplementedError
 
     @abstractmethod
-    def _build_header(self, data: Any) -> dict[str, FitsHeaderEntry]:
+    def _build_header(self, accumulator: Any) -> dict[str, FitsHeaderEntry]:
         raise NotImplementedError
 
     def add_to_header(self, client: str, header: dict[str, FitsHeaderEntry]) -> dict[str, FitsHeaderEntry]:
@@ -44,8 +67,8 @@ class GuidingStatistics(Generic[IN, OUT], metaclass=ABCMeta):
         if client not in self._sessions:
             return header
 
-        data = self._sessions.pop(client)
-        session_header = self._build_header(data)
+        accumulator = self._sessions.pop(client)
+        session_header = self._build_header(accumulator)
 
         return header | session_header
 
@@ -62,5 +85,14 @@ class GuidingStatistics(Generic[IN, OUT], metaclass=ABCMeta):
 
         data = self._get_session_data(input_data)
         if data is not None:
-            for k in self._sessions.keys():
-                self._sessions[k].append(data)
+            for accumulator in self._sessions.values():
+                self._add_to_accumulator(accumulator, data)
+            self._update_live(data, time.monotonic())
+
+    def _update_live(self, data: OUT, timestamp: float) -> None:
+        """Updates rolling summary with new session data at given monotonic time."""
+        pass
+
+    def summary(self) -> float | None:
+        """Returns rolling summary over recent data, or None, if not available."""
+        return None
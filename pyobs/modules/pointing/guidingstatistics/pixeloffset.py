@@ -1,39 +1,46 @@
 import logging
-
-import numpy as np
+import math
 
 from pyobs.images import Image
 from pyobs.images.meta import PixelOffsets
 from pyobs.interfaces import FitsHeaderEntry
 
+from .accumulators import ExponentialMovingAverage, RunningStats
 from .guidingstatistics import GuidingStatistics
 
 log = logging.getLogger(__name__)
 
 
 class GuidingStatisticsPixelOffset(GuidingStatistics[Image, tuple[float, float]]):
+    def __init__(self, live_window: float = 300.0) -> None:
+        GuidingStatistics.__init__(self, live_window)
+        self._live = ExponentialMovingAverage(live_window)
+
+    def _create_accumulator(self) -> tuple[RunningStats, RunningStats]:
+        return RunningStats(), RunningStats()
+
+    def _add_to_accumulator(self, accumulator: tuple[RunningStats, RunningStats], data: tuple[float, float]) -> None:
+        accumulator[0].add(data[0])
+        accumulator[1].add(data[1])
+
     @staticmethod
-    def _calc_rms(data: list[tuple[float, float]]) -> tuple[float, float] | None:
+    def _calc_rms(stats: tuple[RunningStats, RunningStats]) -> tuple[float, float] | None:
         """
         Calculates RMS of data.
 
         Args:
-            data: Data to calculate RMS for.
+            stats: Statistics for both axes to calculate RMS for.
 
         Returns:
             Tuple of RMS.
         """
-        if len(data) < 3:
+        if stats[0].count < 3:
             return None
+        return stats[0].rms, stats[1].rms
 
-        flattened_data = np.array(list(map(list, zip(*data))))
-        data_len = len(flattened_data[0])
-        rms = np.sqrt(np.sum(np.power(flattened_data, 2), axis=1) / data_len)
-        return tuple(rms)
-
-    def _build_header(self, data: list[tuple[float, float]]) -> dict[str, FitsHeaderEntry]:
+    def _build_header(self, stats: tuple[RunningStats, RunningStats]) -> dict[str, FitsHeaderEntry]:
         header: dict[str, FitsHeaderEntry] = {}
-        rms = self._calc_rms(data)
+        rms = self._calc_rms(stats)
 
         if rms is not None:
             header["HIERARCH GUIDING RMS1"] = FitsHeaderEntry(float(rms[0]), "RMS for guiding on axis 1")
@@ -48,3 +55,10 @@ class GuidingStatisticsPixelOffset(GuidingStatistics[Image, tuple[float, float]]
             return primitive
         else:
             return None
+
+    def _update_live(self, data: tuple[float, float], timestamp: float) -> None:
+        self._live.add(data[0] ** 2 + data[1] ** 2, timestamp)
+
+    def summary(self) -> float | None:
+        """Returns rolling RMS of total pixel offsets."""
+        return None if self._live.value is None else math.sqrt(self._live.value)
@@ -1,43 +1,54 @@
 from __future__ import annotations
 
 import logging
-
-import numpy as np
+import math
 
 from pyobs.images import Image
 from pyobs.images.meta import SkyOffsets
 from pyobs.interfaces import FitsHeaderEntry
 
+from .accumulators import ExponentialMovingAverage, RunningStats
 from .guidingstatistics import GuidingStatistics
 
 log = logging.getLogger(__name__)
 
 
 class GuidingStatisticsSkyOffset(GuidingStatistics[Image, float]):
+    def __init__(self, live_window: float = 300.0) -> None:
+        GuidingStatistics.__init__(self, live_window)
+        self._live = ExponentialMovingAverage(live_window)
+
+    def _create_accumulator(self) -> RunningStats:
+        return RunningStats(quantiles=(0.9,))
+
+    def _add_to_accumulator(self, accumulator: RunningStats, data: float) -> None:
+        accumulator.add(data)
+
     @staticmethod
-    def _calc_rms(data: list[float]) -> float | None:
+    def _calc_rms(stats: RunningStats) -> float | None:
         """
         Calculates RMS of data.
 
         Args:
-            data: Data to calculate RMS for.
+            stats: Statistics to calculate RMS for.
 
         Returns:
-            Tuple of RMS.
+            RMS.
         """
-        if len(data) < 3:
+        if stats.count < 3:
             return None
+        return stats.rms
 
-        data_len = len(data)
-        rms = np.sqrt(np.sum(np.power(data, 2)) / data_len)
-        return float(rms)
-
-    def _build_header(self, data: list[float]) -> dict[str, FitsHeaderEntry]:
+    def _build_header(self, stats: RunningStats) -> dict[str, FitsHeaderEntry]:
         header: dict[str, FitsHeaderEntry] = {}
-        rms = self._calc_rms(data)
+        rms = self._calc_rms(stats)
 
         if rms is not None:
             header["HIERARCH GUIDING RMS"] = FitsHeaderEntry(float(rms), "RMS for guiding on sky")
+            header["HIERARCH GUIDING MAX"] = FitsHeaderEntry(float(stats.max), "Maximum guiding offset on sky")
+            p90 = stats.quantile(0.9)
+            if p90 is not None:
+                header["HIERARCH GUIDING P90"] = FitsHeaderEntry(float(p90), "90th percentile of offsets on sky")
 
         return header
 
@@ -47,3 +58,10 @@ class GuidingStatisticsSkyOffset(GuidingStatistics[Image, float]):
             return float(sky_offset.separation().deg)
         else:
             return None
+
+    def _update_live(self, data: float, timestamp: float) -> None:
+        self._live.add(data**2, timestamp)
+
+    def summary(self) -> float | None:
+        """Returns rolling RMS of offsets on sky in degrees."""
+        return None if self._live.value is None else math.sqrt(self._live.value)
@@ -1,54 +1,88 @@
+from __future__ import annotations
+
+import time
 from datetime import datetime
 
 from pyobs.interfaces import FitsHeaderEntry
+from pyobs.modules.pointing.guidingstatistics.accumulators import TimeWeightedAverage
 from pyobs.modules.pointing.guidingstatistics.guidingstatistics import GuidingStatistics
 
 
-class GuidingStatisticsUptime(GuidingStatistics[bool, tuple[bool | None, datetime]]):
-    @staticmethod
-    def _calc_uptime(states: list[tuple[bool | None, datetime]]) -> int:
-        uptimes: list[int] = []
-        for i, entry in enumerate(states):
-            state, timestamp = entry
-            # is not closed?
-            if not state or i + 1 == len(states):
-                continue
+class UptimeAccumulator:
+    """Accumulates the time the guiding loop was closed, from a series of loop states with their timestamps."""
 
-            uptime = (states[i + 1][1] - timestamp).seconds
-            uptimes.append(uptime)
+    def __init__(self) -> None:
+        self.start: datetime | None = None
+        self.uptime = 0.0
+        self._last: tuple[bool | None, datetime] | None = None
+        self._previous_state: bool | None = None
 
-        return sum(uptimes)
+    def add(self, state: bool | None, timestamp: datetime) -> None:
+        """Adds a new state, which is in effect from the given time onwards."""
+        if self._last is None:
+            self.start = timestamp
+        else:
+            # was closed since last state?
+            if self._last[0]:
+                self.uptime += (timestamp - self._last[1]).total_seconds()
+            self._previous_state = self._last[0]
+        self._last = (state, timestamp)
+
+    @property
+    def total_time(self) -> float:
+        """Time between first and last state in seconds."""
+        if self._last is None or self.start is None:
+            return 0.0
+        return (self._last[1] - self.start).total_seconds()
+
+    @property
+    def previous_state(self) -> bool | None:
+        """The state before the last one, i.e. the last real one, if the last one is the stop value."""
+        return self._previous_state
 
-    @staticmethod
-    def _calc_total_time(states: list[tuple[bool | None, datetime]]) -> int:
-        initial_time = states[0][1]
-        end_time = states[-1][1]
-        return (end_time - initial_time).seconds
+
+class GuidingStatisticsUptime(GuidingStatistics[bool, tuple[bool | None, datetime]]):
+    def __init__(self, live_window: float = 300.0) -> None:
+        GuidingStatistics.__init__(self, live_window)
+        self._live = TimeWeightedAverage(live_window)
+
+    def _create_accumulator(self) -> UptimeAccumulator:
+        return UptimeAccumulator()
+
+    def _add_to_accumulator(self, accumulator: UptimeAccumulator, data: tuple[bool | None, datetime]) -> None:
+        accumulator.add(*data)
 
     @staticmethod
-    def _calc_uptime_percentage(states: list[tuple[bool | None, datetime]]) -> float:
-        uptime = GuidingStatisticsUptime._calc_uptime(states)
-        total_time = GuidingStatisticsUptime._calc_total_time(states)
+    def _calc_uptime_percentage(accumulator: UptimeAccumulator) -> float:
+        uptime = accumulator.uptime
+        total_time = accumulator.total_time
 
         """
         If no time has passed, return 100 if the loop is closed, 0 else.
-        We have to take the second last value in the state array, since the last value is the stop value.
+        We have to take the second last state, since the last value is the stop value.
         """
         if total_time == 0:
-            return int(states[-2][0]) * 100.0 if states[-2][0] is not None else 0.0
+            return int(accumulator.previous_state) * 100.0 if accumulator.previous_state is not None else 0.0
 
         return uptime / total_time * 100.0
 
-    def _build_header(self, data: list[tuple[bool | None, datetime]]) -> dict[str, FitsHeaderEntry]:
+    def _build_header(self, accumulator: UptimeAccumulator) -> dict[str, FitsHeaderEntry]:
         now = datetime.now()
-        data.append((None, now))
+        accumulator.add(None, now)
 
-        uptime_percentage = self._calc_uptime_percentage(data)
+        uptime_percentage = self._calc_uptime_percentage(accumulator)
         return {"HIERARCH GUIDING UPTIME": FitsHeaderEntry(uptime_percentage, "Time the guiding loop was closed [%]")}
 
     def _get_session_data(self, input_data: bool) -> tuple[bool | None, datetime] | None:
         now = datetime.now()
         return input_data, now
 
+    def _update_live(self, data: tuple[bool | None, datetime], timestamp: float) -> None:
+        self._live.add(100.0 if data[0] else 0.0, timestamp)
+
+    def summary(self) -> float | None:
+        """Returns rolling percentage of time the loop was closed."""
+        return self._live.value(time.monotonic())
+
 
 __all__ = ["GuidingStatisticsUptime"]
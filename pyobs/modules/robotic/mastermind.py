@@ -1,10 +1,11 @@
 import asyncio
+import contextlib
 import logging
 from typing import Any
 
 import astropy.units as u
 
-from pyobs.events import TaskFailedEvent, TaskFinishedEvent, TaskStartedEvent
+from pyobs.events import Event, ScheduleChangedEvent, TaskFailedEvent, TaskFinishedEvent, TaskStartedEvent
 from pyobs.interfaces import FitsHeaderEntry, IAutonomous, IFitsHeaderBefore, IRunning
 from pyobs.interfaces.IRunning import RunningState
 from pyobs.modules import Module
@@ -18,13 +19,21 @@ from pyobs.robotic import (
 )
 from pyobs.robotic.scheduler.targets import Target
 from pyobs.utils import exceptions as exc
+from pyobs.utils.counter import NightlyCounter
 from pyobs.utils.time import Time
 
 log = logging.getLogger(__name__)
 
 
 class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
-    """Mastermind for a full robotic mode."""
+    """Mastermind for a full robotic mode.
+
+    Instead of polling the schedule in fixed intervals, the mastermind wakes up on a
+    :class:`~pyobs.events.ScheduleChangedEvent` and at the start time of the next observation, and checks the
+    schedule at least every poll_interval seconds. If the next observation starts within stage_ahead seconds, it is
+    prepared in the background (e.g. moving the telescope and setting up the instrument), so that it can start
+    right away. If the schedule changes and another observation is next, the preparation is rolled back.
+    """
 
     __module__ = "pyobs.modules.robotic"
 
@@ -36,6 +45,9 @@ class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
         allowed_late_start: int = 300,
         allowed_overrun: int = 300,
         after_task_sleep: int = 0,
+        obsnum_counter: str | None = None,
+        poll_interval: float = 10.0,
+        stage_ahead: float | None = 300.0,
         **kwargs: Any,
     ):
         """Initialize a new auto focus system.
@@ -44,6 +56,11 @@ class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
             schedule: Object that can return schedule.
             allowed_late_start: Allowed seconds to start late.
             allowed_overrun: Allowed time for a task to exceed it's window in seconds
+            obsnum_counter: Local file for persisting the observation number, see
+                :class:`~pyobs.utils.counter.NightlyCounter`. If None, it is stored in the VFS, but only read once
+                and written in the background.
+            poll_interval: Maximum interval in seconds for checking the schedule.
+            stage_ahead: Prepare next observation, if it starts within this many seconds. None to disable.
         """
         Module.__init__(self, **kwargs)
 
@@ -52,8 +69,15 @@ class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
         self._allowed_overrun = allowed_overrun
         self._running = False
         self._after_task_sleep = after_task_sleep
+        self._poll_interval = poll_interval
+        self._stage_ahead = stage_ahead
         self._last_cant_run_reason: dict[Any, str] = {}
 
+        # wake up on schedule changes, and staged next observation
+        self._wake = asyncio.Event()
+        self._staged: Observation | None = None
+        self._staging: asyncio.Task[None] | None = None
+
         # add thread func
         self.add_background_task(self._run_thread, True)
 
@@ -69,6 +93,8 @@ class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
 
         # per-night observation counter
         self._obsnum_cache = f"/pyobs/modules/{self.name}/obsnum.yaml"
+        self._obsnum_counter_file = obsnum_counter
+        self._obsnum_counter: NightlyCounter | None = None
 
     async def _next_obsnum(self) -> str:
         """Compute and persist the next per-night observation number.
@@ -79,23 +105,12 @@ class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
         night = Time.now().night_obs(self._observer) if self._observer is not None else Time.now().datetime.date()
         night_str = night.strftime("%Y%m%d")
 
-        # load cache, bump counter, reset on night change
-        counter = 1
-        try:
-            cache = await self.vfs.read_yaml(self._obsnum_cache)
-            if cache is not None and cache.get("night") == night_str:
-                counter = cache["obsnum"] + 1
-        except (FileNotFoundError, ValueError, IndexError):
-            # IndexError: some VFS backends (e.g. MemoryFile) raise this for a missing file
-            # instead of FileNotFoundError
-            pass
-
-        # write it back
-        try:
-            await self.vfs.write_yaml(self._obsnum_cache, {"night": night_str, "obsnum": counter})
-        except (FileNotFoundError, ValueError):
-            log.warning("Could not write obsnum cache file.")
-
+        # bump counter, reset on night change
+        if self._obsnum_counter is None:
+            self._obsnum_counter = NightlyCounter(
+                filename=self._obsnum_counter_file, vfs=self.vfs, vfs_filename=self._obsnum_cache, key="obsnum"
+            )
+        counter = await self._obsnum_counter.next(night_str)
         return f"{night_str}-{counter:03d}"
 
     async def open(self) -> None:
@@ -106,11 +121,20 @@ class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
         if self._comm:
             await self.comm.register_event(TaskStartedEvent)
             await self.comm.register_event(TaskFinishedEvent)
+            await self.comm.register_event(ScheduleChangedEvent, self._on_schedule_changed)
 
         # start
         self._running = True
         await self.comm.set_state(IRunning, RunningState(running=self._running))
 
+    async def close(self) -> None:
+        """Close module."""
+        if self._staging is not None:
+            self._staging.cancel()
+        if self._obsnum_counter is not None:
+            await self._obsnum_counter.close()
+        await Module.close(self)
+
     async def start(self, **kwargs: Any) -> None:
         """Starts a service."""
         log.info("Starting robotic system...")
@@ -123,6 +147,89 @@ class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
         self._running = False
         await self.comm.set_state(IRunning, RunningState(running=self._running))
 
+    async def _on_schedule_changed(self, event: Event, sender: str) -> bool:
+        """Wake up main loop, when the schedule has changed."""
+        self._wake.set()
+        return True
+
+    async def _wait(self, until: Time | None = None) -> None:
+        """Waits for poll_interval seconds or until the given time, whatever comes first, or until woken up."""
+        timeout = self._poll_interval
+        if until is not None:
+            timeout = min(timeout, max(0.0, (until - Time.now()).sec))
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(self._wake.wait(), timeout)
+
+    async def _next_pending(self, now: Time) -> Observation | None:
+        """Returns the next pending observation that starts after the given time."""
+        schedule = await self._observation_archive.get_schedule()
+        upcoming = sorted(schedule.filter(state=ObservationState.PENDING, start_after=now))
+        if len(upcoming) == 0:
+            return None
+        observation = upcoming[0]
+        if self._task_archive is not None:
+            await observation.fetch_task(self._task_archive)
+        return observation
+
+    async def _stage_next(self, now: Time) -> Observation | None:
+        """Prepares the next pending observation, if it starts soon, and returns it."""
+        try:
+            upcoming = await self._next_pending(now)
+        except Exception:
+            # only needed for preparing the next observation, so don't fail, and keep what has been staged, since we
+            # don't know whether the schedule has changed at all
+            log.warning("Could not fetch schedule for preparing next observation.")
+            return self._staged
+        await self._stage(upcoming, now)
+        return upcoming
+
+    async def _stage(self, observation: Observation | None, now: Time) -> None:
+        """Prepares the given observation in the background, if it starts soon, and rolls back a different one."""
+        if observation is not None and observation == self._staged:
+            return
+        await self._rollback()
+        if observation is None or self._stage_ahead is None or not isinstance(observation.task, Task):
+            return
+        if observation.start - now > self._stage_ahead * u.second:
+            return
+        if not await self._task_runner.can_run(observation.task, observation.target):
+            return
+
+        log.info("Preparing next task %s...", observation.task.name)
+        self._staged = observation
+        self._staging = asyncio.create_task(self._task_runner.prepare_task(observation.task, observation.target))
+
+    async def _rollback(self) -> None:
+        """Rolls back a staged observation."""
+        staged, staging = self._staged, self._staging
+        self._staged, self._staging = None, None
+        if staged is None:
+            return
+        if staging is not None:
+            staging.cancel()
+            await asyncio.wait([staging])
+        log.info("Rolling back preparation of task %s...", staged.task.name)
+        try:
+            await self._task_runner.rollback_task(staged.task, staged.target)
+        except Exception:
+            log.exception("Could not roll back preparation of task %s.", staged.task.name)
+
+    async def _take_staged(self, observation: Observation) -> Task:
+        """Returns the task to run for the given observation, which is the staged one, if it matches."""
+        if self._staged is None or self._staged != observation:
+            await self._rollback()
+            return observation.task
+
+        # wait for preparation to finish
+        staged, staging = self._staged, self._staging
+        self._staged, self._staging = None, None
+        try:
+            if staging is not None:
+                await staging
+        except Exception:
+            log.warning("Could not prepare task %s, running it anyway.", staged.task.name)
+        return staged.task
+
     async def _run_thread(self) -> None:
         # wait a little
         await asyncio.sleep(5)
@@ -134,11 +241,13 @@ class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
         while True:
             # not running?
             if not self._running:
-                # sleep a little and continue
+                # roll back, sleep a little and continue
+                await self._rollback()
                 await asyncio.sleep(1)
                 continue
 
-            # get now
+            # get now, changes to the schedule after this will wake us up
+            self._wake.clear()
             now = Time.now()
 
             # find task that we want to run now
@@ -146,7 +255,9 @@ class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
                 now, self._task_archive
             )
             if observation is None:
-                await asyncio.sleep(10)
+                # prepare next one and wait for its start
+                upcoming = await self._stage_next(now)
+                await self._wait(upcoming.start if upcoming is not None else None)
                 continue
 
             if not await self._task_runner.can_run(observation.task, observation.target):
@@ -156,7 +267,7 @@ class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
                     if last != reason:
                         log.info("Task %s cannot run: %s", observation.task.name, reason)
                         self._last_cant_run_reason[observation.task.id] = reason
-                await asyncio.sleep(10)
+                await self._wait()
                 continue
 
             # task can run — clear stored reason
@@ -175,15 +286,15 @@ class Mastermind(Module, IAutonomous, IFitsHeaderBefore):
                         )
                     first_late_start_warning = False
 
-                    # sleep a little and skip
-                    await asyncio.sleep(10)
+                    # wait a little and skip
+                    await self._wait()
                     continue
 
             # reset warning
             first_late_start_warning = True
 
-            # task is definitely not None here
-            self._task = observation.task
+            # task is definitely not None here, use staged one, if prepared
+            self._task = await self._take_staged(observation)
             self._task_target = observation.target
             self._obsnum = await self._next_obsnum()
 
@@ -13,6 +13,7 @@ from astropy.time import TimeDelta
 from pyobs.events import (
     Event,
     GoodWeatherEvent,
+    ScheduleChangedEvent,
     TaskFailedEvent,
     TaskFinishedEvent,
     TaskStartedEvent,
@@ -146,6 +147,7 @@ class Scheduler(Module, IStartStop, IRunnable):
 
         # subscribe to events
         if self._comm:
+            await self.comm.register_event(ScheduleChangedEvent)
             await self.comm.register_event(TaskStartedEvent, self._on_task_started)
             await self.comm.register_event(TaskFinishedEvent, self._on_task_finished)
             await self.comm.register_event(TaskFailedEvent, self._on_task_finished)
@@ -294,8 +296,9 @@ class Scheduler(Module, IStartStop, IRunnable):
                             # set new safety_time as duration + 20%, but at least _min_safety_time
                             self._safety_time = max((time.time() - start_time) * 1.2 * u.second, self._min_safety_time)
 
-                            # submit it
+                            # submit it and let mastermind know
                             await self._schedule.add_observations(ObservationList([scheduled_task]))
+                            await self.comm.send_event(ScheduleChangedEvent(start=start))
 
                     if self._need_update:
                         log.info("Not using scheduler results, since update was requested.")
@@ -308,6 +311,7 @@ class Scheduler(Module, IStartStop, IRunnable):
 
                     # submit it
                     await self._schedule.add_observations(scheduled_tasks[1:])
+                    await self.comm.send_event(ScheduleChangedEvent(start=start))
 
                     # clean up
                     del scheduled_tasks
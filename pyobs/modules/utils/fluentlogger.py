@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-from pyobs.events import Event, LogEvent
+from pyobs.events import Event, LogBatchEvent
 from pyobs.modules import Module
 from pyobs.utils.time import Time
 
@@ -42,27 +42,25 @@ class FluentLogger(Module):
         self._fluent = sender.FluentSender("pyobs", host=self._hostname, port=self._port)
 
         # listen to log events
-        await self.comm.register_event(LogEvent, self._process_log_entry)
+        await self.comm.register_event(LogBatchEvent, self._process_log_batch)
 
-    async def _process_log_entry(self, event: Event, sender: str) -> bool:
-        """Process a new log entry.
+    async def _process_log_batch(self, event: Event, sender: str) -> bool:
+        """Process a batch of log entries.
 
         Args:
-            event: The log event.
+            event: The log batch event.
             sender: Name of sender.
         """
 
         # check
         if self._fluent is None:
             raise ValueError("Module not opened.")
-        if not isinstance(event, LogEvent):
+        if not isinstance(event, LogBatchEvent):
             raise ValueError("Wrong event type.")
 
-        # get time
-        time = Time(event.time).unix
-
-        # send it
-        self._fluent.emit_with_time(sender, time, event.data)
+        # send them
+        for entry in event.entries:
+            self._fluent.emit_with_time(entry.sender or sender, Time(entry.time).unix, entry.data)
         return True
 
 
@@ -3,7 +3,7 @@ import logging
 from asyncio import Queue, Task
 from typing import Any
 
-from pyobs.events import Event, LogEvent
+from pyobs.events import Event, LogBatchEvent
 from pyobs.modules import Module
 
 log = logging.getLogger(__name__)
@@ -81,7 +81,7 @@ class Matrix(Module):
             raise RuntimeError(f"Failed to log in: {resp}")
 
         # listen to log events
-        await self.comm.register_event(LogEvent, self._process_log_entry)
+        await self.comm.register_event(LogBatchEvent, self._process_log_batch)
 
         # do initial sync
         await self.client.sync()
@@ -153,30 +153,33 @@ class Matrix(Module):
             # brief pause to stay under the server's rate limit
             await asyncio.sleep(_SEND_INTERVAL)
 
-    async def _process_log_entry(self, entry: Event, sender: str) -> bool:
-        """Process a new log entry.
+    async def _process_log_batch(self, batch: Event, sender: str) -> bool:
+        """Process a batch of log entries, sending a single message.
 
         Args:
-            entry: The log event.
+            batch: The log batch event.
             sender: Name of sender.
         """
-        if not isinstance(entry, LogEvent):
+        if not isinstance(batch, LogBatchEvent):
             return False
 
         # don't log my own messages
         if sender == self.comm.name:
             return False
 
-        # if log level of message is too small, ignore it
-        if self._log_levels[entry.level] < self._log_levels[self._log_level]:
-            return False
-
         # client not yet connected
         if self.client is None:
             return False
 
-        # build log message
-        message = f"({entry.level}) {sender}: {entry.message}"
+        # build log message from entries with large enough log level
+        min_level = self._log_levels[self._log_level]
+        message = "\n".join(
+            f"({entry.level}) {entry.sender or sender}: {entry.message}"
+            for entry in batch.entries
+            if self._log_levels.get(entry.level, 0) >= min_level
+        )
+        if not message:
+            return False
 
         # drop message if queue is full to prevent memory runaway during bursts
         if self._queue.full():
@@ -8,7 +8,7 @@ from inspect import Parameter
 from pprint import pprint
 from typing import TYPE_CHECKING, Any
 
-from pyobs.events import Event, LogEvent
+from pyobs.events import Event, LogBatchEvent
 from pyobs.modules import Module
 
 if TYPE_CHECKING:
@@ -24,6 +24,9 @@ _QUEUE_MAX = 50
 # Minimum delay between send_message calls to avoid rate limiting (in seconds).
 _SEND_INTERVAL = 0.5
 
+# Maximum length of a Telegram message.
+_MAX_MESSAGE_LENGTH = 4096
+
 
 class TelegramUserState(Enum):
     IDLE = (0,)
@@ -107,7 +110,7 @@ class Telegram(Module):
         await self._application.start()
 
         # listen to log events
-        await self.comm.register_event(LogEvent, self._process_log_entry)
+        await self.comm.register_event(LogBatchEvent, self._process_log_batch)
 
     async def close(self) -> None:
         """Close module."""
@@ -530,22 +533,16 @@ class Telegram(Module):
             f"Current log level: {current_level}\nPlease choose new log level:", reply_markup=reply_markup
         )
 
-    async def _process_log_entry(self, entry: Event, sender: str) -> bool:
-        """Process a new log entry.
+    async def _process_log_batch(self, batch: Event, sender: str) -> bool:
+        """Process a batch of log entries, sending a single message per user.
 
         Args:
-            entry: The log event.
+            batch: The log batch event.
             sender: Name of sender.
         """
-        if not isinstance(entry, LogEvent):
+        if not isinstance(batch, LogBatchEvent):
             return False
 
-        # get numerical value for log level
-        level = self._log_levels[entry.level]
-
-        # build log message
-        message = f"({entry.level}) {sender}: {entry.message}"
-
         # get storage
         if self._application is None:
             return False
@@ -556,8 +553,15 @@ class Telegram(Module):
             # get user log level
             user_level = self._log_levels[user["loglevel"]] if user["loglevel"] in self._log_levels else 100
 
-            # is it larger than the log entry level?
-            if level >= user_level:
+            # collect all entries with a log level larger than the user's
+            lines = [
+                f"({entry.level}) {entry.sender or sender}: {entry.message}"
+                for entry in batch.entries
+                if self._log_levels.get(entry.level, 0) >= user_level
+            ]
+
+            # split into messages of allowed size
+            for message in self._join_lines(lines):
                 # drop message if queue is full to prevent memory runaway during bursts
                 if self._message_queue.full():
                     log.warning("Telegram message queue full, dropping message.")
@@ -568,6 +572,18 @@ class Telegram(Module):
 
         return True
 
+    @staticmethod
+    def _join_lines(lines: list[str]) -> list[str]:
+        """Joins lines into as few messages as possible, each not longer than allowed by Telegram."""
+        messages: list[str] = []
+        for line in lines:
+            line = line[:_MAX_MESSAGE_LENGTH]
+            if messages and len(messages[-1]) + 1 + len(line) <= _MAX_MESSAGE_LENGTH:
+                messages[-1] += "\n" + line
+            else:
+                messages.append(line)
+        return messages
+
     async def _log_sender_thread(self) -> None:
         """Drain the message queue and send messages one at a time.
 
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from dataclasses import dataclass, field
 from typing import Any
 
 from pyobs.events import Event
@@ -12,8 +15,75 @@ from pyobs.object import get_class_from_string
 log = logging.getLogger(__name__)
 
 
+@dataclass
+class TriggerStatistics:
+    """Execution statistics of a single trigger."""
+
+    executions: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    skipped: int = 0
+    total_duration: float = 0.0
+    last_error: str | None = None
+
+    @property
+    def mean_duration(self) -> float:
+        """Mean duration of all executions in seconds."""
+        return self.total_duration / self.executions if self.executions > 0 else 0.0
+
+
+@dataclass
+class _Trigger:
+    """A single configured trigger with its runtime state."""
+
+    event: type[Event]
+    module: str
+    method: str
+    sender: str | None = None
+    filter: dict[str, Any] = field(default_factory=dict)
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    timeout: float | None = None
+    min_interval: float = 0.0
+    debounce: float = 0.0
+    statistics: TriggerStatistics = field(default_factory=TriggerStatistics)
+    last_start: float | None = None
+    task: asyncio.Task[None] | None = None
+    pending: bool = False
+
+    @property
+    def name(self) -> str:
+        return f"{self.module}.{self.method}"
+
+    def matches(self, event: Event, sender: str) -> bool:
+        """Whether the trigger fires for the given event from the given sender."""
+        if self.sender is not None and sender != self.sender:
+            return False
+        for key, expected in self.filter.items():
+            data = event.data if isinstance(event.data, dict) else {}
+            value = data[key] if key in data else getattr(event, key, None)
+            if value not in expected if isinstance(expected, list) else value != expected:
+                return False
+        return True
+
+
 class Trigger(Module, IAutonomous):
-    """A module that can call another module's methods when a specific event occurs."""
+    """A module that can call another module's methods when a specific event occurs.
+
+    Each trigger is defined by a dictionary with the following fields:
+
+    - event: Class name of the event to react on.
+    - module, method: Module and method to call.
+    - sender (optional): Only react on events from this module.
+    - filter (optional): Dictionary of event data fields with their required values, or lists of allowed values.
+    - kwargs (optional): Keyword arguments for the method call.
+    - timeout (optional): Maximum time in seconds for the method call.
+    - min_interval (optional): Minimum time in seconds between two calls, events in between are skipped.
+    - debounce (optional): Wait this many seconds for further events before calling the method only once.
+
+    Events are dispatched via an index on their type and the matching triggers are executed concurrently in the
+    background, so that a slow module doesn't delay the others or the event handling. A trigger never runs twice in
+    parallel, events arriving while it is running are merged into a single call after the running one.
+    """
 
     __module__ = "pyobs.modules.utils"
 
@@ -22,7 +92,7 @@ class Trigger(Module, IAutonomous):
 
         Args:
             triggers: List of dictionaries defining the trigger. Must contain fields for event, module and method,
-                      may contain a sender.
+                      may contain sender, filter, kwargs, timeout, min_interval and debounce.
 
         """
         Module.__init__(self, **kwargs)
@@ -30,29 +100,49 @@ class Trigger(Module, IAutonomous):
         # store
         self._running = False
 
-        # store triggers and convert event strings to actual classes
-        self._triggers = triggers
-        for trigger in self._triggers:
-            # get class and store it
-            kls = get_class_from_string(trigger["event"])
-            trigger["event"] = kls
+        # create triggers and index them by event class
+        self._triggers: list[_Trigger] = []
+        self._index: dict[type[Event], list[_Trigger]] = {}
+        for cfg in triggers:
+            cfg = dict(cfg)
+            cfg["event"] = get_class_from_string(cfg["event"]) if isinstance(cfg["event"], str) else cfg["event"]
+            trigger = _Trigger(**cfg)
+            self._triggers.append(trigger)
+            self._index.setdefault(trigger.event, []).append(trigger)
 
     async def open(self) -> None:
         """Open module."""
         await Module.open(self)
 
-        # get a list of all events
-        events = list(set([t["event"] for t in self._triggers]))
-
         # start
         self._running = True
 
-        # register them
-        for event in events:
+        # register all events
+        for event in self._index:
             await self.comm.register_event(event, self._handle_event)
 
         await self.comm.set_state(IRunning, RunningState(running=self._running))
 
+    async def close(self) -> None:
+        """Close module."""
+
+        # cancel running triggers
+        for trigger in self._triggers:
+            if trigger.task is not None:
+                trigger.task.cancel()
+            s = trigger.statistics
+            log.info(
+                "Trigger %s: %d executions (%d failed, %d timed out, %d skipped), mean duration %.2fs.",
+                trigger.name,
+                s.executions,
+                s.failures,
+                s.timeouts,
+                s.skipped,
+                s.mean_duration,
+            )
+
+        await Module.close(self)
+
     async def start(self, **kwargs: Any) -> None:
         """Starts a service."""
         self._running = True
@@ -63,6 +153,10 @@ class Trigger(Module, IAutonomous):
         self._running = False
         await self.comm.set_state(IRunning, RunningState(running=self._running))
 
+    def get_statistics(self) -> dict[str, TriggerStatistics]:
+        """Returns execution statistics for all triggers, keyed by "<module>.<method>"."""
+        return {trigger.name: trigger.statistics for trigger in self._triggers}
+
     async def _handle_event(self, event: Event, sender: str) -> bool:
         """Handle an incoming event.
 
@@ -75,28 +169,78 @@ class Trigger(Module, IAutonomous):
         if not self._running:
             return False
 
-        # loop all triggers
-        for trigger in self._triggers:
-            # does it handle the event?
-            if trigger["event"] == event.__class__:
-                log.info(
-                    "Received a %s event and calling %s.%s now.", str(type(event)), trigger["module"], trigger["method"]
-                )
-
-                # get proxy
-                try:
-                    async with self.comm.proxy(trigger["module"]) as proxy:
-                        await proxy.execute(trigger["method"])
-
-                except ValueError:
-                    log.exception("Could not execute command on proxy %s.", trigger["module"])
-                    continue
-
-                except Exception as e:
-                    log.error("Error on calling %s.%s: %s", trigger["module"], trigger["method"], e)
-                    continue
-
+        # schedule all matching triggers for the event class and its bases, but don't wait for them
+        for event_class in type(event).__mro__:
+            for trigger in self._index.get(event_class, []):
+                if trigger.matches(event, sender):
+                    self._fire(trigger, event)
         return True
 
-
-__all__ = ["Trigger"]
+    def _fire(self, trigger: _Trigger, event: Event) -> None:
+        """Schedule execution of a trigger, respecting its rate limits."""
+
+        # already running or waiting? then just make sure that it runs once more
+        if trigger.task is not None and not trigger.task.done():
+            if trigger.pending:
+                trigger.statistics.skipped += 1
+            trigger.pending = True
+            return
+
+        # too early?
+        if trigger.last_start is not None and time.monotonic() - trigger.last_start < trigger.min_interval:
+            log.debug("Skipping %s, last call was less than %.1fs ago.", trigger.name, trigger.min_interval)
+            trigger.statistics.skipped += 1
+            return
+
+        log.info("Received a %s event and calling %s now.", event.__class__.__name__, trigger.name)
+        trigger.pending = trigger.debounce > 0
+        trigger.task = asyncio.create_task(self._run(trigger))
+
+    async def _run(self, trigger: _Trigger) -> None:
+        """Run a trigger, until no more calls are pending."""
+        while True:
+            # wait for more events to settle
+            while trigger.pending and trigger.debounce > 0:
+                trigger.pending = False
+                await asyncio.sleep(trigger.debounce)
+            trigger.pending = False
+
+            # wait for rate limit
+            if trigger.last_start is not None:
+                wait = trigger.min_interval - (time.monotonic() - trigger.last_start)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+            await self._execute(trigger)
+            if not trigger.pending or not self._running:
+                break
+
+    async def _execute(self, trigger: _Trigger) -> None:
+        """Call the method of a trigger and update its statistics."""
+        s = trigger.statistics
+        trigger.last_start = time.monotonic()
+        try:
+            async with self.comm.proxy(trigger.module) as proxy:
+                await asyncio.wait_for(proxy.execute(trigger.method, **trigger.kwargs), timeout=trigger.timeout)
+
+        except TimeoutError:
+            log.error("Calling %s timed out after %.1fs.", trigger.name, trigger.timeout)
+            s.timeouts += 1
+            s.last_error = "timeout"
+
+        except ValueError as e:
+            log.exception("Could not execute command on proxy %s.", trigger.module)
+            s.failures += 1
+            s.last_error = str(e)
+
+        except Exception as e:
+            log.error("Error on calling %s: %s", trigger.name, e)
+            s.failures += 1
+            s.last_error = str(e)
+
+        finally:
+            s.executions += 1
+            s.total_duration += time.monotonic() - trigger.last_start
+
+
+__all__ = ["Trigger", "TriggerStatistics"]
@@ -2,5 +2,6 @@ from .astroplanscheduler import AstroplanScheduler
 from .dataprovider import DataProvider
 from .ondemandscheduler import OnDemandScheduler
 from .taskscheduler import TaskScheduler
+from .visibility import VisibilityCache
 
-__all__ = ["AstroplanScheduler", "OnDemandScheduler", "TaskScheduler", "DataProvider"]
+__all__ = ["AstroplanScheduler", "OnDemandScheduler", "TaskScheduler", "DataProvider", "VisibilityCache"]
@@ -8,17 +8,23 @@ from typing import TYPE_CHECKING, Any
 
 import astroplan
 import astropy.units as u
+import numpy as np
 from astroplan import FixedTarget, ObservingBlock
 
 from pyobs.object import Object
 from pyobs.utils.time import Time
 
+from ._executor import run_cpu_bound
 from .targets import SiderealTarget
 from .taskscheduler import TaskScheduler
+from .visibility import VisibilityCache
 
 if TYPE_CHECKING:
     from pyobs.robotic import Observation, ObservationList, Project, Task
 
+    from .constraints import Constraint
+    from .dataprovider import DataProvider
+
 log = logging.getLogger(__name__)
 
 
@@ -28,15 +34,21 @@ class AstroplanScheduler(TaskScheduler):
     def __init__(
         self,
         twilight: str = "astronomical",
+        visibility: VisibilityCache | dict[str, Any] | None = None,
         **kwargs: Any,
     ):
         """Initialize a new scheduler.
 
         Args:
             twilight: astronomical or nautical
+            visibility: Cache for altitude and moon separation curves of sidereal targets, used for removing
+                tasks that are never observable before running astroplan.
         """
         Object.__init__(self, **kwargs)
 
+        # visibility cache
+        self._visibility = self.add_child_object(visibility, VisibilityCache) if visibility is not None else None
+
         # store
         self._twilight = twilight
         self._lock = asyncio.Lock()
@@ -81,7 +93,7 @@ class AstroplanScheduler(TaskScheduler):
         """TaskSchedule blocks."""
         from pyobs.robotic.scheduler.dataprovider import DataProvider
 
-        data = DataProvider(self.observer)
+        data = DataProvider(self.observer, visibility=self._visibility)
 
         # only global constraint is the night
         if self._twilight == "astronomical":
@@ -91,17 +103,26 @@ class AstroplanScheduler(TaskScheduler):
         else:
             raise ValueError("Unknown twilight type.")
 
-        # create blocks from tasks
-        blocks: list[ObservingBlock] = []
+        # resolve dynamic targets
+        sidereal_tasks: list[Task] = []
         for task in tasks:
-            # resolve dynamic target
             if not await task.resolve_target(start, task, data):
                 log.warning("Could not resolve target for task '%s', skipping.", task.name)
                 continue
+            if not isinstance(task.target, SiderealTarget):
+                log.warning("Non-sidereal targets not supported.")
+                continue
+            sidereal_tasks.append(task)
+
+        # remove tasks that are never observable
+        if self._visibility is not None:
+            sidereal_tasks = await run_cpu_bound(self._observable_tasks, sidereal_tasks, start, end, data)
 
+        # create blocks from tasks
+        blocks: list[ObservingBlock] = []
+        for task in sidereal_tasks:
             target = task.target
             if not isinstance(target, SiderealTarget):
-                log.warning("Non-sidereal targets not supported.")
                 continue
 
             priority = (1000.0 - task.priority) if task.priority is not None else 1000.0
@@ -122,6 +143,41 @@ class AstroplanScheduler(TaskScheduler):
         # return all
         return blocks, start, end, constraints
 
+    async def _observable_tasks(self, tasks: list[Task], start: Time, end: Time, data: DataProvider) -> list[Task]:
+        """Returns all tasks whose target-dependent constraints are fulfilled at any time between start and end.
+
+        Constraints are evaluated with filter_skycoord() at the sampling times of the visibility cache for all tasks
+        sharing the same constraint at once, so this only interpolates the cached curves.
+        """
+        if self._visibility is None or not tasks:
+            return tasks
+        times = self._visibility.times(start, end)
+        if len(times) == 0:
+            return tasks
+
+        # group tasks by constraints
+        groups: dict[str, tuple[Constraint, list[int]]] = {}
+        for i, task in enumerate(tasks):
+            for constraint in task.constraints:
+                if constraint.target_dependent:
+                    key = constraint.name + constraint.model_dump_json()
+                    groups.setdefault(key, (constraint, []))[1].append(i)
+
+        # evaluate them
+        observable = np.ones((len(tasks), len(times)), dtype=np.bool_)
+        for constraint, indices in groups.values():
+            coords = VisibilityCache.coordinates([tasks[i] for i in indices])
+            if coords is None:
+                continue
+            for j, time in enumerate(times):
+                observable[indices, j] &= await constraint.filter_skycoord(time, coords, data)
+
+        # log removed tasks
+        visible = observable.any(axis=1)
+        for task in (t for t, v in zip(tasks, visible) if not v):
+            log.info("Task '%s' is not observable between %s and %s, skipping.", task.name, start, end)
+        return [t for t, v in zip(tasks, visible) if v]
+
     async def _schedule_blocks(
         self, blocks: list[ObservingBlock], start: Time, end: Time, constraints: list[Any], abort: asyncio.Event
     ) -> list[ObservingBlock]:
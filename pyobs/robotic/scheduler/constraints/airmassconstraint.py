@@ -7,6 +7,7 @@ import numpy as np
 from astropy.coordinates import SkyCoord
 from pydantic import Field
 
+from ..targets import SiderealTarget
 from .constraint import Constraint
 
 if TYPE_CHECKING:
@@ -30,11 +31,17 @@ class AirmassConstraint(Constraint):
         if task.target is None:
             return False
         coord = task.target.coordinates(time)
+        if data.visibility is not None and isinstance(task.target, SiderealTarget):
+            airmass = float(data.visibility.airmass(time, coord)[0])
+            return bool(0.0 < airmass <= self.max_airmass)
         altaz = data.observer.altaz(time, coord)
         airmass = float(altaz.secz)
         return bool(0.0 < airmass <= self.max_airmass and altaz.alt.degree > 0.0)
 
     async def filter_skycoord(self, time: Time, coords: SkyCoord, data: DataProvider) -> np.ndarray:
+        if data.visibility is not None:
+            airmass = data.visibility.airmass(time, coords)
+            return np.asarray((airmass > 0.0) & (airmass <= self.max_airmass), dtype=np.bool_)
         altaz = data.observer.altaz(time, coords)
         return np.asarray((altaz.secz > 0.0) & (altaz.secz <= self.max_airmass) & (altaz.alt.deg > 0.0), dtype=np.bool_)
 
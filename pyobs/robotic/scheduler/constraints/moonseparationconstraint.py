@@ -8,6 +8,7 @@ import numpy as np
 from astropy.coordinates import SkyCoord
 from pydantic import Field
 
+from ..targets import SiderealTarget
 from .constraint import Constraint
 
 if TYPE_CHECKING:
@@ -31,10 +32,14 @@ class MoonSeparationConstraint(Constraint):
         if task.target is None:
             return True
         coord = task.target.coordinates(time)
+        if data.visibility is not None and isinstance(task.target, SiderealTarget):
+            return float(data.visibility.moon_separation(time, coord)[0]) >= self.min_distance
         moon_separation = data.moon(time).separation(coord, origin_mismatch="ignore")  # type: ignore[unexpected-keyword]
         return float(moon_separation.degree) >= self.min_distance
 
     async def filter_skycoord(self, time: Time, coords: SkyCoord, data: DataProvider) -> np.ndarray:
+        if data.visibility is not None:
+            return np.asarray(data.visibility.moon_separation(time, coords) >= self.min_distance, dtype=np.bool_)
         moon = data.moon(time)
         separations = moon.separation(coords, origin_mismatch="ignore").deg  # type: ignore[unexpected-keyword]
         return np.asarray(separations >= self.min_distance, dtype=np.bool_)
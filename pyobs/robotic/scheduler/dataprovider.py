@@ -11,6 +11,7 @@ from astropy.coordinates import SkyCoord
 from pyobs.robotic.scheduler.observationarchiveevolution import (
     ObservationArchiveEvolution,
 )
+from pyobs.robotic.scheduler.visibility import VisibilityCache
 from pyobs.utils.time import Time
 
 
@@ -28,11 +29,21 @@ class DataProvider:
     (`pyobs.robotic.scheduler._executor.run_cpu_bound`), never concurrently from the caller's main
     event loop. A new `DataProvider` is created per `schedule()` call, so cache lifetime is bounded
     to one schedule computation and never leaks stale values across runs.
+
+    The optional `VisibilityCache`, on the other hand, is owned by the scheduler and outlives a single
+    run; it is thread-safe and used by the constraints for sidereal targets instead of transforming
+    coordinates at every time step.
     """
 
-    def __init__(self, observer: Observer, archive: ObservationArchiveEvolution | None = None):
+    def __init__(
+        self,
+        observer: Observer,
+        archive: ObservationArchiveEvolution | None = None,
+        visibility: VisibilityCache | None = None,
+    ):
         self.observer = observer
         self.archive = archive if archive else ObservationArchiveEvolution(observer)
+        self.visibility = visibility
 
     @cache
     def last_sunset(self, time: Time) -> Time:
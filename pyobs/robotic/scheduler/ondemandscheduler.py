@@ -18,6 +18,7 @@ from ._executor import run_cpu_bound
 from .constraints import Constraint
 from .observationarchiveevolution import ObservationArchiveEvolution
 from .taskscheduler import TaskScheduler
+from .visibility import VisibilityCache
 
 if TYPE_CHECKING:
     from pyobs.robotic import Observation, Project, Task
@@ -36,12 +37,14 @@ class OnDemandScheduler(TaskScheduler):
         twilight: str = "astronomical",
         observation_archive: ObservationArchive | dict[str, Any] | None = None,
         constraints: list[Constraint] | list[dict[str, Any]] | None = None,
+        visibility: VisibilityCache | dict[str, Any] | None = None,
         **kwargs: Any,
     ):
         """Initialize a new scheduler.
 
         Args:
             twilight: astronomical or nautical
+            visibility: Cache for altitude and moon separation curves of sidereal targets.
         """
         Object.__init__(self, **kwargs)
 
@@ -50,6 +53,9 @@ class OnDemandScheduler(TaskScheduler):
             self.add_child_object(observation_archive, ObservationArchive) if observation_archive is not None else None
         )
 
+        # visibility cache
+        self._visibility = self.add_child_object(visibility, VisibilityCache) if visibility is not None else None
+
         # store
         self._twilight = twilight
         self._abort: asyncio.Event = asyncio.Event()
@@ -65,7 +71,7 @@ class OnDemandScheduler(TaskScheduler):
             raise RuntimeError("No observer given.")
 
         archive = ObservationArchiveEvolution(self._observer, self._obs_archive)
-        data = DataProvider(self._observer, archive)
+        data = DataProvider(self._observer, archive, self._visibility)
         projects_dict = {project.code: project for project in projects}
 
         # prefetch historical observations on the main loop (the only place aiohttp session works),
@@ -74,6 +80,11 @@ class OnDemandScheduler(TaskScheduler):
         await data.archive.prefetch(tasks, start, night)
         data.archive.freeze()
 
+        # calculate visibilities of all sidereal targets at once
+        coords = VisibilityCache.coordinates(tasks)
+        if self._visibility is not None and coords is not None:
+            await self._visibility.prefetch(coords, start, end)
+
         # schedule from start to end
         async for task in self.schedule_in_interval(tasks, projects_dict, start, end, data):
             # evolve archive -- night is keyed by the task's own scheduled time, not "now", since
@@ -84,6 +95,11 @@ class OnDemandScheduler(TaskScheduler):
             # yield to caller
             yield task
 
+        # tasks usually recur, so calculate the next night in the background
+        if self._visibility is not None and coords is not None:
+            tomorrow = end + TimeDelta(1.0 * u.day)
+            self._visibility.prefetch_in_background(coords, tomorrow, tomorrow)
+
     async def abort(self) -> None:
         self._abort.set()
 
@@ -37,9 +37,9 @@ class CsvPicker(Picker):
         df = await self.vfs.read_csv(self.csv)
         if df is None:
             return False
-        ras = df[self.ra_col].values.astype(float)
         if self.ra_unit == "hour":
             df[self.ra_col] *= 15.0
+        ras = df[self.ra_col].values.astype(float)
         self._dataframe = df
         self._coords = SkyCoord(ra=ras * u.deg, dec=df[self.dec_col].values.astype(float) * u.deg)
         return True
@@ -57,7 +57,8 @@ class CsvPicker(Picker):
         # start with all candidates
         mask = np.ones(len(self._coords), dtype=np.bool_)
 
-        # apply all target-dependent constraints via filter_skycoord
+        # apply all target-dependent constraints via filter_skycoord, which only interpolates the cached curves of
+        # the whole catalogue, if the data provider has a visibility cache
         for c in sorted((c for c in task.constraints if c.target_dependent), key=lambda c: c.cost):
             mask = mask & await c.filter_skycoord(time, self._coords, data)
             if not mask.any():
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import astropy.coordinates
+import numpy as np
+import numpy.typing as npt
+from astropy.coordinates import SkyCoord
+
+from pyobs.object import Object
+from pyobs.utils.time import Time
+
+if TYPE_CHECKING:
+    from pyobs.robotic import Task
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class _Night:
+    """Altitude and moon separation curves of all cached targets for one night."""
+
+    night: int
+    jd0: float
+    step: float
+    moon_ra: npt.NDArray[np.float64]
+    moon_dec: npt.NDArray[np.float64]
+    ra: npt.NDArray[np.float64] = field(default_factory=lambda: np.zeros(0))
+    dec: npt.NDArray[np.float64] = field(default_factory=lambda: np.zeros(0))
+    alt: npt.NDArray[np.float32] = field(default_factory=lambda: np.zeros((0, 0), dtype=np.float32))
+    moon: npt.NDArray[np.float32] = field(default_factory=lambda: np.zeros((0, 0), dtype=np.float32))
+    keys: npt.NDArray[np.int64] = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    order: npt.NDArray[np.int_] = field(default_factory=lambda: np.zeros(0, dtype=int))
+
+
+class VisibilityCache(Object):
+    """Persistent cache of altitude and moon separation curves of sidereal targets.
+
+    For every night, the curves are sampled on a fixed grid of times from local noon to local noon, so a single
+    vectorised AltAz transformation for all targets replaces the many single transformations that constraints and
+    pickers would otherwise do at each time step of a schedule run. Values in between are interpolated linearly, which
+    at the default resolution of five minutes is accurate to a few thousandths of a degree. Targets are identified by
+    their ICRS coordinates, rounded to the given number of decimals.
+
+    If a directory is given, the curves of each night are also stored on disk, so targets that are scheduled night
+    after night, e.g. standard stars or monitoring fields, and repeated runs of the scheduler during a night don't need
+    any transformations at all.
+    """
+
+    __module__ = "pyobs.robotic.scheduler"
+
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        resolution: float = 300.0,
+        decimals: int = 4,
+        max_nights: int = 3,
+        **kwargs: Any,
+    ):
+        """Creates a new visibility cache.
+
+        Args:
+            cache_dir: Directory for storing curves on disk, None for caching in memory only.
+            resolution: Time resolution of curves in seconds.
+            decimals: Number of decimals for rounding coordinates in degrees to identify targets.
+            max_nights: Maximum number of nights to keep in memory.
+        """
+        Object.__init__(self, **kwargs)
+        self._cache_dir = None if cache_dir is None else Path(cache_dir)
+        self._resolution = resolution
+        self._decimals = decimals
+        self._max_nights = max_nights
+        self._nights: OrderedDict[int, _Night] = OrderedDict()
+        self._lock = threading.RLock()
+        self._requests: asyncio.Queue[tuple[SkyCoord, Time, Time]] = asyncio.Queue()
+        self.add_background_task(self._prefetch_loop)
+
+        # create cache directory
+        if self._cache_dir is not None:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _night_index(self, time: Time) -> int:
+        """Returns index of night containing the given time, starting at local noon."""
+        return int(math.floor(time.utc.jd + self.observer.location.lon.degree / 360.0))
+
+    def _filename(self, night: int) -> Path | None:
+        """Returns filename of cached night."""
+        if self._cache_dir is None:
+            return None
+        loc = self.observer.location
+        return self._cache_dir / (
+            f"visibility_{loc.lat.degree:.4f}_{loc.lon.degree:.4f}_{self._resolution:g}_{self._decimals}_{night}.npz"
+        )
+
+    def _create_night(self, night: int) -> _Night:
+        """Creates an empty night with moon positions."""
+        step = self._resolution / 86400.0
+        jd0 = night - self.observer.location.lon.degree / 360.0
+        times = Time(jd0 + np.arange(int(math.ceil(1.0 / step)) + 1) * step, format="jd")
+        moon = astropy.coordinates.get_body("moon", times)
+        return _Night(night=night, jd0=jd0, step=step, moon_ra=moon.ra.degree, moon_dec=moon.dec.degree)
+
+    def _load_night(self, night: int) -> _Night:
+        """Returns night from memory or disk, or creates a new one."""
+        if night in self._nights:
+            self._nights.move_to_end(night)
+            return self._nights[night]
+
+        # cached on disk?
+        data: _Night | None = None
+        filename = self._filename(night)
+        if filename is not None and filename.exists():
+            try:
+                with np.load(filename) as f:
+                    data = _Night(night=night, **{k: f[k] for k in f.files})
+                    data.jd0, data.step = float(data.jd0), float(data.step)
+                    data.keys, data.order = self._index(data.ra, data.dec)
+            except Exception as e:
+                log.warning("Could not read cached visibilities from %s: %s", filename, e)
+                data = None
+        if data is None:
+            data = self._create_night(night)
+
+        # store it
+        self._nights[night] = data
+        if len(self._nights) > self._max_nights:
+            self._nights.popitem(last=False)
+        return data
+
+    def _save_night(self, data: _Night) -> None:
+        """Writes night to disk."""
+        filename = self._filename(data.night)
+        if filename is None:
+            return
+        tmp = filename.with_suffix(".tmp.npz")
+        np.savez(
+            tmp,
+            jd0=data.jd0,
+            step=data.step,
+            moon_ra=data.moon_ra,
+            moon_dec=data.moon_dec,
+            ra=data.ra,
+            dec=data.dec,
+            alt=data.alt,
+            moon=data.moon,
+        )
+        os.replace(tmp, filename)
+
+    def _keys(self, ra: npt.NDArray[np.float64], dec: npt.NDArray[np.float64]) -> npt.NDArray[np.int64]:
+        """Returns unique keys for the given coordinates."""
+        scale = 10**self._decimals
+        ra_key = np.round(np.mod(ra, 360.0) * scale).astype(np.int64) % (360 * scale)
+        dec_key = np.round((dec + 90.0) * scale).astype(np.int64)
+        return ra_key * (180 * scale + 1) + dec_key
+
+    def _index(
+        self, ra: npt.NDArray[np.float64], dec: npt.NDArray[np.float64]
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int_]]:
+        """Returns keys for the given coordinates and the order that sorts them."""
+        keys = self._keys(ra, dec)
+        return keys, np.argsort(keys)
+
+    @staticmethod
+    def _radec(coords: SkyCoord) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """Returns ICRS coordinates in degrees as arrays."""
+        icrs = coords if coords.frame.name == "icrs" else coords.icrs
+        return np.atleast_1d(icrs.ra.degree).astype(float), np.atleast_1d(icrs.dec.degree).astype(float)
+
+    def _rows(self, data: _Night, ra: npt.NDArray[np.float64], dec: npt.NDArray[np.float64]) -> npt.NDArray[np.int_]:
+        """Returns rows of the given coordinates in the night, calculating curves for those that are missing."""
+
+        # find existing rows
+        keys = self._keys(ra, dec)
+        rows = np.full(len(keys), -1, dtype=int)
+        if len(data.keys) > 0:
+            pos = np.minimum(np.searchsorted(data.keys, keys, sorter=data.order), len(data.keys) - 1)
+            found = data.keys[data.order[pos]] == keys
+            rows[found] = data.order[pos[found]]
+        if np.all(rows >= 0):
+            return rows
+
+        # calculate curves for missing ones
+        missing = np.flatnonzero(rows < 0)
+        _, first, inverse = np.unique(keys[missing], return_index=True, return_inverse=True)
+        new_ra, new_dec = ra[missing[first]], dec[missing[first]]
+        alt, moon = self._calculate(data, new_ra, new_dec)
+
+        # add them
+        rows[missing] = len(data.ra) + inverse.ravel()
+        data.ra = np.concatenate([data.ra, new_ra])
+        data.dec = np.concatenate([data.dec, new_dec])
+        data.alt = np.concatenate([data.alt.reshape(-1, alt.shape[1]), alt])
+        data.moon = np.concatenate([data.moon.reshape(-1, moon.shape[1]), moon])
+        data.keys, data.order = self._index(data.ra, data.dec)
+        self._save_night(data)
+        return rows
+
+    def _calculate(
+        self, data: _Night, ra: npt.NDArray[np.float64], dec: npt.NDArray[np.float64]
+    ) -> tuple[npt.NDArray[np.float32], npt.NDArray[np.float32]]:
+        """Calculates altitude and moon separation curves for the given coordinates."""
+        log.debug("Calculating visibilities of %d target(s) for night %d...", len(ra), data.night)
+        times = Time(data.jd0 + np.arange(len(data.moon_ra)) * data.step, format="jd")
+        coords = SkyCoord(ra=ra, dec=dec, frame="icrs", unit="deg")
+        altaz = self.observer.altaz(times, coords, grid_times_targets=True)
+        alt = np.asarray(altaz.alt.degree, dtype=np.float32).reshape(len(ra), len(times))
+
+        # angular distance to moon (haversine)
+        r0, d0 = np.radians(data.moon_ra)[None, :], np.radians(data.moon_dec)[None, :]
+        r, d = np.radians(ra)[:, None], np.radians(dec)[:, None]
+        hav = np.sin((d - d0) / 2.0) ** 2 + np.cos(d0) * np.cos(d) * np.sin((r - r0) / 2.0) ** 2
+        moon = np.degrees(2.0 * np.arcsin(np.sqrt(np.clip(hav, 0.0, 1.0)))).astype(np.float32)
+        return alt, moon
+
+    def _interpolate(self, time: Time, coords: SkyCoord) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """Returns altitudes and moon separations of the given coordinates at the given time."""
+        ra, dec = self._radec(coords)
+        with self._lock:
+            data = self._load_night(self._night_index(time))
+            rows = self._rows(data, ra, dec)
+            pos = (time.utc.jd - data.jd0) / data.step
+            idx = min(int(pos), len(data.moon_ra) - 2)
+            w = pos - idx
+            alt = (1.0 - w) * data.alt[rows, idx] + w * data.alt[rows, idx + 1]
+            moon = (1.0 - w) * data.moon[rows, idx] + w * data.moon[rows, idx + 1]
+        return alt.astype(float), moon.astype(float)
+
+    def altitude(self, time: Time, coords: SkyCoord) -> npt.NDArray[np.float64]:
+        """Returns altitudes of the given coordinates at the given time.
+
+        Args:
+            time: Time to get altitudes for.
+            coords: Scalar or array of sidereal coordinates.
+
+        Returns:
+            Array of altitudes in degrees.
+        """
+        return self._interpolate(time, coords)[0]
+
+    def airmass(self, time: Time, coords: SkyCoord) -> npt.NDArray[np.float64]:
+        """Returns airmasses, i.e. sec(z), of the given coordinates at the given time, negative below the horizon.
+
+        Args:
+            time: Time to get airmasses for.
+            coords: Scalar or array of sidereal coordinates.
+
+        Returns:
+            Array of airmasses.
+        """
+        with np.errstate(divide="ignore"):
+            return 1.0 / np.sin(np.radians(self.altitude(time, coords)))
+
+    def moon_separation(self, time: Time, coords: SkyCoord) -> npt.NDArray[np.float64]:
+        """Returns distances of the given coordinates to the moon at the given time.
+
+        Args:
+            time: Time to get distances for.
+            coords: Scalar or array of sidereal coordinates.
+
+        Returns:
+            Array of distances in degrees.
+        """
+        return self._interpolate(time, coords)[1]
+
+    def times(self, start: Time, end: Time) -> Time:
+        """Returns the times between start and end, at which curves are sampled.
+
+        Args:
+            start: Start of time range.
+            end: End of time range.
+
+        Returns:
+            Array of times.
+        """
+        step = self._resolution / 86400.0
+        jd0 = self._night_index(start) - self.observer.location.lon.degree / 360.0
+        first = int(math.ceil((start.utc.jd - jd0) / step))
+        last = int(math.floor((end.utc.jd - jd0) / step))
+        return Time(jd0 + np.arange(first, last + 1) * step, format="jd")
+
+    @staticmethod
+    def coordinates(tasks: list[Task]) -> SkyCoord | None:
+        """Returns coordinates of all tasks with sidereal targets, or None, if there are none."""
+        from .targets import SiderealTarget
+
+        targets = [task.target for task in tasks if isinstance(task.target, SiderealTarget)]
+        if not targets:
+            return None
+        return SkyCoord(ra=[t.ra for t in targets], dec=[t.dec for t in targets], frame="icrs", unit="deg")
+
+    def _prefetch(self, coords: SkyCoord, start: Time, end: Time) -> None:
+        """Calculates curves of the given coordinates for all nights between start and end."""
+        ra, dec = self._radec(coords)
+        for night in range(self._night_index(start), self._night_index(end) + 1):
+            with self._lock:
+                self._rows(self._load_night(night), ra, dec)
+
+    async def prefetch(self, coords: SkyCoord, start: Time, end: Time) -> None:
+        """Calculates curves of the given coordinates for all nights between start and end in a separate thread.
+
+        Args:
+            coords: Scalar or array of sidereal coordinates.
+            start: Start of time range.
+            end: End of time range.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._prefetch, coords, start, end)
+
+    def prefetch_in_background(self, coords: SkyCoord, start: Time, end: Time) -> None:
+        """Queues calculation of curves of the given coordinates for all nights between start and end.
+
+        Args:
+            coords: Scalar or array of sidereal coordinates.
+            start: Start of time range.
+            end: End of time range.
+        """
+        self._requests.put_nowait((coords, start, end))
+
+    async def _prefetch_loop(self) -> None:
+        """Calculates queued curves."""
+        while True:
+            coords, start, end = await self._requests.get()
+            try:
+                await self.prefetch(coords, start, end)
+            except Exception:
+                log.exception("Could not calculate visibilities.")
+
+
+__all__ = ["VisibilityCache"]
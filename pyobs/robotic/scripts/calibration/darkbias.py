@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import TYPE_CHECKING
 
 from pyobs.interfaces import (
@@ -11,6 +12,8 @@ from pyobs.interfaces import (
     IWindow,
 )
 from pyobs.robotic.scripts import Script
+from pyobs.robotic.utils.overheads import OverheadModel
+from pyobs.robotic.utils.sequence import grab_sequence
 from pyobs.utils.enums import ImageType
 
 if TYPE_CHECKING:
@@ -27,6 +30,7 @@ class DarkBiasScript(Script):
     count: int = 20
     exptime: float = 0
     binning: tuple[int, int] = (1, 1)
+    overheads: OverheadModel | None = None
 
     async def can_run(self, data: TaskData | None) -> bool:
         """Whether this config can currently run.
@@ -78,16 +82,26 @@ class DarkBiasScript(Script):
             im_type = f"{self.count} darks ({self.exptime} s)"
 
         log.info("Starting a series of %s with %s...", im_type, self.camera)
-        async with self.comm.proxy(self.camera, IData) as camera:
-            for i in range(self.count):
-                await camera.grab_data()
+        start = time.monotonic()
+
+        def on_progress(done: int) -> None:
+            nonlocal start
+            now = time.monotonic()
+            if self.overheads is not None:
+                self.overheads.record_readout(self.binning, None, now - start - self.exptime)
+            start = now
+
+        # grab images, as a sequence on the camera, if possible
+        await grab_sequence(self.comm, self.camera, self.count, exposure_time=self.exptime, on_progress=on_progress)
         log.info("Finished series of %s with %s.", im_type, self.camera)
-        return
+
+        # store learned overheads
+        if self.overheads is not None:
+            self.overheads.save()
 
     def estimate_duration(self, data: TaskData | None = None, time: Time | None = None) -> float:
         """Estimate duration of the dark/bias series."""
-        # TODO: get a better estimate for readout overhead
-        readout = 5.0
+        readout = 5.0 if self.overheads is None else self.overheads.readout_time(self.binning)
         return self.count * (self.exptime + readout)
 
 
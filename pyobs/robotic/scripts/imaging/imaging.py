@@ -2,17 +2,20 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 import pyobs.utils.exceptions as exc
 from pyobs.interfaces import (
+    ExposureState,
     FitsHeaderEntry,
     IAcquisition,
     IAutoGuiding,
     IBinning,
     ICamera,
+    IExposure,
     IExposureTime,
     IFilters,
     IImageType,
@@ -24,7 +27,9 @@ from pyobs.interfaces import (
 from pyobs.robotic.scheduler.targets import SiderealTarget, Target
 from pyobs.robotic.scripts import Script
 from pyobs.robotic.utils.exptime import ExposureTimeProvider
-from pyobs.utils.enums import ImageType
+from pyobs.robotic.utils.overheads import OverheadModel
+from pyobs.robotic.utils.sequence import grab_sequence
+from pyobs.utils.enums import ExposureStatus, ImageType
 from pyobs.utils.parallel import Future
 from pyobs.utils.time import Time
 
@@ -85,8 +90,13 @@ class ImagingScript(Script):
     filters: str | None = None
     autoguider: str | None = None
     acquisition: str | None = None
+    overheads: OverheadModel | None = None
 
     _object_name: str | None = PrivateAttr(default=None)
+    _exposure_time: float = PrivateAttr(default=0.0)
+    _prepared: bool = PrivateAttr(default=False)
+    _first_config_prepared: bool = PrivateAttr(default=False)
+    _staged_filter: tuple[str, asyncio.Task[None]] | None = PrivateAttr(default=None)
 
     def _image_types(self) -> list[ImageType]:
         return list({instr.image_type for instr in self.configuration.instrument_configs})
@@ -144,6 +154,28 @@ class ImagingScript(Script):
         self._cant_run_reason = None
         return True
 
+    async def prepare(self, data: TaskData | None) -> None:
+        """Move to target, perform acquisition and set up the first instrument config, so that run() can start
+        guiding and exposing right away."""
+        track, target = await self._track_target(data)
+        await track
+        await self._perform_acquisition(track)
+
+        # only now, since the acquisition may change camera settings and an exposure time provider needs the target
+        if len(self.configuration.instrument_configs) > 0:
+            await self._setup_instrument_config(self.configuration.instrument_configs[0], target, track)
+            self._first_config_prepared = True
+        self._prepared = True
+
+    async def rollback(self, data: TaskData | None) -> None:
+        """Stop telescope, if it was moved in prepare()."""
+        self._prepared = False
+        self._first_config_prepared = False
+        if self.telescope is not None and ImageType.OBJECT in self._image_types():
+            log.info("Stopping telescope...")
+            async with self.comm.proxy(self.telescope, ITelescope) as telescope:
+                await telescope.stop_motion()
+
     async def run(self, data: TaskData | None) -> None:
         """Run script.
 
@@ -151,11 +183,18 @@ class ImagingScript(Script):
             InterruptedError: If interrupted
         """
 
-        # start tracking target
-        track, target = await self._track_target(data)
+        if self._prepared:
+            # already tracking and acquired
+            track: Future | asyncio.Task[Any] = Future(empty=True)
+            target = data.resolved_target if data is not None and data.task is not None else None
+            self._prepared = False
+        else:
+            # start tracking target
+            self._first_config_prepared = False
+            track, target = await self._track_target(data)
 
-        # acquisition?
-        await self._perform_acquisition(track)
+            # acquisition?
+            await self._perform_acquisition(track)
 
         # guiding?
         await self._start_guiding(track)
@@ -166,9 +205,18 @@ class ImagingScript(Script):
         # repeat configuration
         await self._run_configurations(target, track)
 
+        # wait for a filter change that has been staged for a configuration that didn't come
+        if self._staged_filter is not None:
+            await asyncio.gather(self._staged_filter[1], return_exceptions=True)
+            self._staged_filter = None
+
         # stop auto guiding and telescope
         await self._stop_all()
 
+        # store learned overheads
+        if self.overheads is not None:
+            self.overheads.save()
+
     async def _track_target(self, data: TaskData | None) -> tuple[Future | asyncio.Task[Any], Target | None]:
         # got a target?
         target = data.resolved_target if data is not None and data.task is not None else None
@@ -183,7 +231,12 @@ class ImagingScript(Script):
 
     async def _start_move_radec(self, ra: float, dec: float) -> None:
         async with self.comm.proxy(self.telescope, IPointingRaDec) as telescope:
+            pos = telescope.get_state(IPointingRaDec) if self.overheads is not None else None
+            start = time.monotonic()
             await telescope.move_radec(ra, dec)
+            if self.overheads is not None and pos is not None:
+                distance = self.overheads.distance(pos.ra, pos.dec, ra, dec)
+                self.overheads.record_slew(distance, time.monotonic() - start)
 
     async def _perform_acquisition(self, track: Future | asyncio.Task[Any]) -> None:
         if self.configuration.acquisition_config.enabled:
@@ -194,7 +247,10 @@ class ImagingScript(Script):
             try:
                 async with self.comm.proxy(self.acquisition, IAcquisition) as acquisition:
                     log.info("Performing acquisition...")
+                    start = time.monotonic()
                     await acquisition.acquire_target()
+                    if self.overheads is not None:
+                        self.overheads.record_acquisition(time.monotonic() - start)
             except Exception:
                 if self.configuration.acquisition_config.optional:
                     log.warning("Could not acquire target, will continue without.")
@@ -209,7 +265,10 @@ class ImagingScript(Script):
             # start auto-guiding
             async with self.comm.proxy(self.autoguider, IAutoGuiding) as autoguider:
                 log.info("Starting auto-guiding...")
+                start = time.monotonic()
                 await autoguider.start()
+                if self.overheads is not None:
+                    self.overheads.record_guiding_start(time.monotonic() - start)
 
     async def _run_configurations(self, target: Target | None, track: Future | asyncio.Task[Any]) -> None:
         for repeat in range(self.configuration.repeats):
@@ -219,12 +278,23 @@ class ImagingScript(Script):
         log.info("Starting configuration repeat %s/%s...", repeat + 1, self.configuration.repeats)
 
         # loop instrument configs
-        for instrument_config in self.configuration.instrument_configs:
-            await self._setup_instrument_config(instrument_config, target, track)
+        instrument_configs = self.configuration.instrument_configs
+        for i, instrument_config in enumerate(instrument_configs):
+            # first config has already been set up in prepare()?
+            if self._first_config_prepared:
+                self._first_config_prepared = False
+            else:
+                await self._setup_instrument_config(instrument_config, target, track)
 
-            # do repeats
-            for repeat2 in range(instrument_config.count):
-                await self._expose_image(instrument_config, repeat2)
+            # next config, whose filter can be set while the last image of this one is read out
+            next_config: InstrumentConfig | None = None
+            if i + 1 < len(instrument_configs):
+                next_config = instrument_configs[i + 1]
+            elif repeat + 1 < self.configuration.repeats:
+                next_config = instrument_configs[0]
+
+            # take images
+            await self._expose_images(instrument_config, next_config)
 
             # reset object name
             self._object_name = None
@@ -232,6 +302,31 @@ class ImagingScript(Script):
     async def _setup_instrument_config(
         self, instrument_config: InstrumentConfig, target: Target | None, track: Future | asyncio.Task[Any]
     ) -> None:
+        # camera settings and filter are independent of each other and of tracking, so set them all at once,
+        # only the window depends on the binning
+        await Future.wait_all([track, self._setup_camera_and_filter(instrument_config)])
+
+        # set object name?
+        if instrument_config.image_type == ImageType.OBJECT and target is not None:
+            self._object_name = target.name
+
+    async def _setup_camera_and_filter(self, instrument_config: InstrumentConfig) -> None:
+        if not isinstance(instrument_config.exposure_time, ExposureTimeProvider):
+            await asyncio.gather(
+                self._setup_binning_and_window(instrument_config),
+                self._setup_exposure_time(instrument_config),
+                self._setup_image_type(instrument_config),
+                self._setup_filter(instrument_config),
+            )
+            return
+
+        # a provider may take images with the final binning, window and filter, and change window and image type
+        # on the way, so it has to run on its own, and the image type is set afterwards
+        await asyncio.gather(self._setup_binning_and_window(instrument_config), self._setup_filter(instrument_config))
+        await self._setup_exposure_time(instrument_config)
+        await self._setup_image_type(instrument_config)
+
+    async def _setup_binning_and_window(self, instrument_config: InstrumentConfig) -> None:
         async with self.comm.safe_proxy(self.camera, IBinning) as camera:
             if camera:
                 log.info("Setting binning to %sx%s...", instrument_config.binning[0], instrument_config.binning[1])
@@ -251,38 +346,97 @@ class ImagingScript(Script):
                     log.info("Setting window to %sx%s at %s,%s...", wnd[2], wnd[3], wnd[0], wnd[1])
                     await camera.set_window(*wnd)
 
+    async def _setup_exposure_time(self, instrument_config: InstrumentConfig) -> None:
         async with self.comm.safe_proxy(self.camera, IExposureTime) as camera:
             if camera:
-                exposure_time = await instrument_config.get_exposure_time()
-                log.info("Setting exposure time to %ss...", exposure_time)
-                await camera.set_exposure_time(exposure_time)
+                self._exposure_time = await instrument_config.get_exposure_time()
+                log.info("Setting exposure time to %ss...", self._exposure_time)
+                await camera.set_exposure_time(self._exposure_time)
 
-        # set image type
+    async def _setup_image_type(self, instrument_config: InstrumentConfig) -> None:
         async with self.comm.safe_proxy(self.camera, IImageType) as camera:
             if camera:
                 log.info("Setting image type to %s...", instrument_config.image_type)
                 await camera.set_image_type(instrument_config.image_type)
 
-        set_filter: Future | asyncio.Task[Any] = Future(empty=True)
+    async def _setup_filter(self, instrument_config: InstrumentConfig) -> None:
+        # filter has been staged during readout of the previous image?
+        staged, self._staged_filter = self._staged_filter, None
+        if staged is not None:
+            optical_filter, task = staged
+            if optical_filter == instrument_config.optical_filter:
+                await task
+                return
+            await asyncio.gather(task, return_exceptions=True)
+
         if instrument_config.optical_filter is not None:
             async with self.comm.proxy(self.filters, IFilters) as filters:
                 log.info("Setting filter to %s...", instrument_config.optical_filter)
-                set_filter = asyncio.create_task(filters.set_filter(instrument_config.optical_filter))
+                await self._set_filter(filters, instrument_config.optical_filter)
 
-        # wait for tracking and filter
-        await Future.wait_all([track, set_filter])
+    async def _stage_filter(self, optical_filter: str) -> None:
+        async with self.comm.proxy(self.filters, IFilters) as filters:
+            log.info("Setting filter to %s during readout...", optical_filter)
+            await self._set_filter(filters, optical_filter)
 
-        # set object name?
-        if instrument_config.image_type == ImageType.OBJECT and target is not None:
-            self._object_name = target.name
+    async def _set_filter(self, filters: IFilters, optical_filter: str) -> None:
+        start = time.monotonic()
+        await filters.set_filter(optical_filter)
+        if self.overheads is not None:
+            self.overheads.record_filter_change(time.monotonic() - start)
 
-    async def _expose_image(self, instrument_config: InstrumentConfig, repeat2: int) -> None:
-        log.info("Exposing image %s/%s...", repeat2 + 1, instrument_config.count)
-
-        # grab image
-        async with self.comm.proxy(self.camera, ICamera) as camera:
-            await camera.grab_data()
-        self.exptime_done += await instrument_config.get_exposure_time()
+    async def _expose_images(
+        self, instrument_config: InstrumentConfig, next_config: InstrumentConfig | None = None
+    ) -> None:
+        log.info("Exposing %s image(s)...", instrument_config.count)
+        exposure_time = self._exposure_time
+        start = time.monotonic()
+        done = 0
+
+        def on_progress(finished: int) -> None:
+            nonlocal start, done
+            done = finished
+            log.info("Finished image %s/%s.", done, instrument_config.count)
+            self.exptime_done += exposure_time
+
+            # everything beyond the exposure time is readout
+            now = time.monotonic()
+            if self.overheads is not None:
+                self.overheads.record_readout(
+                    instrument_config.binning, instrument_config.window, now - start - exposure_time
+                )
+            start = now
+
+        # the shutter is closed while the last image is read out, so the filter for the next config can already be
+        # set, if the camera tells us about it
+        optical_filter = next_config.optical_filter if next_config is not None else None
+        stage = optical_filter is not None and optical_filter != instrument_config.optical_filter
+
+        def on_exposure(state: ExposureState) -> None:
+            if (
+                optical_filter is not None
+                and self._staged_filter is None
+                and state.status == ExposureStatus.READOUT
+                and done == instrument_config.count - 1
+            ):
+                self._staged_filter = (optical_filter, asyncio.create_task(self._stage_filter(optical_filter)))
+
+        # grab images, as a sequence on the camera, if possible
+        if stage:
+            await self.comm.subscribe_state(self.camera, IExposure, on_exposure)
+        try:
+            await grab_sequence(
+                self.comm, self.camera, instrument_config.count, exposure_time=exposure_time, on_progress=on_progress
+            )
+        except BaseException:
+            # don't leave a staged filter change behind
+            if self._staged_filter is not None:
+                await asyncio.gather(self._staged_filter[1], return_exceptions=True)
+                self._staged_filter = None
+            raise
+        finally:
+            if stage:
+                await self.comm.unsubscribe_state(self.camera, IExposure, on_exposure)
 
     async def _stop_all(self) -> None:
         if self.autoguider is not None and self.configuration.guiding_config.enabled:
@@ -316,20 +470,43 @@ class ImagingScript(Script):
         # return
         return hdr
 
+    @staticmethod
+    def _estimated_exposure_time(ic: InstrumentConfig) -> float:
+        return ic.exposure_time if isinstance(ic.exposure_time, float) else ic.exposure_time.default_exposure_time
+
     def estimate_duration(self, data: TaskData | None = None, time: Time | None = None) -> float:
-        """Estimate the duration of this script in seconds."""
-        # TODO: get some good estimates for slewing/filter/acquisition etc
-        duration = (
-            sum(
-                (ic.exposure_time if isinstance(ic.exposure_time, float) else ic.exposure_time.default_exposure_time)
-                * ic.count
-                for ic in self.configuration.instrument_configs
+        """Estimate the duration of this script in seconds.
+
+        Without an overhead model, fixed overheads are used for slewing and acquisition, otherwise learned overheads
+        for slewing, acquisition, guiding, filter changes and readout.
+        """
+        cfg = self.configuration
+        if self.overheads is None:
+            duration = (
+                sum(self._estimated_exposure_time(ic) * ic.count for ic in cfg.instrument_configs) * cfg.repeats + 60.0
             )
-            * self.configuration.repeats
-            + 60.0
-        )
-        if self.configuration.acquisition_config.enabled:
-            duration += 30.0
+            if cfg.acquisition_config.enabled:
+                duration += 30.0
+            return duration
+
+        # slewing, acquisition and guiding are only done for science exposures
+        duration = 0.0
+        if ImageType.OBJECT in self._image_types():
+            duration += self.overheads.slew_time()
+            if cfg.acquisition_config.enabled:
+                duration += self.overheads.acquisition_time()
+            if cfg.guiding_config.enabled:
+                duration += self.overheads.guiding_start_time()
+
+        # exposures with readout, and filter changes, whenever the filter differs from the previous one
+        optical_filter: str | None = None
+        for _ in range(cfg.repeats):
+            for ic in cfg.instrument_configs:
+                if ic.optical_filter is not None and ic.optical_filter != optical_filter:
+                    duration += self.overheads.filter_change_time()
+                    optical_filter = ic.optical_filter
+                readout = self.overheads.readout_time(ic.binning, ic.window)
+                duration += ic.count * (self._estimated_exposure_time(ic) + readout)
         return duration
 
 
@@ -30,6 +30,17 @@ class Script(PolymorphicBaseModel):
         """Returns reason why script cannot run, or None if it can."""
         return self._cant_run_reason
 
+    async def prepare(self, data: TaskData | None) -> None:
+        """Prepare script before it is run, e.g. by moving the telescope while waiting for the start of its window.
+
+        Everything done here must be safe to be done again in run(), since prepare() might have been interrupted.
+        """
+        pass
+
+    async def rollback(self, data: TaskData | None) -> None:
+        """Revert what prepare() did, if the script is not run after all."""
+        pass
+
     async def run(self, data: TaskData | None) -> None:
         """Run script.
 
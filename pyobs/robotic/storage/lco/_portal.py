@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any, cast
 from urllib.parse import urljoin
@@ -10,6 +9,7 @@ from astropydantic import AstroPydanticTime
 from pydantic import ConfigDict, Field
 
 from pyobs.object import Object
+from pyobs.utils.outbox import Outbox, OutboxEntry, OutboxStatistics
 from pyobs.utils.serialization import BaseModel
 from pyobs.utils.time import Time
 
@@ -166,7 +166,37 @@ class LcoSchedulableRequest(BaseModel):
 
 
 class Portal(Object):
-    def __init__(self, url: str, token: str, site: str, enclosure: str, telescope: str, **kwargs: Any):
+    """Client for the LCO observation portal.
+
+    All writes to the portal go through an :class:`~pyobs.utils.outbox.Outbox`, so they are delivered in order and
+    retried with exponential backoff, if the portal is unavailable. If a journal file is given, pending writes also
+    survive a restart. Every write is sent with an Idempotency-Key header, and a status update for a configuration
+    replaces a pending one for the same configuration.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        site: str,
+        enclosure: str,
+        telescope: str,
+        outbox: str | None = None,
+        write_timeout: float = 30.0,
+        **kwargs: Any,
+    ):
+        """Creates a new portal client.
+
+        Args:
+            url: URL to portal.
+            token: Authorization token for portal.
+            site: Site of telescope.
+            enclosure: Enclosure of telescope.
+            telescope: Name of telescope.
+            outbox: Local file for journaling pending writes.
+            write_timeout: Time in seconds to wait for a schedule write to be delivered, before it is left in the
+                outbox.
+        """
         Object.__init__(self, **kwargs)
         self.url = url
         self.token = token
@@ -175,18 +205,29 @@ class Portal(Object):
         self.enclosure = enclosure
         self.telescope = telescope
         self._session: aiohttp.ClientSession | None = None
+        self._write_timeout = write_timeout
+        self._outbox = Outbox(self._send, filename=outbox)
 
     async def open(self) -> None:
         await Object.open(self)
         timeout = aiohttp.ClientTimeout(total=30)
         self._session = aiohttp.ClientSession(timeout=timeout, headers=self.headers)
+        self._outbox.start()
 
     async def close(self) -> None:
+        stats = self._outbox.statistics()
+        if stats.backlog > 0:
+            log.warning("Closing portal with %d pending write(s) in outbox.", stats.backlog)
+        await self._outbox.close()
         if self._session is not None:
             await self._session.close()
             self._session = None
         await Object.close(self)
 
+    def outbox_statistics(self) -> OutboxStatistics:
+        """Returns statistics of the outbox for writes to the portal, e.g. the size of the backlog."""
+        return self._outbox.statistics()
+
     async def _get(self, path: str, timeout: int = 30, params: dict[str, Any] | None = None) -> Any:
         """Do a GET request on the portal.
 
@@ -254,9 +295,61 @@ class Portal(Object):
         req = await self._get(f"/api/requests/{request_id}/observations/")
         return [self.pyobs_model_validate(LcoObservation, r) for r in req]
 
+    async def _write(self, method: str, path: str, payload: Any, key: str, expected: int = 200) -> Any:
+        """Do a write request on the portal.
+
+        Args:
+            method: HTTP method.
+            path: Path to request.
+            payload: JSON payload.
+            key: Idempotency key for request.
+            expected: Expected status code.
+
+        Returns:
+            Response for request.
+
+        Raises:
+            ValueError: If the portal rejected the request.
+            RuntimeError: If the portal is not available.
+        """
+        if self._session is None:
+            raise RuntimeError("Portal not opened yet.")
+        headers = {"Content-Type": "application/json; charset=utf8", "Idempotency-Key": key}
+        async with self._session.request(method, urljoin(self.url, path), json=payload, headers=headers) as response:
+            if response.status == expected:
+                return await response.json()
+            text = await response.text()
+            if 400 <= response.status < 500 and response.status not in (408, 429):
+                raise ValueError(f"Invalid request ({response.status}): {text}")
+            raise RuntimeError(f"Portal not available ({response.status}): {text}")
+
+    async def _send(self, entry: OutboxEntry) -> None:
+        """Sends a write from the outbox to the portal."""
+        if entry.kind == "cancel":
+            log.info("Deleting all scheduled tasks after %s...", entry.payload["start"])
+            await self._write("POST", "/api/observations/cancel/", entry.payload, entry.key)
+
+        elif entry.kind == "observations":
+            data = await self._write("POST", "/api/observations/", entry.payload, entry.key, expected=201)
+            log.info("%d observations created.", data["num_created"])
+            if "errors" in data and len(data["errors"]) > 0:
+                for err in data["errors"].values():
+                    log.warning("Error from portal: %s", err)
+
+        elif entry.kind == "configurationstatus":
+            log.info("Sending configuration status update to portal...")
+            path = f"/api/configurationstatus/{entry.payload['id']}/"
+            await self._write("PATCH", path, entry.payload["status"], entry.key)
+
+        else:
+            raise ValueError(f"Unknown type of write: {entry.kind}")
+
     async def clear_schedule(self, start: Time, end: Time) -> None:
         """Clear schedule after given start time.
 
+        Waits for the request to be delivered for a while, but keeps it in the outbox, if it fails. It is dropped
+        after the end time.
+
         Args:
             start: Start time to clear schedule from.
             end: End time to clear schedule to
@@ -273,19 +366,17 @@ class Portal(Object):
             "end": end.isot,
         }
 
-        # url and headers
-        url = urljoin(self.url, "/api/observations/cancel/")
-        headers = {"Authorization": "Token " + self.token, "Content-Type": "application/json; charset=utf8"}
-
         # cancel schedule
-        log.info("Deleting all scheduled tasks after %s...", start.isot)
-        async with self._session.post(url, json=params, headers=headers) as response:
-            if response.status != 200:
-                log.error("Could not cancel schedule: %s", await response.text())
+        entry = self._outbox.add("cancel", params, expires=float(end.unix))
+        if not await self._outbox.wait(entry, self._write_timeout):
+            log.warning("Could not cancel schedule yet, keeping request in outbox.")
 
     async def submit_observations(self, observations: list[dict[str, Any]]) -> None:
         """Submit observations.
 
+        Waits for the request to be delivered for a while, but keeps it in the outbox, if it fails. It is dropped
+        after the end of the last observation.
+
         Args:
             observations: List of observations to submit.
         """
@@ -296,26 +387,16 @@ class Portal(Object):
         if len(observations) == 0:
             return
 
-        # url and headers
-        url = urljoin(self.url, "/api/observations/")
-        headers = {"Authorization": "Token " + self.token, "Content-Type": "application/json; charset=utf8"}
-
         # submit observations
-        async with self._session.post(url, json=observations, headers=headers) as response:
-            if response.status != 201:
-                log.error("Could not submit observations: %s", await response.text())
-            data = await response.json()
-
-        # log
-        log.info("%d observations created.", data["num_created"])
-
-        # errors?
-        if "errors" in data and len(data["errors"]) > 0:
-            for err in data["errors"].values():
-                log.warning("Error from portal: %s", err)
+        expires = max(float(Time(obs["end"]).unix) for obs in observations)
+        entry = self._outbox.add("observations", observations, expires=expires)
+        if not await self._outbox.wait(entry, self._write_timeout):
+            log.warning("Could not submit observations yet, keeping request in outbox.")
 
     async def update_configuration_status(self, status_id: int, status: dict[str, Any]) -> None:
-        """Send report to LCO portal
+        """Send report to LCO portal.
+
+        The report is sent in the background and replaces a pending one for the same configuration status.
 
         Args:
             status_id: id of config status
@@ -323,36 +404,9 @@ class Portal(Object):
         """
         if self._session is None:
             raise RuntimeError("Portal not opened yet.")
-
-        log.info("Sending configuration status update to portal...")
-        url = urljoin(self.url, f"/api/configurationstatus/{status_id}/")
-
-        # do request
-        try:
-            async with self._session.patch(url, json=status) as response:
-                if response.status != 200:
-                    log.error("Could not update configuration status: %s", await response.text())
-
-        except TimeoutError:
-            # schedule re-attempt for sending
-            asyncio.create_task(self._update_configuration_status_later(status_id, status))
-
-    async def _update_configuration_status_later(
-        self, status_id: int, status: dict[str, Any], delay: int = 300
-    ) -> None:
-        """Delay re-attempt to send report to LCO portal
-
-        Args:
-            status_id: id of config status
-            status: Status dictionary
-            delay: Delay in seconds
-        """
-
-        # sleep
-        await asyncio.sleep(delay)
-
-        # re-send
-        await self.update_configuration_status(status_id, status)
+        self._outbox.add(
+            "configurationstatus", {"id": status_id, "status": status}, coalesce=f"configurationstatus/{status_id}"
+        )
 
     async def download_schedule(self, start_before: Time, end_after: Time) -> list[LcoObservation]:
         """Fetch schedule from portal.
@@ -54,7 +54,12 @@ class LcoScheduleWriter(Object):
 
         Args:
             tasks: Scheduled tasks.
+
+        Raises:
+            RuntimeError: If no configuration from the configdb is available.
         """
+        if not await self._configdb.wait(30.0):
+            raise RuntimeError("No configuration from configdb available.")
         observations = self._create_observations(tasks)
         await self._portal.submit_observations(observations)
 
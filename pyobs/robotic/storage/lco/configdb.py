@@ -1,10 +1,21 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
 from collections import namedtuple
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 from urllib.parse import urljoin
 
+import aiohttp
 import dacite
-import requests
+
+from pyobs.object import Object
+
+log = logging.getLogger(__name__)
 
 
 @dataclass
@@ -150,32 +161,203 @@ class Site:
 InstrumentLocation = namedtuple("InstrumentLocation", ["site", "enclosure", "telescope", "instrument"])
 
 
-class ConfigDB:
-    def __init__(self, url: str):
+class ConfigDB(Object):
+    """Client for the LCO configuration database.
+
+    Nothing is downloaded in the constructor. When opened, the last configuration is loaded from a local snapshot
+    file, if given, so that lookups work immediately, even if the configuration database is not reachable. The
+    configuration is then refreshed in the background, using ETag/Last-Modified headers, so that an unchanged
+    configuration is not downloaded again. Instruments are indexed by type for fast lookups.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        snapshot: str | None = None,
+        refresh: float = 3600.0,
+        retry: float = 60.0,
+        **kwargs: Any,
+    ):
+        """Creates a new configdb client.
+
+        Args:
+            url: URL to configdb.
+            snapshot: Local file for storing the last downloaded configuration.
+            refresh: Interval in seconds for refreshing the configuration.
+            retry: Interval in seconds for retrying a failed download, while no configuration is available.
+        """
+        Object.__init__(self, **kwargs)
         self.url = url
-        self.config = self._download_config()
-
-    def _download_config(self) -> list[Site]:
-        json = requests.get(urljoin(self.url, "sites")).json()
-        return [dacite.from_dict(Site, site) for site in json["results"]]
+        self._snapshot = snapshot
+        self._refresh_interval = refresh
+        self._retry_interval = retry
+
+        # configuration and validators for conditional requests
+        self.config = []
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._loaded = asyncio.Event()
+
+        # refresh
+        self.add_background_task(self._refresh)
+
+    @property
+    def config(self) -> list[Site]:
+        """Current configuration."""
+        return self._config
+
+    @config.setter
+    def config(self, config: list[Site]) -> None:
+        self._config = config
+        self._index = self._build_index(config)
+
+    @staticmethod
+    def _build_index(config: list[Site]) -> dict[str, list[tuple[str, str, str, InstrumentLocation]]]:
+        """Builds index of instrument locations by lower-case instrument type."""
+        index: dict[str, list[tuple[str, str, str, InstrumentLocation]]] = {}
+        for site in config:
+            for enclosure in site.enclosure_set:
+                for telescope in enclosure.telescope_set:
+                    for instrument in telescope.instrument_set:
+                        index.setdefault(instrument.instrument_type.code.lower(), []).append(
+                            (
+                                site.code.lower(),
+                                enclosure.code.lower(),
+                                telescope.code.lower(),
+                                InstrumentLocation(site, enclosure, telescope, instrument),
+                            )
+                        )
+        return index
+
+    @property
+    def loaded(self) -> bool:
+        """Whether a configuration is available."""
+        return len(self._config) > 0
+
+    async def open(self) -> None:
+        """Loads snapshot and starts refreshing."""
+        self._load_snapshot()
+        await Object.open(self)
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """Waits for a configuration to be available.
+
+        Args:
+            timeout: Maximum time to wait in seconds.
+
+        Returns:
+            Whether a configuration is available.
+        """
+        if not self.loaded:
+            try:
+                await asyncio.wait_for(self._loaded.wait(), timeout)
+            except TimeoutError:
+                pass
+        return self.loaded
+
+    def _set_config(self, results: list[dict[str, Any]]) -> None:
+        """Parses and sets new configuration."""
+        self.config = [dacite.from_dict(Site, site) for site in results]
+        if self.loaded:
+            self._loaded.set()
+
+    def _load_snapshot(self) -> None:
+        """Loads configuration from snapshot file, if it exists."""
+        if self._snapshot is None or not os.path.exists(self._snapshot):
+            return
+        try:
+            with open(self._snapshot) as f:
+                data = json.load(f)
+            self._set_config(data["results"])
+            self._etag, self._last_modified = data.get("etag"), data.get("last_modified")
+            log.info("Loaded configdb snapshot from %s.", self._snapshot)
+        except (OSError, ValueError, KeyError, TypeError, dacite.DaciteError) as e:
+            log.warning("Could not load configdb snapshot from %s: %s", self._snapshot, e)
+
+    def _write_snapshot(self, results: list[dict[str, Any]]) -> None:
+        """Writes configuration to snapshot file."""
+        if self._snapshot is None:
+            return
+        Path(self._snapshot).parent.mkdir(parents=True, exist_ok=True)
+        tmp = f"{self._snapshot}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"etag": self._etag, "last_modified": self._last_modified, "results": results}, f)
+        os.replace(tmp, self._snapshot)
+
+    async def update(self) -> bool:
+        """Downloads configuration, if it has changed.
+
+        Returns:
+            Whether the configuration has changed.
+
+        Raises:
+            aiohttp.ClientError: If download failed.
+            ValueError: If response is invalid.
+        """
+
+        # conditional request, if we have a configuration
+        headers = {}
+        if self.loaded:
+            if self._etag is not None:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified is not None:
+                headers["If-Modified-Since"] = self._last_modified
+
+        # download
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.get(urljoin(self.url, "sites"), headers=headers) as response:
+                if response.status == 304:
+                    return False
+                if response.status != 200:
+                    raise ValueError(f"Could not fetch configdb: {response.status} {await response.text()}")
+                data = await response.json()
+                etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+        # parse and store
+        try:
+            self._set_config(data["results"])
+        except (KeyError, TypeError, dacite.DaciteError) as e:
+            raise ValueError(f"Invalid configdb response: {e}") from e
+        self._etag, self._last_modified = etag, last_modified
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._write_snapshot, data["results"])
+        except OSError as e:
+            log.warning("Could not write configdb snapshot to %s: %s", self._snapshot, e)
+        log.info("Updated configuration from configdb.")
+        return True
+
+    async def _refresh(self) -> None:
+        """Refreshes configuration periodically."""
+        while True:
+            try:
+                await self.update()
+            except (aiohttp.ClientError, TimeoutError, ValueError) as e:
+                log.warning("Could not update configuration from configdb: %s", e)
+            await asyncio.sleep(self._refresh_interval if self.loaded else self._retry_interval)
 
     def get_instrument_by_type(
         self, instrument_type: str, site: str | None = None, enclosure: str | None = None, telescope: str | None = None
     ) -> list[InstrumentLocation]:
-        locations: list[InstrumentLocation] = []
-        for site_it in self.config:
-            if site is not None and site.lower() != site_it.code.lower():
-                continue
-            for enclosure_it in site_it.enclosure_set:
-                if enclosure is not None and enclosure.lower() != enclosure_it.code.lower():
-                    continue
-                for telescope_it in enclosure_it.telescope_set:
-                    if telescope is not None and telescope.lower() != telescope_it.code.lower():
-                        continue
-                    for instrument_it in telescope_it.instrument_set:
-                        if instrument_it.instrument_type.code.lower() == instrument_type.lower():
-                            locations.append(InstrumentLocation(site_it, enclosure_it, telescope_it, instrument_it))
-        return locations
+        """Returns locations of all instruments of the given type, optionally filtered by site, enclosure and telescope.
+
+        Args:
+            instrument_type: Code of instrument type.
+            site: Site code.
+            enclosure: Enclosure code.
+            telescope: Telescope code.
+
+        Returns:
+            Locations of matching instruments.
+        """
+        site, enclosure, telescope = (v.lower() if v is not None else None for v in (site, enclosure, telescope))
+        return [
+            location
+            for site_code, enclosure_code, telescope_code, location in self._index.get(instrument_type.lower(), [])
+            if (site is None or site == site_code)
+            and (enclosure is None or enclosure == enclosure_code)
+            and (telescope is None or telescope == telescope_code)
+        ]
 
 
 __all__ = ["ConfigDB"]
@@ -36,6 +36,8 @@ class LcoObservationArchive(ObservationArchive):
         telescope: str,
         period: int = 24,
         mode: Literal["read", "write", "readwrite"] = "readwrite",
+        outbox: str | None = None,
+        configdb_snapshot: str | None = None,
         **kwargs: Any,
     ):
         """Creates a new LCO scheduler.
@@ -49,6 +51,9 @@ class LcoObservationArchive(ObservationArchive):
             telescope: Telescope for new schedules.
             instrument: Instrument for new schedules.
             period: Period to schedule in hours
+            outbox: Local file for journaling pending writes to the portal, so that they survive a restart.
+            configdb_snapshot: Local file for storing the configuration from the configdb, for starting up while it
+                is not reachable.
         """
         from ._schedulereader import LcoScheduleReader
         from ._schedulewriter import LcoScheduleWriter
@@ -57,9 +62,16 @@ class LcoObservationArchive(ObservationArchive):
 
         # portal
         self._portal = self.add_child_object(
-            Portal, Portal, url=url, token=token, site=site, enclosure=enclosure, telescope=telescope
+            Portal,
+            Portal,
+            url=url,
+            token=token,
+            site=site,
+            enclosure=enclosure,
+            telescope=telescope,
+            outbox=outbox,
         )
-        self._configdb = ConfigDB(configdb)
+        self._configdb = self.add_child_object(ConfigDB, ConfigDB, url=configdb, snapshot=configdb_snapshot)
 
         # reader/writer
         self._schedule_reader = self.add_child_object(
@@ -105,6 +105,20 @@ class LcoDefaultScript(LcoScript):
         # seems alright
         return True
 
+    async def prepare(self, data: TaskData | None) -> None:
+        """Move telescope to target, so that run() can start right away."""
+        if self._image_type == ImageType.OBJECT:
+            cfg = self.request.configurations[0]
+            log.info("Moving to target %s of next task...", cfg.target.name)
+            async with self.comm.proxy(self.telescope, IPointingRaDec) as telescope:
+                await telescope.move_radec(cfg.target.ra, cfg.target.dec)
+
+    async def rollback(self, data: TaskData | None) -> None:
+        """Stop telescope, if it was moved in prepare()."""
+        if self._image_type == ImageType.OBJECT:
+            async with self.comm.proxy(self.telescope, ITelescope) as telescope:
+                await telescope.stop_motion()
+
     async def run(self, data: TaskData | None) -> None:
         """Run script.
 
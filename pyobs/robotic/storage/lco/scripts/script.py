@@ -27,6 +27,7 @@ class LcoScript(Script):
     scripts: dict[str, dict[str, Any]] = {}
 
     _running_script: Script | None = PrivateAttr(default=None)
+    _prepared_script: Script | None = PrivateAttr(default=None)
 
     def _create_script(self) -> Script:
         """Build the script selected via the configuration's extra_params["script_name"].
@@ -52,13 +53,25 @@ class LcoScript(Script):
         self._cant_run_reason = script.cant_run_reason()
         return can_run
 
+    async def prepare(self, data: TaskData | None) -> None:
+        """Prepare the selected script before it is run."""
+        self._prepared_script = self._create_script()
+        await self._prepared_script.prepare(data)
+
+    async def rollback(self, data: TaskData | None) -> None:
+        """Revert preparation of the selected script."""
+        script, self._prepared_script = self._prepared_script, None
+        if script is not None:
+            await script.rollback(data)
+
     async def run(self, data: TaskData | None) -> None:
         """Run script.
 
         Raises:
             InterruptedError: If interrupted
         """
-        script = self._create_script()
+        script = self._prepared_script if self._prepared_script is not None else self._create_script()
+        self._prepared_script = None
         self._running_script = script
         try:
             await script.run(data)
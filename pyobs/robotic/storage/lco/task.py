@@ -153,10 +153,11 @@ class LcoTask(Task):
                 config.state = "ATTEMPTED"
                 await data.observation_archive.send_update(config.configuration_status, status.finish().to_json())
 
-            # can run?
-            script = self.pyobs_model_validate(Script, self.script, by_alias=True)
+            # can run? use the prepared script, if there is one
+            script = self._prepared_script or self.pyobs_model_validate(Script, self.script, by_alias=True)
             if not await script.can_run(data):
                 log.warning("Cannot run config.")
+                await self.rollback(data)
                 continue
 
             # run config
@@ -168,6 +169,9 @@ class LcoTask(Task):
                 config.state = status.state
                 await data.observation_archive.send_update(config.configuration_status, status.to_json())
 
+        # a prepared script that has not been run is not needed anymore
+        await self.rollback(data)
+
         # finished task
         log.info("Finished task.")
 
@@ -183,7 +187,8 @@ class LcoTask(Task):
 
         # at least we tried...
         config_status = ConfigStatus()
-        script = self.pyobs_model_validate(Script, self.script, by_alias=True)
+        script = self._prepared_script or self.pyobs_model_validate(Script, self.script, by_alias=True)
+        self._prepared_script = None
         self._running_script = script
 
         try:
@@ -40,6 +40,18 @@ class LcoTaskRunner(TaskRunner):
         task.script = self._get_config_script(task.request)
         return await TaskRunner.run_task(self, task, target)
 
+    async def prepare_task(self, task: Task, target: Target | None = None) -> None:
+        """Prepare a task before it is run.
+
+        Args:
+            task: Task to prepare
+            target: Resolved target for this specific run, e.g. from the scheduled observation.
+        """
+        if not isinstance(task, LcoTask):
+            raise ValueError("Not an LCO task")
+        task.script = self._get_config_script(task.request)
+        await TaskRunner.prepare_task(self, task, target)
+
     async def can_run(self, task: Task, target: Target | None = None) -> bool:
         """Checks whether this task could run now.
 
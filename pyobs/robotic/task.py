@@ -53,6 +53,7 @@ class Task(PolymorphicBaseModel):
     _resolved_target: Target | None = PrivateAttr(default=None)
     _cant_run_reason: str | None = None
     _running_script: Script | None = PrivateAttr(default=None)
+    _prepared_script: Script | None = PrivateAttr(default=None)
 
     model_config = ConfigDict(populate_by_name=True)
 
@@ -94,10 +95,23 @@ class Task(PolymorphicBaseModel):
         """
         return False
 
+    async def prepare(self, data: TaskData | None) -> None:
+        """Prepare task before it is run. The prepared script is used by the next call to run()."""
+        if self.script is not None:
+            self._prepared_script = self.create_script()
+            await self._prepared_script.prepare(data)
+
+    async def rollback(self, data: TaskData | None) -> None:
+        """Revert preparation of task, if it is not run after all."""
+        script, self._prepared_script = self._prepared_script, None
+        if script is not None:
+            await script.rollback(data)
+
     async def run(self, data: TaskData | None) -> None:
         """Run a task"""
         if self.script is not None:
-            script = self.create_script()
+            script = self._prepared_script if self._prepared_script is not None else self.create_script()
+            self._prepared_script = None
             self._running_script = script
             await script.run(data)
 
@@ -52,6 +52,24 @@ class TaskRunner(Object):
         """Returns reason why task cannot run, or None if it can."""
         return task.cant_run_reason()
 
+    async def prepare_task(self, task: Task, target: Target | None = None) -> None:
+        """Prepare a task before it is run, e.g. by moving the telescope.
+
+        Args:
+            task: Task to prepare
+            target: Resolved target for this specific run, e.g. from the scheduled observation.
+        """
+        await task.prepare(self.__task_data(task, target))
+
+    async def rollback_task(self, task: Task, target: Target | None = None) -> None:
+        """Revert preparation of a task that is not run after all.
+
+        Args:
+            task: Task to roll back
+            target: Resolved target for this specific run, e.g. from the scheduled observation.
+        """
+        await task.rollback(self.__task_data(task, target))
+
     async def run_task(self, task: Task, target: Target | None = None) -> bool:
         """Run a task.
 
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import logging
+import math
+import time
+from typing import Any, ClassVar
 
 import numpy as np
 from astropy.modeling import fitting, models
+from numpy.typing import NDArray
 
-from pyobs.interfaces import IData, IExposureTime, IImageType, IWindow
+from pyobs.interfaces import IBinning, IData, IExposureTime, IImageType, IWindow
 from pyobs.utils.enums import ImageType
 
 from .exptime import ExposureTimeProvider
@@ -21,6 +25,12 @@ class StellarExposureTimeProvider(ExposureTimeProvider):
     the brightest source within the search radius, and scales the exposure
     time so the fitted peak matches ``target_peak``. Repeats up to
     ``max_iterations`` times until the result converges.
+
+    If ``windowed`` is set, only a window of the size of the search region around the centre of the
+    detector is read out. Bias frames are cached per camera, binning and window for ``bias_max_age``
+    seconds and shared between all providers. If the catalog ``magnitude`` of the star is given, the
+    first test exposure time is predicted from it and a zero point, which is learned from previous
+    measurements with the same camera and ``band``, so that usually a single test exposure suffices.
     """
 
     camera: str
@@ -41,6 +51,38 @@ class StellarExposureTimeProvider(ExposureTimeProvider):
     default_exposure_time: float = 1.0
     """Initial test exposure time and fallback if no star is found."""
 
+    windowed: bool = True
+    """Only read out the search region instead of the full frame."""
+
+    bias_max_age: float = 3600.0
+    """Maximum age in seconds of a cached bias frame, 0 to disable caching."""
+
+    magnitude: float | None = None
+    """Catalog magnitude of the star, used for predicting the first test exposure time."""
+
+    band: str | None = None
+    """Photometric band of the magnitude, zero points are learned separately for each band."""
+
+    zero_point: float | None = None
+    """Initial zero point in magnitudes for 1 ADU/s peak, until one has been learned."""
+
+    min_exposure_time: float = 0.001
+    """Minimum predicted exposure time in seconds."""
+
+    max_exposure_time: float = 300.0
+    """Maximum predicted exposure time in seconds."""
+
+    # bias frames by camera, binning and window, with time of creation
+    _bias_cache: ClassVar[
+        dict[tuple[str, tuple[int, int], tuple[int, int, int, int] | None], tuple[float, NDArray[np.float32]]]
+    ] = {}
+
+    # learned zero points by camera and band, with number of measurements
+    _zero_points: ClassVar[dict[tuple[str, str | None], tuple[int, float]]] = {}
+
+    # maximum number of measurements to average zero points over, older ones fade out
+    _ZERO_POINT_SAMPLES: ClassVar[int] = 10
+
     async def __call__(self) -> float:
         """Determine the optimal exposure time.
 
@@ -57,19 +99,23 @@ class StellarExposureTimeProvider(ExposureTimeProvider):
             orig_window = (
                 (wnd_state.x, wnd_state.y, wnd_state.width, wnd_state.height) if wnd_state is not None else None
             )
+        async with self.comm.safe_proxy(self.camera, IBinning) as camera:
+            bin_state = camera.get_state(IBinning) if camera is not None else None
+            binning = (bin_state.x, bin_state.y) if bin_state is not None else (1, 1)
+        async with self.comm.proxy(self.camera, IWindow) as camera:
+            window = self._search_window(camera, binning) if self.windowed else None
 
-        exptime = self.default_exposure_time
+        exptime = self._predict_exposure_time()
 
         try:
-            # take bias once before all iterations
-            log.info("Taking bias frame...")
-            async with self.comm.proxy(self.camera, IExposureTime) as camera:
-                await camera.set_exposure_time(0.0)
-            async with self.comm.proxy(self.camera, IImageType) as camera:
-                await camera.set_image_type(ImageType.BIAS)
-            async with self.comm.proxy(self.camera, IData) as camera:
-                bias_filename = await camera.grab_data(broadcast=False)
-            bias_img = await self.vfs.read_image(bias_filename)
+            # read out search window only
+            if window is not None:
+                log.info("Setting window to %sx%s at %s,%s...", window[2], window[3], window[0], window[1])
+                async with self.comm.proxy(self.camera, IWindow) as camera:
+                    await camera.set_window(*window)
+
+            # take bias once before all iterations, or use cached one
+            bias = await self._get_bias(binning, window)
 
             for iteration in range(self.max_iterations):
                 log.info("Iteration %d/%d, exptime=%.2fs", iteration + 1, self.max_iterations, exptime)
@@ -85,7 +131,7 @@ class StellarExposureTimeProvider(ExposureTimeProvider):
                 sci_img = await self.vfs.read_image(sci_filename)
 
                 # subtract bias
-                data = sci_img.data.astype(float) - bias_img.data.astype(float)
+                data = np.asarray(sci_img.data, dtype=np.float32) - bias
 
                 # find brightest pixel within search radius of centre
                 peak, cx, cy = self._find_star(data)
@@ -95,6 +141,7 @@ class StellarExposureTimeProvider(ExposureTimeProvider):
                     return exptime
 
                 log.info("Found star at (%d, %d) with peak=%.1f ADU", cx, cy, peak)
+                self._learn_zero_point(peak, exptime)
 
                 # scale exposure time linearly
                 ratio = self.target_peak / peak
@@ -120,6 +167,75 @@ class StellarExposureTimeProvider(ExposureTimeProvider):
 
         return exptime
 
+    def _search_window(self, camera: Any, binning: tuple[int, int]) -> tuple[int, int, int, int] | None:
+        """Returns window covering the search region around the centre of the full frame, or None,
+        if the full frame is not larger. The search radius is given in binned pixels, the window in unbinned ones."""
+        cap = camera.get_capabilities(IWindow)
+        if cap is None or cap.full_frame_width <= 0 or cap.full_frame_height <= 0:
+            return None
+        width = min(2 * self.search_radius * binning[0], cap.full_frame_width)
+        height = min(2 * self.search_radius * binning[1], cap.full_frame_height)
+        if width == cap.full_frame_width and height == cap.full_frame_height:
+            return None
+        left = cap.full_frame_x + (cap.full_frame_width - width) // 2
+        top = cap.full_frame_y + (cap.full_frame_height - height) // 2
+        return left, top, width, height
+
+    async def _get_bias(
+        self, binning: tuple[int, int], window: tuple[int, int, int, int] | None
+    ) -> NDArray[np.float32]:
+        """Returns a bias frame for the current binning and window, from cache, if possible."""
+
+        # cached?
+        key = (self.camera, binning, window)
+        if key in self._bias_cache:
+            created, bias = self._bias_cache[key]
+            if time.monotonic() - created < self.bias_max_age:
+                log.info("Using cached bias frame.")
+                return bias
+            del self._bias_cache[key]
+
+        log.info("Taking bias frame...")
+        async with self.comm.proxy(self.camera, IExposureTime) as camera:
+            await camera.set_exposure_time(0.0)
+        async with self.comm.proxy(self.camera, IImageType) as camera:
+            await camera.set_image_type(ImageType.BIAS)
+        async with self.comm.proxy(self.camera, IData) as camera:
+            bias_filename = await camera.grab_data(broadcast=False)
+        bias_img = await self.vfs.read_image(bias_filename)
+        bias = np.asarray(bias_img.data, dtype=np.float32)
+
+        # store it
+        if self.bias_max_age > 0:
+            StellarExposureTimeProvider._bias_cache[key] = (time.monotonic(), bias)
+        return bias
+
+    def _current_zero_point(self) -> float | None:
+        """Returns the learned zero point for camera and band, or the configured one."""
+        learned = self._zero_points.get((self.camera, self.band))
+        return learned[1] if learned is not None else self.zero_point
+
+    def _predict_exposure_time(self) -> float:
+        """Predicts exposure time for reaching target_peak from catalog magnitude and zero point,
+        or returns default_exposure_time, if that's not possible."""
+        zp = self._current_zero_point()
+        if self.magnitude is None or zp is None:
+            return self.default_exposure_time
+        exptime = self.target_peak * 10 ** (0.4 * (self.magnitude - zp))
+        exptime = min(max(exptime, self.min_exposure_time), self.max_exposure_time)
+        log.info("Predicted exptime=%.2fs from magnitude %.2f and zero point %.2f.", exptime, self.magnitude, zp)
+        return exptime
+
+    def _learn_zero_point(self, peak: float, exptime: float) -> None:
+        """Updates zero point for camera and band from measured peak, if the catalog magnitude is known."""
+        if self.magnitude is None or peak <= 0 or exptime <= 0:
+            return
+        zp = self.magnitude + 2.5 * math.log10(peak / exptime)
+        key = (self.camera, self.band)
+        count, mean = self._zero_points.get(key, (0, 0.0))
+        count = min(count + 1, self._ZERO_POINT_SAMPLES)
+        StellarExposureTimeProvider._zero_points[key] = (count, mean + (zp - mean) / count)
+
     def _find_star(self, data: np.ndarray) -> tuple[float | None, int, int]:
         """Find the brightest star near the image centre by fitting a 2D Gaussian.
 
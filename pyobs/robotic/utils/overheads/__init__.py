@@ -0,0 +1,3 @@
+from .overheads import OverheadModel
+
+__all__ = ["OverheadModel"]
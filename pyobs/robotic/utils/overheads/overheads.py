@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Any, ClassVar
+
+import numpy as np
+from astropy.coordinates import angular_separation
+from pydantic import PrivateAttr
+
+from pyobs.utils.serialization import BaseModel
+
+log = logging.getLogger(__name__)
+
+
+class _Mean:
+    """Mean of a series of values, in which old values fade out after max_samples values."""
+
+    def __init__(self, count: int = 0, mean: float = 0.0):
+        self.count = count
+        self.mean = mean
+
+    def add(self, value: float, max_samples: int) -> None:
+        self.count = min(self.count + 1, max_samples)
+        self.mean += (value - self.mean) / self.count
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"count": self.count, "mean": self.mean}
+
+
+class _LinearFit:
+    """Least-squares fit of a straight line to a series of (x, y) pairs, in which old pairs fade out after
+    max_samples pairs."""
+
+    def __init__(self, n: float = 0.0, sx: float = 0.0, sy: float = 0.0, sxx: float = 0.0, sxy: float = 0.0):
+        self.n, self.sx, self.sy, self.sxx, self.sxy = n, sx, sy, sxx, sxy
+
+    def add(self, x: float, y: float, max_samples: int) -> None:
+        # down-weight old pairs, so that their total weight stays below max_samples
+        if self.n + 1.0 > max_samples:
+            f = (max_samples - 1.0) / self.n
+            self.n, self.sx, self.sy, self.sxx, self.sxy = (
+                f * v for v in (self.n, self.sx, self.sy, self.sxx, self.sxy)
+            )
+        self.n += 1.0
+        self.sx += x
+        self.sy += y
+        self.sxx += x * x
+        self.sxy += x * y
+
+    def __call__(self, x: float | None) -> float:
+        mean_y = self.sy / self.n
+        var_x = self.sxx / self.n - (self.sx / self.n) ** 2
+        if x is None or var_x <= 1e-9:
+            return mean_y
+        slope = (self.sxy / self.n - self.sx / self.n * mean_y) / var_x
+        return mean_y + slope * (x - self.sx / self.n)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"n": self.n, "sx": self.sx, "sy": self.sy, "sxx": self.sxx, "sxy": self.sxy}
+
+
+class _OverheadStatistics:
+    """Learned overheads, shared between all models using the same file."""
+
+    def __init__(self, filename: str | None = None):
+        self.filename = filename
+        self.slew = _LinearFit()
+        self.means: dict[str, _Mean] = {}
+        self.modified = False
+        self._mtime: int | None = None
+        self.refresh()
+
+    def _file_mtime(self) -> int | None:
+        if self.filename is None:
+            return None
+        try:
+            return os.stat(self.filename).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self) -> None:
+        """Reload data, if the file has been changed, e.g. by another process, and there are no unsaved values."""
+        mtime = self._file_mtime()
+        if mtime is None or mtime == self._mtime or self.modified:
+            return
+        self._mtime = mtime
+        try:
+            with open(str(self.filename)) as f:
+                data = json.load(f)
+            self.slew = _LinearFit(**data.get("slew", {}))
+            self.means = {k: _Mean(**v) for k, v in data.get("means", {}).items()}
+        except (OSError, ValueError, TypeError):
+            log.exception("Could not load overheads from %s, keeping current values.", self.filename)
+
+    def save(self) -> None:
+        if self.filename is None:
+            return
+        self.modified = False
+        data = {"slew": self.slew.to_dict(), "means": {k: v.to_dict() for k, v in self.means.items()}}
+
+        # write to temporary file first, so that we never leave a broken file behind
+        tmp = f"{self.filename}.tmp"
+        try:
+            Path(self.filename).parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, self.filename)
+            self._mtime = self._file_mtime()
+        except OSError:
+            log.exception("Could not write overheads to %s.", self.filename)
+
+
+class OverheadModel(BaseModel):
+    """Model for the overheads of an observation, which learns from executed observations.
+
+    Scripts record the durations of slews, readouts, filter changes, acquisitions and starting the auto-guiding, while
+    running. Slew times are fitted linearly against the angular distance, readout times are averaged per binning and
+    window, all others are simple averages. Until min_samples values have been recorded for an overhead, its default
+    value is used. Old values fade out after max_samples values, so that the model follows changes in the hardware.
+
+    Learned values are stored in a local JSON file and shared between all models using the same file, so all scripts
+    of a module use the same numbers. Whenever the file is changed by another process, the values are reloaded,
+    unless there are unsaved values.
+    """
+
+    filename: str | None = None
+    """Local JSON file to store learned overheads in, only kept in memory if None."""
+
+    slew: float = 60.0
+    """Default time in seconds for slewing to a target, including settling."""
+
+    readout: float = 5.0
+    """Default time in seconds for reading out an image."""
+
+    filter_change: float = 10.0
+    """Default time in seconds for changing the filter."""
+
+    acquisition: float = 30.0
+    """Default time in seconds for a target acquisition."""
+
+    guiding_start: float = 10.0
+    """Default time in seconds for starting the auto-guiding."""
+
+    min_samples: int = 3
+    """Minimum number of recorded values before learned values are used."""
+
+    max_samples: int = 100
+    """Number of recorded values after which old values fade out."""
+
+    _statistics: _OverheadStatistics = PrivateAttr()
+    _shared: ClassVar[dict[str, _OverheadStatistics]] = {}
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.filename is None:
+            self._statistics = _OverheadStatistics()
+        else:
+            filename = os.path.abspath(self.filename)
+            if filename not in OverheadModel._shared:
+                OverheadModel._shared[filename] = _OverheadStatistics(filename)
+            self._statistics = OverheadModel._shared[filename]
+
+    def save(self) -> None:
+        """Write learned overheads to file, if one is configured."""
+        self._statistics.save()
+
+    @staticmethod
+    def distance(ra1: float, dec1: float, ra2: float, dec2: float) -> float:
+        """Returns angular distance in degrees between two positions given in degrees."""
+        return float(
+            np.degrees(angular_separation(math.radians(ra1), math.radians(dec1), math.radians(ra2), math.radians(dec2)))
+        )
+
+    @staticmethod
+    def _readout_keys(binning: tuple[int, int], window: tuple[int, int, int, int] | None) -> list[str]:
+        """Keys for readout times, from most to least specific."""
+        binning_key = f"readout:{binning[0]}x{binning[1]}"
+        window_key = "full" if window is None else f"{window[2]}x{window[3]}"
+        return [f"{binning_key}:{window_key}", binning_key, "readout"]
+
+    def _add(self, key: str, value: float) -> None:
+        if not math.isfinite(value) or value < 0.0:
+            return
+        self._statistics.refresh()
+        self._statistics.modified = True
+        if key not in self._statistics.means:
+            self._statistics.means[key] = _Mean()
+        self._statistics.means[key].add(value, self.max_samples)
+
+    def _get(self, keys: list[str], default: float) -> float:
+        self._statistics.refresh()
+        for key in keys:
+            mean = self._statistics.means.get(key)
+            if mean is not None and mean.count >= self.min_samples:
+                return mean.mean
+        return default
+
+    def record_slew(self, distance: float, duration: float) -> None:
+        """Record a slew over the given distance in degrees that took the given time in seconds."""
+        if math.isfinite(distance) and math.isfinite(duration) and duration >= 0.0:
+            self._statistics.refresh()
+            self._statistics.modified = True
+            self._statistics.slew.add(distance, duration, self.max_samples)
+
+    def record_readout(
+        self, binning: tuple[int, int], window: tuple[int, int, int, int] | None, duration: float
+    ) -> None:
+        """Record the readout time for the given binning and window (None for full frame)."""
+        for key in self._readout_keys(binning, window):
+            self._add(key, duration)
+
+    def record_filter_change(self, duration: float) -> None:
+        """Record the time for a filter change."""
+        self._add("filter_change", duration)
+
+    def record_acquisition(self, duration: float) -> None:
+        """Record the time for a target acquisition."""
+        self._add("acquisition", duration)
+
+    def record_guiding_start(self, duration: float) -> None:
+        """Record the time for starting the auto-guiding."""
+        self._add("guiding_start", duration)
+
+    def slew_time(self, distance: float | None = None) -> float:
+        """Returns the estimated time for a slew over the given distance in degrees, or an average slew, if None."""
+        self._statistics.refresh()
+        if self._statistics.slew.n < self.min_samples:
+            return self.slew
+        return max(0.0, self._statistics.slew(distance))
+
+    def readout_time(self, binning: tuple[int, int] = (1, 1), window: tuple[int, int, int, int] | None = None) -> float:
+        """Returns the estimated readout time for the given binning and window (None for full frame)."""
+        return self._get(self._readout_keys(binning, window), self.readout)
+
+    def filter_change_time(self) -> float:
+        """Returns the estimated time for a filter change."""
+        return self._get(["filter_change"], self.filter_change)
+
+    def acquisition_time(self) -> float:
+        """Returns the estimated time for a target acquisition."""
+        return self._get(["acquisition"], self.acquisition)
+
+    def guiding_start_time(self) -> float:
+        """Returns the estimated time for starting the auto-guiding."""
+        return self._get(["guiding_start"], self.guiding_start)
+
+
+__all__ = ["OverheadModel"]
@@ -0,0 +1,3 @@
+from .sequence import grab_sequence
+
+__all__ = ["grab_sequence"]
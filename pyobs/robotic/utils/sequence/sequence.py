@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from pyobs.comm import Comm
+from pyobs.interfaces import DataSequenceState, IData, IDataSequence
+
+log = logging.getLogger(__name__)
+
+
+async def grab_sequence(
+    comm: Comm,
+    camera: str,
+    count: int,
+    exposure_time: float = 0.0,
+    broadcast: bool = True,
+    on_progress: Callable[[int], None] | None = None,
+    frame_timeout: float = 120.0,
+) -> int:
+    """Takes a series of images with the current camera settings.
+
+    If the camera implements IDataSequence, the whole series is handed to the camera in a single call and progress is
+    followed via its DataSequenceState, so that the images are taken back to back without a round trip for each of
+    them. If the sequence stops early, e.g. because a single image failed, the remaining images are taken one by one
+    with grab_data(), so that the images taken so far are kept. A sequence without progress is stopped first and the
+    remaining images are only taken once the camera is idle again. Cameras without IDataSequence are always used this
+    way.
+
+    Args:
+        comm: Comm object to use.
+        camera: Name of camera module.
+        count: Number of images to take.
+        exposure_time: Exposure time of the images in seconds, only used for timeouts.
+        broadcast: Broadcast existence of each image.
+        on_progress: If given, called with the number of finished images after each image.
+        frame_timeout: Seconds beyond the exposure time to wait for an image in a sequence before giving up on it.
+
+    Returns:
+        Number of images taken.
+    """
+
+    # whole sequence on camera, if possible
+    done = 0
+    async with comm.proxy(camera, IData) as cam:
+        if count > 1 and isinstance(cam, IDataSequence):
+            done = await _run_camera_sequence(
+                comm, camera, cam, count, broadcast, on_progress, exposure_time + frame_timeout
+            )
+            if done < count:
+                log.warning("Sequence stopped after %d/%d images, taking remaining images one by one.", done, count)
+
+        # remaining images one by one
+        for _ in range(done, count):
+            await cam.grab_data(broadcast=broadcast)
+            done += 1
+            if on_progress is not None:
+                on_progress(done)
+    return done
+
+
+async def _run_camera_sequence(
+    comm: Comm,
+    camera: str,
+    cam: Any,
+    count: int,
+    broadcast: bool,
+    on_progress: Callable[[int], None] | None,
+    timeout: float,
+) -> int:
+    """Runs a sequence on the camera and returns the number of images taken."""
+    done = 0
+    started = False
+    finished = asyncio.Event()
+    updated = asyncio.Event()
+
+    def on_state(state: DataSequenceState) -> None:
+        nonlocal done, started
+        if state.count_total == count:
+            # our sequence is running, report every new image
+            started = True
+            while done < state.count_total - state.count_left:
+                done += 1
+                if on_progress is not None:
+                    on_progress(done)
+        elif state.count_total == 0 and started:
+            finished.set()
+        updated.set()
+
+    await comm.subscribe_state(camera, IDataSequence, on_state)
+    try:
+        log.info("Starting sequence of %d images on %s...", count, camera)
+        await cam.grab_sequence(count, broadcast=broadcast)
+
+        # wait for sequence to finish, with a timeout for every single image
+        while not finished.is_set():
+            updated.clear()
+            try:
+                await asyncio.wait_for(updated.wait(), timeout=timeout)
+            except TimeoutError:
+                log.warning("No progress from sequence within %.0fs, aborting it.", timeout)
+                await _stop_sequence(cam, finished, timeout)
+                break
+
+    except asyncio.CancelledError:
+        # don't leave the camera running, if we got cancelled
+        await cam.abort_sequence()
+        raise
+
+    finally:
+        await comm.unsubscribe_state(camera, IDataSequence, on_state)
+
+    return done
+
+
+async def _stop_sequence(cam: Any, finished: asyncio.Event, timeout: float) -> None:
+    """Stops a stalled sequence and makes sure that the camera is idle before any other images are taken."""
+
+    # stop gracefully first, so that an image still reading out is kept and not taken again
+    await cam.abort_sequence()
+    try:
+        await asyncio.wait_for(finished.wait(), timeout=timeout)
+        return
+    except TimeoutError:
+        pass
+
+    # still not idle, so abort hard, which only returns after the exposure has stopped
+    log.warning("Sequence did not stop within %.0fs, aborting camera.", timeout)
+    await cam.abort()
+
+
+__all__ = ["grab_sequence"]
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any
+from collections.abc import Callable
+from typing import Any, overload
 
 import astropy.units as u
+import numpy as np
+import numpy.typing as npt
+import py_expression_eval
 from astroplan import Observer
-from astropy.time import TimeDelta
 from py_expression_eval import Expression, Parser
 
 from pyobs.utils.time import Time
@@ -14,6 +17,133 @@ from pyobs.utils.time import Time
 log = logging.getLogger(__name__)
 
 
+ArrayLike = float | npt.NDArray[np.float64]
+CompiledFunction = Callable[[ArrayLike], ArrayLike]
+
+# NumPy counterparts of py_expression_eval's unary operators
+_OPS1: dict[str, Callable[[Any], Any]] = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "asin": np.arcsin,
+    "acos": np.arccos,
+    "atan": np.arctan,
+    "sind": lambda a: np.sin(np.radians(a)),
+    "cosd": lambda a: np.cos(np.radians(a)),
+    "tand": lambda a: np.tan(np.radians(a)),
+    "asind": lambda a: np.degrees(np.arcsin(a)),
+    "acosd": lambda a: np.degrees(np.arccos(a)),
+    "atand": lambda a: np.degrees(np.arctan(a)),
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "ceil": np.ceil,
+    "floor": np.floor,
+    "round": np.round,
+    "-": np.negative,
+    "not": np.logical_not,
+    "exp": np.exp,
+}
+
+# ... of its binary operators
+_OPS2: dict[str, Callable[[Any, Any], Any]] = {
+    "+": np.add,
+    "-": np.subtract,
+    "*": np.multiply,
+    "/": np.true_divide,
+    "%": np.mod,
+    "^": np.power,
+    "**": np.power,
+    "==": np.equal,
+    "!=": np.not_equal,
+    ">": np.greater,
+    "<": np.less,
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+    "and": np.logical_and,
+    "or": np.logical_or,
+    "xor": np.logical_xor,
+}
+
+# ... and of its functions
+_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "log": lambda a, b=None: np.log(a) if b is None else np.log(a) / np.log(b),
+    "min": np.minimum,
+    "max": np.maximum,
+    "pyt": np.hypot,
+    "pow": np.power,
+    "atan2": np.arctan2,
+    "if": np.where,
+}
+
+
+def compile_expression(expr: Expression, variable: str = "h") -> CompiledFunction:
+    """Compiles a parsed expression into a NumPy-vectorised callable.
+
+    The RPN token list of the expression is walked once and turned into a tree of closures over NumPy ufuncs, so
+    evaluating the result neither dispatches on tokens nor requires a Python call per element.
+
+    Args:
+        expr: Parsed expression.
+        variable: Name of the only free variable in the expression.
+
+    Returns:
+        Callable that evaluates the expression for a scalar or an array of values of the given variable.
+
+    Raises:
+        ValueError: If the expression uses an operator or function that has no vectorised counterpart.
+    """
+
+    # stack of closures, each one evaluating a sub-expression for the given variable
+    stack: list[Callable[[Any], Any]] = []
+    for token in expr.tokens:
+        if token.type_ == py_expression_eval.TNUMBER:
+            stack.append(lambda x, n=token.number_: n)
+
+        elif token.type_ == py_expression_eval.TVAR:
+            if token.index_ == variable:
+                stack.append(lambda x: x)
+            elif token.index_ in _FUNCTIONS:
+                stack.append(lambda x, f=_FUNCTIONS[token.index_]: f)
+            else:
+                raise ValueError(f"Unknown variable {token.index_} in expression.")
+
+        elif token.type_ == py_expression_eval.TOP1:
+            if token.index_ not in _OPS1:
+                raise ValueError(f"Unsupported unary operator {token.index_} in expression.")
+            a1 = stack.pop()
+            stack.append(lambda x, f=_OPS1[token.index_], a=a1: f(a(x)))
+
+        elif token.type_ == py_expression_eval.TOP2:
+            b2, a2 = stack.pop(), stack.pop()
+            if token.index_ == ",":
+                # argument lists are collected into a tuple
+                stack.append(lambda x, a=a2, b=b2: (*_args(a(x)), b(x)))
+            elif token.index_ in _OPS2:
+                stack.append(lambda x, f=_OPS2[token.index_], a=a2, b=b2: f(a(x), b(x)))
+            else:
+                raise ValueError(f"Unsupported binary operator {token.index_} in expression.")
+
+        elif token.type_ == py_expression_eval.TFUNCALL:
+            args, func = stack.pop(), stack.pop()
+            stack.append(lambda x, f=func, a=args: f(x)(*_args(a(x))))
+
+        else:
+            raise ValueError("Invalid expression.")
+
+    # there must be exactly one value left
+    if len(stack) != 1:
+        raise ValueError("Invalid expression (parity).")
+    root = stack[0]
+
+    # make sure that we always return something with the shape of the input, even for constant expressions
+    return lambda x: root(x) + np.zeros_like(x, dtype=float)
+
+
+def _args(value: Any) -> tuple[Any, ...]:
+    """Returns given value as tuple of function arguments."""
+    return value if isinstance(value, tuple) else (value,)
+
+
 class ExpTimeEval:
     """Exposure time evaluator for skyflats."""
 
@@ -38,8 +168,8 @@ class ExpTimeEval:
         # init
         self._observer = observer
         self._time: Time | None = None
-        self._m: float | None = None
-        self._b: float | None = None
+        self._sun_offsets: npt.NDArray[np.float64] | None = None
+        self._sun_alts: npt.NDArray[np.float64] | None = None
 
         # get parser and init functions dict, which is a tuple holding x/y binning and filter
         p = Parser()
@@ -88,6 +218,11 @@ class ExpTimeEval:
                 # parse
                 self._functions = {(None, f): p.parse(func) for f, func in functions.items()}
 
+        # compile all functions once, so that they can be evaluated on whole arrays of solar altitudes
+        self._compiled: dict[tuple[tuple[int, int] | None, str | None], CompiledFunction] = {
+            k: compile_expression(v) for k, v in self._functions.items()
+        }
+
     @staticmethod
     def _bin(binning: str) -> tuple[int, int]:
         """Split binning"""
@@ -110,16 +245,28 @@ class ExpTimeEval:
         """Return list of filters."""
         return self._keys(1)
 
-    def __call__(self, solalt: float, binning: tuple[int, int] | None = None, filter_name: str | None = None) -> float:
+    @overload
+    def __call__(
+        self, solalt: float, binning: tuple[int, int] | None = None, filter_name: str | None = None
+    ) -> float: ...
+
+    @overload
+    def __call__(
+        self, solalt: npt.NDArray[np.float64], binning: tuple[int, int] | None = None, filter_name: str | None = None
+    ) -> npt.NDArray[np.float64]: ...
+
+    def __call__(
+        self, solalt: ArrayLike, binning: tuple[int, int] | None = None, filter_name: str | None = None
+    ) -> Any:
         """Estimate exposure time for given filter
 
         Args:
-            solalt: Solar altitude.
+            solalt: Solar altitude, either a single value or an array.
             binning: Used binning.
             filter_name: Name of filter.
 
         Returns:
-            Estimated exposure time.
+            Estimated exposure time, either a single value or an array with the shape of solalt.
         """
 
         # got binning?
@@ -129,73 +276,110 @@ class ExpTimeEval:
         if len(self.filters) == 0:
             filter_name = None
 
-        # get function and evaluate it
-        exptime = float(self._functions[binning if got_binnings else None, filter_name].evaluate({"h": solalt}))
+        # get function and evaluate it, overflows only happen far outside any useful range and end up as inf
+        with np.errstate(over="ignore"):
+            exptime = self._compiled[binning if got_binnings else None, filter_name](solalt)
 
         # need to scale with exp time?
-        return exptime / (binning[0] * binning[1]) if not got_binnings and binning is not None else exptime
+        if not got_binnings and binning is not None:
+            exptime = exptime / (binning[0] * binning[1])
+        return float(exptime) if np.ndim(exptime) == 0 else exptime
 
-    def init(self, time: Time) -> None:
+    def init(self, time: Time, timespan: float = 600.0, step: float = 600.0) -> None:
         """Initialize object with the given time.
 
+        The solar altitude is computed once for the whole given timespan on a grid with the given step size and is
+        linearly interpolated (and extrapolated beyond the timespan) afterward.
+
         Args:
             time: Start time for all further calculations.
+            timespan: Timespan in seconds after time to precompute the solar altitude for.
+            step: Step size in seconds for the precomputed solar altitudes.
         """
 
         # store time
         self._time = time
 
-        # get sun now and in 10 minutes
-        sun_now = self._observer.sun_altaz(time)  # type: ignore[union-attr]
-        sun_10min = self._observer.sun_altaz(time + TimeDelta(10 * u.minute))  # type: ignore[union-attr]
+        # get offsets for grid, always at least start and end
+        count = max(int(np.ceil(timespan / step)), 1) + 1
+        offsets = np.linspace(0.0, count * step - step, count)
 
-        # get m, b for calculating sun_alt=m*time+b
-        self._b = sun_now.alt.degree
-        self._m = (sun_10min.alt.degree - self._b) / (10.0 * 60.0)
+        # calculate sun altitudes for all of them at once
+        sun = self._observer.sun_altaz(time + offsets * u.second)  # type: ignore[union-attr]
+        self._sun_offsets = offsets
+        self._sun_alts = np.asarray(sun.alt.degree, dtype=float)
+
+    def solar_altitude(self, time_offset: ArrayLike) -> ArrayLike:
+        """Returns solar altitude at the given time offset(s) from the start time (see init).
+
+        Args:
+            time_offset: Offset(s) in seconds from start time.
+
+        Returns:
+            Solar altitude(s) in degrees.
+        """
+        if self._sun_offsets is None or self._sun_alts is None:
+            raise ValueError("Solar altitudes not initialized.")
+        offsets, alts = self._sun_offsets, self._sun_alts
+        t = np.asarray(time_offset, dtype=float)
+
+        # interpolate and extrapolate linearly with slopes at both ends
+        alt = np.interp(t, offsets, alts)
+        alt = np.where(
+            t < offsets[0], alts[0] + (t - offsets[0]) * (alts[1] - alts[0]) / (offsets[1] - offsets[0]), alt
+        )
+        alt = np.where(
+            t > offsets[-1], alts[-1] + (t - offsets[-1]) * (alts[-1] - alts[-2]) / (offsets[-1] - offsets[-2]), alt
+        )
+        return float(alt) if alt.ndim == 0 else alt
 
     def exp_time(
-        self, time_offset: float, binning: tuple[int, int] | None = None, filter_name: str | None = None
-    ) -> float:
+        self, time_offset: ArrayLike, binning: tuple[int, int] | None = None, filter_name: str | None = None
+    ) -> Any:
         """Estimates exposure time for a given filter and binning at a given time offset from the start time (see init).
 
         Args:
-            time_offset: Offset in seconds from start time (see init)
+            time_offset: Offset(s) in seconds from start time (see init)
             binning: Used binning.
             filter_name: Name of filter
 
         Returns:
-            Estimated exposure time
+            Estimated exposure time(s)
         """
-        if self._m is None or self._b is None:
-            raise ValueError("m or b not set.")
-        return self(self._m * time_offset + self._b, binning=binning, filter_name=filter_name)
+        return self(self.solar_altitude(time_offset), binning=binning, filter_name=filter_name)
 
     def duration(
         self,
         count: int,
-        start_time: float = 0,
+        start_time: ArrayLike = 0,
         readout: float = 0,
         binning: tuple[int, int] | None = None,
         filter_name: str | None = None,
-    ) -> float:
+    ) -> Any:
         """Estimates the duration for a given amount of flats in the given filter and binning, starting at the given
         start time.
 
         Args
             count: Number of flats to take.:
-            start_time: Time in seconds to start after the time set in init()
+            start_time: Time(s) in seconds to start after the time set in init()
             readout: Time in seconds for readout per flat
             binning: Used binning.
             filter_name: Name of filter
 
         Returns:
-            Estimated duration in seconds
+            Estimated duration(s) in seconds
         """
 
-        # loop through images and add estimated exposure times at their respective start times
-        elapsed = start_time
+        # loop through images and add estimated exposure times at their respective start times,
+        # this is done for all start times at once
+        start = np.asarray(start_time, dtype=float)
+        elapsed = start.copy()
         for i in range(count):
-            elapsed += self.exp_time(elapsed, binning=binning, filter_name=filter_name) + readout
+            elapsed = elapsed + self.exp_time(elapsed, binning=binning, filter_name=filter_name) + readout
 
         # we started at start_time, so subtract it again
-        return elapsed - start_time
+        duration = elapsed - start
+        return float(duration) if duration.ndim == 0 else duration
+
+
+__all__ = ["ExpTimeEval", "compile_expression"]
@@ -24,6 +24,7 @@ from pyobs.interfaces import (
 from pyobs.object import Object
 from pyobs.utils.enums import ImageType
 from pyobs.utils.fits import fitssec
+from pyobs.utils.imagestatistics import wait_for_image_statistics
 from pyobs.utils.parallel import Future, event_wait
 from pyobs.utils.time import Time
 
@@ -59,6 +60,7 @@ class FlatFielder(Object):
         counts_frame: tuple[float, float, float, float] | None = None,
         allowed_offset_frac: float = 0.2,
         min_counts: int = 100,
+        camera_statistics: bool = True,
         pointing: dict[str, Any] | SkyFlatsBasePointing | None = None,
         callback: Callable[..., Coroutine[Any, Any, None]] | None = None,
         **kwargs: Any,
@@ -77,6 +79,8 @@ class FlatFielder(Object):
             allowed_offset_frac: Offset from target_count (given in fraction of it) that's still allowed for good
                 flat-field
             min_counts: Minimum counts in frames.
+            camera_statistics: Use median computed by the camera instead of downloading images, if the camera
+                provides one via IImageStatistics. Its statistics frame should then match counts_frame.
             observer: Observer to use.
             vfs: VFS to use.
             callback: Callback function for statistics.
@@ -91,6 +95,7 @@ class FlatFielder(Object):
         self._counts_frame = (25, 25, 75, 75) if counts_frame is None else counts_frame
         self._allowed_offset_frac = allowed_offset_frac
         self._min_counts = min_counts
+        self._camera_statistics = camera_statistics
         self._callback = callback
 
         # parse function
@@ -402,7 +407,7 @@ class FlatFielder(Object):
         filename = await self._take_image(camera, broadcast=False)
 
         # analyse image
-        await self._analyse_image(filename)
+        await self._analyse_image(filename, camera)
 
         # then evaluate exposure time
         state = self._eval_exptime()
@@ -456,23 +461,25 @@ class FlatFielder(Object):
                 log.info("Setting camera window to %dx%d at %d,%d...", width, height, left, top)
                 await cam.set_window(left, top, width, height)
 
-    async def _analyse_image(self, filename: str) -> bool:
+    async def _analyse_image(self, filename: str, camera: ICamera | str | None = None) -> bool:
         """Analyze image and return whether it's okay.
 
         Args:
             filename: Filename of image.
+            camera: Camera that took the image, for fetching statistics computed by it.
 
         Returns:
             Whether flat-field is okay.
         """
 
-        # download image
-        flat_field = await self.vfs.read_image(filename)
-        if flat_field is None:
-            return False
-
-        # get median from image
-        self._median = self._get_image_median(flat_field, self._counts_frame)
+        # get median from camera, or download image and calculate it
+        median = await self._get_camera_median(camera, filename)
+        if median is None:
+            flat_field = await self.vfs.read_image(filename)
+            if flat_field is None:
+                return False
+            median = self._get_image_median(flat_field, self._counts_frame)
+        self._median = median
         log.info("Got a flat field with median counts of %.2f.", self._median)
 
         # if count rate is too low, don't use this image to calculate new exposure time
@@ -495,6 +502,16 @@ class FlatFielder(Object):
                 log.info("Calculated new exposure time to be %.2fs.", self._exptime)
                 return True
 
+    async def _get_camera_median(self, camera: ICamera | str | None, filename: str) -> float | None:
+        """Returns median of image as computed by the camera, or None, if not available."""
+        if camera is None or not self._camera_statistics:
+            return None
+        name = camera if isinstance(camera, str) else getattr(camera, "name", None)
+        if name is None:
+            return None
+        statistics = await wait_for_image_statistics(self.comm, name, filename)
+        return None if statistics is None else statistics.get("median")
+
     @staticmethod
     def _get_image_median(image: Image, frame: tuple[float, float, float, float] | None = None) -> float:
         """Returns median of image after trimming it to TRIMSEC and to given frame.
@@ -557,7 +574,7 @@ class FlatFielder(Object):
         filename = await self._take_image(camera)
 
         # analyse image
-        if await self._analyse_image(filename):
+        if await self._analyse_image(filename, camera):
             # increase count and quite here, if finished
             self._exptime_done += self._exptime
             self._exposures_done += 1
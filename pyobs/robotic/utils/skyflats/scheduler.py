@@ -3,6 +3,8 @@ from __future__ import annotations
 import logging
 import operator
 
+import numpy as np
+import numpy.typing as npt
 from astroplan import Observer
 
 from pyobs.utils.time import Time
@@ -54,6 +56,8 @@ class Scheduler:
         filter_change: float = 30,
         count: int = 20,
         readout: dict[str, float] | None = None,
+        time_step: float = 10,
+        sun_step: float = 60,
     ):
         """Initializes a new scheduler for taking flat fields
 
@@ -67,6 +71,8 @@ class Scheduler:
             filter_change: Time required for filter change [s]
             count: Number of flats to schedule
             readout: Dictionary with readout times (in sec) per binning (as BxB).
+            time_step: Step size for possible start times [s]
+            sun_step: Step size for precomputing the solar altitude over the timespan [s]
         """
         self._eval = ExpTimeEval(observer, functions)
         self._observer = observer
@@ -79,6 +85,8 @@ class Scheduler:
         self._filter_change = filter_change
         self._count = count
         self._readout = {} if readout is None else readout
+        self._time_step = time_step
+        self._sun_step = sun_step
 
     async def __call__(self, time: Time) -> None:
         """Calculate schedule starting at given time
@@ -87,18 +95,21 @@ class Scheduler:
             time: Time to start schedule at
         """
 
-        # init evaluator
-        self._eval.init(time)
+        # init evaluator, precompute solar altitude for whole timespan
+        self._eval.init(time, timespan=self._timespan, step=self._sun_step)
 
         # sort filters by priority in a List of (filter, binning, priority) tuples
         tmp = [(k, v) for k, v in (await self._priorities()).items()]
         priorities = sorted(tmp, key=operator.itemgetter(1), reverse=True)
 
+        # all possible start times
+        times = np.arange(0, self._timespan, self._time_step, dtype=float)
+
         # place them
         schedules: list[SchedulerItem] = []
         for (filter_name, binning), priority in priorities:
             # find possible time
-            self._find_slot(schedules, filter_name, binning, priority)
+            self._find_slot(schedules, times, filter_name, binning, priority)
 
         # sort by start time
         self._schedules = sorted(schedules, key=lambda x: x.start)
@@ -122,74 +133,53 @@ class Scheduler:
         return self._schedules[item]
 
     def _find_slot(
-        self, schedules: list[SchedulerItem], filter_name: str, binning: tuple[int, int], priority: float
+        self,
+        schedules: list[SchedulerItem],
+        times: npt.NDArray[np.float64],
+        filter_name: str,
+        binning: tuple[int, int],
+        priority: float,
     ) -> None:
         """Find a possible slot for a given filter/binning in the given schedule
 
         Args:
             schedules: List of existing schedules
+            times: Array of possible start times
             filter_name: Name of filter
             binning: Used binning
         """
 
         # get readout time
-        sbin = f"{binning}x{binning}"
+        sbin = f"{binning[0]}x{binning[1]}"
         readout = self._readout[sbin] if sbin in self._readout else 0.0
 
-        # find first possible start time
-        time = 0
-        while time < self._timespan:
-            # get exposure time
-            exp_time_start = self._eval.exp_time(time, binning=binning, filter_name=filter_name)
-
-            # are we in allowed limit?
-            if self._min_exptime <= exp_time_start <= self._max_exptime:
-                # seems to fit, get duration
-                duration = self._eval.duration(
-                    self._count, start_time=time, readout=readout, binning=binning, filter_name=filter_name
-                )
-
-                # add time for filter change
-                duration += self._filter_change
-
-                # get exp time at end
-                exp_time_end = self._eval.exp_time(time + duration, binning=binning, filter_name=filter_name)
-
-                # still in limits?
-                if self._min_exptime <= exp_time_end <= self._max_exptime:
-                    # check for overlap with existing schedule
-                    if not self._overlaps(schedules, time, time + duration):
-                        # add schedule and quit
-                        schedules.append(SchedulerItem(time, time + duration, filter_name, binning, priority))
-                        return
-
-            # next step
-            time += 10
-
-        # being here means we didn't find any
-        return
-
-    def _overlaps(self, schedules: list[SchedulerItem], start: float, end: float) -> bool:
-        """Checks, whether a new scheduler item would overlap an existing item
-
-        Args:
-            schedules: List of existing scheduler items
-            start: Start time of new item
-            end: End time of new item
+        # get exposure times for all start times and check limits
+        exp_time_start = self._eval.exp_time(times, binning=binning, filter_name=filter_name)
+        valid = (self._min_exptime <= exp_time_start) & (exp_time_start <= self._max_exptime)
+        if not np.any(valid):
+            return
+
+        # durations for all start times, including time for filter change
+        durations = (
+            self._eval.duration(
+                self._count, start_time=times, readout=readout, binning=binning, filter_name=filter_name
+            )
+            + self._filter_change
+        )
 
-        Returns:
-            Whether it overlaps
-        """
+        # exposure times at end still in limits?
+        exp_time_end = self._eval.exp_time(times + durations, binning=binning, filter_name=filter_name)
+        valid &= (self._min_exptime <= exp_time_end) & (exp_time_end <= self._max_exptime)
 
-        # loop all scheduler items
-        item: SchedulerItem
+        # remove all slots that overlap with existing schedules
+        ends = times + durations
         for item in schedules:
-            # does it overlap?
-            if (start < item.end and end > item.start) or (item.start < end and item.end > start):
-                return True
+            valid &= ~((times < item.end) & (ends > item.start))
 
-        # no overlap found
-        return False
+        # take first possible start time, if any
+        if np.any(valid):
+            idx = int(np.argmax(valid))
+            schedules.append(SchedulerItem(float(times[idx]), float(ends[idx]), filter_name, binning, priority))
 
 
 __all__ = ["SchedulerItem", "Scheduler"]
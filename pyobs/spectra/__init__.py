@@ -0,0 +1,10 @@
+"""
+Some info about :class:`pyobs.spectra.Spectrum`.
+"""
+
+__title__ = "Spectra"
+
+from .processor import SpectrumProcessor
+from .spectrum import Spectrum
+
+__all__ = ["Spectrum", "SpectrumProcessor"]
@@ -0,0 +1,3 @@
+from .snr import SignalToNoise
+
+__all__ = ["SignalToNoise"]
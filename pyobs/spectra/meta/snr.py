@@ -0,0 +1,6 @@
+class SignalToNoise:
+    def __init__(self, snr: float):
+        self.snr = snr
+
+
+__all__ = ["SignalToNoise"]
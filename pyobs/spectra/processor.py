@@ -0,0 +1,75 @@
+import os
+from abc import ABCMeta, abstractmethod
+from typing import Any
+
+from pyobs.object import Object
+from pyobs.spectra.spectrum import Spectrum
+from pyobs.utils.exceptions import SpectrumError
+
+
+class SpectrumProcessor(Object, metaclass=ABCMeta):
+    """Base class for all spectrum processors, the counterpart of :class:`~pyobs.images.ImageProcessor`."""
+
+    VALID_ERROR_MODES = frozenset(("raise", "error", "info", "ignore"))
+
+    def __init__(self, on_error: str = "raise", **kwargs: Any):
+        """Init new spectrum processor.
+
+        Args:
+            on_error: How the pipeline should handle a SpectrumError raised by this step. One of:
+                - "raise" (default): re-raise the exception, aborting the pipeline.
+                - "error": call handle_error(), pass its return value downstream.
+                - "info": log at INFO level, pass the pre-step spectrum downstream unmodified.
+                - "ignore": silently pass the pre-step spectrum downstream unmodified.
+        """
+        Object.__init__(self, **kwargs)
+
+        self._on_error = on_error
+        if self._on_error not in self.VALID_ERROR_MODES:
+            raise ValueError(f"on_error must be one of {sorted(self.VALID_ERROR_MODES)}, got {self._on_error!r}.")
+
+    @property
+    def on_error(self) -> str:
+        """The error handling mode for this step."""
+        return self._on_error
+
+    @abstractmethod
+    async def __call__(self, spectrum: Spectrum) -> Spectrum:
+        """Processes a spectrum.
+
+        Args:
+            spectrum: Spectrum to process.
+
+        Returns:
+            Processed spectrum.
+        """
+
+    def handle_error(self, spectrum: Spectrum, error: SpectrumError) -> Spectrum:
+        """Handle a SpectrumError raised by this step, when on_error == "error".
+
+        The default implementation re-raises the error.
+
+        Args:
+            spectrum: The spectrum that caused the error.
+            error: The SpectrumError that was raised.
+
+        Returns:
+            The spectrum to pass to the next pipeline step.
+        """
+        raise error
+
+    async def _modification_time(self, filename: str) -> float | None:
+        """Returns the modification time of a file in the VFS, or None, if it is not a local file or doesn't exist.
+
+        Used for invalidating cached data derived from the file, after it has been replaced.
+        """
+        try:
+            return os.path.getmtime(await self.vfs.local_path(filename))
+        except (ValueError, OSError):
+            return None
+
+    async def reset(self) -> None:
+        """Resets state of spectrum processor"""
+
+
+__all__ = ["SpectrumProcessor"]
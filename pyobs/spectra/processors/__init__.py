@@ -0,0 +1,22 @@
+"""
+Spectrum processors are the counterpart of the image processors in :mod:`pyobs.images.processors`: each one
+accepts a :class:`pyobs.spectra.Spectrum` and returns a (possibly modified) copy, so they can be composed into
+pipelines, e.g. for a quick-look reduction in :class:`~pyobs.modules.camera.BaseSpectrograph`:
+
+.. code-block:: yaml
+
+  quicklook:
+  - class: pyobs.spectra.processors.calibration.SpectrumCalibration
+    bias: /archive/masters/bias.fits
+  - class: pyobs.spectra.processors.extraction.ExtractSpectrum
+    aperture: 12
+  - class: pyobs.spectra.processors.wavelength.ArcWavelengthSolution
+    arc: /archive/masters/arc.fits
+    lines: [5852.49, 5881.90, 5944.83, 5975.53, 6030.00]
+    guess: [5800.0, 0.5]
+  - class: pyobs.spectra.processors.misc.EstimateSNR
+  - class: pyobs.spectra.processors.exptime.SNRExpTimeEstimator
+    target_snr: 100
+"""
+
+__title__ = "Spectrum processors"
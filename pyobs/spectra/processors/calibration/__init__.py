@@ -0,0 +1,5 @@
+__title__ = "Calibration"
+
+from .calibration import SpectrumCalibration
+
+__all__ = ["SpectrumCalibration"]
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from typing import Any, ClassVar
+
+import numpy as np
+import numpy.typing as npt
+
+from pyobs.spectra import Spectrum, SpectrumProcessor
+from pyobs.utils.exceptions import SpectrumError
+
+log = logging.getLogger(__name__)
+
+
+class SpectrumCalibration(SpectrumProcessor):
+    """
+    Calibrate the raw frame of a spectrum using master bias, dark, and flat frames.
+
+    The master frames are given as filenames in the VFS. They are loaded on first use and kept in a cache that is
+    shared by all instances of this class, so that a spectrograph running the same quick-look pipeline on every
+    exposure reads each master frame only once, and a local one again only after it has been replaced. The dark is
+    scaled to the exposure time of the spectrum, the flat is normalised to a median of one.
+
+    Configuration (YAML)
+    --------------------
+
+    .. code-block:: yaml
+
+       class: pyobs.spectra.processors.calibration.SpectrumCalibration
+       bias: /archive/masters/bias.fits
+       flat: /archive/masters/flat.fits
+    """
+
+    __module__ = "pyobs.spectra.processors.calibration"
+
+    """Cache for master frames, maps filenames and modification times to data and exposure time."""
+    _cache: ClassVar[OrderedDict[tuple[str, float | None], tuple[npt.NDArray[np.float32], float | None]]] = (
+        OrderedDict()
+    )
+
+    def __init__(
+        self,
+        bias: str | None = None,
+        dark: str | None = None,
+        flat: str | None = None,
+        max_cache_size: int = 10,
+        **kwargs: Any,
+    ):
+        """Init a new spectrum calibration step.
+
+        Args:
+            bias: Filename of master bias.
+            dark: Filename of master dark, bias-subtracted.
+            flat: Filename of master flat, bias- and dark-subtracted.
+            max_cache_size: Maximum number of master frames kept in the shared cache.
+        """
+        SpectrumProcessor.__init__(self, **kwargs)
+        self._bias = bias
+        self._dark = dark
+        self._flat = flat
+        self._max_cache_size = max_cache_size
+
+    async def _load(self, filename: str) -> tuple[npt.NDArray[np.float32], float | None]:
+        """Loads a master frame, either from cache or from the VFS, if it has been changed since it was cached."""
+        key = (filename, await self._modification_time(filename))
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        log.info("Loading master frame %s...", filename)
+        try:
+            image = await self.vfs.read_image(filename)
+        except FileNotFoundError:
+            raise SpectrumError(f"Could not load master frame {filename}.")
+        exptime = float(image.header["EXPTIME"]) if "EXPTIME" in image.header else None
+        entry = (np.asarray(image.data, dtype=np.float32), exptime)
+
+        # store in cache
+        for k in [k for k in self._cache if k[0] == filename]:
+            del self._cache[k]
+        self._cache[key] = entry
+        while len(self._cache) > self._max_cache_size:
+            self._cache.popitem(last=False)
+        return entry
+
+    async def __call__(self, spectrum: Spectrum) -> Spectrum:
+        """Calibrate raw frame of spectrum.
+
+        Args:
+            spectrum: Spectrum to calibrate.
+
+        Returns:
+            Calibrated spectrum.
+
+        Raises:
+            SpectrumError: If the spectrum has no raw frame or a master frame doesn't match it.
+        """
+        if spectrum.safe_data is None:
+            raise SpectrumError("Spectrum contains no raw frame to calibrate.")
+        data = spectrum.data.astype(np.float32)
+        output = spectrum.copy()
+
+        # bias
+        if self._bias is not None:
+            bias, _ = await self._load(self._bias)
+            data -= self._check_shape(bias, data, self._bias)
+            output.header["L1BIAS"] = (self._bias, "Master bias")
+
+        # dark, scaled to exposure time
+        if self._dark is not None:
+            dark, dark_exptime = await self._load(self._dark)
+            scale = 1.0
+            if dark_exptime and spectrum.exposure_time is not None:
+                scale = spectrum.exposure_time / dark_exptime
+            data -= scale * self._check_shape(dark, data, self._dark)
+            output.header["L1DARK"] = (self._dark, "Master dark")
+
+        # flat, normalised
+        if self._flat is not None:
+            flat, _ = await self._load(self._flat)
+            flat = self._check_shape(flat, data, self._flat)
+            norm = flat / np.nanmedian(flat)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                data = np.where(norm > 0, data / norm, 0.0).astype(np.float32)
+            output.header["L1FLAT"] = (self._flat, "Master flat")
+
+        output.data = data
+        output.header["RLEVEL"] = (1, "Reduction level")
+        return output
+
+    @staticmethod
+    def _check_shape(
+        master: npt.NDArray[np.float32], data: npt.NDArray[np.float32], filename: str
+    ) -> npt.NDArray[np.float32]:
+        if master.shape != data.shape:
+            raise SpectrumError(f"Shape of master frame {filename} {master.shape} doesn't match {data.shape}.")
+        return master
+
+
+__all__ = ["SpectrumCalibration"]
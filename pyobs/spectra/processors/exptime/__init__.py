@@ -0,0 +1,5 @@
+__title__ = "Exposure Time estimators"
+
+from .snr import SNRExpTimeEstimator
+
+__all__ = ["SNRExpTimeEstimator"]
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import numpy as np
+
+from pyobs.images.meta import ExpTime
+from pyobs.spectra import Spectrum, SpectrumProcessor
+from pyobs.spectra.meta import SignalToNoise
+from pyobs.spectra.processors.misc.snr import estimate_snr
+from pyobs.utils.exceptions import SpectrumError
+
+log = logging.getLogger(__name__)
+
+
+class SNRExpTimeEstimator(SpectrumProcessor):
+    """
+    Estimate the exposure time required to reach a target signal-to-noise ratio.
+
+    The S/N of the spectrum is taken from its :class:`~pyobs.spectra.meta.SignalToNoise` meta information or
+    estimated, if missing. Assuming that the S/N is limited by photon noise, it grows with the square root of
+    the exposure time, so the required exposure time is EXPTIME * (target / S/N)^2. The result is clipped to the
+    given limits and stored as :class:`~pyobs.images.meta.ExpTime` meta information, just like the exposure time
+    estimators for images, and in the SNREXPT header. Whether the target was reached is written to SNRDONE.
+    """
+
+    __module__ = "pyobs.spectra.processors.exptime"
+
+    def __init__(self, target_snr: float, min_exp_time: float = 0.0, max_exp_time: float | None = None, **kwargs: Any):
+        """Init a new exposure time estimator.
+
+        Args:
+            target_snr: Signal-to-noise ratio to reach.
+            min_exp_time: Minimum exposure time.
+            max_exp_time: Maximum exposure time.
+        """
+        SpectrumProcessor.__init__(self, **kwargs)
+        self._target_snr = target_snr
+        self._min_exp_time = min_exp_time
+        self._max_exp_time = max_exp_time
+
+    async def __call__(self, spectrum: Spectrum) -> Spectrum:
+        """Estimate required exposure time.
+
+        Args:
+            spectrum: Extracted spectrum.
+
+        Returns:
+            Spectrum with exposure time.
+
+        Raises:
+            SpectrumError: If spectrum has no exposure time or S/N could not be determined.
+        """
+        exp_time = spectrum.exposure_time
+        if exp_time is None or exp_time <= 0:
+            raise SpectrumError("Spectrum has no valid exposure time.")
+
+        # get S/N
+        meta = spectrum.get_meta_safe(SignalToNoise)
+        snr = meta.snr if meta is not None else None
+        if snr is None and spectrum.safe_flux is not None:
+            snr = estimate_snr(spectrum)
+        if snr is None or snr <= 0:
+            raise SpectrumError("Could not determine S/N of spectrum.")
+
+        # scale exposure time
+        new_exp_time = float(np.clip(exp_time * (self._target_snr / snr) ** 2, self._min_exp_time, self._max_exp_time))
+        log.info("S/N %.1f in %.1fs, need %.1fs for S/N %.1f.", snr, exp_time, new_exp_time, self._target_snr)
+
+        output = spectrum.copy()
+        output.set_meta(ExpTime(new_exp_time))
+        output.header["SNREXPT"] = (new_exp_time, f"Exposure time for S/N={self._target_snr:g}")
+        output.header["SNRDONE"] = (bool(snr >= self._target_snr), "Whether target S/N has been reached")
+        return output
+
+
+__all__ = ["SNRExpTimeEstimator"]
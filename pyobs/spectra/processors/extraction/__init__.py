@@ -0,0 +1,5 @@
+__title__ = "Extraction"
+
+from .extract import ExtractSpectrum
+
+__all__ = ["ExtractSpectrum"]
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+from scipy.ndimage import uniform_filter1d
+
+from pyobs.spectra import Spectrum, SpectrumProcessor
+from pyobs.utils.exceptions import SpectrumError
+
+log = logging.getLogger(__name__)
+
+
+class ExtractSpectrum(SpectrumProcessor):
+    """
+    Extract a one-dimensional spectrum from the raw frame of a spectrum.
+
+    The trace of the spectrum is found by collapsing the frame into bins along the dispersion axis, locating the
+    peak of the spatial profile in each bin and fitting a polynomial to the centroids. The flux is then summed in
+    an aperture around the trace, with fractional weights for pixels on its edges, after subtracting the median
+    background from two bands on both sides of the trace. Alternatively, an optimal (profile-weighted) extraction
+    can be used. All steps work on whole arrays at once, there is no loop over the columns of the frame.
+
+    Uncertainties are computed from the photon noise of the raw counts and the read noise, using the GAIN and
+    RDNOISE headers, if not given explicitly.
+
+    The dispersion axis is taken from the DISPAXIS header (1: along rows, 2: along columns), defaulting to 1.
+    """
+
+    __module__ = "pyobs.spectra.processors.extraction"
+
+    def __init__(
+        self,
+        aperture: float = 10.0,
+        background: tuple[float, float] | None = (15.0, 25.0),
+        optimal: bool = False,
+        trace_bin: int = 32,
+        trace_degree: int = 3,
+        trace_center: float | None = None,
+        gain: float | None = None,
+        read_noise: float | None = None,
+        **kwargs: Any,
+    ):
+        """Init a new extraction step.
+
+        Args:
+            aperture: Full width of extraction aperture in pixels.
+            background: Inner and outer distance in pixels from trace of background bands, None for no background.
+            optimal: Use optimal extraction instead of a simple sum over the aperture.
+            trace_bin: Number of pixels along the dispersion axis to combine for tracing.
+            trace_degree: Degree of polynomial fitted to trace.
+            trace_center: If given, only search trace within an aperture around this position.
+            gain: Gain in electrons per ADU, defaults to GAIN header or 1.
+            read_noise: Read noise in electrons, defaults to RDNOISE header or 0.
+        """
+        SpectrumProcessor.__init__(self, **kwargs)
+        self._aperture = aperture
+        self._background = background
+        self._optimal = optimal
+        self._trace_bin = trace_bin
+        self._trace_degree = trace_degree
+        self._trace_center = trace_center
+        self._gain = gain
+        self._read_noise = read_noise
+
+    async def __call__(self, spectrum: Spectrum) -> Spectrum:
+        """Extract spectrum.
+
+        Args:
+            spectrum: Spectrum with raw frame.
+
+        Returns:
+            Spectrum with extracted flux, uncertainties and trace.
+
+        Raises:
+            SpectrumError: If spectrum contains no raw frame or trace could not be found.
+        """
+        if spectrum.safe_data is None or spectrum.data.ndim != 2:
+            raise SpectrumError("Spectrum contains no two-dimensional raw frame.")
+
+        # rotate, so that dispersion goes along rows
+        data = spectrum.data.astype(np.float64)
+        if int(spectrum.header.get("DISPAXIS", 1)) == 2:
+            data = data.T
+
+        gain = self._gain if self._gain is not None else float(spectrum.header.get("GAIN", 1.0))
+        read_noise = self._read_noise if self._read_noise is not None else float(spectrum.header.get("RDNOISE", 0.0))
+
+        # extract
+        trace = self.find_trace(data)
+        flux, uncertainty = self.extract(data, trace, gain, read_noise)
+
+        # output
+        output = spectrum.copy()
+        output.flux = flux.astype(np.float32)
+        output.uncertainty = uncertainty.astype(np.float32)
+        output.trace = trace
+        output.header["EXTRACT"] = ("optimal" if self._optimal else "boxcar", "Extraction method")
+        output.header["APWIDTH"] = (self._aperture, "Width of extraction aperture [px]")
+        output.header["TRACEPOS"] = (float(np.median(trace)), "Median position of trace [px]")
+        return output
+
+    def find_trace(self, data: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Finds the trace of the spectrum on a frame with the dispersion along rows.
+
+        Args:
+            data: Raw frame.
+
+        Returns:
+            Position of the trace for every column.
+        """
+        ny, nx = data.shape
+        nbins = max(1, nx // self._trace_bin)
+        width = nx // nbins
+
+        # collapse bins along dispersion axis and remove background from profiles
+        binned = np.median(data[:, : nbins * width].reshape(ny, nbins, width), axis=2)
+        binned -= np.median(binned, axis=0)
+        xs = (np.arange(nbins) + 0.5) * width - 0.5
+
+        # only search around given center
+        if self._trace_center is not None:
+            rows = np.arange(ny)[:, None]
+            binned = np.where(np.abs(rows - self._trace_center) <= self._aperture, binned, -np.inf)
+
+        # centroids around peaks of all profiles at once
+        peaks = np.argmax(binned, axis=0)
+        half = max(1, int(np.ceil(self._aperture / 2)))
+        offsets = np.arange(-half, half + 1)[:, None]
+        rows = np.clip(peaks[None, :] + offsets, 0, ny - 1)
+        values = np.clip(np.take_along_axis(binned, rows, axis=0), 0.0, None)
+        total = np.sum(values, axis=0)
+        valid = total > 0
+        if np.sum(valid) == 0:
+            raise SpectrumError("Could not find trace of spectrum.")
+        centroids = np.sum(rows * values, axis=0)[valid] / total[valid]
+
+        # fit polynomial, weighted by signal
+        degree = min(self._trace_degree, int(np.sum(valid)) - 1)
+        coeffs = np.polyfit(xs[valid], centroids, degree, w=np.sqrt(total[valid]))
+        return np.asarray(np.polyval(coeffs, np.arange(nx)), dtype=np.float64)
+
+    def extract(
+        self, data: npt.NDArray[np.float64], trace: npt.NDArray[np.float64], gain: float, read_noise: float
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """Extracts the spectrum along the given trace.
+
+        Args:
+            data: Raw frame with dispersion along rows.
+            trace: Position of trace for every column.
+            gain: Gain in electrons per ADU.
+            read_noise: Read noise in electrons.
+
+        Returns:
+            Tuple of flux and its uncertainty, both in ADU.
+        """
+
+        # distance of every pixel from trace
+        distance = np.arange(data.shape[0])[:, None] - trace[None, :]
+        absdist = np.abs(distance)
+
+        # aperture with fractional weights at its edges
+        weights = np.clip(self._aperture / 2.0 + 0.5 - absdist, 0.0, 1.0)
+
+        # background from bands on both sides
+        sky = np.zeros(data.shape[1])
+        sky_var = np.zeros(data.shape[1])
+        if self._background is not None:
+            inner, outer = self._background
+            band = (absdist >= inner) & (absdist <= outer)
+            masked = np.where(band, data, np.nan)
+            counts = np.sum(band, axis=0)
+            if np.all(counts > 0):
+                sky = np.nanmedian(masked, axis=0)
+                sky_var = (np.pi / 2.0) * np.nanvar(masked, axis=0) / counts
+        signal = data - sky[None, :]
+
+        # variance of every pixel in ADU
+        variance = np.clip(data, 0.0, None) / gain + (read_noise / gain) ** 2
+
+        if not self._optimal:
+            flux = np.sum(weights * signal, axis=0)
+            var = np.sum(weights**2 * variance, axis=0) + np.sum(weights, axis=0) ** 2 * sky_var
+            return flux, np.sqrt(var)
+
+        # spatial profile, normalised per column and smoothed along dispersion
+        profile = np.clip(weights * signal, 0.0, None)
+        profile = uniform_filter1d(profile, size=self._trace_bin, axis=1, mode="nearest")
+        norm = np.sum(profile, axis=0)
+        profile = np.divide(profile, norm, out=np.zeros_like(profile), where=norm > 0)
+
+        # optimal extraction
+        denominator = np.sum(profile**2 / variance, axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            flux = np.where(denominator > 0, np.sum(profile * signal / variance, axis=0) / denominator, 0.0)
+            var = np.where(denominator > 0, 1.0 / denominator, np.inf) + sky_var
+        return flux, np.sqrt(var)
+
+
+__all__ = ["ExtractSpectrum"]
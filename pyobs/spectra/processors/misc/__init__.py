@@ -0,0 +1,6 @@
+__title__ = "Miscellaneous"
+
+from .normalize import NormalizeContinuum
+from .snr import EstimateSNR
+
+__all__ = ["EstimateSNR", "NormalizeContinuum"]
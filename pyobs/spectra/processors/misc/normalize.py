@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import numpy as np
+
+from pyobs.spectra import Spectrum, SpectrumProcessor
+from pyobs.utils.exceptions import SpectrumError
+
+log = logging.getLogger(__name__)
+
+
+class NormalizeContinuum(SpectrumProcessor):
+    """
+    Normalise an extracted spectrum to its continuum.
+
+    The continuum is fitted with a polynomial, iteratively rejecting pixels that deviate more than the given
+    number of standard deviations below or above the fit, so that absorption and emission lines are ignored. Flux
+    and uncertainties are divided by the fitted continuum.
+    """
+
+    __module__ = "pyobs.spectra.processors.misc"
+
+    def __init__(self, degree: int = 5, iterations: int = 5, low: float = 1.5, high: float = 3.0, **kwargs: Any):
+        """Init a new normalisation step.
+
+        Args:
+            degree: Degree of continuum polynomial.
+            iterations: Number of clipping iterations.
+            low: Reject pixels this many standard deviations below the continuum.
+            high: Reject pixels this many standard deviations above the continuum.
+        """
+        SpectrumProcessor.__init__(self, **kwargs)
+        self._degree = degree
+        self._iterations = iterations
+        self._low = low
+        self._high = high
+
+    async def __call__(self, spectrum: Spectrum) -> Spectrum:
+        """Normalise spectrum.
+
+        Args:
+            spectrum: Extracted spectrum.
+
+        Returns:
+            Normalised spectrum.
+
+        Raises:
+            SpectrumError: If spectrum has not been extracted or continuum could not be fitted.
+        """
+        if spectrum.safe_flux is None:
+            raise SpectrumError("Spectrum has not been extracted.")
+        flux = np.asarray(spectrum.flux, dtype=np.float64)
+        x = np.arange(len(flux), dtype=np.float64)
+
+        # iterative fit
+        use = np.isfinite(flux)
+        continuum = np.ones_like(flux)
+        for _ in range(self._iterations):
+            if np.sum(use) <= self._degree:
+                raise SpectrumError("Not enough pixels for fitting continuum.")
+            poly = np.polynomial.Polynomial.fit(x[use], flux[use], self._degree)
+            continuum = poly(x)
+            residuals = flux - continuum
+            std = np.std(residuals[use])
+            new_use = np.isfinite(flux) & (residuals > -self._low * std) & (residuals < self._high * std)
+            if np.array_equal(new_use, use):
+                break
+            use = new_use
+
+        # normalise
+        if np.any(continuum[np.isfinite(flux)] <= 0):
+            raise SpectrumError("Fitted continuum is not positive.")
+        output = spectrum.copy()
+        output.flux = (flux / continuum).astype(np.float32)
+        if spectrum.safe_uncertainty is not None:
+            output.uncertainty = (spectrum.uncertainty / continuum).astype(np.float32)
+        output.header["CONTNORM"] = (True, "Spectrum is normalised to continuum")
+        return output
+
+
+__all__ = ["NormalizeContinuum"]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from pyobs.spectra import Spectrum, SpectrumProcessor
+from pyobs.spectra.meta import SignalToNoise
+from pyobs.utils.exceptions import SpectrumError
+
+log = logging.getLogger(__name__)
+
+
+def estimate_snr(
+    spectrum: Spectrum, window: tuple[float, float] | None = None, use_uncertainty: bool = True
+) -> float | None:
+    """Estimates the median signal-to-noise ratio of an extracted spectrum.
+
+    If uncertainties are available, the median of flux over uncertainty is used. Otherwise the DER_SNR algorithm
+    (Stoehr et al. 2008) estimates the noise from the flux alone.
+
+    Args:
+        spectrum: Extracted spectrum.
+        window: Range in wavelength (or pixels, if no wavelength solution exists) to estimate S/N in.
+        use_uncertainty: Whether to use uncertainties, if available.
+
+    Returns:
+        Estimated S/N or None, if there are not enough valid pixels.
+    """
+    flux = np.asarray(spectrum.flux, dtype=np.float64)
+    uncertainty = spectrum.safe_uncertainty if use_uncertainty else None
+
+    # select window
+    valid = np.isfinite(flux)
+    if window is not None:
+        x = spectrum.safe_wavelength if spectrum.safe_wavelength is not None else np.arange(len(flux))
+        valid &= (x >= window[0]) & (x <= window[1])
+
+    if uncertainty is not None:
+        uncertainty = np.asarray(uncertainty, dtype=np.float64)
+        valid &= np.isfinite(uncertainty) & (uncertainty > 0)
+        if np.sum(valid) == 0:
+            return None
+        return float(np.median(flux[valid] / uncertainty[valid]))
+
+    return _der_snr(flux[valid])
+
+
+def _der_snr(flux: npt.NDArray[np.float64]) -> float | None:
+    """DER_SNR estimate for the given flux values."""
+    if len(flux) < 5:
+        return None
+    signal = np.median(flux)
+    noise = 0.6052697 * np.median(np.abs(2.0 * flux[2:-2] - flux[:-4] - flux[4:]))
+    return float(signal / noise) if noise > 0 else None
+
+
+class EstimateSNR(SpectrumProcessor):
+    """
+    Estimate the signal-to-noise ratio of an extracted spectrum.
+
+    The S/N is stored as :class:`~pyobs.spectra.meta.SignalToNoise` meta information and in the SNR header. If
+    uncertainties are available, the median of flux over uncertainty is used, otherwise the DER_SNR algorithm
+    estimates the noise from the flux alone.
+    """
+
+    __module__ = "pyobs.spectra.processors.misc"
+
+    def __init__(self, window: tuple[float, float] | None = None, use_uncertainty: bool = True, **kwargs: Any):
+        """Init a new S/N estimator.
+
+        Args:
+            window: Range in wavelength (or pixels, if no wavelength solution exists) to estimate S/N in.
+            use_uncertainty: Whether to use uncertainties, if available.
+        """
+        SpectrumProcessor.__init__(self, **kwargs)
+        self._window = window
+        self._use_uncertainty = use_uncertainty
+
+    async def __call__(self, spectrum: Spectrum) -> Spectrum:
+        """Estimate S/N of spectrum.
+
+        Args:
+            spectrum: Extracted spectrum.
+
+        Returns:
+            Spectrum with S/N.
+
+        Raises:
+            SpectrumError: If spectrum has not been extracted or S/N could not be estimated.
+        """
+        if spectrum.safe_flux is None:
+            raise SpectrumError("Spectrum has not been extracted.")
+        snr = estimate_snr(spectrum, self._window, self._use_uncertainty)
+        if snr is None:
+            raise SpectrumError("Could not estimate S/N of spectrum.")
+
+        output = spectrum.copy()
+        output.set_meta(SignalToNoise(snr))
+        output.header["SNR"] = (snr, "Median signal-to-noise ratio")
+        log.info("Estimated S/N of spectrum: %.1f", snr)
+        return output
+
+
+__all__ = ["EstimateSNR", "estimate_snr"]
@@ -0,0 +1,5 @@
+__title__ = "Wavelength calibration"
+
+from .arcsolution import ArcWavelengthSolution
+
+__all__ = ["ArcWavelengthSolution"]
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, ClassVar
+
+import numpy as np
+import numpy.typing as npt
+
+from pyobs.spectra import Spectrum, SpectrumProcessor
+from pyobs.utils.exceptions import SpectrumError
+
+log = logging.getLogger(__name__)
+
+
+class ArcWavelengthSolution(SpectrumProcessor):
+    """
+    Calibrate the wavelengths of an extracted spectrum using an arc frame.
+
+    The arc is loaded from the VFS and, if it is a raw frame, extracted along the trace of the spectrum. Emission
+    lines are detected as local maxima above a noise threshold and refined to sub-pixel positions. Starting from an
+    initial guess for the dispersion, the detected lines are matched to the given reference wavelengths and a
+    polynomial is fitted iteratively, rejecting outliers. The solution is cached per arc, trace position and
+    parameters, so it is only computed once for a series of exposures, and again after a local arc has been replaced.
+
+    The coefficients of the solution are written to the header as WAVEC0, WAVEC1, ..., together with its RMS
+    (WAVERMS) and the number of lines used (WAVENLIN).
+
+    Configuration (YAML)
+    --------------------
+
+    .. code-block:: yaml
+
+       class: pyobs.spectra.processors.wavelength.ArcWavelengthSolution
+       arc: /archive/masters/arc.fits
+       lines: [5852.49, 5881.90, 5944.83, 5975.53, 6030.00, 6074.34, 6096.16, 6143.06]
+       guess: [5800.0, 0.5]
+    """
+
+    __module__ = "pyobs.spectra.processors.wavelength"
+
+    """Cache for solutions, maps arc filename and modification time, trace position and solver parameters to
+    coefficients, RMS and number of lines."""
+    _cache: ClassVar[dict[tuple[Any, ...], tuple[npt.NDArray[np.float64], float, int]]] = {}
+
+    def __init__(
+        self,
+        arc: str,
+        lines: list[float],
+        guess: list[float],
+        degree: int = 3,
+        tolerance: float = 3.0,
+        threshold: float = 5.0,
+        iterations: int = 5,
+        sigma: float = 3.0,
+        **kwargs: Any,
+    ):
+        """Init a new wavelength calibration step.
+
+        Args:
+            arc: Filename of arc frame or extracted arc spectrum in the VFS.
+            lines: Reference wavelengths of arc lines.
+            guess: Initial guess for the polynomial coefficients of the solution, lowest order first.
+            degree: Degree of polynomial to fit.
+            tolerance: Maximum difference in wavelength for matching a detected to a reference line.
+            threshold: Detection threshold for arc lines in units of the noise.
+            iterations: Number of iterations for matching lines and fitting the solution.
+            sigma: Lines with residuals larger than this many times the RMS are rejected.
+        """
+        SpectrumProcessor.__init__(self, **kwargs)
+        self._arc = arc
+        self._lines = np.sort(np.asarray(lines, dtype=np.float64))
+        if len(self._lines) < 2:
+            raise ValueError("At least two reference lines are required.")
+        self._guess = np.asarray(guess, dtype=np.float64)
+        self._degree = degree
+        self._tolerance = tolerance
+        self._threshold = threshold
+        self._iterations = iterations
+        self._sigma = sigma
+
+    async def __call__(self, spectrum: Spectrum) -> Spectrum:
+        """Calibrate wavelengths of spectrum.
+
+        Args:
+            spectrum: Extracted spectrum.
+
+        Returns:
+            Spectrum with wavelengths.
+
+        Raises:
+            SpectrumError: If spectrum has not been extracted or no solution could be found.
+        """
+        if spectrum.safe_flux is None:
+            raise SpectrumError("Spectrum has not been extracted.")
+
+        # get solution
+        trace = spectrum.safe_trace
+        key = (
+            self._arc,
+            await self._modification_time(self._arc),
+            0 if trace is None else int(round(float(np.median(trace)))),
+            tuple(self._lines),
+            tuple(self._guess),
+            self._degree,
+            self._tolerance,
+            self._threshold,
+            self._iterations,
+            self._sigma,
+        )
+        if key not in self._cache:
+            arc = await self._load_arc(spectrum)
+            self._cache[key] = self.solve(arc)
+        coeffs, rms, nlines = self._cache[key]
+
+        # apply it
+        output = spectrum.copy()
+        output.wavelength = np.polynomial.polynomial.polyval(np.arange(len(spectrum.flux)), coeffs)
+        for i, c in enumerate(coeffs):
+            output.header[f"WAVEC{i}"] = (float(c), f"Wavelength solution, coefficient {i}")
+        output.header["WAVERMS"] = (rms, "RMS of wavelength solution")
+        output.header["WAVENLIN"] = (nlines, "Number of lines in wavelength solution")
+        output.header["WAVEARC"] = (self._arc, "Arc used for wavelength solution")
+        return output
+
+    async def _load_arc(self, spectrum: Spectrum) -> npt.NDArray[np.float64]:
+        """Loads arc and extracts it along trace of spectrum, if necessary."""
+        try:
+            hdulist = await self.vfs.read_fits(self._arc)
+        except FileNotFoundError:
+            raise SpectrumError(f"Could not load arc {self._arc}.")
+        arc = Spectrum.from_hdulist(hdulist)
+        if arc.safe_flux is not None:
+            return np.asarray(arc.flux, dtype=np.float64)
+        if arc.safe_data is None or spectrum.safe_trace is None:
+            raise SpectrumError("Arc is a raw frame, but spectrum has no trace to extract it.")
+
+        # sum arc over aperture around trace
+        data = arc.data.astype(np.float64)
+        if int(arc.header.get("DISPAXIS", 1)) == 2:
+            data = data.T
+        aperture = float(spectrum.header.get("APWIDTH", 10.0))
+        distance = np.abs(np.arange(data.shape[0])[:, None] - spectrum.trace[None, :])
+        weights = np.clip(aperture / 2.0 + 0.5 - distance, 0.0, 1.0)
+        return np.asarray(np.sum(weights * data, axis=0))
+
+    def find_lines(self, arc: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Detects emission lines in an extracted arc.
+
+        Args:
+            arc: Extracted arc spectrum.
+
+        Returns:
+            Sub-pixel positions of detected lines.
+        """
+
+        # noise from median absolute deviation
+        background = np.median(arc)
+        noise = 1.4826 * np.median(np.abs(arc - background))
+        if noise <= 0:
+            noise = np.std(arc)
+
+        # local maxima above threshold
+        y0, y1, y2 = arc[:-2], arc[1:-1], arc[2:]
+        peaks = np.nonzero((y1 > y0) & (y1 >= y2) & (y1 - background > self._threshold * noise))[0]
+
+        # refine with parabola through maximum and its neighbours
+        a, b, c = y0[peaks], y1[peaks], y2[peaks]
+        denominator = a - 2.0 * b + c
+        shift = np.divide(0.5 * (a - c), denominator, out=np.zeros_like(b), where=denominator != 0)
+        return peaks + 1.0 + np.clip(shift, -0.5, 0.5)
+
+    def solve(self, arc: npt.NDArray[np.float64]) -> tuple[npt.NDArray[np.float64], float, int]:
+        """Finds the wavelength solution for an extracted arc.
+
+        Args:
+            arc: Extracted arc spectrum.
+
+        Returns:
+            Tuple of polynomial coefficients (lowest order first), RMS, and number of lines used.
+
+        Raises:
+            SpectrumError: If not enough lines could be matched.
+        """
+        positions = self.find_lines(arc)
+        if len(positions) == 0:
+            raise SpectrumError("No lines found in arc.")
+        coeffs = self._guess
+        rms = self._tolerance
+        used = np.zeros(len(positions), dtype=bool)
+
+        for _ in range(self._iterations):
+            # match all detected lines to nearest reference line
+            predicted = np.polynomial.polynomial.polyval(positions, coeffs)
+            idx = np.clip(np.searchsorted(self._lines, predicted), 1, len(self._lines) - 1)
+            left, right = self._lines[idx - 1], self._lines[idx]
+            nearest = np.where(np.abs(predicted - left) < np.abs(predicted - right), left, right)
+            residuals = predicted - nearest
+            used = np.abs(residuals) < min(self._tolerance, self._sigma * rms if rms > 0 else self._tolerance)
+
+            # fit, never with more coefficients than lines
+            if np.sum(used) < 2:
+                raise SpectrumError("Could not match enough arc lines.")
+            degree = min(self._degree, int(np.sum(used)) - 1)
+            coeffs = np.polynomial.polynomial.polyfit(positions[used], nearest[used], degree)
+            fitted = np.polynomial.polynomial.polyval(positions[used], coeffs)
+            rms = float(np.sqrt(np.mean((fitted - nearest[used]) ** 2)))
+
+        log.info("Found wavelength solution with %d lines and an RMS of %.3f.", int(np.sum(used)), rms)
+        return np.asarray(coeffs), rms, int(np.sum(used))
+
+
+__all__ = ["ArcWavelengthSolution"]
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import copy
+import io
+from typing import Any, TypeVar, cast
+
+import numpy as np
+import numpy.typing as npt
+from astropy.io import fits
+
+MetaClass = TypeVar("MetaClass")
+
+
+class Spectrum:
+    """
+    A container class for spectroscopic data and associated metadata.
+
+    A spectrum can hold the raw two-dimensional frame from the detector of a spectrograph, the one-dimensional
+    spectrum extracted from it, or both. Spectrum processors (see :class:`~pyobs.spectra.SpectrumProcessor`)
+    usually start from the raw frame, extract the spectrum and then work on the one-dimensional arrays.
+
+    Attributes
+    ----------
+    data : numpy.ndarray, optional
+        Raw two-dimensional frame from the detector.
+    header : astropy.io.fits.Header
+        FITS header.
+    flux : numpy.ndarray, optional
+        Extracted one-dimensional spectrum.
+    uncertainty : numpy.ndarray, optional
+        Standard deviations of the extracted spectrum.
+    wavelength : numpy.ndarray, optional
+        Wavelengths of the extracted spectrum, usually in Angstrom.
+    trace : numpy.ndarray, optional
+        Position of the spectrum on the raw frame perpendicular to the dispersion axis, for every pixel along the
+        dispersion axis.
+    meta : dict
+        Dictionary with meta information, not preserved in I/O operations.
+
+    Serialisation
+    -------------
+    In FITS files, the raw frame is stored in the primary HDU and the extracted spectrum in a binary table
+    extension named ``SPECTRUM`` with the columns ``FLUX``, ``UNCERT``, and ``WAVELENGTH``. Spectrographs that
+    deliver a one-dimensional spectrum directly may store it in the primary HDU instead, it is then loaded as flux.
+    """
+
+    def __init__(
+        self,
+        data: npt.NDArray[np.floating[Any]] | None = None,
+        header: fits.Header | None = None,
+        flux: npt.NDArray[np.floating[Any]] | None = None,
+        uncertainty: npt.NDArray[np.floating[Any]] | None = None,
+        wavelength: npt.NDArray[np.floating[Any]] | None = None,
+        trace: npt.NDArray[np.floating[Any]] | None = None,
+        meta: dict[Any, Any] | None = None,
+    ):
+        """Init a new spectrum.
+
+        Args:
+            data: Raw two-dimensional frame.
+            header: Header for the new spectrum.
+            flux: Extracted spectrum.
+            uncertainty: Standard deviations of extracted spectrum.
+            wavelength: Wavelengths of extracted spectrum.
+            trace: Position of spectrum on raw frame.
+            meta: Dictionary with meta information (note: not preserved in I/O operations!).
+        """
+        self._data = data
+        self._header = fits.Header() if header is None else header.copy()
+        self._flux = flux
+        self._uncertainty = uncertainty
+        self._wavelength = wavelength
+        self._trace = trace
+        self._meta = {} if meta is None else copy.deepcopy(meta)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Spectrum:
+        """Create Spectrum from a bytes array containing a FITS file.
+
+        Args:
+            data: Bytes array to create spectrum from.
+
+        Returns:
+            The new spectrum.
+        """
+        with io.BytesIO(data) as bio:
+            with fits.open(bio, memmap=False, lazy_load_hdus=False) as hdulist:
+                return cls.from_hdulist(hdulist)
+
+    @classmethod
+    def from_file(cls, filename: str) -> Spectrum:
+        """Create spectrum from FITS file.
+
+        Args:
+            filename: Name of file to load spectrum from.
+
+        Returns:
+            New spectrum.
+        """
+        with fits.open(filename, memmap=False, lazy_load_hdus=False) as hdulist:
+            return cls.from_hdulist(hdulist)
+
+    @classmethod
+    def from_hdulist(cls, hdulist: fits.HDUList) -> Spectrum:
+        """Create spectrum from HDU list.
+
+        Args:
+            hdulist: HDU list.
+
+        Returns:
+            New spectrum.
+        """
+
+        # primary HDU or HDU named SCI
+        primary = hdulist["SCI"] if "SCI" in hdulist else hdulist[0]
+        spectrum = cls(header=primary.header)
+        if primary.data is not None:
+            data = np.asarray(primary.data)
+            if data.ndim == 1:
+                spectrum._flux = data
+            else:
+                spectrum._data = data
+
+        # extracted spectrum
+        if "SPECTRUM" in hdulist:
+            table = hdulist["SPECTRUM"].data
+            names = [n.upper() for n in table.columns.names]
+            if "FLUX" in names:
+                spectrum._flux = np.asarray(table["FLUX"])
+            if "UNCERT" in names:
+                spectrum._uncertainty = np.asarray(table["UNCERT"])
+            if "WAVELENGTH" in names:
+                spectrum._wavelength = np.asarray(table["WAVELENGTH"])
+        return spectrum
+
+    def to_hdulist(self) -> fits.HDUList:
+        """Returns spectrum as HDU list, see class description for the layout."""
+        hdulist = fits.HDUList([fits.PrimaryHDU(data=self._data, header=self._header)])
+        hdulist.append(self.to_table_hdu())
+        return hdulist
+
+    def to_table_hdu(self) -> fits.BinTableHDU:
+        """Returns extracted spectrum as a binary table HDU named SPECTRUM.
+
+        Raises:
+            ValueError: If no spectrum has been extracted.
+        """
+        if self._flux is None:
+            raise ValueError("No extracted spectrum available.")
+        columns = [fits.Column(name="FLUX", format="E", array=self._flux)]
+        if self._uncertainty is not None:
+            columns.append(fits.Column(name="UNCERT", format="E", array=self._uncertainty))
+        if self._wavelength is not None:
+            columns.append(fits.Column(name="WAVELENGTH", format="D", array=self._wavelength))
+        return fits.BinTableHDU.from_columns(columns, name="SPECTRUM")
+
+    def to_bytes(self) -> bytes:
+        """Returns spectrum as FITS file in a bytes array."""
+        hdulist = (
+            self.to_hdulist()
+            if self._flux is not None
+            else fits.HDUList([fits.PrimaryHDU(data=self._data, header=self._header)])
+        )
+        with io.BytesIO() as bio:
+            hdulist.writeto(bio)
+            return bio.getvalue()
+
+    def __deepcopy__(self, memodict: dict[int, Any] | None = None) -> Spectrum:
+        """Returns a shallow copy of this spectrum."""
+        return self.copy()
+
+    def copy(self) -> Spectrum:
+        """Returns a copy of this spectrum, sharing its arrays."""
+        return Spectrum(
+            data=self._data,
+            header=self._header,
+            flux=self._flux,
+            uncertainty=self._uncertainty,
+            wavelength=self._wavelength,
+            trace=self._trace,
+            meta=self._meta,
+        )
+
+    @property
+    def exposure_time(self) -> float | None:
+        """Exposure time from EXPTIME header, if available."""
+        return float(self._header["EXPTIME"]) if "EXPTIME" in self._header else None
+
+    def set_meta(self, meta: Any) -> None:
+        """Sets meta information, storing it under its class.
+
+        Args:
+            meta: Meta information to store.
+        """
+        self._meta[meta.__class__] = meta
+
+    def has_meta(self, meta_class: type[MetaClass]) -> bool:
+        """Whether meta exists."""
+        return meta_class in self._meta
+
+    def get_meta(self, meta_class: type[MetaClass]) -> MetaClass:
+        """Returns meta information, assuming that it is stored under the class of the object.
+
+        Args:
+            meta_class: Class to return meta information for.
+
+        Returns:
+            Meta information of the given class.
+        """
+        if meta_class not in self._meta:
+            raise ValueError("Meta value not found.")
+        if not isinstance(self._meta[meta_class], meta_class):
+            raise ValueError("Stored meta information is of wrong type.")
+        return cast(MetaClass, self._meta[meta_class])
+
+    def get_meta_safe(self, meta_class: type[MetaClass], default: MetaClass | None = None) -> MetaClass | None:
+        """Calls get_meta in a safe way and returns default value in case of an exception."""
+        try:
+            return self.get_meta(meta_class)
+        except Exception:
+            return default
+
+    @property
+    def safe_data(self) -> npt.NDArray[np.floating[Any]] | None:
+        return self._data
+
+    @property
+    def data(self) -> npt.NDArray[np.floating[Any]]:
+        if self._data is None:
+            raise ValueError("No data found in spectrum.")
+        return self._data
+
+    @data.setter
+    def data(self, val: npt.NDArray[np.floating[Any]] | None) -> None:
+        self._data = val
+
+    @property
+    def header(self) -> fits.Header:
+        return self._header
+
+    @header.setter
+    def header(self, val: fits.Header | None) -> None:
+        self._header = fits.Header() if val is None else val
+
+    @property
+    def safe_flux(self) -> npt.NDArray[np.floating[Any]] | None:
+        return self._flux
+
+    @property
+    def flux(self) -> npt.NDArray[np.floating[Any]]:
+        if self._flux is None:
+            raise ValueError("No extracted spectrum found.")
+        return self._flux
+
+    @flux.setter
+    def flux(self, val: npt.NDArray[np.floating[Any]] | None) -> None:
+        self._flux = val
+
+    @property
+    def safe_uncertainty(self) -> npt.NDArray[np.floating[Any]] | None:
+        return self._uncertainty
+
+    @property
+    def uncertainty(self) -> npt.NDArray[np.floating[Any]]:
+        if self._uncertainty is None:
+            raise ValueError("No uncertainties found in spectrum.")
+        return self._uncertainty
+
+    @uncertainty.setter
+    def uncertainty(self, val: npt.NDArray[np.floating[Any]] | None) -> None:
+        self._uncertainty = val
+
+    @property
+    def safe_wavelength(self) -> npt.NDArray[np.floating[Any]] | None:
+        return self._wavelength
+
+    @property
+    def wavelength(self) -> npt.NDArray[np.floating[Any]]:
+        if self._wavelength is None:
+            raise ValueError("No wavelength solution found in spectrum.")
+        return self._wavelength
+
+    @wavelength.setter
+    def wavelength(self, val: npt.NDArray[np.floating[Any]] | None) -> None:
+        self._wavelength = val
+
+    @property
+    def safe_trace(self) -> npt.NDArray[np.floating[Any]] | None:
+        return self._trace
+
+    @property
+    def trace(self) -> npt.NDArray[np.floating[Any]]:
+        if self._trace is None:
+            raise ValueError("No trace found in spectrum.")
+        return self._trace
+
+    @trace.setter
+    def trace(self, val: npt.NDArray[np.floating[Any]] | None) -> None:
+        self._trace = val
+
+    @property
+    def meta(self) -> dict[Any, Any]:
+        return self._meta
+
+    @meta.setter
+    def meta(self, val: dict[Any, Any] | None) -> None:
+        self._meta = {} if val is None else val
+
+
+__all__ = ["Spectrum"]
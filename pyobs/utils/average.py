@@ -1,45 +1,107 @@
 from __future__ import annotations
 
+import math
+import time
+from collections import deque
 from datetime import UTC, datetime
 
 import numpy as np
 
 
 class RollingTimeAverage:
+    """Average, minimum, maximum, and median of all values added within the last interval seconds.
+
+    Values are kept in a ring buffer together with monotonic timestamps, and expired values are only ever removed
+    from its front. A running sum and two monotonic queues make add(), average(), minimum(), and maximum() amortised
+    O(1); only median() needs to look at all values in the window.
+    """
+
     def __init__(self, interval: float):
         self._interval = interval
-        self._values: list[tuple[datetime, float]] = []
+        self._values: deque[tuple[float, float]] = deque()
+        self._sum = 0.0
+        # candidates for minimum/maximum, with values increasing/decreasing from front to back
+        self._min: deque[tuple[float, float]] = deque()
+        self._max: deque[tuple[float, float]] = deque()
         self._start_time = datetime.now(UTC)
 
     def clear(self) -> None:
-        self._values = []
+        self._values.clear()
+        self._min.clear()
+        self._max.clear()
+        self._sum = 0.0
         self._start_time = datetime.now(UTC)
 
+    def _evict(self, now: float) -> None:
+        """Remove all values that are older than interval."""
+        while self._values and now - self._values[0][0] >= self._interval:
+            t, value = self._values.popleft()
+            self._sum -= value
+            if self._min and self._min[0][0] == t:
+                self._min.popleft()
+            if self._max and self._max[0][0] == t:
+                self._max.popleft()
+
+        # avoid accumulating rounding errors
+        if not self._values:
+            self._sum = 0.0
+
     def add(self, value: float) -> None:
-        # add value
-        now = datetime.now(UTC)
+        # add value, timestamps are strictly increasing, so they identify values
+        now = time.monotonic()
+        if self._values and now <= self._values[-1][0]:
+            now = math.nextafter(self._values[-1][0], math.inf)
         self._values.append((now, value))
+        self._sum += value
+
+        # update candidates for minimum and maximum
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((now, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((now, value))
 
         # clean up
-        self._values = [(time, value) for time, value in self._values if (now - time).total_seconds() < self._interval]
+        self._evict(now)
 
-    def average(self, min_interval: float | None = None) -> float | None:
-        # got values?
+    def _window(self, min_interval: float | None) -> bool:
+        """Evicts old values and returns whether there are values, some older than min_interval, if given."""
+        now = time.monotonic()
+        self._evict(now)
         if len(self._values) == 0:
+            return False
+        if min_interval and now - self._values[0][0] <= min_interval:
+            return False
+        return True
+
+    def average(self, min_interval: float | None = None) -> float | None:
+        """Returns average of values within interval.
+
+        Args:
+            min_interval: If given, None is returned unless there are values older than this.
+        """
+        if not self._window(min_interval):
             return None
+        return float(self._sum / len(self._values))
 
-        # get time
-        now = datetime.now(UTC)
+    def minimum(self, min_interval: float | None = None) -> float | None:
+        """Returns minimum of values within interval, see average()."""
+        if not self._window(min_interval):
+            return None
+        return float(self._min[0][1])
 
-        # go no values older than now-interval?
-        if min_interval:
-            values = [value for time, value in self._values if (now - time).total_seconds() > min_interval]
-            if len(values) == 0:
-                return None
+    def maximum(self, min_interval: float | None = None) -> float | None:
+        """Returns maximum of values within interval, see average()."""
+        if not self._window(min_interval):
+            return None
+        return float(self._max[0][1])
 
-        # get values and average
-        values = [value for time, value in self._values if (now - time).total_seconds() < self._interval]
-        return float(np.mean(values))
+    def median(self, min_interval: float | None = None) -> float | None:
+        """Returns median of values within interval, see average()."""
+        if not self._window(min_interval):
+            return None
+        return float(np.median([value for _, value in self._values]))
 
 
 __all__ = ["RollingTimeAverage"]
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+from astropy.table import Table
+
+from pyobs.utils.simulation.catalog import SyntheticStarCatalog
+
+log = logging.getLogger(__name__)
+
+
+class ReferenceCatalog:
+    """Catalog of reference stars, cached locally for fast repeated queries around the same positions.
+
+    The sky is divided into tiles of roughly tile_size x tile_size degrees. Stars are always fetched for a whole tile,
+    i.e. for a cone around its center that also covers the given radius around every position within the tile, so all
+    queries within the same tile are answered from the cache. Fetched tiles are kept in memory and, if a directory is
+    given, on disk, so that targets that are observed night after night never need a query to the archive again.
+
+    Stars are fetched from the Gaia archive or from a :class:`~pyobs.utils.simulation.catalog.SyntheticStarCatalog`
+    for simulations. The returned tables have the columns ra, dec, phot_g_mean_mag, phot_g_mean_flux, and dist.
+    """
+
+    def __init__(
+        self,
+        source: Literal["gaia", "synthetic"] = "gaia",
+        cache_dir: str | None = None,
+        max_mag: float = 18.0,
+        tile_size: float = 1.0,
+        radius: float = 0.5,
+        cache_size: int = 16,
+        url: str = "https://gea.esac.esa.int/tap-server/tap",
+        table: str = "gaiadr3.gaia_source",
+        limit: int = 20000,
+    ):
+        """Creates a new reference catalog.
+
+        Args:
+            source: Source of stars, either "gaia" for the Gaia archive or "synthetic" for a synthetic catalog.
+            cache_dir: Directory for caching fetched tiles on disk, None for caching in memory only.
+            max_mag: Faintest G magnitude of stars to fetch.
+            tile_size: Size of tiles in degrees.
+            radius: Largest radius in degrees that queries are expected to use.
+            cache_size: Maximum number of tiles to keep in memory.
+            url: URL of TAP service for Gaia.
+            table: Name of Gaia table to query.
+            limit: Maximum number of stars to fetch for a tile.
+        """
+        if source not in ("gaia", "synthetic"):
+            raise ValueError(f"Invalid source for reference catalog: {source}")
+        self._source = source
+        self._cache_dir = None if cache_dir is None else Path(cache_dir)
+        self._max_mag = max_mag
+        self._tile_size = tile_size
+        self._radius = radius
+        self._cache_size = cache_size
+        self._url = url
+        self._table = table
+        self._limit = limit
+        self._tiles: OrderedDict[tuple[int, int], Table] = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._synthetic = SyntheticStarCatalog(max_mag=max_mag) if source == "synthetic" else None
+
+        # create cache directory
+        if self._cache_dir is not None:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _num_ra(self, band: int) -> int:
+        """Returns number of tiles in RA for the given band in declination."""
+        center = -90.0 + (band + 0.5) * self._tile_size
+        return max(1, int(math.ceil(360.0 * math.cos(math.radians(min(abs(center), 89.9))) / self._tile_size)))
+
+    def _tile(self, ra: float, dec: float) -> tuple[int, int]:
+        """Returns index of tile containing the given position."""
+        band = min(int(math.floor((dec + 90.0) / self._tile_size)), int(math.ceil(180.0 / self._tile_size)) - 1)
+        num_ra = self._num_ra(band)
+        return band, int(math.floor((ra % 360.0) / 360.0 * num_ra)) % num_ra
+
+    def _tile_center(self, tile: tuple[int, int]) -> tuple[float, float]:
+        """Returns center of given tile in degrees."""
+        band, cell = tile
+        return (cell + 0.5) * 360.0 / self._num_ra(band), -90.0 + (band + 0.5) * self._tile_size
+
+    def _tile_radius(self, tile: tuple[int, int], radius: float) -> float:
+        """Returns radius of cone around tile center that covers the given radius around all its positions."""
+        _, dec = self._tile_center(tile)
+        half_width = (
+            0.5 * 360.0 / self._num_ra(tile[0]) * math.cos(math.radians(max(0.0, abs(dec) - 0.5 * self._tile_size)))
+        )
+        return min(180.0, math.hypot(half_width, 0.5 * self._tile_size) + radius)
+
+    def _filename(self, tile: tuple[int, int]) -> Path | None:
+        """Returns filename of cached tile."""
+        if self._cache_dir is None:
+            return None
+        return self._cache_dir / f"{self._source}_{self._tile_size:g}_{self._max_mag:g}_{tile[0]}_{tile[1]}.fits"
+
+    def _fetch(self, ra: float, dec: float, radius: float) -> Table:
+        """Fetches stars within the given cone from the source."""
+        if self._synthetic is not None:
+            return self._synthetic.query(ra, dec, radius, max_mag=self._max_mag, limit=self._limit)
+
+        from astroquery.utils.tap import TapPlus
+
+        tap = TapPlus(url=self._url)
+        query = f"""
+            SELECT TOP {self._limit}
+              DISTANCE(POINT('ICRS', ra, dec), POINT('ICRS', {ra}, {dec})) as dist,
+              ra, dec, phot_g_mean_flux, phot_g_mean_mag
+            FROM {self._table}
+            WHERE 1 = CONTAINS(POINT('ICRS', ra, dec), CIRCLE('ICRS', {ra}, {dec}, {radius}))
+              AND phot_g_mean_mag < {self._max_mag}
+            ORDER BY phot_g_mean_mag ASC
+        """
+        result = tap.launch_job(query).get_results()
+        return Table(
+            {
+                c: np.asarray(result[c], dtype=float)
+                for c in ("dist", "ra", "dec", "phot_g_mean_flux", "phot_g_mean_mag")
+            }
+        )
+
+    def _load_tile(self, tile: tuple[int, int], radius: float) -> Table:
+        """Loads tile from disk or fetches it, if it is not cached or does not cover the given radius."""
+
+        # cached on disk?
+        filename = self._filename(tile)
+        if filename is not None and filename.exists():
+            try:
+                stars = Table.read(filename)
+                if stars.meta.get("RADIUS", 0.0) >= radius:
+                    return stars
+            except Exception as e:
+                log.warning("Could not read cached reference stars from %s: %s", filename, e)
+
+        # fetch it
+        ra, dec = self._tile_center(tile)
+        log.info("Fetching reference stars within %.2f deg around %.4f, %.4f...", radius, ra, dec)
+        stars = self._fetch(ra, dec, radius)
+        stars.meta["RADIUS"] = radius
+
+        # and store it
+        if filename is not None:
+            tmp = filename.with_suffix(".tmp")
+            stars.write(tmp, format="fits", overwrite=True)
+            os.replace(tmp, filename)
+        return stars
+
+    async def query(self, ra: float, dec: float, radius: float, max_mag: float | None = None) -> Table:
+        """Returns all stars within the given cone, sorted by magnitude.
+
+        Args:
+            ra: Right ascension of center in degrees.
+            dec: Declination of center in degrees.
+            radius: Radius of cone in degrees.
+            max_mag: Faintest magnitude to return.
+
+        Returns:
+            Table with stars.
+        """
+
+        # get tile, loading it if necessary
+        key = self._tile(ra, dec)
+        tile_radius = self._tile_radius(key, max(radius, self._radius))
+        async with self._lock:
+            stars = self._tiles.get(key)
+            if stars is None or stars.meta["RADIUS"] < tile_radius:
+                loop = asyncio.get_running_loop()
+                stars = await loop.run_in_executor(None, self._load_tile, key, tile_radius)
+                self._tiles[key] = stars
+                if len(self._tiles) > self._cache_size:
+                    self._tiles.popitem(last=False)
+            self._tiles.move_to_end(key)
+
+        # angular distance (haversine)
+        ra0, dec0 = math.radians(ra), math.radians(dec)
+        r, d = np.radians(np.asarray(stars["ra"])), np.radians(np.asarray(stars["dec"]))
+        hav = np.sin((d - dec0) / 2.0) ** 2 + math.cos(dec0) * np.cos(d) * np.sin((r - ra0) / 2.0) ** 2
+        dist = np.degrees(2.0 * np.arcsin(np.sqrt(np.clip(hav, 0.0, 1.0))))
+
+        # filter and sort
+        mask = dist <= radius
+        if max_mag is not None:
+            mask &= np.asarray(stars["phot_g_mean_mag"]) <= max_mag
+        idx = np.flatnonzero(mask)
+        idx = idx[np.argsort(np.asarray(stars["phot_g_mean_mag"])[idx], kind="stable")]
+        result = stars[idx]
+        result["dist"] = dist[idx]
+        result.meta = {}
+        return result
+
+
+__all__ = ["ReferenceCatalog"]
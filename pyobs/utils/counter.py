@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from pyobs.vfs import VirtualFileSystem
+
+log = logging.getLogger(__name__)
+
+
+class NightlyCounter:
+    """A counter that restarts with every night, e.g. for frame or observation numbers.
+
+    The current value is kept in memory, so getting the next number is cheap. It is persisted in one of two ways:
+
+    - In a local file, to which every new value is appended as a single line "<night> <value>". This is an atomic
+      append on the local disk, so no round trip to a remote file system is needed. After a crash, the last complete
+      line is used and a truncated line is ignored. The log is compacted to a single line every now and then. With
+      locking enabled, several processes can share the same file: the counter is incremented while holding an
+      exclusive lock on "<filename>.lock" after reading all values appended by other processes. Since waiting for the
+      lock and the file I/O may block, this is done in a thread pool and not in the event loop.
+    - For backward compatibility, in a YAML file in the VFS, which is only read once and then written in the
+      background, so that writing doesn't delay the caller.
+
+    If neither is given, the counter is kept in memory only.
+    """
+
+    def __init__(
+        self,
+        filename: str | None = None,
+        lock: bool = True,
+        compact: int = 1000,
+        fsync: bool = False,
+        vfs: VirtualFileSystem | None = None,
+        vfs_filename: str | None = None,
+        key: str = "counter",
+    ):
+        """Creates a new counter.
+
+        Args:
+            filename: Local file to persist counter in.
+            lock: Whether to lock the local file, so that it can be shared by several processes.
+            compact: Compact local file after this many lines.
+            fsync: Whether to flush the local file to disk after every new value.
+            vfs: VFS to persist counter in, if no local file is given.
+            vfs_filename: Name of YAML file in VFS.
+            key: Key for counter in YAML file.
+        """
+        self._filename = filename
+        self._lock = lock and fcntl is not None
+        self._compact = compact
+        self._fsync = fsync
+        self._vfs = vfs
+        self._vfs_filename = vfs_filename
+        self._key = key
+
+        # state
+        self._night: str | None = None
+        self._value = 0
+        self._loaded = False
+
+        # local file
+        self._file: IO[bytes] | None = None
+        self._offset = 0
+        self._lines = 0
+        self._local_lock = threading.Lock()
+
+        # background writer for VFS
+        self._vfs_dirty = False
+        self._vfs_task: asyncio.Task[None] | None = None
+
+    @property
+    def night(self) -> str | None:
+        """Night of current value."""
+        return self._night
+
+    @property
+    def value(self) -> int:
+        """Current value, i.e. the last one returned by next()."""
+        return self._value
+
+    async def next(self, night: str) -> int:
+        """Increments the counter for the given night, restarting at 1 for a new night.
+
+        Args:
+            night: Night to get next value for, e.g. "2024-01-01".
+
+        Returns:
+            New value of counter.
+        """
+        if not self._loaded:
+            await self._load_vfs()
+            self._loaded = True
+
+        # local file?
+        if self._filename is not None:
+            return await asyncio.get_running_loop().run_in_executor(None, self._next_local, night)
+
+        # increment in memory and write to VFS in background
+        self._increment(night)
+        if self._vfs is not None and self._vfs_filename is not None:
+            self._vfs_dirty = True
+            if self._vfs_task is None or self._vfs_task.done():
+                self._vfs_task = asyncio.create_task(self._write_vfs())
+        return self._value
+
+    def _increment(self, night: str) -> None:
+        self._value = self._value + 1 if night == self._night else 1
+        self._night = night
+
+    def _apply(self, data: bytes) -> None:
+        """Applies complete lines from the log to the current state."""
+        for line in data.decode(errors="replace").splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[1].isdigit():
+                self._night, self._value = parts[0], int(parts[1])
+                self._lines += 1
+
+    def _open(self) -> None:
+        """Opens local file and reads it, terminating a truncated last line."""
+        assert self._filename is not None
+        if self._file is not None:
+            self._file.close()
+        Path(self._filename).parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._filename, "a+b")
+        self._offset = 0
+        self._lines = 0
+
+    def _read_new(self) -> None:
+        """Reads lines appended since last read, possibly by other processes."""
+        assert self._file is not None
+        self._file.seek(self._offset)
+        data = self._file.read()
+        if not data:
+            return
+
+        # a line without newline at the end comes from a crashed writer, since writers hold the lock
+        if not data.endswith(b"\n"):
+            data = data[: data.rfind(b"\n") + 1]
+            self._file.write(b"\n")
+            log.warning("Ignoring truncated line in counter file %s.", self._filename)
+        self._apply(data)
+        self._offset = self._file.seek(0, os.SEEK_END)
+
+    def _next_local(self, night: str) -> int:
+        """Increments counter in local file. Runs in a thread pool, so calls are serialized by a thread lock."""
+        assert self._filename is not None
+
+        with self._local_lock:
+            return self._next_local_locked(night)
+
+    def _next_local_locked(self, night: str) -> int:
+        """Increments counter in local file while holding the thread lock."""
+        assert self._filename is not None
+
+        lock_file = open(f"{self._filename}.lock", "a") if self._lock else None
+        try:
+            if lock_file is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            # (re-)open file, if necessary, e.g. after compaction by another process
+            if (
+                self._file is None
+                or not os.path.exists(self._filename)
+                or os.stat(self._filename).st_ino != os.fstat(self._file.fileno()).st_ino
+            ):
+                self._open()
+            self._read_new()
+
+            # increment and append
+            self._increment(night)
+            assert self._file is not None
+            self._file.write(f"{self._night} {self._value}\n".encode())
+            self._file.flush()
+            if self._fsync:
+                os.fsync(self._file.fileno())
+            self._offset = self._file.tell()
+            self._lines += 1
+
+            # compact
+            if self._lines > self._compact:
+                self._compact_file()
+            return self._value
+
+        finally:
+            if lock_file is not None:
+                lock_file.close()
+
+    def _compact_file(self) -> None:
+        """Replaces local file with a single line with the current state."""
+        assert self._filename is not None
+        tmp = f"{self._filename}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(f"{self._night} {self._value}\n".encode())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._filename)
+        self._open()
+        self._read_new()
+
+    async def _load_vfs(self) -> None:
+        """Loads state from YAML file in VFS, if configured and no local file is used."""
+        if self._filename is not None or self._vfs is None or self._vfs_filename is None:
+            return
+        try:
+            cache = await self._vfs.read_yaml(self._vfs_filename)
+            if cache is not None and "night" in cache and self._key in cache:
+                self._night, self._value = str(cache["night"]), int(cache[self._key])
+        except (FileNotFoundError, ValueError, IndexError):
+            # IndexError: some VFS backends (e.g. MemoryFile) raise this for a missing file
+            pass
+
+    async def _write_vfs(self) -> None:
+        """Writes state to VFS until no more changes are pending."""
+        assert self._vfs is not None and self._vfs_filename is not None
+        while self._vfs_dirty:
+            self._vfs_dirty = False
+            try:
+                await self._vfs.write_yaml(self._vfs_filename, {"night": self._night, self._key: self._value})
+            except (FileNotFoundError, ValueError):
+                log.warning("Could not write counter file %s.", self._vfs_filename)
+
+    async def flush(self) -> None:
+        """Waits for pending writes to the VFS."""
+        if self._vfs_task is not None:
+            await self._vfs_task
+
+    async def close(self) -> None:
+        """Flushes pending writes and closes local file."""
+        await self.flush()
+        if self._file is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._close_local)
+
+    def _close_local(self) -> None:
+        """Closes local file, after a running increment has finished."""
+        with self._local_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+__all__ = ["NightlyCounter"]
@@ -79,6 +79,10 @@ class ImageError(PyobsError):
     pass
 
 
+class SpectrumError(PyobsError):
+    pass
+
+
 class MotionError(PyobsError):
     pass
 
@@ -1,2 +1,3 @@
 from .filters import *  # noqa: F403
 from .grid import *  # noqa: F403
+from .tour import *  # noqa: F403
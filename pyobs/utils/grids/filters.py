@@ -2,16 +2,20 @@ from __future__ import annotations
 
 import abc
 import random
+import time
 from typing import Any
 
 import astropy.units as u
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
-from astropy.coordinates import SkyCoord, get_body
+from astropy.coordinates import AltAz, SkyCoord, get_body
 
 from pyobs.utils.time import Time
 
 from .grid import Grid
 from .gridnode import GridNode
+from .tour import plan_tour, slew_times
 
 
 class GridFilter(GridNode, metaclass=abc.ABCMeta):
@@ -282,45 +286,59 @@ class RandomizeGrid(GridFilter):
 class AvoidMoon(GridFilter):
     """Remove points too close to the moon.
 
-    If the next point in the underlying grid is too close to the moon, skip it.
+    If the next point in the underlying grid is too close to the moon, it is appended back to the grid, since the
+    moon moves on. If all remaining points are too close to the moon, iteration stops. The position of the moon is
+    only updated every moon_update seconds.
     """
 
-    def __init__(self, grid: Grid | GridFilter, min_moon_distance: int = 20, **kwargs: object):
+    def __init__(
+        self, grid: Grid | GridFilter, min_moon_distance: int = 20, moon_update: float = 300.0, **kwargs: object
+    ):
         """Initialize the moon avoider.
 
         Args:
             grid: Upstream grid or filter.
-            min_moon_distance: Minimum distance to avoid the moon in degrees..
+            min_moon_distance: Minimum distance to avoid the moon in degrees.
+            moon_update: Interval in seconds for updating the position of the moon.
             **kwargs: Additional keyword arguments forwarded to GridFilter.__init__().
-
-        Raises:
-            ValueError: If iterations < 0.
         """
         GridFilter.__init__(self, grid, **kwargs)
         self._min_moon_distance = min_moon_distance
+        self._moon_update = moon_update
+        self._moon: SkyCoord | None = None
+        self._moon_time = 0.0
+
+    def _get_moon(self) -> SkyCoord:
+        """Returns the position of the moon in ICRS, updating it if necessary."""
+        if self._moon is None or time.monotonic() - self._moon_time > self._moon_update:
+            location = self._observer.location if self._observer is not None else None
+            self._moon = get_body("moon", Time.now(), location=location).icrs
+            self._moon_time = time.monotonic()
+        return self._moon
 
     def _get_next(self) -> tuple[float, float] | SkyCoord:
-        """Yield a point after rotating the underlying grid a random number of times.
+        """Yield the next point that is far enough from the moon.
 
         Returns:
             The next point in the underlying grid, except it is too close to the moon.
 
         Raises:
-            StopIteration: If the underlying grid is exhausted.
+            StopIteration: If the underlying grid is exhausted or all remaining points are too close to the moon.
         """
 
-        while True:
+        # after this many rejected points in a row, we have seen them all
+        rejected = 0
+        while rejected <= len(self._grid):
             next_point = next(self._grid)
             if not isinstance(next_point, SkyCoord):
                 raise TypeError("Expected a SkyCoord.")
-            moon = get_body("moon", Time.now())
-            dist = moon.separation(next_point)
-            if dist > self._min_moon_distance * u.degree:
+            if self._get_moon().separation(next_point) > self._min_moon_distance * u.degree:
                 return next_point
             elif len(self._grid) == 0:
                 raise StopIteration
-            else:
-                self._grid.append_last()
+            self._grid.append_last()
+            rejected += 1
+        raise StopIteration
 
 
 class FromList(GridFilter):
@@ -384,4 +402,158 @@ class FromList(GridFilter):
                 self._grid.append_last()
 
 
-__all__ = ["GridFilterValue", "ConvertGridFrame", "ConvertGridToSkyCoord", "RandomizeGrid", "AvoidMoon", "FromList"]
+class OptimizeSlewOrder(GridFilter):
+    """Reorder points to minimize the total slew time of the telescope.
+
+    On the first request, all points are taken from the underlying grid and their Alt/Az positions are calculated
+    at once. Starting from the given position, a nearest-neighbour tour is built and improved with 2-opt moves,
+    using the slew time from :func:`~pyobs.utils.grids.tour.slew_times` as cost, which includes the dome and the
+    cable wrap, if configured. Points are then yielded in order of this tour.
+
+    Points can be (az, alt) tuples in degrees, SkyCoords in AltAz, or SkyCoords in any other frame. Since the Alt/Az
+    positions of the latter change with time, the tour is re-planned from the last yielded point every
+    replan_interval seconds. Points appended back via append_last() are visited after all the others.
+    """
+
+    def __init__(
+        self,
+        grid: Grid | GridFilter,
+        az_speed: float = 3.0,
+        alt_speed: float = 3.0,
+        dome_speed: float | None = None,
+        cable_wrap: float | None = None,
+        start: tuple[float, float] = (0.0, 90.0),
+        replan_interval: float = 300.0,
+        iterations: int = 100,
+        **kwargs: object,
+    ):
+        """Initialize the slew optimizer.
+
+        Args:
+            grid: Upstream grid or filter.
+            az_speed: Speed of telescope in azimuth in degrees per second.
+            alt_speed: Speed of telescope in altitude in degrees per second.
+            dome_speed: Speed of dome in degrees per second, None for no dome.
+            cable_wrap: Azimuth in degrees that the telescope can not cross, None for no cable wrap.
+            start: Position (az, alt) of telescope in degrees before the first point.
+            replan_interval: Interval in seconds for re-planning the tour of time-dependent points.
+            iterations: Maximum number of 2-opt passes.
+            **kwargs: Additional keyword arguments forwarded to GridFilter.__init__().
+        """
+        GridFilter.__init__(self, grid, **kwargs)
+        self._az_speed = az_speed
+        self._alt_speed = alt_speed
+        self._dome_speed = dome_speed
+        self._cable_wrap = cable_wrap
+        self._position = (float(start[0]), float(start[1]))
+        self._replan_interval = replan_interval
+        self._iterations = iterations
+
+        # remaining points in reversed order of visit with their (az, alt), and appended points
+        self._tour: list[tuple[tuple[float, float] | SkyCoord, float, float]] | None = None
+        self._deferred: list[tuple[float, float] | SkyCoord] = []
+        self._planned = 0.0
+
+    def _altaz(self, points: list[tuple[float, float] | SkyCoord]) -> npt.NDArray[np.float64]:
+        """Returns an array of shape (N, 2) with the current (az, alt) of all points in degrees."""
+        altaz = np.empty((len(points), 2))
+        radec: list[int] = []
+        for i, p in enumerate(points):
+            if isinstance(p, tuple):
+                altaz[i] = p[0], p[1]
+            elif isinstance(p, SkyCoord) and hasattr(p, "az") and hasattr(p, "alt"):
+                altaz[i] = p.az.degree, p.alt.degree
+            elif isinstance(p, SkyCoord):
+                radec.append(i)
+            else:
+                raise TypeError("Unknown point type.")
+
+        # transform all other coordinates at once
+        if radec:
+            if self._observer is None:
+                raise ValueError("No observer given.")
+            coords = [points[i] if points[i].frame.name == "icrs" else points[i].icrs for i in radec]  # type: ignore
+            icrs = SkyCoord([c.ra.degree for c in coords], [c.dec.degree for c in coords], unit="deg", frame="icrs")
+            converted = icrs.transform_to(AltAz(obstime=Time.now(), location=self._observer.location))
+            altaz[radec, 0] = converted.az.degree
+            altaz[radec, 1] = converted.alt.degree
+        return altaz
+
+    def _plan(self, points: list[tuple[float, float] | SkyCoord]) -> None:
+        """Plans a tour through the given points starting at the current position."""
+        altaz = self._altaz(points)
+        az = np.append(self._position[0], altaz[:, 0])
+        alt = np.append(self._position[1], altaz[:, 1])
+        costs = slew_times(
+            az[:, None],
+            alt[:, None],
+            az[None, :],
+            alt[None, :],
+            self._az_speed,
+            self._alt_speed,
+            self._dome_speed,
+            self._cable_wrap,
+        )
+        order = plan_tour(costs, 0, self._iterations)[1:] - 1
+        self._tour = [(points[i], float(altaz[i, 0]), float(altaz[i, 1])) for i in order[::-1]]
+        self._planned = time.monotonic()
+
+    def _is_time_dependent(self) -> bool:
+        """Whether the Alt/Az positions of the remaining points change with time."""
+        return any(
+            isinstance(p, SkyCoord) and not (hasattr(p, "az") and hasattr(p, "alt")) for p, _, _ in self._tour or []
+        )
+
+    def _get_next(self) -> tuple[float, float] | SkyCoord:
+        """Return the next point in the tour.
+
+        Returns:
+            The point with the next position in the tour.
+
+        Raises:
+            StopIteration: If no points remain.
+        """
+        if self._tour is None:
+            self._plan(list(self._grid))
+        elif not self._tour and self._deferred:
+            points, self._deferred = self._deferred, []
+            self._plan(points)
+        elif time.monotonic() - self._planned > self._replan_interval and self._is_time_dependent():
+            self._plan([p for p, _, _ in reversed(self._tour)])
+
+        assert self._tour is not None
+        if not self._tour:
+            raise StopIteration
+        point, az, alt = self._tour.pop()
+        self._position = (az, alt)
+        return point
+
+    def __len__(self) -> int:
+        """Return the number of remaining points.
+
+        Returns:
+            Number of remaining points, including those appended back.
+        """
+        if self._tour is None:
+            return len(self._grid)
+        return len(self._tour) + len(self._deferred)
+
+    def append_last(self) -> None:
+        """Append the last yielded point, so that it is visited after all others."""
+        if self._last is not None:
+            self._deferred.append(self._last)
+
+    def log_last(self) -> None:
+        """Log the last yielded point, if logging is enabled."""
+        self.log(self._last)  # type: ignore[arg-type]
+
+
+__all__ = [
+    "GridFilterValue",
+    "ConvertGridFrame",
+    "ConvertGridToSkyCoord",
+    "RandomizeGrid",
+    "AvoidMoon",
+    "FromList",
+    "OptimizeSlewOrder",
+]
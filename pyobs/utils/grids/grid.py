@@ -1,4 +1,5 @@
 import abc
+from collections import deque
 from typing import Any
 
 import numpy as np
@@ -8,7 +9,7 @@ from .gridnode import GridNode
 
 
 class Grid(GridNode, metaclass=abc.ABCMeta):
-    """Abstract base class for grids backed by a mutable list of points.
+    """Abstract base class for grids backed by a queue of points.
 
     This class consumes a list of points (tuples or SkyCoord) in FIFO order.
     It implements iteration, length, and appending the last element back to
@@ -24,10 +25,10 @@ class Grid(GridNode, metaclass=abc.ABCMeta):
             **kwargs: Additional keyword arguments forwarded to GridNode.__init__().
         """
         GridNode.__init__(self, **kwargs)
-        self._points = points
+        self._points: deque[tuple[float, float] | SkyCoord] = deque(points)
 
     def _get_next(self) -> tuple[float, float] | SkyCoord:
-        """Return the next point and remove it from the internal list.
+        """Return the next point and remove it from the internal queue.
 
         Returns:
             The next point as (x, y) in degrees or a SkyCoord.
@@ -37,7 +38,7 @@ class Grid(GridNode, metaclass=abc.ABCMeta):
         """
         if len(self._points) == 0:
             raise StopIteration
-        return self._points.pop(0)
+        return self._points.popleft()
 
     def __len__(self) -> int:
         """Return the number of remaining points.
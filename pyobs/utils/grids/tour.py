@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+
+
+def slew_times(
+    az1: npt.ArrayLike,
+    alt1: npt.ArrayLike,
+    az2: npt.ArrayLike,
+    alt2: npt.ArrayLike,
+    az_speed: float = 3.0,
+    alt_speed: float = 3.0,
+    dome_speed: float | None = None,
+    cable_wrap: float | None = None,
+) -> npt.NDArray[np.float64]:
+    """Estimates slew times between positions in Alt/Az, broadcasting over all given arrays.
+
+    Both axes and the dome are assumed to move simultaneously, so the slew time is the maximum of the individual
+    times. Without a cable wrap, the telescope moves the shorter way in azimuth. With a cable wrap, it can not
+    cross the given azimuth and might have to go the long way round. The dome always takes the shorter way.
+
+    Args:
+        az1: Azimuth of start position(s) in degrees.
+        alt1: Altitude of start position(s) in degrees.
+        az2: Azimuth of end position(s) in degrees.
+        alt2: Altitude of end position(s) in degrees.
+        az_speed: Speed of telescope in azimuth in degrees per second.
+        alt_speed: Speed of telescope in altitude in degrees per second.
+        dome_speed: Speed of dome in degrees per second, None for no dome.
+        cable_wrap: Azimuth in degrees that the telescope can not cross, None for no cable wrap.
+
+    Returns:
+        Slew times in seconds.
+    """
+    az1, alt1, az2, alt2 = (np.asarray(a, dtype=np.float64) for a in (az1, alt1, az2, alt2))
+
+    # shortest way in azimuth
+    short = np.abs((az2 - az1 + 180.0) % 360.0 - 180.0)
+
+    # telescope
+    if cable_wrap is None:
+        az = short
+    else:
+        az = np.abs((az2 - cable_wrap) % 360.0 - (az1 - cable_wrap) % 360.0)
+    times = np.maximum(az / az_speed, np.abs(alt2 - alt1) / alt_speed)
+
+    # dome
+    if dome_speed is not None:
+        times = np.maximum(times, short / dome_speed)
+    return times
+
+
+def path_cost(costs: npt.NDArray[np.float64], path: npt.ArrayLike) -> float:
+    """Returns the total cost of an open path.
+
+    Args:
+        costs: Matrix of costs between all nodes.
+        path: Indices of nodes in order of visit.
+
+    Returns:
+        Sum of costs along path.
+    """
+    path = np.asarray(path, dtype=int)
+    return float(np.sum(costs[path[:-1], path[1:]]))
+
+
+def plan_tour(costs: npt.NDArray[np.float64], start: int = 0, iterations: int = 100) -> npt.NDArray[np.int_]:
+    """Finds a short open path starting at the given node and visiting all others.
+
+    A nearest-neighbour tour is improved with 2-opt moves until no move reduces the total cost anymore or the
+    maximum number of iterations is reached. The path does not return to its start. Costs must be symmetric.
+
+    Args:
+        costs: Square matrix of costs between all nodes.
+        start: Index of node to start at, e.g. the current position of the telescope.
+        iterations: Maximum number of 2-opt passes.
+
+    Returns:
+        Indices of all nodes in order of visit, starting with start.
+    """
+    n = len(costs)
+    if n == 0:
+        return np.zeros(0, dtype=int)
+
+    # nearest neighbour
+    path = np.empty(n, dtype=int)
+    path[0] = start
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    for i in range(1, n):
+        row = np.where(visited, np.inf, costs[path[i - 1]])
+        path[i] = int(np.argmin(row))
+        visited[path[i]] = True
+
+    # 2-opt, reversing path[i:j+1] for all j at once
+    for _ in range(iterations):
+        improved = False
+        for i in range(1, n - 1):
+            a = path[i - 1]
+            j = np.arange(i + 1, n)
+            after = np.append(path[j[:-1] + 1], -1)
+            delta = costs[a, path[j]] - costs[a, path[i]]
+            inner = j < n - 1
+            delta[inner] += costs[path[i], after[inner]] - costs[path[j[inner]], after[inner]]
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                path[i : j[best] + 1] = path[i : j[best] + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return path
+
+
+__all__ = ["slew_times", "path_cost", "plan_tour"]
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from pyobs.interfaces import IImageStatistics, ImageStatisticsState
+from pyobs.utils.fits import parse_section_bounds
+
+if TYPE_CHECKING:
+    from pyobs.comm import Comm
+    from pyobs.images import Image
+
+log = logging.getLogger(__name__)
+
+
+class ImageStatistics:
+    """Computes statistics of images, e.g. in a camera right after readout.
+
+    Supported statistics are "mean", "median", "min", "max", "std", and percentiles given as "p" followed by an
+    integer between 0 and 100, e.g. "p90". The image is trimmed to its TRIMSEC and optionally to a frame given in
+    percent of its size, masked pixels are ignored. All percentiles and the median are computed with a single
+    partial sort.
+    """
+
+    # FITS header keywords for statistics, percentiles are stored as STATPnn
+    _KEYWORDS = {"mean": "STATMEAN", "median": "STATMED", "min": "STATMIN", "max": "STATMAX", "std": "STATSTD"}
+    _PERCENTILE = re.compile(r"^p(\d{1,3})$")
+
+    def __init__(
+        self,
+        statistics: list[str],
+        frame: tuple[float, float, float, float] | None = None,
+        trimsec: bool = True,
+    ):
+        """Creates new image statistics.
+
+        Args:
+            statistics: Names of statistics to compute.
+            frame: Tuple (left, top, width, height) in percent of the (trimmed) image to compute statistics in.
+            trimsec: Whether to trim image to TRIMSEC first.
+
+        Raises:
+            ValueError: If an unknown statistic is requested.
+        """
+        for name in statistics:
+            if name not in self._KEYWORDS and self._percentile(name) is None:
+                raise ValueError(f"Unknown image statistic: {name}.")
+        self._statistics = list(statistics)
+        self._frame = frame
+        self._trimsec = trimsec
+
+    @classmethod
+    def _percentile(cls, name: str) -> int | None:
+        m = cls._PERCENTILE.match(name)
+        return int(m.group(1)) if m is not None and int(m.group(1)) <= 100 else None
+
+    @classmethod
+    def keyword(cls, name: str) -> str:
+        """Returns FITS header keyword for given statistic."""
+        return cls._KEYWORDS[name] if name in cls._KEYWORDS else f"STATP{cls._percentile(name)}"
+
+    def _region(self, image: Image) -> NDArray[Any]:
+        """Returns valid pixels of the image in the configured region."""
+
+        # trim data and mask to same region
+        data, mask = image.data, image.safe_mask
+        bounds = parse_section_bounds(image.header, "TRIMSEC") if self._trimsec else None
+        if bounds is not None:
+            x0, x1, y0, y1 = bounds
+            data = data[..., y0:y1, x0:x1]
+            mask = mask[y0:y1, x0:x1] if mask is not None and mask.ndim == 2 else mask
+
+        # cut to frame
+        if self._frame is not None:
+            height, width = data.shape[-2:]
+            left, top, w, h = self._frame
+            ys = slice(int(top / 100 * height), int((top + h) / 100 * height))
+            xs = slice(int(left / 100 * width), int((left + w) / 100 * width))
+            data = data[..., ys, xs]
+            if mask is not None and mask.ndim == 2:
+                mask = mask[ys, xs]
+
+        # remove masked pixels
+        if mask is not None and mask.shape == data.shape[-2:]:
+            return np.asarray(data[..., ~mask.astype(bool)])
+        return np.asarray(data)
+
+    def __call__(self, image: Image) -> dict[str, float]:
+        """Computes statistics for the given image.
+
+        Args:
+            image: Image to compute statistics for.
+
+        Returns:
+            Dictionary with requested statistics, empty if there are no valid pixels.
+        """
+        if len(self._statistics) == 0 or image.safe_data is None:
+            return {}
+        data = self._region(image).ravel()
+        if not np.issubdtype(data.dtype, np.integer):
+            data = data[np.isfinite(data)]
+        if data.size == 0:
+            return {}
+
+        # percentiles in one go
+        percentiles = {name: 50 if name == "median" else self._percentile(name) for name in self._statistics}
+        percentiles = {k: v for k, v in percentiles.items() if v is not None}
+        results: dict[str, float] = {}
+        if percentiles:
+            values = np.percentile(data, list(percentiles.values()))
+            results.update({k: float(v) for k, v in zip(percentiles.keys(), values)})
+
+        # others
+        for name in self._statistics:
+            if name == "mean":
+                results[name] = float(np.mean(data, dtype=np.float64))
+            elif name == "std":
+                results[name] = float(np.std(data, dtype=np.float64))
+            elif name == "min":
+                results[name] = float(np.min(data))
+            elif name == "max":
+                results[name] = float(np.max(data))
+        return {name: results[name] for name in self._statistics}
+
+    def add_fits_headers(self, image: Image, statistics: dict[str, float]) -> None:
+        """Writes given statistics into the header of the given image."""
+        for name, value in statistics.items():
+            image.header[self.keyword(name)] = (value, f"Image statistic: {name}")
+
+
+async def wait_for_image_statistics(
+    comm: Comm, camera: str, filename: str, timeout: float = 5.0
+) -> dict[str, float] | None:
+    """Waits for the statistics of the given image to be published by the given camera.
+
+    Args:
+        comm: Comm object to use.
+        camera: Name of camera module, which must implement IImageStatistics.
+        filename: Filename of image as returned by grab_data().
+        timeout: Maximum time to wait in seconds.
+
+    Returns:
+        Statistics of the image, or None, if the camera doesn't provide any for it within the given time.
+    """
+    if not await comm.has_proxy(camera, IImageStatistics):
+        return None
+
+    # wait for state with given filename, the current one is delivered on subscribe
+    result: dict[str, float] | None = None
+    event = asyncio.Event()
+
+    def on_state(state: ImageStatisticsState) -> None:
+        nonlocal result
+        if state.filename == filename:
+            result = dict(state.statistics)
+            event.set()
+
+    await comm.subscribe_state(camera, IImageStatistics, on_state)
+    try:
+        await asyncio.wait_for(event.wait(), timeout=timeout)
+    except TimeoutError:
+        log.warning("No statistics for image %s from %s.", filename, camera)
+    finally:
+        await comm.unsubscribe_state(camera, IImageStatistics, on_state)
+    return result if result else None
+
+
+__all__ = ["ImageStatistics", "wait_for_image_statistics"]
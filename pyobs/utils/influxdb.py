@@ -1,18 +1,36 @@
 from __future__ import annotations
 
-# from https://gitlab.com/kipe/influx_logging_handler
+# originally from https://gitlab.com/kipe/influx_logging_handler
+import copy
 import logging
+import queue
+import threading
+import time
 import traceback
 from collections.abc import Iterator
-from typing import Any
+from typing import Any, Literal
 
 from influxdb_client import InfluxDBClient, Point, WritePrecision
 from influxdb_client.client.write_api import SYNCHRONOUS, WriteOptions
 
 from pyobs.utils.time import Time
 
+OverflowPolicy = Literal["drop_oldest", "drop_newest", "block"]
+
 
 class InfluxHandler(logging.Handler):
+    """Logging handler that ships log records to an InfluxDB.
+
+    emit() never talks to the server itself, it only puts the record into a bounded in-memory queue. A background
+    thread collects records from there and writes them in batches, whenever either batch_size records are available
+    or flush_interval seconds have passed. So a slow or unreachable server never stalls the thread that logged.
+
+    If the queue is full, the overflow policy decides what happens:
+        - drop_oldest: the oldest queued record is discarded in favour of the new one.
+        - drop_newest: the new record is discarded.
+        - block: emit() waits up to block_timeout seconds for space, and drops the new record afterward.
+    """
+
     def __init__(  # pylint: disable=too-many-arguments
         self,
         url: str,
@@ -22,7 +40,31 @@ class InfluxHandler(logging.Handler):
         module: str,
         measurement: str = "logging",
         write_options: WriteOptions = SYNCHRONOUS,
+        queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow: OverflowPolicy = "drop_oldest",
+        block_timeout: float = 0.1,
     ) -> None:
+        """Creates a new handler and starts its writer thread.
+
+        Args:
+            url: URL of InfluxDB server.
+            org: Organisation to write to.
+            bucket: Bucket to write to.
+            token: Access token.
+            module: Name of module, added as tag.
+            measurement: Name of measurement.
+            write_options: Write options for the InfluxDB client, used from writer thread.
+            queue_size: Maximum number of records in queue.
+            batch_size: Maximum number of records per write.
+            flush_interval: Maximum time in seconds before queued records are written.
+            overflow: What to do if queue is full, see class docs.
+            block_timeout: Maximum time in seconds to wait for space in queue with "block" policy.
+        """
+        super().__init__()
+        if overflow not in ("drop_oldest", "drop_newest", "block"):
+            raise ValueError(f"Invalid overflow policy: {overflow}")
 
         self.client = InfluxDBClient(url=url, token=token)
         self.write_api = self.client.write_api(write_options=write_options)
@@ -30,17 +72,101 @@ class InfluxHandler(logging.Handler):
         self.bucket = bucket
         self.measurement = measurement
         self.module = module
-        super().__init__()
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._overflow = overflow
+        self._block_timeout = block_timeout
+
+        # queue and counters
+        self._queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=queue_size)
+        self._stats_lock = threading.Lock()
+        self._dropped = 0
+        self._written = 0
+        self._failed = 0
+
+        # start writer thread
+        self._closing = threading.Event()
+        self._thread = threading.Thread(target=self._writer, name="InfluxHandler", daemon=True)
+        self._thread.start()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Counters for written, failed and dropped records as well as current queue size."""
+        with self._stats_lock:
+            return {
+                "queued": self._queue.qsize(),
+                "written": self._written,
+                "failed": self._failed,
+                "dropped": self._dropped,
+            }
 
     @staticmethod
     def _get_additional_tags(record: logging.LogRecord) -> Iterator[tuple[str, Any]]:
         if "tags" in record.__dict__ and isinstance(record.__dict__["tags"], dict):
             yield from record.__dict__["tags"].items()
 
+    def _count(self, dropped: int = 0, written: int = 0, failed: int = 0) -> None:
+        with self._stats_lock:
+            self._dropped += dropped
+            self._written += written
+            self._failed += failed
+
+    @staticmethod
+    def _prepare(record: logging.LogRecord) -> logging.LogRecord:
+        """Returns a copy of the record that is safe to be processed in another thread, i.e. with the message
+        already merged with its arguments and the traceback rendered, like logging.handlers.QueueHandler does."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            exc_type = record.exc_info[1].__class__.__name__
+            record.__dict__["influx_exception"] = (exc_type, "\n".join(traceback.format_tb(record.exc_info[2])).strip())
+            record.exc_info = None
+        return record
+
     def emit(self, record: logging.LogRecord) -> None:
+        # never feed back records logged by the writer thread itself, e.g. from the client library
+        if self._closing.is_set() or threading.current_thread() is self._thread:
+            return
+
+        try:
+            prepared = self._prepare(record)
+            try:
+                self._queue.put_nowait(prepared)
+                return
+            except queue.Full:
+                pass
+
+            if self._overflow == "drop_oldest":
+                # make space for new record, the writer thread might have done so in the meantime
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                    self._count(dropped=1)
+                except queue.Empty:
+                    pass
+                try:
+                    self._queue.put_nowait(prepared)
+                except queue.Full:
+                    self._count(dropped=1)
+
+            elif self._overflow == "block":
+                try:
+                    self._queue.put(prepared, timeout=self._block_timeout)
+                except queue.Full:
+                    self._count(dropped=1)
+
+            else:
+                self._count(dropped=1)
+
+        except Exception:
+            self.handleError(record)
+
+    def _to_point(self, record: logging.LogRecord) -> Point:
+        """Converts a prepared log record into a point."""
         point = (
             Point(self.measurement)
-            .tag("timestamp", Time.now().isot)
+            .tag("timestamp", Time(record.created, format="unix").isot)
             .tag("module", self.module)
             .tag("logger", record.name)
             .tag("level", record.levelname)
@@ -58,20 +184,64 @@ class InfluxHandler(logging.Handler):
         for tag, value in self._get_additional_tags(record):
             point = point.tag(tag, value)
 
-        exception = record.exc_info
+        exception = record.__dict__.get("influx_exception")
         if exception:
-            point = (
-                point.tag("exception", "1")
-                .tag("exception_type", exception[1].__class__.__name__)
-                .field("traceback", "\n".join(traceback.format_tb(exception[2])).strip())
-            )
+            point = point.tag("exception", "1").tag("exception_type", exception[0]).field("traceback", exception[1])
+
+        return point
+
+    def _next_batch(self) -> list[logging.LogRecord]:
+        """Waits for records in queue and returns up to batch_size of them, at latest after flush_interval."""
+        batch: list[logging.LogRecord] = []
+        deadline = time.monotonic() + self._flush_interval
+        while len(batch) < self._batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                # wait for more records only while within flush interval and not closing
+                if timeout <= 0 or self._closing.is_set():
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
 
-        self.write_api.write(self.bucket, self.org, point)
+    def _writer(self) -> None:
+        """Writer thread, writes batches of records until closed and queue is drained."""
+        while not self._closing.is_set() or not self._queue.empty():
+            batch = self._next_batch()
+            if batch:
+                try:
+                    self.write_api.write(self.bucket, self.org, [self._to_point(r) for r in batch])
+                    self._count(written=len(batch))
+                except Exception:
+                    # server not available or rejected points, nothing we can do about it
+                    self._count(failed=len(batch))
 
-    def flush(self) -> None:
+            # mark as done, which notifies flush()
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self, timeout: float = 10.0) -> None:
+        """Waits until all queued records have been written or timeout seconds have passed."""
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks > 0 and self._thread.is_alive():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._queue.all_tasks_done.wait(remaining)
         self.write_api.flush()
         return super().flush()
 
-    def close(self) -> None:
-        self.write_api.close()
+    def close(self, timeout: float = 10.0) -> None:
+        """Stops accepting new records, writes the remaining ones and closes the connection."""
+        if not self._closing.is_set():
+            self._closing.set()
+            self._thread.join(timeout)
+            self.write_api.close()
+            self.client.close()
         return super().close()
+
+
+__all__ = ["InfluxHandler"]
@@ -33,11 +33,21 @@ class ApplyOffsets(Object):
 
     __module__ = "pyobs.utils.offsets"
 
-    def __init__(self, log_file: str | None = None, log_absolute: bool = False, **kwargs: Any):
+    def __init__(
+        self, log_file: str | None = None, log_absolute: bool = False, log_append: bool = False, **kwargs: Any
+    ):
+        """Init new offset application.
+
+        Args:
+            log_file: Name of CSV file to log offsets in.
+            log_absolute: Whether to log absolute offsets instead of relative ones.
+            log_append: Whether to only append to the log file instead of rewriting it for every frame, which is
+                much faster for long logs, see :class:`~pyobs.utils.publisher.CsvPublisher`.
+        """
         Object.__init__(self, **kwargs)
 
         # init log file
-        self._publisher = None if log_file is None else CsvPublisher(log_file)
+        self._publisher = None if log_file is None else CsvPublisher(log_file, append=log_append)
         self._log_absolute = log_absolute
 
     async def __call__(self, image: Image, telescope: ITelescope, location: EarthLocation | None) -> OffsetResult:
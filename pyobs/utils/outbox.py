@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboxEntry:
+    """A message in the outbox. delivered is None while it is pending."""
+
+    kind: str
+    payload: Any
+    key: str = field(default_factory=lambda: str(uuid.uuid4()))
+    coalesce: str | None = None
+    expires: float | None = None
+    created: float = field(default_factory=time.time)
+    attempts: int = 0
+    delivered: bool | None = None
+
+
+@dataclass
+class OutboxStatistics:
+    """Statistics for an outbox."""
+
+    backlog: int = 0
+    oldest_age: float = 0.0
+    sent: int = 0
+    retries: int = 0
+    rejected: int = 0
+    expired: int = 0
+    coalesced: int = 0
+    last_error: str | None = None
+
+
+class Outbox:
+    """A durable queue for messages that need to be delivered to a remote service, e.g. the LCO portal.
+
+    Messages are delivered one after the other in the order they were added, using the given send function. If
+    sending fails, it is retried with exponential backoff, blocking all later messages, so that their order is kept.
+    If the send function raises a ValueError, the message has been rejected and is dropped. Every message gets a
+    unique key that can be sent along as idempotency key, so that the remote service can ignore duplicates after a
+    retry. A message with a coalesce key replaces a pending message with the same coalesce key, e.g. for status
+    updates that supersede previous ones. Messages can expire, if they are useless after a given time.
+
+    If a filename is given, all messages are journaled to this local file as JSON lines, so pending messages survive
+    a restart. The journal is compacted every now and then.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[OutboxEntry], Awaitable[None]],
+        filename: str | None = None,
+        min_backoff: float = 5.0,
+        max_backoff: float = 600.0,
+        compact: int = 1000,
+        warn_backlog: int = 100,
+    ):
+        """Creates a new outbox.
+
+        Args:
+            send: Function for sending a message, raising a ValueError if rejected and any other exception to retry.
+            filename: Local file for journaling messages.
+            min_backoff: Time in seconds to wait before the first retry.
+            max_backoff: Maximum time in seconds between retries.
+            compact: Compact journal after this many lines.
+            warn_backlog: Log a warning, if the backlog grows beyond this many messages.
+        """
+        self._send = send
+        self._filename = filename
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._compact = compact
+        self._warn_backlog = warn_backlog
+
+        # pending messages in order, the one currently being sent, and waiters for delivery
+        self._entries: dict[str, OutboxEntry] = {}
+        self._sending: str | None = None
+        self._delivered: dict[str, asyncio.Future[bool]] = {}
+        self._statistics = OutboxStatistics()
+
+        # journal
+        self._file: IO[str] | None = None
+        self._lines = 0
+
+        # worker
+        self._wake = asyncio.Event()
+        self._worker: asyncio.Task[None] | None = None
+
+        # load journal
+        if self._filename is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        """Number of pending messages."""
+        return len(self._entries)
+
+    def _load(self) -> None:
+        """Replays journal and opens it for appending."""
+        assert self._filename is not None
+        path = Path(self._filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        if record["op"] == "add":
+                            entry = OutboxEntry(**record["entry"])
+                            self._entries[entry.key] = entry
+                        elif record["op"] == "done":
+                            self._entries.pop(record["key"], None)
+                    except (ValueError, KeyError, TypeError):
+                        # a truncated last line after a crash
+                        log.warning("Ignoring invalid line in outbox journal %s.", self._filename)
+            if len(self._entries) > 0:
+                log.info("Loaded %d pending message(s) from outbox journal %s.", len(self._entries), self._filename)
+        self._rewrite()
+
+    def _journal(self, record: dict[str, Any]) -> None:
+        """Appends a record to the journal."""
+        if self._file is None:
+            return
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        self._lines += 1
+        if self._lines > self._compact:
+            self._rewrite()
+
+    def _rewrite(self) -> None:
+        """Replaces journal with one containing only the pending messages."""
+        assert self._filename is not None
+        if self._file is not None:
+            self._file.close()
+        tmp = f"{self._filename}.tmp"
+        with open(tmp, "w") as f:
+            for entry in self._entries.values():
+                f.write(json.dumps({"op": "add", "entry": asdict(entry)}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._filename)
+        self._file = open(self._filename, "a")
+        self._lines = len(self._entries)
+
+    def add(self, kind: str, payload: Any, coalesce: str | None = None, expires: float | None = None) -> OutboxEntry:
+        """Adds a new message to the outbox.
+
+        Args:
+            kind: Type of message, used by the send function to decide what to do.
+            payload: JSON-serializable payload.
+            coalesce: If given, a pending message with the same coalesce key is replaced.
+            expires: Unix time after which the message is dropped, if it hasn't been sent yet.
+
+        Returns:
+            The new message.
+        """
+
+        # replace pending message, unless it is being sent right now
+        if coalesce is not None:
+            for key, entry in list(self._entries.items()):
+                if entry.coalesce == coalesce and key != self._sending:
+                    self._done(key, False)
+                    self._statistics.coalesced += 1
+
+        # add it
+        entry = OutboxEntry(kind=kind, payload=payload, coalesce=coalesce, expires=expires)
+        self._entries[entry.key] = entry
+        self._delivered[entry.key] = asyncio.get_running_loop().create_future()
+        self._journal({"op": "add", "entry": asdict(entry)})
+        if len(self._entries) > self._warn_backlog:
+            log.warning("Backlog of outbox has grown to %d messages.", len(self._entries))
+
+        # wake up worker
+        self._wake.set()
+        return entry
+
+    def _done(self, key: str, delivered: bool) -> None:
+        """Removes a message and notifies waiters."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry.delivered = delivered
+        self._journal({"op": "done", "key": key})
+        future = self._delivered.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(delivered)
+
+    async def wait(self, entry: OutboxEntry, timeout: float | None = None) -> bool:
+        """Waits for a message that has just been added to be delivered.
+
+        Args:
+            entry: Message to wait for.
+            timeout: Maximum time to wait in seconds.
+
+        Returns:
+            True, if message has been delivered, False if it has been dropped or the timeout was reached.
+        """
+        future = self._delivered.get(entry.key)
+        if future is None:
+            return entry.delivered is True
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except TimeoutError:
+            return False
+
+    def statistics(self) -> OutboxStatistics:
+        """Returns current statistics.
+
+        Returns:
+            Statistics of outbox, including size and age of backlog.
+        """
+        self._statistics.backlog = len(self._entries)
+        self._statistics.oldest_age = (
+            time.time() - min(e.created for e in self._entries.values()) if self._entries else 0.0
+        )
+        return self._statistics
+
+    def start(self) -> None:
+        """Starts delivering messages in the background."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stops delivering messages and closes journal. Pending messages are kept in the journal."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.wait([self._worker])
+            self._worker = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def _run(self) -> None:
+        """Delivers messages in order."""
+        while True:
+            # wait for message
+            if len(self._entries) == 0:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            entry = next(iter(self._entries.values()))
+
+            # expired?
+            if entry.expires is not None and time.time() > entry.expires:
+                log.warning("Dropping expired %s message from outbox.", entry.kind)
+                self._statistics.expired += 1
+                self._done(entry.key, False)
+                continue
+
+            # send it
+            self._sending = entry.key
+            try:
+                await self._send(entry)
+                self._statistics.sent += 1
+                self._done(entry.key, True)
+            except asyncio.CancelledError:
+                raise
+            except ValueError as e:
+                log.error("Message of type %s rejected, dropping it: %s", entry.kind, e)
+                self._statistics.rejected += 1
+                self._statistics.last_error = str(e)
+                self._done(entry.key, False)
+            except Exception as e:
+                # back off
+                entry.attempts += 1
+                backoff = min(self._max_backoff, self._min_backoff * 2 ** (entry.attempts - 1))
+                log.warning(
+                    "Could not send %s message (attempt %d, %d pending), retrying in %.0fs: %s",
+                    entry.kind,
+                    entry.attempts,
+                    len(self._entries),
+                    backoff,
+                    e,
+                )
+                self._statistics.retries += 1
+                self._statistics.last_error = str(e)
+                await asyncio.sleep(backoff)
+            finally:
+                self._sending = None
+
+
+__all__ = ["Outbox", "OutboxEntry", "OutboxStatistics"]
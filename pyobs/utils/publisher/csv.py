@@ -1,4 +1,11 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import io
 import logging
+import os
+import time
 from typing import Any
 
 import pandas as pd
@@ -9,16 +16,67 @@ log = logging.getLogger(__name__)
 
 
 class CsvPublisher(Publisher):
-    def __init__(self, filename: str, **kwargs: Any):
+    """Publishes results as rows in a CSV file.
+
+    By default, every call reads the whole file, adds a row, and writes it back. With append=True, rows are only
+    appended to the end of the file instead, and can be buffered to be written in batches of flush_rows rows or at
+    latest every flush_interval seconds (checked on every publish and, if opened, in the background). In that mode,
+    the publisher assumes to be the only writer of its file, and the filename may contain a {date} placeholder that
+    is replaced by the current UTC date, which rotates the file daily. Files in VFS roots that cannot be appended to
+    (e.g. SSH or HTTP) are still rewritten as a whole on every flush.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        append: bool = False,
+        flush_rows: int = 1,
+        flush_interval: float = 10.0,
+        **kwargs: Any,
+    ):
         """Initialize new CSV publisher.
 
         Args:
-            filename: Name of file to log in.
+            filename: Name of file to log in, may contain {date} placeholder in append mode.
+            append: Whether to only append new rows to the file.
+            flush_rows: In append mode, number of buffered rows after which they are written.
+            flush_interval: In append mode, maximum time in seconds that rows are kept in buffer.
         """
         Publisher.__init__(self, **kwargs)
 
         # store
         self._filename = filename
+        self._append = append
+        self._flush_rows = flush_rows
+        self._flush_interval = flush_interval
+
+        # buffered rows with their filenames, and time of last flush
+        self._buffer: list[tuple[str, dict[str, Any]]] = []
+        self._last_flush = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        # columns of files written to so far
+        self._columns: dict[str, list[str]] = {}
+
+        # data of current file, read on first call to data(), and rows published since
+        self._cache: tuple[str, pd.DataFrame] | None = None
+        self._cache_rows: list[dict[str, Any]] = []
+
+        # flush regularly
+        if self._append and self._flush_interval > 0:
+            self.add_background_task(self._flush_task)
+
+    @property
+    def filename(self) -> str:
+        """Name of file currently published to."""
+        if "{date}" in self._filename:
+            return self._filename.replace("{date}", datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%d"))
+        return self._filename
+
+    async def close(self) -> None:
+        """Write remaining rows and close publisher."""
+        await Publisher.close(self)
+        await self.flush()
 
     async def __call__(self, **kwargs: Any) -> None:
         """Publish the given results.
@@ -27,6 +85,11 @@ class CsvPublisher(Publisher):
             **kwargs: Results to publish.
         """
 
+        # append?
+        if self._append:
+            await self._publish_append(**kwargs)
+            return
+
         # load data
         csv = await self.data()
 
@@ -37,18 +100,203 @@ class CsvPublisher(Publisher):
         # write it
         await self.vfs.write_csv(self._filename, csv, index=False)
 
-    async def data(self) -> pd.DataFrame:
-        """Return data that has so far been published."""
+    async def _publish_append(self, **kwargs: Any) -> None:
+        """Buffer given results and write them, if necessary."""
 
-        # load data
+        # add to buffer and, if data has been read already, to cache
+        filename = self.filename
+        self._buffer.append((filename, kwargs))
+        if self._cache is not None and self._cache[0] == filename:
+            self._cache_rows.append(kwargs)
+
+        # flush?
+        if len(self._buffer) >= self._flush_rows or time.monotonic() - self._last_flush >= self._flush_interval:
+            await self.flush()
+
+    async def _flush_task(self) -> None:
+        """Flush buffer regularly."""
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            if self._buffer and time.monotonic() - self._last_flush >= self._flush_interval:
+                await self.flush()
+
+    async def flush(self) -> None:
+        """Append all buffered rows to their files."""
+        async with self._lock:
+            # nothing to do?
+            self._last_flush = time.monotonic()
+            if not self._buffer:
+                return
+            buffer, self._buffer = self._buffer, []
+
+            # group by filename, keeping the order
+            rows: dict[str, list[dict[str, Any]]] = {}
+            for filename, row in buffer:
+                rows.setdefault(filename, []).append(row)
+
+            # write
+            for filename, file_rows in rows.items():
+                try:
+                    await self._append_rows(filename, pd.DataFrame(file_rows))
+                except Exception:
+                    log.exception("Could not write to CSV file %s.", filename)
+
+    async def _append_rows(self, filename: str, df: pd.DataFrame) -> None:
+        """Append the rows in the given DataFrame to the given file.
+
+        Args:
+            filename: Name of file to append to.
+            df: Rows to append.
+        """
+
+        # get columns of existing file
+        if filename not in self._columns:
+            columns = await self._read_columns(filename)
+            if columns is not None:
+                self._columns[filename] = columns
+        columns = self._columns.get(filename)
+
+        if columns is None:
+            # new file, write with header
+            self._columns[filename] = list(df.columns)
+            await self._write(filename, df, header=True)
+
+        elif set(df.columns).issubset(columns):
+            # append rows, with the same order of columns as in the file
+            await self._write(filename, df.reindex(columns=columns), header=False)
+
+        else:
+            # new columns, so we need to rewrite the file once
+            log.info("New columns in rows for %s, rewriting whole file...", filename)
+            csv = pd.concat([await self._read(filename), df], ignore_index=True)
+            self._columns[filename] = list(csv.columns)
+            await self.vfs.write_csv(filename, csv, index=False)
+
+    async def _write(self, filename: str, df: pd.DataFrame, header: bool) -> None:
+        """Append the given DataFrame to a file."""
+
+        # can't append? then rewrite file
+        if not self.vfs.supports_append(filename):
+            csv = df if header else pd.concat([await self._read(filename), df], ignore_index=True)
+            await self.vfs.write_csv(filename, csv, index=False)
+            return
+
+        with io.StringIO() as sio:
+            df.to_csv(sio, index=False, header=header)
+            async with self.vfs.open_file(filename, "a") as f:
+                await f.write(sio.getvalue())
+
+    async def _read(self, filename: str) -> pd.DataFrame:
+        """Read the given file or return an empty DataFrame, if it doesn't exist."""
+        try:
+            return await self.vfs.read_csv(filename, index_col=False)
+        except FileNotFoundError:
+            return pd.DataFrame()
+
+    async def _read_columns(self, filename: str) -> list[str] | None:
+        """Returns the columns of the given file or None, if it doesn't exist or is empty."""
+        try:
+            async with self.vfs.open_file(filename, "r") as f:
+                line = ""
+                while "\n" not in line:
+                    chunk = await f.read(1024)
+                    if isinstance(chunk, bytes):
+                        chunk = chunk.decode("utf-8")
+                    if not chunk:
+                        break
+                    line += chunk
+        except FileNotFoundError:
+            return None
+        header = line.split("\n")[0].strip()
+        return None if header == "" else list(pd.read_csv(io.StringIO(header), index_col=False).columns)
+
+    async def data(self, tail: int | None = None) -> pd.DataFrame:
+        """Return data that has so far been published.
+
+        In append mode, the file is read only on the first call and the result is kept in memory, and only the current
+        file is returned if it is rotated.
+
+        Args:
+            tail: If given, only return that many rows from the end.
+        """
+
+        # not append mode?
+        if not self._append:
+            df = await self._read_or_warn(self._filename)
+            return df if tail is None else df.iloc[-tail:]
+
+        # read file, if necessary
+        filename = self.filename
+        if self._cache is None or self._cache[0] != filename:
+            if tail is not None:
+                # only read the tail and don't cache it
+                df = await self._read_tail(filename, tail)
+                pending = [row for fn, row in self._buffer if fn == filename]
+                df = pd.concat([df, pd.DataFrame(pending)], ignore_index=True) if pending else df
+                return df.iloc[-tail:]
+
+            # read file and add rows that have not been written so far
+            df = await self._read_or_warn(filename)
+            pending = [row for fn, row in self._buffer if fn == filename]
+            self._cache = (filename, df)
+            self._cache_rows = pending
+
+        # add new rows to cache
+        if self._cache_rows:
+            self._cache = (filename, pd.concat([self._cache[1], pd.DataFrame(self._cache_rows)], ignore_index=True))
+            self._cache_rows = []
+
+        # return copy
+        df = self._cache[1]
+        return df.copy() if tail is None else df.iloc[-tail:].copy()
+
+    async def _read_or_warn(self, filename: str) -> pd.DataFrame:
+        """Read the given file or return an empty DataFrame with a warning, if it doesn't exist."""
         try:
             # load it
-            return await self.vfs.read_csv(self._filename, index_col=False)
+            return await self.vfs.read_csv(filename, index_col=False)
 
         except FileNotFoundError:
             # file not found, so start new with row
             log.warning("No previous CSV file found, creating new one...")
             return pd.DataFrame()
 
+    async def _read_tail(self, filename: str, tail: int) -> pd.DataFrame:
+        """Read the last rows of the given file, only reading its end for local files."""
+
+        # not a local file? then we need to read everything
+        try:
+            path = await self.vfs.local_path(filename)
+        except ValueError:
+            return (await self._read_or_warn(filename)).iloc[-tail:]
+        if not os.path.exists(path):
+            return pd.DataFrame()
+
+        def _read() -> pd.DataFrame:
+            with open(path, "rb") as f:
+                # read header
+                header = f.readline()
+
+                # read blocks from the end until we got enough lines
+                f.seek(0, os.SEEK_END)
+                end = pos = f.tell()
+                data = b""
+                while pos > len(header) and data.count(b"\n") <= tail:
+                    pos = max(pos - 65536, len(header))
+                    f.seek(pos)
+                    data = f.read(end - pos)
+
+            # cut first (maybe incomplete) line, if we didn't read up to header
+            lines = data.splitlines()
+            if pos > len(header):
+                lines = lines[1:]
+            content = b"\n".join([header.rstrip(b"\r\n")] + lines[-tail:]).decode("utf-8")
+            try:
+                return pd.read_csv(io.StringIO(content), index_col=False)
+            except pd.errors.EmptyDataError:
+                return pd.DataFrame()
+
+        return await asyncio.to_thread(_read)
+
 
 __all__ = ["CsvPublisher"]
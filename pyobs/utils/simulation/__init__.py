@@ -0,0 +1,4 @@
+from .catalog import SyntheticStarCatalog
+from .renderer import SkyRenderer
+
+__all__ = ["SkyRenderer", "SyntheticStarCatalog"]
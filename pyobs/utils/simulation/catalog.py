@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+from astropy.table import Table
+from numpy.typing import NDArray
+
+
+class SyntheticStarCatalog:
+    """Procedurally generated all-sky star catalog, which works without any network access.
+
+    The sky is divided into cells of roughly cell_size x cell_size degrees. The stars of each cell are drawn from a
+    random generator seeded with the catalog seed and the cell index, so the same part of the sky always shows the
+    same stars. Their magnitudes follow a power-law luminosity function, with approximately the number of stars per
+    square degree that Gaia sees on average. Generated cells are kept in a small LRU cache, so repeated queries around
+    the same position only need to select stars from a few arrays.
+
+    The returned tables have the same columns as a query to the Gaia archive, i.e. ra, dec, phot_g_mean_mag,
+    phot_g_mean_flux, and dist.
+    """
+
+    # number of stars per square degree brighter than _REF_MAG, and slope of log10(N(<m))
+    _REF_DENSITY = 7.0
+    _REF_MAG = 10.0
+    _SLOPE = 0.375
+
+    # Gaia G band zero point, for converting magnitudes to fluxes in e-/s
+    _ZERO_POINT = 25.6874
+
+    def __init__(self, max_mag: float = 20.0, seed: int = 0, cell_size: float = 1.0, cache_size: int = 64):
+        """Creates a new synthetic catalog.
+
+        Args:
+            max_mag: Faintest magnitude of generated stars.
+            seed: Seed for random generator.
+            cell_size: Size of cells in degrees.
+            cache_size: Maximum number of generated cells to keep in memory.
+        """
+        self._max_mag = max_mag
+        self._seed = seed
+        self._cell_size = cell_size
+        self._cache_size = cache_size
+        self._cells: OrderedDict[tuple[int, int], tuple[NDArray[Any], NDArray[Any], NDArray[Any]]] = OrderedDict()
+
+        # dec bands and number of RA cells in each of them
+        self._num_bands = max(1, int(round(180.0 / cell_size)))
+        self._band_edges = np.linspace(-90.0, 90.0, self._num_bands + 1)
+        centers = np.radians(0.5 * (self._band_edges[:-1] + self._band_edges[1:]))
+        self._num_ra_cells = np.maximum(1, np.ceil(360.0 * np.cos(centers) / cell_size)).astype(int)
+
+    def density(self, max_mag: float | None = None) -> float:
+        """Returns the average number of stars per square degree brighter than the given magnitude."""
+        mag = self._max_mag if max_mag is None else min(max_mag, self._max_mag)
+        return float(self._REF_DENSITY * 10 ** (self._SLOPE * (mag - self._REF_MAG)))
+
+    def _cell(self, band: int, cell: int) -> tuple[NDArray[Any], NDArray[Any], NDArray[Any]]:
+        """Returns ra, dec, and magnitudes of all stars in the given cell, sorted by magnitude."""
+        key = (band, cell)
+        if key in self._cells:
+            self._cells.move_to_end(key)
+            return self._cells[key]
+
+        # area of cell
+        dec1, dec2 = self._band_edges[band], self._band_edges[band + 1]
+        width = 360.0 / self._num_ra_cells[band]
+        sin1, sin2 = math.sin(math.radians(dec1)), math.sin(math.radians(dec2))
+        area = (sin2 - sin1) * math.radians(width) * (180.0 / math.pi) ** 2
+
+        # draw stars uniformly on the sphere
+        rng = np.random.default_rng([self._seed, band, cell])
+        n = rng.poisson(self.density() * area)
+        ra = cell * width + rng.uniform(0.0, width, n)
+        dec = np.degrees(np.arcsin(rng.uniform(sin1, sin2, n)))
+
+        # and magnitudes from inverted cumulative luminosity function
+        mag = self._max_mag + np.log10(1.0 - rng.uniform(0.0, 1.0, n)) / self._SLOPE
+        order = np.argsort(mag)
+        stars = (ra[order], dec[order], np.maximum(mag[order], -1.0))
+
+        # store in cache
+        self._cells[key] = stars
+        if len(self._cells) > self._cache_size:
+            self._cells.popitem(last=False)
+        return stars
+
+    def _cells_in_cone(self, ra: float, dec: float, radius: float) -> list[tuple[int, int]]:
+        """Returns all cells that overlap with the given cone."""
+        cells = []
+        band1 = int(np.searchsorted(self._band_edges, dec - radius, side="right")) - 1
+        band2 = int(np.searchsorted(self._band_edges, dec + radius, side="right")) - 1
+        for band in range(max(band1, 0), min(band2, self._num_bands - 1) + 1):
+            n_ra = int(self._num_ra_cells[band])
+            width = 360.0 / n_ra
+
+            # maximum extent in RA within this band
+            max_dec = max(abs(self._band_edges[band]), abs(self._band_edges[band + 1]))
+            if max_dec + radius >= 89.999:
+                cells.extend((band, i) for i in range(n_ra))
+                continue
+            dra = radius / math.cos(math.radians(max_dec))
+            if dra >= 180.0:
+                cells.extend((band, i) for i in range(n_ra))
+                continue
+
+            # cells covering [ra-dra, ra+dra], wrapping around
+            first = int(math.floor((ra - dra) / width))
+            last = int(math.floor((ra + dra) / width))
+            cells.extend((band, i) for i in sorted({i % n_ra for i in range(first, last + 1)}))
+        return cells
+
+    def query(self, ra: float, dec: float, radius: float, max_mag: float | None = None, limit: int = 1000) -> Table:
+        """Returns the brightest stars within the given cone.
+
+        Args:
+            ra: Right ascension of center in degrees.
+            dec: Declination of center in degrees.
+            radius: Radius of cone in degrees.
+            max_mag: Faintest magnitude to return.
+            limit: Maximum number of stars to return.
+
+        Returns:
+            Table with stars, sorted by magnitude.
+        """
+
+        # collect stars
+        cells = [self._cell(band, cell) for band, cell in self._cells_in_cone(ra, dec, radius)]
+        ras = np.concatenate([c[0] for c in cells]) if cells else np.empty(0)
+        decs = np.concatenate([c[1] for c in cells]) if cells else np.empty(0)
+        mags = np.concatenate([c[2] for c in cells]) if cells else np.empty(0)
+
+        # angular distance (haversine)
+        ra0, dec0 = math.radians(ra), math.radians(dec)
+        r, d = np.radians(ras), np.radians(decs)
+        hav = np.sin((d - dec0) / 2.0) ** 2 + math.cos(dec0) * np.cos(d) * np.sin((r - ra0) / 2.0) ** 2
+        dist = np.degrees(2.0 * np.arcsin(np.sqrt(np.clip(hav, 0.0, 1.0))))
+
+        # filter and sort
+        mask = dist <= radius
+        if max_mag is not None:
+            mask &= mags <= max_mag
+        idx = np.flatnonzero(mask)
+        idx = idx[np.argsort(mags[idx], kind="stable")][:limit]
+
+        return Table(
+            {
+                "dist": dist[idx],
+                "ra": ras[idx],
+                "dec": decs[idx],
+                "phot_g_mean_flux": 10 ** (-0.4 * (mags[idx] - self._ZERO_POINT)),
+                "phot_g_mean_mag": mags[idx],
+            }
+        )
+
+
+__all__ = ["SyntheticStarCatalog"]
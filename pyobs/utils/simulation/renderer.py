@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import math
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+class SkyRenderer:
+    """Fast renderer for simulated images.
+
+    Noise is not drawn from a random generator for every frame, but taken from a pool of normally distributed values
+    that is generated once and only re-drawn when a larger frame is requested, starting at a random offset for every
+    frame. Stars are rendered as Gaussian PSFs on small stamps, all at once with vectorised numpy operations.
+    Illumination patterns for simulated flat-field fall-off are cached by shape.
+    """
+
+    def __init__(self, seed: int | None = None, pool_factor: float = 2.0, max_stamp_size: int = 31):
+        """Creates a new renderer.
+
+        Args:
+            seed: Seed for random generator.
+            pool_factor: Size of noise pool relative to largest frame so far.
+            max_stamp_size: Maximum size of PSF stamps in pixels.
+        """
+        self._rng = np.random.default_rng(seed)
+        self._pool_factor = pool_factor
+        self._max_stamp_size = max_stamp_size
+        self._pool: NDArray[np.float32] = np.empty(0, dtype=np.float32)
+        self._illumination: dict[tuple[tuple[int, int], float], NDArray[np.float32]] = {}
+
+    def noise(
+        self, shape: tuple[int, int], mean: float | NDArray[Any] = 0.0, stddev: float = 1.0
+    ) -> NDArray[np.float32]:
+        """Returns an image with normally distributed noise.
+
+        Args:
+            shape: Shape of image.
+            mean: Mean value, either scalar or array with given shape.
+            stddev: Standard deviation.
+
+        Returns:
+            New image in single precision.
+        """
+
+        # (re-)create pool, if necessary
+        size = shape[0] * shape[1]
+        if len(self._pool) < size:
+            self._pool = self._rng.standard_normal(int(size * self._pool_factor) + 1, dtype=np.float32)
+
+        # take slice at random offset
+        start = int(self._rng.integers(0, len(self._pool) - size + 1))
+        data = self._pool[start : start + size].reshape(shape) * np.float32(stddev)
+        data += mean
+        return data
+
+    def illumination(self, shape: tuple[int, int], vignetting: float) -> NDArray[np.float32]:
+        """Returns a radial illumination pattern that drops from 1 in the center to 1-vignetting in the corners.
+
+        Args:
+            shape: Shape of image.
+            vignetting: Fraction of light lost in the corners.
+
+        Returns:
+            Illumination pattern.
+        """
+        key = (shape, vignetting)
+        if key not in self._illumination:
+            y, x = np.ogrid[: shape[0], : shape[1]]
+            cy, cx = (shape[0] - 1) / 2.0, (shape[1] - 1) / 2.0
+            r2 = ((x - cx) ** 2 + (y - cy) ** 2) / max(cx**2 + cy**2, 1.0)
+            self._illumination[key] = (1.0 - vignetting * r2).astype(np.float32)
+        return self._illumination[key]
+
+    def add_stars(
+        self,
+        data: NDArray[Any],
+        x: NDArray[Any],
+        y: NDArray[Any],
+        flux: NDArray[Any],
+        fwhm: float,
+        illumination: NDArray[Any] | None = None,
+    ) -> None:
+        """Adds stars with Gaussian PSFs to the given image in place.
+
+        Args:
+            data: Image to add stars to.
+            x: 0-based x positions of stars.
+            y: 0-based y positions of stars.
+            flux: Total fluxes of stars.
+            fwhm: FWHM of PSF in pixels.
+            illumination: If given, fluxes are scaled by illumination at star positions.
+        """
+
+        # size of stamps
+        half = min(max(2, math.ceil(2.0 * fwhm)), self._max_stamp_size // 2)
+        height, width = data.shape
+
+        # only stars that touch the image
+        x, y, flux = np.asarray(x, dtype=float), np.asarray(y, dtype=float), np.asarray(flux, dtype=float)
+        mask = (x > -half) & (x < width + half) & (y > -half) & (y < height + half) & np.isfinite(flux)
+        x, y, flux = x[mask], y[mask], flux[mask]
+        if len(x) == 0:
+            return
+
+        # scale by illumination
+        ix, iy = np.rint(x).astype(int), np.rint(y).astype(int)
+        if illumination is not None:
+            flux = flux * illumination[np.clip(iy, 0, height - 1), np.clip(ix, 0, width - 1)]
+
+        # separable Gaussian profiles on stamp grids, normalized to unit sum
+        offsets = np.arange(-half, half + 1)
+        gx, gy = ix[:, None] + offsets, iy[:, None] + offsets
+        sigma = fwhm / (2.0 * math.sqrt(2.0 * math.log(2.0)))
+        px = np.exp(-0.5 * ((gx - x[:, None]) / sigma) ** 2)
+        py = np.exp(-0.5 * ((gy - y[:, None]) / sigma) ** 2)
+        px /= px.sum(axis=1, keepdims=True)
+        py /= py.sum(axis=1, keepdims=True)
+        stamps = flux[:, None, None] * py[:, :, None] * px[:, None, :]
+
+        # add all pixels within image
+        yy = np.broadcast_to(gy[:, :, None], stamps.shape)
+        xx = np.broadcast_to(gx[:, None, :], stamps.shape)
+        valid = (xx >= 0) & (xx < width) & (yy >= 0) & (yy < height)
+        np.add.at(data, (yy[valid], xx[valid]), stamps[valid])
+
+
+__all__ = ["SkyRenderer"]
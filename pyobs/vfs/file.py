@@ -8,6 +8,9 @@ class VFSFile(metaclass=ABCMeta):
 
     __module__ = "pyobs.vfs"
 
+    """Whether files can be opened in append mode ("a"), instead of only being written as a whole."""
+    supports_append: bool = False
+
     @abstractmethod
     async def close(self) -> None: ...
 
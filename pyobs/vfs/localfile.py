@@ -11,6 +11,7 @@ class LocalFile(VFSFile):
     """Wraps a local file with the virtual file system."""
 
     __module__ = "pyobs.vfs"
+    supports_append = True
 
     def __init__(self, name: str, mode: str = "r", root: str | None = None, mkdir: bool = True, **kwargs: Any):
         """Open a local file.
@@ -11,6 +11,7 @@ class MemoryFile(BufferedFile):
     """A file stored in memory."""
 
     __module__ = "pyobs.vfs"
+    supports_append = True
 
     def __init__(self, name: str, mode: str = "r", **kwargs: Any):
         """Open/create a file in memory.
@@ -12,6 +12,7 @@ class SFTPFile(VFSFile):
     """VFS wrapper for a file that can be accessed over a SFTP connection."""
 
     __module__ = "pyobs.vfs"
+    supports_append = True
 
     def __init__(
         self,
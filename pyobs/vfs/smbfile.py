@@ -17,6 +17,7 @@ class SMBFile(VFSFile):
     """
 
     __module__ = "pyobs.vfs"
+    supports_append = True
 
     def __init__(
         self,
@@ -272,6 +272,18 @@ class VirtualFileSystem:
         # get local path
         return await klass.local_path(path, **self._roots[root])
 
+    def supports_append(self, path: str) -> bool:
+        """Whether the file with the given path can be opened in append mode.
+
+        Args:
+            path: Path to check.
+
+        Returns:
+            True, if appending to the file is supported.
+        """
+        klass, _, _ = self._get_class(path)
+        return klass.supports_append
+
     def _get_class(self, path: str) -> tuple[type[VFSFile], str, str]:
         from pyobs.object import get_class_from_string
 
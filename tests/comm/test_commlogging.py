@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
 
-from pyobs.comm.commlogging import CommLoggingHandler
-from pyobs.events import LogEvent
+from pyobs.comm import Comm
+from pyobs.comm.commlogging import CommLoggingHandler, LogRateLimiter
+from pyobs.events import Event, LogBatchEvent, LogEvent
 
 
 @pytest.fixture
@@ -166,3 +169,117 @@ def test_via_logging_integration(comm: MagicMock) -> None:
     event = comm.log_message.call_args[0][0]
     assert "integration test message" in event.message
     logger.removeHandler(handler)
+
+
+# ── rate limiting and forwarding ──────────────────────────────────────────────
+
+
+def _entry(i: int, level: str = "DEBUG", filename: str = "guiding.py") -> LogEvent:
+    return LogEvent("2025-01-01T00:00:00.000000", level, filename, "f", i, f"message {i}")
+
+
+def test_rate_limiter_allows_burst_then_rate() -> None:
+    limiter = LogRateLimiter(rate=10.0, burst=5)
+    assert sum(limiter.allow("a", now=0.0) for _ in range(10)) == 5
+    assert limiter.allow("b", now=0.0)
+    assert sum(limiter.allow("a", now=1.0) for _ in range(20)) == 5
+    assert limiter.pop_suppressed() == {"a": 20}
+    assert not limiter.has_suppressed
+
+
+class _ForwardingComm(Comm):
+    """Comm that records sent events."""
+
+    def __init__(self, **kwargs: Any):
+        Comm.__init__(self, **kwargs)
+        self.sent: list[Event] = []
+
+    async def send_event(self, event: Event) -> None:
+        self.sent.append(event)
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_logging_forwards_batches() -> None:
+    comm = _ForwardingComm(log_batch_size=10, log_rate=None)
+    task = asyncio.create_task(comm._logging())
+    try:
+        for i in range(25):
+            comm.log_message(_entry(i))
+        await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+
+    assert all(isinstance(e, LogBatchEvent) for e in comm.sent)
+    assert [len(e) for e in comm.sent] == [10, 10, 5]  # type: ignore[arg-type]
+    assert [entry.line for e in comm.sent for entry in e.entries] == list(range(25))  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_logging_forwards_single_records_to_old_peers(mocker) -> None:
+    comm = _ForwardingComm(log_batch_size=10, log_rate=None)
+    mocker.patch.object(comm, "_send_single_log_events", return_value=True)
+    task = asyncio.create_task(comm._logging())
+    try:
+        for i in range(5):
+            comm.log_message(_entry(i))
+        await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+
+    assert all(type(e) is LogEvent for e in comm.sent)
+    assert [e.line for e in comm.sent] == list(range(5))  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_logging_reports_suppressed_records() -> None:
+    comm = _ForwardingComm(log_rate=1.0, log_burst=3, log_queue_size=2)
+    for i in range(10):
+        comm.log_message(_entry(i))
+    comm.log_message(_entry(100, level="ERROR"))
+
+    task = asyncio.create_task(comm._logging())
+    try:
+        await asyncio.sleep(0.01)
+    finally:
+        task.cancel()
+
+    entries = [entry for e in comm.sent for entry in e.entries]  # type: ignore[attr-defined]
+    assert [e.line for e in entries[:2]] == [0, 1]
+    messages = [e.message for e in entries[2:]]
+    assert "Suppressed 7 DEBUG log record(s) from guiding.py." in messages
+    assert "Dropped 2 log record(s), since too many were waiting to be forwarded." in messages
+
+
+@pytest.mark.asyncio
+async def test_log_handlers_get_converted_events() -> None:
+    comm = Comm()
+    single: list[tuple[LogEvent, str]] = []
+    batches: list[LogBatchEvent] = []
+
+    async def on_single(event: Event, sender: str) -> bool:
+        single.append((event, sender))  # type: ignore[arg-type]
+        return True
+
+    async def on_batch(event: Event, sender: str) -> bool:
+        batches.append(event)  # type: ignore[arg-type]
+        return True
+
+    await comm.register_event(LogEvent, on_single)
+    await comm.register_event(LogBatchEvent, on_batch)
+
+    # a batch from a new sender and a single record from an old one
+    entry = _entry(1)
+    entry.data["sender"] = "camera"
+    comm._send_event_to_module(LogBatchEvent([entry, _entry(2)]), "multi")
+    comm._send_event_to_module(_entry(3), "old")
+    await asyncio.sleep(0.01)
+
+    assert [(e.line, s) for e, s in single] == [(1, "camera"), (2, "multi"), (3, "old")]
+    assert [[e.line for e in b.entries] for b in batches] == [[1, 2], [3]]
+
+    # unregistering removes converting handler as well
+    await comm.unregister_event(LogEvent, on_single)
+    comm._send_event_to_module(LogBatchEvent([_entry(4)]), "multi")
+    await asyncio.sleep(0.01)
+    assert len(single) == 3
@@ -0,0 +1,147 @@
+"""Tests for bounded and ordered event delivery in Comm."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from pyobs.comm import Comm, EventPolicy
+from pyobs.comm.eventqueue import EventQueue
+from pyobs.events import BadWeatherEvent, Event, LogEvent
+
+
+class _Recorder:
+    """Handler that records events and can be blocked."""
+
+    def __init__(self) -> None:
+        self.events: list[Event] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, event: Event, sender: str) -> bool:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await self.gate.wait()
+        await asyncio.sleep(0)
+        self.events.append(event)
+        self.running -= 1
+        return True
+
+
+def _log(i: int) -> LogEvent:
+    return LogEvent(time=float(i), level="INFO", filename="", function="", line=i, message=str(i))
+
+
+@pytest.mark.asyncio
+async def test_events_are_delivered_in_order() -> None:
+    handler = _Recorder()
+    queue = EventQueue(handler)
+    for i in range(100):
+        queue.put(_log(i), "camera")
+    await queue.join()
+
+    assert [e.line for e in handler.events] == list(range(100))  # type: ignore[attr-defined]
+    assert handler.max_running == 1
+    stats = queue.statistics()
+    assert stats.delivered == 100
+    assert stats.dropped == 0
+    assert stats.max_queued == 99
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_limited() -> None:
+    handler = _Recorder()
+    handler.gate.clear()
+    queue = EventQueue(handler, EventPolicy(concurrency=3))
+    for i in range(10):
+        queue.put(_log(i), "camera")
+    await asyncio.sleep(0.01)
+    assert handler.running == 3
+
+    handler.gate.set()
+    await queue.join()
+    assert len(handler.events) == 10
+    assert handler.max_running == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("overflow, expected", [("drop_oldest", [0, 3, 4]), ("drop_newest", [0, 1, 2])])
+async def test_overflow(overflow: str, expected: list[int]) -> None:
+    handler = _Recorder()
+    handler.gate.clear()
+    queue = EventQueue(handler, EventPolicy.from_config({"capacity": 2, "overflow": overflow}))
+
+    # first one is handled immediately, the others wait in the queue
+    for i in range(5):
+        queue.put(_log(i), "camera")
+    handler.gate.set()
+    await queue.join()
+
+    assert [e.line for e in handler.events] == expected  # type: ignore[attr-defined]
+    assert queue.statistics().dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesce_keeps_latest_event_per_sender() -> None:
+    handler = _Recorder()
+    handler.gate.clear()
+    queue = EventQueue(handler, EventPolicy(coalesce=True))
+    for i in range(5):
+        queue.put(_log(i), "camera")
+    queue.put(_log(10), "telescope")
+    queue.put(_log(5), "camera")
+    handler.gate.set()
+    await queue.join()
+
+    assert [e.line for e in handler.events] == [0, 10, 5]  # type: ignore[attr-defined]
+    assert queue.statistics().coalesced == 4
+
+
+@pytest.mark.asyncio
+async def test_failing_handler_is_counted(caplog: pytest.LogCaptureFixture) -> None:
+    async def handler(event: Event, sender: str) -> bool:
+        raise ValueError("broken")
+
+    queue = EventQueue(handler)
+    queue.put(_log(0), "camera")
+    queue.put(_log(1), "camera")
+    await queue.join()
+
+    assert queue.statistics().failed == 2
+    assert "Unhandled exception in event handler" in caplog.text
+
+
+def test_invalid_policy() -> None:
+    with pytest.raises(ValueError):
+        EventPolicy.from_config({"capacity": 0})
+    with pytest.raises(ValueError):
+        EventPolicy.from_config({"overflow": "block"})
+
+
+@pytest.mark.asyncio
+async def test_comm_uses_policy_by_event_name() -> None:
+    comm = Comm(event_policies={"LogEvent": {"capacity": 1, "overflow": "drop_newest"}})
+    log_handler = _Recorder()
+    log_handler.gate.clear()
+    weather_handler = _Recorder()
+    weather_handler.gate.clear()
+    await comm.register_event(LogEvent, log_handler)
+    await comm.register_event(BadWeatherEvent, weather_handler)
+
+    for i in range(5):
+        comm._send_event_to_module(_log(i), "camera")
+        comm._send_event_to_module(BadWeatherEvent(), "weather")
+    log_handler.gate.set()
+    weather_handler.gate.set()
+    await asyncio.sleep(0.01)
+
+    assert len(log_handler.events) == 2
+    assert len(weather_handler.events) == 5
+    assert max(s.dropped for s in comm.event_statistics()) == 3
+
+    # unregistering drops the queue
+    await comm.unregister_event(LogEvent, log_handler)
+    assert len(comm.event_statistics()) == 1
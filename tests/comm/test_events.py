@@ -5,29 +5,46 @@ inverse, so a caller (e.g. a GUI widget torn down on client disconnect) could
 never stop receiving events -- the stale handler stayed in _event_handlers
 forever, keeping the caller alive and firing on every future matching event.
 
-Uses ModuleOpenedEvent/LogEvent (real pyobs.events members with no subclasses)
-rather than a locally-defined Event subclass -- Comm._get_derived_events()
-scans pyobs.events' own namespace for subclasses of the given class, so a
-class that isn't itself reachable from pyobs.events would resolve to an empty
-list and never actually reach _event_handlers.
+Also covers dispatch along the hierarchy of event classes, including events
+defined outside pyobs.events, and subscriptions with predicates.
 """
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
 
 from pyobs.comm.comm import Comm
-from pyobs.events import LogEvent, ModuleOpenedEvent
+from pyobs.comm.eventqueue import EventPolicy
+from pyobs.events import BadWeatherEvent, Event, LogEvent, ModuleOpenedEvent, MoveAltAzEvent, MoveEvent
+from pyobs.events.event import EventFactory, derived_events, get_registered_event
 
 
-@pytest.mark.asyncio
-async def test_unregister_event_removes_handler() -> None:
+class PluginWeatherEvent(BadWeatherEvent):
+    """Event derived from a pyobs event, but defined outside of pyobs.events, like in a plugin."""
+
+    pass
+
+
+def _make_comm() -> Comm:
     comm = Comm.__new__(Comm)
     comm._event_handlers = {}
     comm._events_sent = set()
     comm._events_subscribed = set()
+    comm._event_predicates = {}
+    comm._event_dispatch = {}
+    comm._event_policy = EventPolicy()
+    comm._event_policies = {}
+    comm._event_queues = {}
+    comm._log_adapters = {}
+    return comm
+
+
+@pytest.mark.asyncio
+async def test_unregister_event_removes_handler() -> None:
+    comm = _make_comm()
     handler = AsyncMock(return_value=True)
 
     await comm.register_event(ModuleOpenedEvent, handler)
@@ -39,10 +56,7 @@ async def test_unregister_event_removes_handler() -> None:
 
 @pytest.mark.asyncio
 async def test_unregister_event_stops_delivery() -> None:
-    comm = Comm.__new__(Comm)
-    comm._event_handlers = {}
-    comm._events_sent = set()
-    comm._events_subscribed = set()
+    comm = _make_comm()
     handler = AsyncMock(return_value=True)
 
     await comm.register_event(ModuleOpenedEvent, handler)
@@ -56,10 +70,7 @@ async def test_unregister_event_stops_delivery() -> None:
 async def test_unregister_event_only_removes_matching_handler() -> None:
     """Two independent subscribers (e.g. two widget instances for the same
     event type) don't interfere with each other's teardown."""
-    comm = Comm.__new__(Comm)
-    comm._event_handlers = {}
-    comm._events_sent = set()
-    comm._events_subscribed = set()
+    comm = _make_comm()
     handler_a = AsyncMock(return_value=True)
     handler_b = AsyncMock(return_value=True)
 
@@ -74,10 +85,7 @@ async def test_unregister_event_only_removes_matching_handler() -> None:
 
 @pytest.mark.asyncio
 async def test_unregister_event_unknown_handler_does_not_raise() -> None:
-    comm = Comm.__new__(Comm)
-    comm._event_handlers = {}
-    comm._events_sent = set()
-    comm._events_subscribed = set()
+    comm = _make_comm()
 
     # never registered -- must be a no-op, not an error
     await comm.unregister_event(ModuleOpenedEvent, AsyncMock())
@@ -88,10 +96,7 @@ async def test_unregister_event_drops_subscribed_role_when_last_handler_removed(
     """Once the last handler for an event is unregistered, the event must no longer be
     advertised as subscribed -- otherwise disco#info keeps telling peers this module still
     wants to receive an event nothing here handles anymore."""
-    comm = Comm.__new__(Comm)
-    comm._event_handlers = {}
-    comm._events_sent = set()
-    comm._events_subscribed = set()
+    comm = _make_comm()
     handler = AsyncMock(return_value=True)
 
     await comm.register_event(ModuleOpenedEvent, handler)
@@ -105,10 +110,7 @@ async def test_unregister_event_drops_subscribed_role_when_last_handler_removed(
 async def test_unregister_event_keeps_subscribed_role_while_other_handlers_remain() -> None:
     """Two independent subscribers for the same event: one tearing down must not un-declare
     the event for the other."""
-    comm = Comm.__new__(Comm)
-    comm._event_handlers = {}
-    comm._events_sent = set()
-    comm._events_subscribed = set()
+    comm = _make_comm()
     handler_a = AsyncMock(return_value=True)
     handler_b = AsyncMock(return_value=True)
 
@@ -124,10 +126,7 @@ async def test_unregister_event_keeps_subscribed_role_while_other_handlers_remai
 async def test_unregister_event_leaves_sent_role_untouched() -> None:
     """A module that both sends an event (handler-less register_event()) and separately
     subscribes to it keeps advertising it as sent even after its subscription is torn down."""
-    comm = Comm.__new__(Comm)
-    comm._event_handlers = {}
-    comm._events_sent = set()
-    comm._events_subscribed = set()
+    comm = _make_comm()
     handler = AsyncMock(return_value=True)
 
     await comm.register_event(ModuleOpenedEvent)
@@ -142,10 +141,7 @@ async def test_unregister_event_leaves_sent_role_untouched() -> None:
 async def test_unregister_event_expands_derived_events() -> None:
     """unregister must mirror the exact same derived-events expansion register_event
     uses, so it can find everything a matching register_event() call added."""
-    comm = Comm.__new__(Comm)
-    comm._event_handlers = {}
-    comm._events_sent = set()
-    comm._events_subscribed = set()
+    comm = _make_comm()
     handler = AsyncMock(return_value=True)
 
     await comm.register_event(LogEvent, handler)
@@ -153,3 +149,91 @@ async def test_unregister_event_expands_derived_events() -> None:
 
     await comm.unregister_event(LogEvent, handler)
     assert handler not in comm._event_handlers[LogEvent]
+
+
+def test_plugin_events_are_registered() -> None:
+    assert get_registered_event("PluginWeatherEvent") is PluginWeatherEvent
+    assert PluginWeatherEvent in derived_events(BadWeatherEvent)
+    assert PluginWeatherEvent in derived_events(Event)
+    assert derived_events(MoveEvent)[0] is MoveEvent
+
+    event = EventFactory.from_dict(PluginWeatherEvent().to_json())
+    assert isinstance(event, PluginWeatherEvent)
+
+
+def test_event_names_must_be_unique() -> None:
+    with pytest.raises(TypeError):
+
+        class BadWeatherEvent(Event):  # noqa: F811
+            pass
+
+
+@pytest.mark.asyncio
+async def test_plugin_event_is_delivered_to_base_class_handler() -> None:
+    comm = _make_comm()
+    handler = AsyncMock(return_value=True)
+
+    await comm.register_event(BadWeatherEvent, handler)
+    assert PluginWeatherEvent in comm._events_subscribed
+
+    comm._send_event_to_module(PluginWeatherEvent(), "weather")
+    await asyncio.sleep(0)
+    handler.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_event_defined_after_registration_is_delivered() -> None:
+    comm = _make_comm()
+    handler = AsyncMock(return_value=True)
+    await comm.register_event(MoveEvent, handler)
+
+    class LateMoveEvent(MoveAltAzEvent):
+        pass
+
+    comm._send_event_to_module(LateMoveEvent(alt=10.0, az=20.0), "telescope")
+    await asyncio.sleep(0)
+    handler.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_wildcard_handler_is_called_once() -> None:
+    comm = _make_comm()
+    handler = AsyncMock(return_value=True)
+    await comm.register_event(Event, handler)
+    await comm.register_event(MoveEvent, handler)
+
+    comm._send_event_to_module(MoveAltAzEvent(alt=10.0, az=20.0), "telescope")
+    comm._send_event_to_module(ModuleOpenedEvent(), "camera")
+    await asyncio.sleep(0.01)
+    assert handler.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_predicate_filters_events() -> None:
+    comm = _make_comm()
+    handler = AsyncMock(return_value=True)
+    await comm.register_event(BadWeatherEvent, handler, predicate=lambda event, sender: sender == "weather")
+
+    comm._send_event_to_module(BadWeatherEvent(), "other")
+    comm._send_event_to_module(PluginWeatherEvent(), "weather")
+    await asyncio.sleep(0.01)
+    assert handler.call_count == 1
+    assert handler.call_args.args[1] == "weather"
+
+    # registering again without predicate removes it
+    await comm.register_event(BadWeatherEvent, handler)
+    comm._send_event_to_module(BadWeatherEvent(), "other")
+    await asyncio.sleep(0.01)
+    assert handler.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failing_predicate_skips_event(caplog: pytest.LogCaptureFixture) -> None:
+    comm = _make_comm()
+    handler = AsyncMock(return_value=True)
+    await comm.register_event(BadWeatherEvent, handler, predicate=lambda event, sender: 1 / 0 > 0)
+
+    comm._send_event_to_module(BadWeatherEvent(), "weather")
+    await asyncio.sleep(0.01)
+    handler.assert_not_called()
+    assert "Unhandled exception in event predicate" in caplog.text
@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from pyobs.comm.comm import Comm
+from pyobs.comm.eventqueue import EventPolicy
 from pyobs.modules.module import Module
 from pyobs.utils.enums import ModuleState
 
@@ -388,8 +389,14 @@ async def test_got_online_completes_despite_broken_presence_callback() -> None:
     comm._client_states = {}
     comm._online_clients = []
     comm._peer_sent_events = {}
+    comm._peer_subscribed_events = {}
     comm._presence_callbacks = {"camera": [MagicMock(side_effect=RuntimeError("Signal source has been deleted"))]}
     comm._event_handlers = {ModuleOpenedEvent: [handler]}
+    comm._event_predicates = {}
+    comm._event_dispatch = {}
+    comm._event_policy = EventPolicy()
+    comm._event_policies = {}
+    comm._event_queues = {}
     comm._get_interfaces = AsyncMock(return_value=["IModule"])
 
     msg = {"from": MagicMock(full="camera@localhost/pyobs", username="camera"), "show": "", "status": ""}
@@ -2,11 +2,27 @@
 
 from __future__ import annotations
 
+from typing import Any
+
+import numpy as np
 import pytest
 from slixmpp.xmlstream import ET
 
-from pyobs.comm.xmpp.rpc import _NS, _PYOBS_NS, fault_to_xml, params_to_xml, xml_to_fault, xml_to_params
+from pyobs.comm.xmpp.rpc import (
+    _NS,
+    _PYOBS_NS,
+    fault_to_xml,
+    params_to_xml,
+    return_to_xml,
+    xml_to_fault,
+    xml_to_params,
+    xml_to_return,
+)
+from pyobs.comm.xmpp.serializer import compact_supported, value_to_compact, value_to_xml, xml_to_value
+from pyobs.interfaces import CoolingState
 from pyobs.utils import exceptions as exc
+from pyobs.utils.enums import ImageType
+from pyobs.utils.time import Time
 
 
 class TestXmlToParams:
@@ -86,3 +102,50 @@ class TestFaultXml:
         # a builtin, or a domain type whose defining module was never imported here
         assert exc.PyobsError.resolve("builtins.ValueError") is None
         assert exc.PyobsError.resolve("some.module.that.was.never.imported.WeatherDataError") is None
+
+
+class TestCompactPayload:
+    """Test compact payloads, see value_to_compact."""
+
+    def test_supported_hints(self) -> None:
+        assert compact_supported(list[float])
+        assert compact_supported(dict[str, tuple[int, float]])
+        assert compact_supported(CoolingState)
+        assert compact_supported(ImageType | None)
+        assert not compact_supported(Any)
+        assert not compact_supported(dict[int, float])
+        assert not compact_supported(tuple[int, ...])
+        assert not compact_supported(int | str)
+
+    @pytest.mark.parametrize(
+        "value, type_hint",
+        [
+            ([1.5, 2.5, -3.0], list[float]),
+            ({"a": (1, 2.0), "b": (3, 4.0)}, dict[str, tuple[int, float]]),
+            (CoolingState(setpoint=-20.0, power=65, enabled=True, time=Time("2026-01-01T12:00:00.123")), CoolingState),
+            (ImageType.BIAS, ImageType),
+            (None, ImageType | None),
+        ],
+    )
+    def test_round_trip(self, value: Any, type_hint: Any) -> None:
+        elem = value_to_compact(value, type_hint)
+        assert elem.tag == "json"
+        assert xml_to_value(elem, type_hint) == value
+        assert xml_to_value(elem, type_hint) == xml_to_value(value_to_xml(value, type_hint), type_hint)
+
+    def test_numpy_values(self) -> None:
+        elem = value_to_compact([np.float64(1.5), np.int64(2)], list[float])
+        assert xml_to_value(elem, list[float]) == [1.5, 2]
+
+    def test_falls_back_to_xml(self) -> None:
+        # unsupported type hint
+        assert value_to_compact({1: 2.0}, dict[int, float]).tag == "dict"
+        # value doesn't match type hint
+        assert value_to_compact([1, "a"], list[int]).tag == "items"
+
+    def test_rpc_round_trip(self) -> None:
+        types = {"x": list[float], "y": str}
+        params_elem = params_to_xml(["x", "y"], [[1.0, 2.0], "a"], types, compact=True)
+        assert xml_to_params(params_elem, ["x", "y"], types) == [[1.0, 2.0], "a"]
+        state = CoolingState(setpoint=-20.0, power=65, enabled=True, time=Time("2026-01-01T12:00:00.123"))
+        assert xml_to_return(return_to_xml(state, CoolingState, compact=True), CoolingState) == state
@@ -0,0 +1,122 @@
+"""Tests for coalescing and rate-limited state publication in Comm.set_state."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from pyobs.comm import Comm, StatePolicy
+from pyobs.comm.proxy import Proxy
+from pyobs.interfaces import AutoFocusPoint, AutoFocusState, CoolingState, IAutoFocus, ICooling, Interface
+
+
+class RecordingComm(Comm):
+    """Comm that only records published states."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        Comm.__init__(self, *args, **kwargs)
+        self.published: list[tuple[type[Interface], Any]] = []
+        self.proxy: Proxy | None = None
+
+    async def _set_state(self, interface: type[Interface], state: Any) -> None:
+        self.published.append((interface, state))
+        if self.proxy is not None:
+            self.proxy.update_state(interface, state)
+
+
+SUPPRESS = {"suppress_unchanged": True}
+
+
+@pytest.mark.asyncio
+async def test_unchanged_state_is_suppressed() -> None:
+    comm = RecordingComm(state_policy=SUPPRESS)
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=50, enabled=True))
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=50, enabled=True))
+    assert len(comm.published) == 1
+
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=51, enabled=True))
+    assert len(comm.published) == 2
+
+
+@pytest.mark.asyncio
+async def test_state_mutated_in_place_is_published() -> None:
+    comm = RecordingComm(state_policy=SUPPRESS)
+    points = [AutoFocusPoint(focus=1.0, value=2.0)]
+    await comm.set_state(IAutoFocus, AutoFocusState(points=points))
+    points.append(AutoFocusPoint(focus=2.0, value=1.0))
+    await comm.set_state(IAutoFocus, AutoFocusState(points=points))
+    assert len(comm.published) == 2
+
+
+@pytest.mark.asyncio
+async def test_suppression_is_off_by_default() -> None:
+    comm = RecordingComm()
+    for _ in range(3):
+        await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=50, enabled=True))
+    assert len(comm.published) == 3
+
+
+@pytest.mark.asyncio
+async def test_tolerances() -> None:
+    comm = RecordingComm(state_policies={"ICooling": {**SUPPRESS, "tolerances": {"setpoint": 0.5}}})
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=50, enabled=True))
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.3, power=50, enabled=True))
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.4, power=50, enabled=True))
+    assert len(comm.published) == 1
+
+    # compared to last published state, not last given one
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.6, power=50, enabled=True))
+    assert len(comm.published) == 2
+    assert comm.published[-1][1].setpoint == -20.6
+
+
+@pytest.mark.asyncio
+async def test_min_interval_coalesces_and_delivers_latest() -> None:
+    comm = RecordingComm()
+    comm.set_state_policy(ICooling, StatePolicy(min_interval=0.1))
+    for power in range(10):
+        await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=power, enabled=True))
+
+    # first one goes out immediately, latest one is returned as own state
+    assert [s.power for _, s in comm.published] == [0]
+    assert comm.get_own_state(ICooling).power == 9
+
+    # latest one is delivered eventually
+    await asyncio.sleep(0.2)
+    assert [s.power for _, s in comm.published] == [0, 9]
+
+
+@pytest.mark.asyncio
+async def test_pending_state_reverted_to_published_one() -> None:
+    comm = RecordingComm(state_policy=StatePolicy(min_interval=0.1, suppress_unchanged=True))
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=0, enabled=True))
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=1, enabled=True))
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=0, enabled=True))
+    await asyncio.sleep(0.2)
+    assert [s.power for _, s in comm.published] == [0]
+
+
+@pytest.mark.asyncio
+async def test_pending_states_are_flushed_on_close() -> None:
+    comm = RecordingComm(state_policy=StatePolicy(min_interval=60.0))
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=0, enabled=True))
+    await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=1, enabled=True))
+    await comm.close()
+    assert [s.power for _, s in comm.published] == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_steady_state_stays_fresh() -> None:
+    comm = RecordingComm(state_policy=StatePolicy(suppress_unchanged=True, max_silence=0.1))
+    comm.proxy = Proxy(comm, "camera", [ICooling])
+
+    # module publishes the same state periodically
+    for _ in range(6):
+        await comm.set_state(ICooling, CoolingState(setpoint=-20.0, power=50, enabled=True))
+        await asyncio.sleep(0.05)
+
+    # some are suppressed, but consumers still see a fresh state
+    assert 2 <= len(comm.published) < 6
+    assert await comm.proxy.wait_for_state(ICooling, timeout=0.01, max_age=0.2) is not None
@@ -8,12 +8,15 @@ Comm._resolve_proxy folding that hint into its ValueError.
 from __future__ import annotations
 
 import logging
+import xml.etree.ElementTree as ET
 from abc import ABCMeta
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from pyobs.comm.comm import Comm
+from pyobs.comm.xmpp.serializer import COMPACT_FEATURE
 from pyobs.comm.xmpp.xmppcomm import XmppComm
 from pyobs.interfaces import ICooling, IModule, Interface
 
@@ -31,7 +34,9 @@ def make_xmpp_comm() -> XmppComm:
     comm._domain = "localhost"
     comm._resource = "pyobs"
     comm._interface_features = {}
+    comm._compact_peers = set()
     comm._peer_sent_events = {}
+    comm._peer_subscribed_events = {}
     comm._warned_version_mismatches = set()
     return comm
 
@@ -196,3 +201,42 @@ def test_real_interfaces_default_to_version_one() -> None:
     the expected default version, since the filtering tests depend on it."""
     assert ICooling.version == 1
     assert IModule.version == 1
+
+
+@pytest.mark.asyncio
+async def test_get_interfaces_detects_compact_peers() -> None:
+    comm = make_xmpp_comm()
+    comm._safe_send = AsyncMock(return_value={"features": ["urn:pyobs:interface:IModule:1", COMPACT_FEATURE]})
+    await comm._get_interfaces("camera@localhost/pyobs")
+    assert comm.supports_compact("camera@localhost/pyobs")
+
+    comm._safe_send = AsyncMock(return_value={"features": ["urn:pyobs:interface:IModule:1"]})
+    await comm._get_interfaces("camera@localhost/pyobs")
+    assert not comm.supports_compact("camera@localhost/pyobs")
+
+
+class _DiscoInfo(dict[str, Any]):
+    """disco#info result with features and rich <event> elements."""
+
+    def __init__(self, subscribed: list[str]):
+        dict.__init__(self, features=["urn:pyobs:interface:IModule:1"])
+        self.xml = [
+            ET.Element(f"{{urn:pyobs:event:{name}:1}}event", name=name, role="subscribe") for name in subscribed
+        ]
+
+
+@pytest.mark.asyncio
+async def test_single_log_events_while_old_peers_subscribe() -> None:
+    comm = make_xmpp_comm()
+    comm._safe_send = AsyncMock(return_value=_DiscoInfo(["LogEvent", "LogBatchEvent"]))
+    await comm._get_interfaces("gui@localhost/pyobs")
+    assert not comm._send_single_log_events()
+
+    # a peer that doesn't know about batches
+    comm._safe_send = AsyncMock(return_value=_DiscoInfo(["LogEvent"]))
+    await comm._get_interfaces("logger@localhost/pyobs")
+    assert comm._send_single_log_events()
+
+    # and after it left
+    comm._peer_subscribed_events.pop("logger@localhost/pyobs")
+    assert not comm._send_single_log_events()
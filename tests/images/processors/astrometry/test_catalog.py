@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from astropy.io.fits import Header
+from astropy.table import Table
+from astropy.wcs import WCS
+
+import pyobs.utils.exceptions as exc
+from pyobs.images import Image
+from pyobs.images.meta import OnSkyDistance
+from pyobs.images.processors.astrometry import CatalogAstrometry
+from pyobs.images.processors.astrometry._triangles import match_triangles
+from pyobs.images.processors.offsets import AstrometryOffsets
+from pyobs.utils.catalog import ReferenceCatalog
+
+SCALE = 1.0 / 3600.0
+
+
+def _header(ra: float, dec: float) -> Header:
+    header = Header()
+    header["NAXIS1"] = 1000
+    header["NAXIS2"] = 1000
+    header["CTYPE1"] = "RA---TAN"
+    header["CTYPE2"] = "DEC--TAN"
+    header["CRPIX1"] = 500.0
+    header["CRPIX2"] = 500.0
+    header["CRVAL1"] = ra
+    header["CRVAL2"] = dec
+    header["CDELT1"] = -SCALE
+    header["CDELT2"] = SCALE
+    header["TEL-RA"] = ra
+    header["TEL-DEC"] = dec
+    return header
+
+
+async def _image(catalog: ReferenceCatalog, offset: tuple[float, float], rotation: float) -> Image:
+    """Image at 30/20 with a pointing error of offset in arcsec and a slight rotation of the camera."""
+    header = _header(30.0, 20.0)
+
+    # true WCS of image
+    true = WCS(_header(30.0 + offset[0] / 3600.0 / np.cos(np.radians(20.0)), 20.0 + offset[1] / 3600.0))
+    rot = np.radians(rotation)
+    true.wcs.pc = [[np.cos(rot), -np.sin(rot)], [np.sin(rot), np.cos(rot)]]
+
+    # stars in image with a little noise, a missing one and some spurious sources
+    stars = await catalog.query(30.0, 20.0, 0.5)
+    xy = true.all_world2pix(np.column_stack([stars["ra"], stars["dec"]]), 1)
+    inside = np.flatnonzero((xy[:, 0] > 0) & (xy[:, 0] < 1000) & (xy[:, 1] > 0) & (xy[:, 1] < 1000))[1:40]
+    rng = np.random.default_rng(42)
+    x = np.concatenate([xy[inside, 0] + rng.normal(0, 0.2, len(inside)), rng.uniform(0, 1000, 5)])
+    y = np.concatenate([xy[inside, 1] + rng.normal(0, 0.2, len(inside)), rng.uniform(0, 1000, 5)])
+    flux = np.concatenate([np.asarray(stars["phot_g_mean_flux"])[inside], np.full(5, 1e4)])
+    return Image(header=header, catalog=Table({"x": x, "y": y, "flux": flux}))
+
+
+def test_match_triangles() -> None:
+    rng = np.random.default_rng(1)
+    reference = rng.uniform(0, 2000, (60, 2))
+    rot = np.radians(2.0)
+    matrix = np.array([[np.cos(rot), -np.sin(rot)], [np.sin(rot), np.cos(rot)]])
+    source = (reference[:30] - [35.0, -80.0]) @ np.linalg.inv(matrix).T
+
+    match = match_triangles(source[::-1], reference)
+    assert match is not None
+    assert len(match.source) == 30
+    np.testing.assert_allclose(match.matrix, matrix, atol=1e-6)
+    np.testing.assert_allclose(match.offset, [35.0, -80.0], atol=1e-3)
+
+
+def test_match_triangles_fails_for_unrelated_positions() -> None:
+    rng = np.random.default_rng(2)
+    assert match_triangles(rng.uniform(0, 2000, (20, 2)), rng.uniform(0, 2000, (60, 2))) is None
+
+
+@pytest.mark.asyncio
+async def test_offsets_from_single_frame(tmp_path) -> None:
+    catalog = ReferenceCatalog(source="synthetic", cache_dir=str(tmp_path))
+    image = await _image(catalog, (90.0, -60.0), 0.3)
+
+    solved = await CatalogAstrometry(catalog=catalog)(image)
+    assert solved.header["WCSERR"] == 0
+    assert "ra" in solved.catalog.colnames
+
+    # offset is found in a single step
+    result = await AstrometryOffsets()(solved)
+    distance = result.get_meta(OnSkyDistance).distance.arcsec
+    assert distance == pytest.approx(np.hypot(90.0, 60.0), abs=1.0)
+
+    # tile was cached on disk, so a new catalog doesn't need the source
+    assert len(list(tmp_path.iterdir())) == 1
+    cached = ReferenceCatalog(source="synthetic", cache_dir=str(tmp_path))
+    cached._fetch = None  # type: ignore[assignment]
+    assert len(await cached.query(30.0, 20.0, 0.2)) > 0
+
+
+@pytest.mark.asyncio
+async def test_no_match_raises() -> None:
+    catalog = ReferenceCatalog(source="synthetic")
+    image = await _image(catalog, (0.0, 0.0), 0.0)
+    image.catalog["x"] = np.random.default_rng(3).uniform(0, 1000, len(image.catalog))
+
+    with pytest.raises(exc.ImageError):
+        await CatalogAstrometry(catalog=catalog)(image)
@@ -394,9 +394,42 @@ async def test_add_framenum_uses_cache_value_for_same_night() -> None:
     await m._fitsheadermixin_add_framenum(image)
 
     assert image.header["FRAMENUM"] == 8
+
+    # cache is written in the background
+    await m._fitsheadermixin_frame_counter.flush()
     m._vfs.write_yaml.assert_awaited_once_with(m._fitsheadermixin_cache, {"night": "2024-01-01", "framenum": 8})
 
 
+@pytest.mark.asyncio
+async def test_add_framenum_reads_cache_only_once() -> None:
+    m = make_module()
+    m._vfs = MagicMock()
+    m._vfs.read_yaml = AsyncMock(return_value={"night": "2024-01-01", "framenum": 7})
+    m._vfs.write_yaml = AsyncMock()
+
+    for _ in range(3):
+        await m._fitsheadermixin_add_framenum(make_image(**{"DAY-OBS": "2024-01-01"}))
+    await m._fitsheadermixin_frame_counter.flush()
+
+    assert m._fitsheadermixin_frame_number == 10
+    m._vfs.read_yaml.assert_awaited_once()
+    m._vfs.write_yaml.assert_awaited_with(m._fitsheadermixin_cache, {"night": "2024-01-01", "framenum": 10})
+
+
+@pytest.mark.asyncio
+async def test_add_framenum_uses_local_counter_file(tmp_path) -> None:
+    m = make_module(frame_counter=str(tmp_path / "framenum.log"))
+    m._vfs = MagicMock()
+
+    await m._fitsheadermixin_add_framenum(make_image(**{"DAY-OBS": "2024-01-01"}))
+    image = make_image(**{"DAY-OBS": "2024-01-01"})
+    await m._fitsheadermixin_add_framenum(image)
+
+    assert image.header["FRAMENUM"] == 2
+    m._vfs.read_yaml.assert_not_called()
+    m._vfs.write_yaml.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_add_framenum_resets_on_new_night() -> None:
     m = make_module()
@@ -648,3 +681,15 @@ def test_warns_without_rotation(caplog) -> None:
 
     assert "CD matrix" in caplog.text
     assert "PC1_1" not in image.header
+
+
+@pytest.mark.asyncio
+async def test_close_writes_pending_frame_number() -> None:
+    m = make_module()
+    m._vfs = MagicMock()
+    m._vfs.read_yaml = AsyncMock(side_effect=FileNotFoundError())
+    m._vfs.write_yaml = AsyncMock()
+    await m._fitsheadermixin_add_framenum(make_image(**{"DAY-OBS": "2024-01-01"}))
+
+    await ImageFitsHeaderMixin.close(m)
+    m._vfs.write_yaml.assert_awaited_with(m._fitsheadermixin_cache, {"night": "2024-01-01", "framenum": 1})
@@ -1,9 +1,12 @@
 import asyncio
+from unittest.mock import AsyncMock
 
+import numpy as np
 import pytest
 from astropy.io import fits
 
 from pyobs.events import BadWeatherEvent
+from pyobs.interfaces import IImageStatistics
 from pyobs.modules.camera import DummyCamera
 from pyobs.utils import exceptions as exc
 from pyobs.utils.enums import ImageType
@@ -205,3 +208,39 @@ async def test_trimsec():
     camera.set_biassec_trimsec(hdr, **full)
     assert "[1:20,1:50]" == hdr["BIASSEC"]
     assert "[21:40,1:50]" == hdr["TRIMSEC"]
+
+
+def test_dummycamera_synthetic_sky():
+    camera = DummyCamera(image_size=(256, 256), catalog="synthetic", seed=1, max_mag=22.0)
+    data = camera._simulate_image(10.0, True)
+    assert data.shape == (256, 256)
+    assert data.dtype == np.uint16
+    # some stars well above the background
+    assert np.max(data) > 1000
+
+
+@pytest.mark.asyncio
+async def test_image_statistics():
+    """Statistics are computed right after readout, written to the header and published, also without broadcast."""
+    camera = DummyCamera(
+        image_size=(100, 100),
+        catalog="synthetic",
+        statistics=["median", "max", "p90"],
+        vfs={"class": "pyobs.vfs.VirtualFileSystem", "roots": {"cache": {"class": "pyobs.vfs.MemoryFile"}}},
+    )
+    await camera.open()
+    await camera.set_exposure_time(0.0)
+    await camera.set_image_type(ImageType.BIAS)
+    camera.comm.set_state = AsyncMock()
+
+    filename = await camera.grab_data(broadcast=False)
+    image = await camera.vfs.read_image(filename)
+    state = next(c.args[1] for c in camera.comm.set_state.await_args_list if c.args[0] is IImageStatistics)
+
+    assert state.filename == filename
+    assert list(state.statistics.keys()) == ["median", "max", "p90"]
+    assert state.statistics["max"] >= state.statistics["p90"] >= state.statistics["median"]
+    assert image.header["STATMED"] == state.statistics["median"]
+    assert image.header["STATP90"] == state.statistics["p90"]
+
+    await camera.close()
@@ -1,4 +1,10 @@
-from pyobs.modules.camera import DummySpectrograph
+import asyncio
+
+import pytest
+from astropy.io import fits
+
+from pyobs.modules.camera import BaseSpectrograph, DummySpectrograph
+from tests.spectra.helpers import make_frame
 
 
 def test_fits_header_timeout_reaches_mixin():
@@ -7,3 +13,36 @@ def test_fits_header_timeout_reaches_mixin():
     forwarding before the fix; this test guards against a future regression."""
     spectrograph = DummySpectrograph(fits_header_timeout=1.0)
     assert spectrograph._fitsheadermixin_header_timeout == 1.0
+
+
+class FrameSpectrograph(BaseSpectrograph):
+    async def _expose(self, abort_event: asyncio.Event) -> fits.HDUList:
+        return fits.HDUList([fits.PrimaryHDU(make_frame(), header=fits.Header({"EXPTIME": 60.0}))])
+
+
+@pytest.mark.asyncio
+async def test_quicklook() -> None:
+    spectrograph = FrameSpectrograph(
+        quicklook=[
+            {"class": "pyobs.spectra.processors.extraction.ExtractSpectrum", "aperture": 14},
+            {"class": "pyobs.spectra.processors.misc.EstimateSNR"},
+            {"class": "pyobs.spectra.processors.exptime.SNRExpTimeEstimator", "target_snr": 40},
+        ]
+    )
+    hdulist = await spectrograph._expose(asyncio.Event())
+    snr = await spectrograph._quicklook(hdulist)
+
+    # S/N is about 1000/sqrt(1000 + 14*100), raw frame is kept, extracted spectrum and results are added
+    assert snr == pytest.approx(20.0, rel=0.2)
+    assert hdulist[0].data.shape == (60, 400)
+    assert hdulist[0].header["SNR"] == pytest.approx(snr)
+    assert hdulist[0].header["SNREXPT"] == pytest.approx(60.0 * (40 / snr) ** 2)
+    assert len(hdulist["SPECTRUM"].data["FLUX"]) == 400
+
+
+@pytest.mark.asyncio
+async def test_quicklook_failure_keeps_spectrum() -> None:
+    spectrograph = FrameSpectrograph(quicklook=[{"class": "pyobs.spectra.processors.misc.EstimateSNR"}])
+    hdulist = await spectrograph._expose(asyncio.Event())
+    assert await spectrograph._quicklook(hdulist) is None
+    assert "SPECTRUM" not in hdulist
@@ -181,9 +181,11 @@ async def test_grab_sequence_skips_delay_after_last_grab() -> None:
 
     camera.grab_data = fake_grab_data
 
-    await asyncio.wait_for(camera.grab_sequence(1, delay=10), timeout=1.0)
-    assert camera._sequence_task is not None
-    await asyncio.wait_for(camera._sequence_task, timeout=1.0)
+    # wait_for() would run grab_sequence() in its own task, which lets the sequence finish before we get its task
+    await camera.grab_sequence(1, delay=10)
+    task = camera._sequence_task
+    assert task is not None
+    await asyncio.wait_for(task, timeout=1.0)
 
 
 @pytest.mark.asyncio
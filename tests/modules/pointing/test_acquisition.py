@@ -23,6 +23,7 @@ from pyobs.interfaces import (
     IRunning,
     RaDecOffsetState,
     RaDecState,
+    WindowCapabilities,
 )
 from pyobs.modules.pointing.acquisition import Acquisition
 from pyobs.utils.enums import OffsetFrame
@@ -403,3 +404,29 @@ async def test_abort_sets_event() -> None:
     assert not acq._abort_event.is_set()
     await acq.abort()
     assert acq._abort_event.is_set()
+
+
+# ── window ──────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_acquire_reads_window_after_offset_and_restores_full_frame() -> None:
+    apply = AsyncMock(spec=ApplyOffsets)
+    apply.return_value = OffsetResult(applied=True, frame=OffsetFrame.RA_DEC, lon=1.0, lat=2.0)
+    acq = make_acquisition(apply=apply, tolerance=1.0, max_offset=100.0, attempts=3, window=500)
+    camera = make_camera()
+    camera.set_window = AsyncMock()
+    camera.wait_for_capabilities = AsyncMock(
+        return_value=WindowCapabilities(full_frame_width=2048, full_frame_height=1024)
+    )
+    wire_comm(acq, camera, make_telescope("radec"))
+    acq._do_camera_settings = AsyncMock()
+    acq._vfs = MagicMock()
+    acq._vfs.read_image = AsyncMock(side_effect=[make_image(10.0), make_image(2.0), make_image(0.5)])
+    acq._comm.set_state = AsyncMock()
+
+    await acq.acquire_target()
+
+    # window is set once and full frame restored at the end
+    assert [c.args for c in camera.set_window.await_args_list] == [(774, 262, 500, 500), (0, 0, 2048, 1024)]
+    assert acq._windowed is False
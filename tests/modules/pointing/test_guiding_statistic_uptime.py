@@ -1,6 +1,7 @@
 from datetime import datetime
 
 from pyobs.modules.pointing.guidingstatistics import GuidingStatisticsUptime
+from pyobs.modules.pointing.guidingstatistics.uptime import UptimeAccumulator
 
 
 def test_end_to_end() -> None:
@@ -17,9 +18,22 @@ def test_end_to_end() -> None:
 
 
 def test_calc_uptime_percentage() -> None:
-    states = [
-        (True, datetime.fromtimestamp(100)),
-        (False, datetime.fromtimestamp(110)),
-        (None, datetime.fromtimestamp(120)),
-    ]
-    assert GuidingStatisticsUptime()._calc_uptime_percentage(states) == 50
+    accumulator = UptimeAccumulator()
+    accumulator.add(True, datetime.fromtimestamp(100))
+    accumulator.add(False, datetime.fromtimestamp(110))
+    accumulator.add(None, datetime.fromtimestamp(120))
+    assert GuidingStatisticsUptime()._calc_uptime_percentage(accumulator) == 50
+
+
+def test_calc_uptime_percentage_no_time_passed() -> None:
+    accumulator = UptimeAccumulator()
+    accumulator.add(True, datetime.fromtimestamp(100))
+    accumulator.add(None, datetime.fromtimestamp(100))
+    assert GuidingStatisticsUptime()._calc_uptime_percentage(accumulator) == 100
+
+
+def test_summary() -> None:
+    statistic = GuidingStatisticsUptime()
+    assert statistic.summary() is None
+    statistic.add_data(True)
+    assert statistic.summary() == 100.0
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from pyobs.modules.pointing.guidingstatistics.accumulators import (
+    ExponentialMovingAverage,
+    P2Quantile,
+    RunningStats,
+    TimeWeightedAverage,
+)
+
+
+def test_running_stats() -> None:
+    values = np.random.default_rng(0).normal(1.0, 2.0, 1000)
+    stats = RunningStats(quantiles=(0.5, 0.9))
+    for v in values:
+        stats.add(float(v))
+
+    assert stats.count == 1000
+    assert stats.mean == pytest.approx(np.mean(values))
+    assert stats.std == pytest.approx(np.std(values))
+    assert stats.rms == pytest.approx(np.sqrt(np.mean(values**2)))
+    assert stats.min == np.min(values)
+    assert stats.max == np.max(values)
+    assert stats.quantile(0.5) == pytest.approx(np.median(values), abs=0.2)
+    assert stats.quantile(0.9) == pytest.approx(np.percentile(values, 90), abs=0.2)
+
+
+def test_p2_quantile_few_values() -> None:
+    q = P2Quantile(0.5)
+    assert q.value is None
+    for v in [3.0, 1.0, 2.0]:
+        q.add(v)
+    assert q.value == 2.0
+
+
+def test_exponential_moving_average() -> None:
+    ema = ExponentialMovingAverage(10.0)
+    ema.add(1.0, 0.0)
+    assert ema.value == 1.0
+    ema.add(0.0, 1000.0)
+    assert ema.value == pytest.approx(0.0)
+
+
+def test_time_weighted_average() -> None:
+    twa = TimeWeightedAverage(10.0)
+    assert twa.value(0.0) is None
+    twa.add(100.0, 0.0)
+    twa.add(0.0, 10.0)
+    assert twa.value(10.0) == 100.0
+    assert twa.value(20.0) == pytest.approx(100.0 * np.exp(-1.0))
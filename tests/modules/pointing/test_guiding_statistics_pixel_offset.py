@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from pyobs.images import Image
@@ -32,7 +33,22 @@ def test_end_to_end(mock_meta_image) -> None:
 
 def test_build_header_to_few_values() -> None:
     gspo = GuidingStatisticsPixelOffset()
-    assert gspo._build_header([(1.0, 1.0)]) == {}
+    accumulator = gspo._create_accumulator()
+    gspo._add_to_accumulator(accumulator, (1.0, 1.0))
+    assert gspo._build_header(accumulator) == {}
+
+
+def test_rms_and_summary() -> None:
+    gspo = GuidingStatisticsPixelOffset()
+    gspo.init_stats("camera")
+    for offset in [(3.0, 0.0), (-3.0, 4.0), (0.0, -4.0), (0.0, 0.0)]:
+        image = Image()
+        image.set_meta(PixelOffsets(*offset))
+        gspo.add_data(image)
+    header = gspo.add_to_header("camera", {})
+    assert header["HIERARCH GUIDING RMS1"].value == pytest.approx(np.sqrt(18.0 / 4))
+    assert header["HIERARCH GUIDING RMS2"].value == pytest.approx(np.sqrt(32.0 / 4))
+    assert gspo.summary() is not None
 
 
 def test_get_session_data() -> None:
@@ -32,11 +32,16 @@ def test_end_to_end(mock_meta_image) -> None:
 
     np.testing.assert_almost_equal(header["HIERARCH GUIDING RMS"].value, 10.0)
     assert header["HIERARCH GUIDING RMS"].comment == "RMS for guiding on sky"
+    np.testing.assert_almost_equal(header["HIERARCH GUIDING MAX"].value, 10.0)
+    np.testing.assert_almost_equal(header["HIERARCH GUIDING P90"].value, 10.0)
+    np.testing.assert_almost_equal(statistic.summary(), 10.0)
 
 
 def test_build_header_to_few_values() -> None:
     guiding_stat = GuidingStatisticsSkyOffset()
-    assert guiding_stat._build_header([1.0]) == {}
+    accumulator = guiding_stat._create_accumulator()
+    guiding_stat._add_to_accumulator(accumulator, 1.0)
+    assert guiding_stat._build_header(accumulator) == {}
 
 
 def test_get_session_data() -> None:
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+
+import astropy.units as u
+import pytest
+from astropy.time import TimeDelta
+
+from pyobs.events import ScheduleChangedEvent
+from pyobs.modules.robotic.mastermind import Mastermind
+from pyobs.robotic import Task
+from pyobs.robotic.observation import Observation, ObservationList, ObservationState
+from pyobs.robotic.storage.memory import MemoryObservationArchive
+from pyobs.robotic.taskrunner import TaskRunner
+from pyobs.utils.time import Time
+
+NOW = Time("2025-11-03T23:00:00", scale="utc")
+
+
+class StagingRunner(TaskRunner):
+    """TaskRunner that records calls."""
+
+    def __init__(self, **kwargs):
+        TaskRunner.__init__(self, **kwargs)
+        self.calls: list[tuple[str, str]] = []
+        self.prepare_delay = 0.0
+
+    async def can_run(self, task, target=None) -> bool:
+        return True
+
+    async def prepare_task(self, task, target=None) -> None:
+        self.calls.append(("prepare", task.name))
+        await asyncio.sleep(self.prepare_delay)
+
+    async def rollback_task(self, task, target=None) -> None:
+        self.calls.append(("rollback", task.name))
+
+
+def make_obs(name: str, start_in: float, task_id: int = 1) -> Observation:
+    return Observation(
+        task=Task(id=task_id, name=name, duration=60),
+        start=NOW + TimeDelta(start_in * u.second),
+        end=NOW + TimeDelta((start_in + 60) * u.second),
+        state=ObservationState.PENDING,
+    )
+
+
+def make_mastermind(**kwargs) -> tuple[Mastermind, MemoryObservationArchive, StagingRunner]:
+    archive = MemoryObservationArchive()
+    runner = StagingRunner()
+    mm = Mastermind(schedule=archive, runner=runner, **kwargs)
+    return mm, archive, runner
+
+
+@pytest.mark.asyncio
+async def test_stage_next_observation() -> None:
+    mm, archive, runner = make_mastermind(stage_ahead=120)
+    await archive.add_observations(ObservationList([make_obs("later", 600, 2), make_obs("next", 60)]))
+
+    upcoming = await mm._next_pending(NOW)
+    assert upcoming is not None and upcoming.task.name == "next"
+    await mm._stage(upcoming, NOW)
+    assert await mm._take_staged(upcoming) is upcoming.task
+    assert runner.calls == [("prepare", "next")]
+
+
+@pytest.mark.asyncio
+async def test_stage_not_too_early() -> None:
+    mm, archive, runner = make_mastermind(stage_ahead=120)
+    await mm._stage(make_obs("later", 600), NOW)
+    assert mm._staged is None
+    assert runner.calls == []
+
+
+@pytest.mark.asyncio
+async def test_rollback_on_schedule_change() -> None:
+    mm, archive, runner = make_mastermind()
+    runner.prepare_delay = 10.0
+    first = make_obs("first", 60, 1)
+    await mm._stage(first, NOW)
+    await asyncio.sleep(0)
+
+    # schedule changed, other observation is next, so first is cancelled and rolled back
+    second = make_obs("second", 30, 2)
+    await mm._stage(second, NOW)
+    assert runner.calls == [("prepare", "first"), ("rollback", "first")]
+    assert mm._staged is second
+
+    # a different observation is run, so second is rolled back as well
+    await mm._take_staged(make_obs("third", 0, 3))
+    assert runner.calls[-1] == ("rollback", "second")
+    assert mm._staged is None
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_keeps_staged_observation(mocker) -> None:
+    mm, archive, runner = make_mastermind(stage_ahead=120)
+    await archive.add_observations(ObservationList([make_obs("next", 60)]))
+    staged = await mm._stage_next(NOW)
+    assert staged is not None and mm._staged is staged
+    await asyncio.sleep(0)
+
+    # a failing archive doesn't roll back the preparation
+    mocker.patch.object(archive, "get_schedule", side_effect=ConnectionError("unreachable"))
+    assert await mm._stage_next(NOW) is staged
+    assert mm._staged is staged
+    assert runner.calls == [("prepare", "next")]
+
+    # but an empty schedule does
+    mocker.stopall()
+    await archive.clear_schedule(NOW)
+    assert await mm._stage_next(NOW) is None
+    assert runner.calls == [("prepare", "next"), ("rollback", "next")]
+
+
+@pytest.mark.asyncio
+async def test_wait_wakes_on_schedule_change() -> None:
+    mm, _, _ = make_mastermind(poll_interval=10.0)
+    mm._wake.clear()
+    asyncio.get_running_loop().call_later(
+        0.01, lambda: asyncio.create_task(mm._on_schedule_changed(ScheduleChangedEvent(), "scheduler"))
+    )
+    await asyncio.wait_for(mm._wait(), 1.0)
+
+
+@pytest.mark.asyncio
+async def test_wait_until_start() -> None:
+    mm, _, _ = make_mastermind(poll_interval=10.0)
+    mm._wake.clear()
+    await asyncio.wait_for(mm._wait(Time.now() + TimeDelta(0.05 * u.second)), 1.0)
@@ -5,7 +5,7 @@ import astropy.units as u
 import pytest
 
 from pyobs.comm import Comm
-from pyobs.events import GoodWeatherEvent, TaskFailedEvent, TaskFinishedEvent, TaskStartedEvent
+from pyobs.events import GoodWeatherEvent, ScheduleChangedEvent, TaskFailedEvent, TaskFinishedEvent, TaskStartedEvent
 from pyobs.interfaces import IRunning
 from pyobs.modules.robotic import Scheduler
 from pyobs.modules.robotic.scheduler import _class_accepts_param
@@ -204,6 +204,7 @@ async def test_open_registers_events_and_publishes_state(mocker) -> None:
     assert TaskFinishedEvent in registered
     assert TaskFailedEvent in registered
     assert GoodWeatherEvent in registered
+    assert ScheduleChangedEvent in registered
     state = _state_for(scheduler._comm.set_state, IRunning)
     assert state.running is True
 
@@ -408,6 +409,9 @@ async def test_schedule_worker_schedules_and_submits_tasks(mocker) -> None:
     assert list(first_call_arg) == [obs1]
     second_call_arg = scheduler._schedule.add_observations.await_args_list[1].args[0]
     assert list(second_call_arg) == [obs2]
+    events = [c.args[0] for c in scheduler._comm.send_event.await_args_list]
+    assert len(events) == 2
+    assert all(isinstance(e, ScheduleChangedEvent) for e in events)
 
 
 @pytest.mark.asyncio
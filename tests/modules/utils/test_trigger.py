@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from pyobs.comm import Comm
+from pyobs.events import BadWeatherEvent, GoodWeatherEvent, ModeChangedEvent, MoveRaDecEvent
+from pyobs.modules.utils.trigger import Trigger
+from tests.helpers import make_proxy_cm
+
+
+def make_trigger(triggers: list[dict[str, Any]], proxies: dict[str, MagicMock]) -> Trigger:
+    comm = MagicMock(spec=Comm)
+    comm.proxy = MagicMock(side_effect=lambda name, *args: make_proxy_cm(proxies[name]))
+    trigger = Trigger(triggers=triggers, comm=comm)
+    trigger._running = True
+    return trigger
+
+
+async def settle(trigger: Trigger) -> None:
+    tasks = [t.task for t in trigger._triggers if t.task is not None]
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_dispatch_by_event_type_and_filter() -> None:
+    dome, telescope = AsyncMock(), AsyncMock()
+    trigger = make_trigger(
+        [
+            {"event": "pyobs.events.GoodWeatherEvent", "module": "dome", "method": "init"},
+            {
+                "event": "pyobs.events.ModeChangedEvent",
+                "module": "telescope",
+                "method": "park",
+                "sender": "weather",
+                "filter": {"mode": ["closed", "off"]},
+            },
+        ],
+        {"dome": dome, "telescope": telescope},
+    )
+
+    assert await trigger._handle_event(GoodWeatherEvent(), "weather")
+    await trigger._handle_event(BadWeatherEvent(), "weather")
+    await trigger._handle_event(ModeChangedEvent(group="g", current="open"), "weather")
+    await trigger._handle_event(ModeChangedEvent(group="g", current="closed"), "other")
+    await settle(trigger)
+    dome.execute.assert_awaited_once_with("init")
+    telescope.execute.assert_not_called()
+
+    await trigger._handle_event(ModeChangedEvent(group="g", current="off"), "weather")
+    await settle(trigger)
+    telescope.execute.assert_awaited_once_with("park")
+
+
+@pytest.mark.asyncio
+async def test_dispatch_derived_events() -> None:
+    telescope = AsyncMock()
+    trigger = make_trigger(
+        [{"event": "pyobs.events.MoveEvent", "module": "telescope", "method": "log"}], {"telescope": telescope}
+    )
+
+    await trigger._handle_event(MoveRaDecEvent(ra=10.0, dec=20.0), "telescope")
+    await settle(trigger)
+    telescope.execute.assert_awaited_once_with("log")
+
+
+@pytest.mark.asyncio
+async def test_slow_module_does_not_block_others() -> None:
+    slow, fast = AsyncMock(), AsyncMock()
+
+    async def hang(*args: Any) -> None:
+        await asyncio.sleep(10)
+
+    slow.execute.side_effect = hang
+    trigger = make_trigger(
+        [
+            {"event": "pyobs.events.GoodWeatherEvent", "module": "slow", "method": "init", "timeout": 0.05},
+            {"event": "pyobs.events.GoodWeatherEvent", "module": "fast", "method": "init"},
+        ],
+        {"slow": slow, "fast": fast},
+    )
+
+    await trigger._handle_event(GoodWeatherEvent(), "weather")
+    await asyncio.sleep(0.01)
+    fast.execute.assert_awaited_once()
+
+    await settle(trigger)
+    stats = trigger.get_statistics()
+    assert stats["slow.init"].timeouts == 1
+    assert stats["fast.init"].executions == 1
+    assert stats["fast.init"].failures == 0
+
+
+@pytest.mark.asyncio
+async def test_events_during_execution_are_merged() -> None:
+    module = AsyncMock()
+
+    async def work(*args: Any) -> None:
+        await asyncio.sleep(0.02)
+
+    module.execute.side_effect = work
+    trigger = make_trigger([{"event": "pyobs.events.GoodWeatherEvent", "module": "m", "method": "init"}], {"m": module})
+
+    await trigger._handle_event(GoodWeatherEvent(), "weather")
+    await asyncio.sleep(0.005)
+    for _ in range(4):
+        await trigger._handle_event(GoodWeatherEvent(), "weather")
+    await settle(trigger)
+
+    # first call plus one merged call for all events during it
+    assert module.execute.await_count == 2
+    assert trigger.get_statistics()["m.init"].skipped == 3
+
+
+@pytest.mark.asyncio
+async def test_min_interval() -> None:
+    module = AsyncMock()
+    module.execute.side_effect = RuntimeError("broken")
+    trigger = make_trigger(
+        [{"event": "pyobs.events.GoodWeatherEvent", "module": "m", "method": "init", "min_interval": 60}],
+        {"m": module},
+    )
+
+    await trigger._handle_event(GoodWeatherEvent(), "weather")
+    await settle(trigger)
+    await trigger._handle_event(GoodWeatherEvent(), "weather")
+    await settle(trigger)
+
+    stats = trigger.get_statistics()["m.init"]
+    assert module.execute.await_count == 1
+    assert (stats.executions, stats.failures, stats.skipped) == (1, 1, 1)
+    assert stats.last_error == "broken"
+
+
+@pytest.mark.asyncio
+async def test_not_running() -> None:
+    module = AsyncMock()
+    trigger = make_trigger([{"event": "pyobs.events.GoodWeatherEvent", "module": "m", "method": "init"}], {"m": module})
+    trigger._running = False
+    assert not await trigger._handle_event(GoodWeatherEvent(), "weather")
+    module.execute.assert_not_called()
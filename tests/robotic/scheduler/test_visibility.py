@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import astropy.units as u
+import numpy as np
+import pytest
+from astroplan import Observer
+from astropy.coordinates import EarthLocation, SkyCoord, get_body
+from astropy.time import TimeDelta
+
+from pyobs.robotic import Task
+from pyobs.robotic.scheduler import AstroplanScheduler
+from pyobs.robotic.scheduler.constraints import AirmassConstraint, MoonSeparationConstraint
+from pyobs.robotic.scheduler.dataprovider import DataProvider
+from pyobs.robotic.scheduler.targets import SiderealTarget
+from pyobs.robotic.scheduler.visibility import VisibilityCache
+from pyobs.utils.time import Time
+
+
+def make_observer() -> Observer:
+    return Observer(location=EarthLocation.from_geodetic(lon=20.8108 * u.deg, lat=-32.3758 * u.deg, height=1798 * u.m))
+
+
+def make_coords() -> SkyCoord:
+    rng = np.random.default_rng(0)
+    return SkyCoord(ra=rng.uniform(0, 360, 50) * u.deg, dec=rng.uniform(-85, 40, 50) * u.deg)
+
+
+def test_curves_agree_with_transformations() -> None:
+    observer = make_observer()
+    cache = VisibilityCache(observer=observer)
+    coords = make_coords()
+
+    for time in [Time("2025-11-03T18:03:17", scale="utc"), Time("2025-11-04T02:41:53", scale="utc")]:
+        altaz = observer.altaz(time, coords)
+        np.testing.assert_allclose(cache.altitude(time, coords), altaz.alt.degree, atol=0.01)
+        np.testing.assert_allclose(cache.airmass(time, coords[:1]), [float(altaz[0].secz)], rtol=1e-3)
+        separation = get_body("moon", time).separation(coords, origin_mismatch="ignore").degree
+        np.testing.assert_allclose(cache.moon_separation(time, coords), separation, atol=0.05)
+
+
+def test_curves_are_cached_per_target(mocker) -> None:
+    observer = make_observer()
+    cache = VisibilityCache(observer=observer)
+    coords = make_coords()
+    spy = mocker.spy(observer, "altaz")
+    time = Time("2025-11-03T22:00:00", scale="utc")
+
+    cache.altitude(time, coords)
+    cache.altitude(time + TimeDelta(2 * u.hour), coords[::-1])  # same night
+    cache.altitude(time, SkyCoord(ra=coords[3].ra + 1e-6 * u.deg, dec=coords[3].dec))  # same after rounding
+    assert spy.call_count == 1
+
+    cache.altitude(time, SkyCoord(ra=1.0 * u.deg, dec=2.0 * u.deg))  # new target
+    cache.altitude(time + TimeDelta(1 * u.day), coords[:1])  # new night
+    assert spy.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_curves_are_stored_on_disk(tmp_path, mocker) -> None:
+    coords = make_coords()
+    start = Time("2025-11-03T18:00:00", scale="utc")
+    end = Time("2025-11-04T04:00:00", scale="utc")
+
+    cache = VisibilityCache(cache_dir=str(tmp_path), observer=make_observer())
+    await cache.prefetch(coords, start, end)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    # new cache reads curves from disk
+    observer = make_observer()
+    cached = VisibilityCache(cache_dir=str(tmp_path), observer=observer)
+    spy = mocker.spy(observer, "altaz")
+    np.testing.assert_allclose(cached.altitude(end, coords), cache.altitude(end, coords))
+    assert spy.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_constraints_use_cache() -> None:
+    observer = make_observer()
+    coords = make_coords()
+    data = DataProvider(observer)
+    cached = DataProvider(observer, visibility=VisibilityCache(observer=observer))
+    time = Time("2025-11-03T23:00:00", scale="utc")
+
+    for constraint in [AirmassConstraint(max_airmass=1.5), MoonSeparationConstraint(min_distance=60.0)]:
+        expected = await constraint.filter_skycoord(time, coords, data)
+        np.testing.assert_array_equal(await constraint.filter_skycoord(time, coords, cached), expected)
+
+        for coord, e in zip(coords[:10], expected[:10]):
+            target = SiderealTarget(name="t", ra=float(coord.ra.degree), dec=float(coord.dec.degree))
+            task = Task(id=1, name="t", duration=100, target=target)
+            assert await constraint(time, task, cached) is bool(e)
+
+
+@pytest.mark.asyncio
+async def test_astroplan_scheduler_skips_unobservable_tasks() -> None:
+    observer = make_observer()
+    scheduler = AstroplanScheduler(visibility={"class": "pyobs.robotic.scheduler.VisibilityCache"}, observer=observer)
+    data = DataProvider(observer, visibility=scheduler._visibility)
+    constraints = [AirmassConstraint(max_airmass=2.0)]
+    tasks = [
+        Task(
+            id=1,
+            name="canopus",
+            duration=100,
+            constraints=constraints,
+            target=SiderealTarget(name="c", ra=96.0, dec=-52.7),
+        ),
+        Task(
+            id=2,
+            name="polaris",
+            duration=100,
+            constraints=constraints,
+            target=SiderealTarget(name="p", ra=37.9, dec=89.3),
+        ),
+    ]
+
+    start = Time("2025-11-03T18:00:00", scale="utc")
+    observable = await scheduler._observable_tasks(tasks, start, start + TimeDelta(10 * u.hour), data)
+    assert observable == tasks[:1]
@@ -167,3 +167,20 @@ async def test_takes_correct_count() -> None:
 
     await script.run(None)
     assert camera.grab_data.call_count == 5
+
+
+# ── overheads ─────────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_learns_readout_overhead() -> None:
+    script = make_script(count=3, exptime=0, binning=(2, 2), overheads={"readout": 5.0, "min_samples": 3})
+    camera = make_camera()
+    setup_run_comm(script, camera)
+    assert script.estimate_duration() == 15.0
+
+    # mocked camera reads out immediately
+    await script.run(None)
+    assert script.overheads is not None
+    assert script.overheads.readout_time((2, 2)) < 1.0
+    assert script.estimate_duration() < 3.0
@@ -1,9 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import time
+from typing import Any, ClassVar
+from unittest.mock import AsyncMock, MagicMock
+
 import pytest
 from pydantic import ValidationError
 
-from pyobs.robotic.scripts.imaging.imaging import Configuration
+from pyobs.interfaces import (
+    ExposureState,
+    IBinning,
+    ICamera,
+    IExposure,
+    IExposureTime,
+    IFilters,
+    IImageType,
+    IWindow,
+    WindowCapabilities,
+)
+from pyobs.robotic.scheduler.targets import SiderealTarget
+from pyobs.robotic.scripts.imaging.imaging import Configuration, ImagingScript
+from pyobs.robotic.task import Task, TaskData
+from pyobs.robotic.utils.exptime import ExposureTimeProvider
+from pyobs.utils.enums import ExposureStatus
+from pyobs.utils.parallel import Future
+from tests.helpers import isinstance_class, make_proxy_cm
 
 
 def test_misplaced_guiding_config_inside_instrument_configs_raises() -> None:
@@ -23,3 +45,162 @@ def test_misplaced_guiding_config_inside_instrument_configs_raises() -> None:
                 ],
             }
         )
+
+
+class _RecordingProvider(ExposureTimeProvider):
+    """Exposure time provider that records when it is called."""
+
+    calls: ClassVar[list[str] | None] = None
+
+    async def __call__(self) -> float:
+        if self.calls is not None:
+            self.calls.append("provider")
+        return 5.0
+
+
+def make_script(**configuration) -> ImagingScript:
+    return ImagingScript.model_validate(
+        {
+            "camera": "camera",
+            "filters": "filters",
+            "configuration": {
+                "acquisition_config": {"enabled": False},
+                "guiding_config": {"enabled": False},
+                **configuration,
+            },
+        },
+        context={"comm": MagicMock()},
+    )
+
+
+def setup_comm(script: ImagingScript, delay: float = 0.0) -> tuple[MagicMock, list[str]]:
+    """Wires a camera and a filter wheel, whose commands take the given time, into the script's comm."""
+    calls: list[str] = []
+
+    def command(name: str) -> AsyncMock:
+        async def run(*args: Any) -> None:
+            calls.append(f"{name}{args}")
+            await asyncio.sleep(delay)
+            calls.append(f"{name} done")
+
+        return AsyncMock(side_effect=run)
+
+    interfaces = [ICamera, IBinning, IWindow, IExposureTime, IImageType, IExposure, IFilters]
+    device = MagicMock(spec=interfaces)
+    for name in ["set_binning", "set_window", "set_exposure_time", "set_image_type", "set_filter"]:
+        setattr(device, name, command(name))
+    device.get_capabilities = MagicMock(
+        return_value=WindowCapabilities(full_frame_x=0, full_frame_y=0, full_frame_width=1024, full_frame_height=1024)
+    )
+    device.__class__ = isinstance_class("Device", interfaces)
+
+    script._comm.safe_proxy = MagicMock(return_value=make_proxy_cm(device))
+    script._comm.proxy = MagicMock(return_value=make_proxy_cm(device))
+    script._comm.subscribe_state = AsyncMock()
+    script._comm.unsubscribe_state = AsyncMock()
+    return device, calls
+
+
+@pytest.mark.asyncio
+async def test_instrument_config_is_set_at_once() -> None:
+    script = make_script(instrument_configs=[{"exposure_time": 10.0, "binning": (2, 2), "optical_filter": "V"}])
+    _, calls = setup_comm(script, delay=0.05)
+
+    start = time.monotonic()
+    await script._setup_instrument_config(script.configuration.instrument_configs[0], None, Future(empty=True))
+
+    # only the window has to wait for the binning
+    assert time.monotonic() - start < 0.15
+    assert calls.index("set_window(0, 0, 1024, 1024)") > calls.index("set_binning done")
+    assert {"set_exposure_time(10.0,)", "set_image_type(<ImageType.OBJECT: 'object'>,)", "set_filter('V',)"} <= set(
+        calls[:4]
+    )
+
+
+@pytest.mark.asyncio
+async def test_exposure_time_provider_runs_after_camera_setup(mocker) -> None:
+    script = make_script(
+        instrument_configs=[
+            {
+                "exposure_time": {"class": "tests.robotic.scripts.test_imaging._RecordingProvider"},
+                "binning": (2, 2),
+                "optical_filter": "V",
+            }
+        ]
+    )
+    _, calls = setup_comm(script, delay=0.01)
+    mocker.patch.object(_RecordingProvider, "calls", calls)
+
+    await script._setup_instrument_config(script.configuration.instrument_configs[0], None, Future(empty=True))
+
+    # provider needs final binning, window and filter, and the image type is set after it
+    provider = calls.index("provider")
+    assert provider > max(calls.index("set_window done"), calls.index("set_filter done"))
+    assert calls[provider + 1 :] == [
+        "set_exposure_time(5.0,)",
+        "set_exposure_time done",
+        "set_image_type(<ImageType.OBJECT: 'object'>,)",
+        "set_image_type done",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_prepare_determines_exposure_time_once_after_slew(mocker) -> None:
+    script = make_script(
+        instrument_configs=[
+            {"exposure_time": {"class": "tests.robotic.scripts.test_imaging._RecordingProvider"}, "count": 1}
+        ]
+    )
+    script.telescope = "telescope"
+    device, calls = setup_comm(script, delay=0.01)
+
+    async def move_radec(*args: Any) -> None:
+        await asyncio.sleep(0.05)
+        calls.append("slewed")
+
+    device.move_radec = AsyncMock(side_effect=move_radec)
+    device.stop_motion = AsyncMock()
+    mocker.patch.object(_RecordingProvider, "calls", calls)
+    mocker.patch("pyobs.robotic.scripts.imaging.imaging.grab_sequence", AsyncMock(return_value=1))
+
+    task = Task(id=1, name="t", duration=60, target=SiderealTarget(name="t", ra=10.0, dec=20.0))
+    await script.prepare(TaskData(task=task))
+    await script.run(TaskData(task=task))
+
+    # provider runs once, after the slew, and the config isn't set up again in run()
+    assert calls.count("provider") == 1
+    assert calls.index("provider") > calls.index("slewed")
+    assert calls.count("set_exposure_time(5.0,)") == 1
+
+
+@pytest.mark.asyncio
+async def test_next_filter_is_set_during_readout(mocker) -> None:
+    script = make_script(
+        instrument_configs=[{"count": 2, "optical_filter": "B"}, {"count": 1, "optical_filter": "V"}],
+    )
+    device, calls = setup_comm(script)
+
+    async def grab_sequence(comm: Any, camera: str, count: int, on_progress: Any, **kwargs: Any) -> int:
+        on_state = script._comm.subscribe_state.call_args.args[2] if script._comm.subscribe_state.called else None
+        for i in range(count):
+            calls.append("expose")
+            if on_state is not None:
+                on_state(ExposureState(status=ExposureStatus.READOUT, progress=100.0))
+            await asyncio.sleep(0.01)
+            on_progress(i + 1)
+        return count
+
+    mocker.patch("pyobs.robotic.scripts.imaging.imaging.grab_sequence", side_effect=grab_sequence)
+    await script.run(None)
+
+    # V is set while reading out the second B image, and not again for the V config
+    assert [c for c in calls if c.startswith("set_filter(") or c == "expose"] == [
+        "set_filter('B',)",
+        "expose",
+        "expose",
+        "set_filter('V',)",
+        "expose",
+    ]
+    assert device.set_filter.call_count == 2
+    assert script._comm.subscribe_state.call_count == 1
+    assert script._comm.unsubscribe_state.call_count == 1
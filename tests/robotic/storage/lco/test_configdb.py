@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from pyobs.robotic.storage.lco.configdb import ConfigDB
+
+from .helpers import make_configdb_site
+
+
+class _ConfigDBServer:
+    """Local configdb serving a single site with an ETag."""
+
+    def __init__(self) -> None:
+        self.results = [dataclasses.asdict(make_configdb_site())]
+        self.etag = '"v1"'
+        self.available = True
+        self.requests: list[dict[str, str]] = []
+
+    async def sites(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.headers))
+        if not self.available:
+            return web.Response(status=503)
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304)
+        return web.json_response({"results": self.results}, headers={"ETag": self.etag})
+
+
+@pytest_asyncio.fixture
+async def server() -> AsyncIterator[tuple[_ConfigDBServer, str]]:
+    srv = _ConfigDBServer()
+    app = web.Application()
+    app.router.add_get("/sites", srv.sites)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    yield srv, f"http://127.0.0.1:{port}/"
+    await runner.cleanup()
+
+
+def test_constructor_does_not_download() -> None:
+    configdb = ConfigDB("http://127.0.0.1:1/")
+    assert not configdb.loaded
+    assert configdb.get_instrument_by_type("0M5 IAG50CM SBIG6303E") == []
+
+
+@pytest.mark.asyncio
+async def test_update_uses_etag(server: Any) -> None:
+    srv, url = server
+    configdb = ConfigDB(url)
+
+    assert await configdb.update() is True
+    assert configdb.get_instrument_by_type("0m5 iag50cm sbig6303e", telescope="0M5A")[0].instrument.code == "kb03"
+
+    # unchanged
+    assert await configdb.update() is False
+    assert srv.requests[-1]["If-None-Match"] == '"v1"'
+    assert configdb.loaded
+
+
+@pytest.mark.asyncio
+async def test_snapshot_for_offline_start(server: Any, tmp_path: Path) -> None:
+    srv, url = server
+    snapshot = str(tmp_path / "configdb.json")
+    configdb = ConfigDB(url, snapshot=snapshot)
+    await configdb.update()
+
+    # configdb is down, but snapshot is available immediately after opening
+    srv.available = False
+    configdb = ConfigDB(url, snapshot=snapshot, retry=0.01)
+    await configdb.open()
+    try:
+        assert await configdb.wait(0.0)
+        assert len(configdb.get_instrument_by_type("0M5 IAG50CM SBIG6303E", site="goe")) == 1
+    finally:
+        await configdb.close()
+
+
+@pytest.mark.asyncio
+async def test_wait_for_background_refresh(server: Any) -> None:
+    srv, url = server
+    srv.available = False
+    configdb = ConfigDB(url, retry=0.01)
+    await configdb.open()
+    try:
+        assert await configdb.wait(0.05) is False
+        srv.available = True
+        assert await configdb.wait(5.0) is True
+    finally:
+        await configdb.close()
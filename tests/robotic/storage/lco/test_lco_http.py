@@ -16,7 +16,7 @@ from .conftest import (
     OBSERVATIONS_RESPONSE,
     SCHEDULABLE_REQUESTS_RESPONSE,
 )
-from .helpers import make_observation_archive, make_task_archive
+from .helpers import make_configdb_site, make_observation_archive, make_task_archive
 
 
 def make_lco_task() -> LcoTask:
@@ -218,80 +218,9 @@ async def test_observation_archive_update_observation_skips_non_lco(mocker) -> N
 
 
 def test_configdb_get_instrument_by_type() -> None:
-    from pyobs.robotic.storage.lco.configdb import (
-        Camera,
-        CameraType,
-        ConfigDB,
-        Enclosure,
-        Instrument,
-        InstrumentType,
-        Site,
-        Telescope,
-    )
-
-    camera_type = CameraType(id=1, size="", pscale=0.0, name="", code="kb03", pixels_x=3072, pixels_y=2048, max_rois=1)
-    camera = Camera(
-        id=1, code="kb03", camera_type=camera_type, orientation=0.0, optical_element_groups=[], host="localhost"
-    )
-    instrument_type = InstrumentType(
-        id=1,
-        name="SBIG 6303e",
-        code="0M5 IAG50CM SBIG6303E",
-        fixed_overhead_per_exposure=0.0,
-        instrument_category="IMAGE",
-        observation_front_padding=0.0,
-        acquire_exposure_time=0.0,
-        default_configuration_type="EXPOSE",
-        mode_types=[],
-        default_acceptability_threshold=90.0,
-        config_front_padding=0.0,
-        allow_self_guiding=False,
-        configuration_types=[],
-        validation_schema={},
-    )
-    instrument = Instrument(
-        id=1,
-        code="kb03",
-        state="SCHEDULABLE",
-        telescope="0m5a",
-        autoguider_camera=camera,
-        science_cameras=[camera],
-        instrument_type=instrument_type,
-    )
-    telescope = Telescope(
-        id=1,
-        serial_number="",
-        name="0m5a",
-        code="0m5a",
-        active=True,
-        aperture=0.5,
-        lat=0.0,
-        slew_rate=0.0,
-        minimum_slew_overhead=0.0,
-        instrument_change_overhead=0.0,
-        long=0.0,
-        enclosure="roof",
-        horizon=30.0,
-        ha_limit_pos=4.5,
-        ha_limit_neg=-4.5,
-        telescope_front_padding=0.0,
-        zenith_blind_spot=0.0,
-        instrument_set=[instrument],
-    )
-    enclosure = Enclosure(id=1, name="roof", code="roof", active=True, site="goe", telescope_set=[telescope])
-    site = Site(
-        id=1,
-        name="Goettingen",
-        code="goe",
-        active=True,
-        timezone=1,
-        restart="",
-        tz="Europe/Berlin",
-        lat=51.56,
-        long=9.94,
-        enclosure_set=[enclosure],
-    )
+    from pyobs.robotic.storage.lco.configdb import ConfigDB
 
+    site = make_configdb_site()
     configdb = ConfigDB.__new__(ConfigDB)
     configdb.config = [site]
 
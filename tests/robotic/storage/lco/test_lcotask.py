@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from typing import ClassVar
 
 import pytest
 
@@ -14,11 +15,33 @@ from pyobs.robotic.scheduler.constraints import (
 )
 from pyobs.robotic.scheduler.merits import PerNightMerit
 from pyobs.robotic.scheduler.targets import SiderealTarget
-from pyobs.robotic.storage.lco import LcoTask
-from pyobs.robotic.storage.lco._portal import LcoSchedulableRequest
+from pyobs.robotic.scripts import Script
+from pyobs.robotic.storage.lco import LcoTask, LcoTaskRunner
+from pyobs.robotic.storage.lco._portal import LcoRequest, LcoSchedulableRequest
+from pyobs.robotic.task import TaskData
 
 from .test_task import REQUEST_CONFIG
 
+# ── module-level script stub (needed so pyobs_model_validate can find it) ────
+
+
+class _PreparingScript(Script):
+    request: LcoRequest
+    prepared: bool = False
+    instances: ClassVar[list[str]] = []
+
+    async def prepare(self, data: TaskData | None) -> None:
+        self.prepared = True
+        self.instances.append(f"prepare {id(self)}")
+
+    async def rollback(self, data: TaskData | None) -> None:
+        self.prepared = False
+        self.instances.append(f"rollback {id(self)}")
+
+    async def run(self, data: TaskData | None) -> None:
+        self.instances.append(f"run {id(self)} prepared={self.prepared}")
+
+
 # ── fixtures ──────────────────────────────────────────────────────────────────
 
 
@@ -148,3 +171,24 @@ def test_from_observation(schedulable_request: LcoSchedulableRequest) -> None:
     assert task.name == str(obs.request.id)
     assert isinstance(task.target, SiderealTarget)
     assert task.target.name == "Kochab"
+
+
+# ── prepare / run ─────────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_runner_runs_prepared_script(task: LcoTask) -> None:
+    """The script prepared by the task runner is the one that runs, and only once."""
+    runner = LcoTaskRunner(scripts={"EXPOSE": {"class": "tests.robotic.storage.lco.test_lcotask._PreparingScript"}})
+    _PreparingScript.instances.clear()
+
+    await runner.prepare_task(task)
+    await runner.run_task(task)
+    assert len(_PreparingScript.instances) == 2
+    prepared = _PreparingScript.instances[0].split()[1]
+    assert _PreparingScript.instances[1] == f"run {prepared} prepared=True"
+    assert task._prepared_script is None
+
+    # next run without preparation uses a fresh script
+    await runner.run_task(task)
+    assert _PreparingScript.instances[2].endswith("prepared=False")
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from typing import Any
 
@@ -49,3 +50,28 @@ async def test_observations_parses_no_request_shape(mocker: Any) -> None:
     assert observations[0].id == 1020277
     assert observations[0].request == 98260
     assert observations[0].ipp_value is None
+
+
+@pytest.mark.asyncio
+async def test_configuration_status_updates_are_coalesced(mocker: Any) -> None:
+    portal = Portal("", "", "", "", "")
+    portal._session = mocker.MagicMock()
+    write = mocker.patch.object(portal, "_write", return_value={})
+
+    # two updates for the same configuration before the outbox is started
+    await portal.update_configuration_status(1, {"state": "ATTEMPTED"})
+    await portal.update_configuration_status(2, {"state": "ATTEMPTED"})
+    await portal.update_configuration_status(1, {"state": "COMPLETED"})
+    portal._outbox.start()
+    for _ in range(100):
+        if len(portal._outbox) == 0:
+            break
+        await asyncio.sleep(0.01)
+    await portal._outbox.close()
+
+    paths = [(c.args[1], c.args[2]) for c in write.call_args_list]
+    assert paths == [
+        ("/api/configurationstatus/2/", {"state": "ATTEMPTED"}),
+        ("/api/configurationstatus/1/", {"state": "COMPLETED"}),
+    ]
+    assert portal.outbox_statistics().coalesced == 1
@@ -153,6 +153,19 @@ async def test_add_schedule_calls_portal() -> None:
     assert len(submitted) == 1
 
 
+@pytest.mark.asyncio
+async def test_add_schedule_without_configdb_raises() -> None:
+    portal = make_portal()
+    portal.submit_observations = AsyncMock()
+    configdb = make_configdb()
+    configdb.wait.return_value = False
+    writer = make_writer(portal=portal, configdb=configdb)
+
+    with pytest.raises(RuntimeError):
+        await writer.add_schedule(ObservationList([make_lco_observation()]))
+    portal.submit_observations.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_clear_schedule_calls_portal() -> None:
     portal = make_portal()
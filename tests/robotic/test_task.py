@@ -31,6 +31,20 @@ class _NeverCanRunScript(Script):
         return False
 
 
+class _PreparingScript(Script):
+    prepared: bool = False
+
+    async def prepare(self, data: TaskData | None) -> None:
+        self.prepared = True
+
+    async def rollback(self, data: TaskData | None) -> None:
+        self.prepared = False
+
+    async def run(self, data: TaskData | None) -> None:
+        if not self.prepared:
+            raise ValueError("Not prepared.")
+
+
 # ── YAML parsing ─────────────────────────────────────────────────────────────
 
 TASK_CONFIG = """
@@ -220,3 +234,26 @@ async def test_resolve_target_returns_false_when_no_candidate() -> None:
     # static_target is DynamicTarget, _resolved_target is None,
     # so target property returns the DynamicTarget (not None)
     assert task._resolved_target is None
+
+
+# ── prepare / rollback ───────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_run_uses_prepared_script() -> None:
+    task = Task(name="t", script={"class": "tests.robotic.test_task._PreparingScript"})
+    await task.prepare(TaskData(task=task))
+    await task.run(TaskData(task=task))
+
+    # prepared script is only used once
+    with pytest.raises(ValueError):
+        await task.run(TaskData(task=task))
+
+
+@pytest.mark.asyncio
+async def test_rollback_discards_prepared_script() -> None:
+    task = Task(name="t", script={"class": "tests.robotic.test_task._PreparingScript"})
+    await task.prepare(TaskData(task=task))
+    await task.rollback(TaskData(task=task))
+    with pytest.raises(ValueError):
+        await task.run(TaskData(task=task))
@@ -9,13 +9,21 @@ from astropy.table import Table
 from photutils.datasets import make_model_image
 
 from pyobs.comm.comm import Comm
-from pyobs.interfaces import ExposureTimeState, WindowState
+from pyobs.interfaces import BinningState, ExposureTimeState, IBinning, WindowCapabilities, WindowState
 from pyobs.robotic.utils.exptime.stellarexptime import StellarExposureTimeProvider
 from pyobs.utils.enums import ImageType
 from tests.helpers import make_proxy_cm
 
 # ── helpers ───────────────────────────────────────────────────────────────────
 
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """Cached bias frames and learned zero points are shared between providers, so reset them for every test."""
+    StellarExposureTimeProvider._bias_cache.clear()
+    StellarExposureTimeProvider._zero_points.clear()
+
+
 SHAPE = (200, 200)
 BACKGROUND = 100.0
 SIGMA = 3.0
@@ -65,6 +73,9 @@ def make_camera_mocks(
 
     mock_window = AsyncMock()
     mock_window.get_state = MagicMock(return_value=WindowState(x=0, y=0, width=SHAPE[1], height=SHAPE[0]))
+    mock_window.get_capabilities = MagicMock(
+        return_value=WindowCapabilities(full_frame_width=SHAPE[1], full_frame_height=SHAPE[0])
+    )
 
     return mock_camera, mock_exptime, mock_imagetype, mock_window
 
@@ -83,7 +94,7 @@ def wire_proxies(
     MagicMock -- an AsyncMock here would make the call return a coroutine
     instead of a context manager.
     """
-    from pyobs.interfaces import IData, IExposureTime, IImageType
+    from pyobs.interfaces import IBinning, IData, IExposureTime, IImageType
 
     def proxy_side_effect(name, interface=None):
         if interface is IData:
@@ -96,6 +107,10 @@ def wire_proxies(
 
     provider._comm.proxy = MagicMock(side_effect=proxy_side_effect)
 
+    mock_binning = MagicMock(spec=IBinning)
+    mock_binning.get_state = MagicMock(return_value=BinningState(x=1, y=1))
+    provider._comm.safe_proxy = MagicMock(return_value=make_proxy_cm(mock_binning))
+
 
 def attach_proxies(
     provider: StellarExposureTimeProvider,
@@ -218,6 +233,7 @@ async def test_call_restores_settings_on_exception() -> None:
     mock_imagetype = AsyncMock()
     mock_window = AsyncMock()
     mock_window.get_state = MagicMock(return_value=WindowState(x=0, y=0, width=512, height=512))
+    mock_window.get_capabilities = MagicMock(return_value=None)
 
     wire_proxies(provider, mock_camera, mock_exptime, mock_imagetype, mock_window)
 
@@ -244,3 +260,82 @@ async def test_call_converges_in_one_iteration() -> None:
 
     # bias + exactly one science frame = 2 grab_data calls
     assert mocks[0].grab_data.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_call_reads_out_search_window_only() -> None:
+    """A window around the centre of the search region is set for the test exposures and restored afterward."""
+    bias_data = np.zeros(SHAPE)
+    sci_data = make_stellar_image(100.0, 100.0, amplitude=30000.0, background=0.0)
+
+    provider = make_provider(search_radius=50, max_iterations=1)
+    mocks = make_camera_mocks(bias_data, sci_data)
+    attach_proxies(provider, *mocks, bias_data, sci_data)
+
+    await provider()
+
+    calls = [c.args for c in mocks[3].set_window.call_args_list]
+    assert calls == [(50, 50, 100, 100), (0, 0, SHAPE[1], SHAPE[0])]
+
+
+@pytest.mark.asyncio
+async def test_call_search_window_scales_with_binning() -> None:
+    """The search radius is given in binned pixels, so the window grows with the binning, but not beyond the frame."""
+    bias_data = np.zeros((100, 50))
+    sci_data = make_stellar_image(25.0, 50.0, amplitude=30000.0, background=0.0, shape=(100, 50))
+
+    provider = make_provider(search_radius=30, max_iterations=1)
+    mocks = make_camera_mocks(bias_data, sci_data)
+    attach_proxies(provider, *mocks, bias_data, sci_data)
+    mock_binning = MagicMock(spec=IBinning)
+    mock_binning.get_state = MagicMock(return_value=BinningState(x=4, y=2))
+    provider._comm.safe_proxy = MagicMock(return_value=make_proxy_cm(mock_binning))
+
+    await provider()
+
+    calls = [c.args for c in mocks[3].set_window.call_args_list]
+    assert calls == [(0, 40, 200, 120), (0, 0, SHAPE[1], SHAPE[0])]
+
+
+@pytest.mark.asyncio
+async def test_call_reuses_cached_bias() -> None:
+    """A second call with the same binning and window takes no new bias frame."""
+    bias_data = np.zeros(SHAPE)
+    sci_data = make_stellar_image(100.0, 100.0, amplitude=30000.0, background=0.0)
+
+    provider = make_provider(max_iterations=1)
+    mocks = make_camera_mocks(bias_data, sci_data)
+    attach_proxies(provider, *mocks, bias_data, sci_data)
+    await provider()
+
+    provider2 = make_provider(max_iterations=1)
+    mocks2 = make_camera_mocks(bias_data, sci_data)
+    mocks2[0].grab_data = AsyncMock(return_value="sci.fits")
+    wire_proxies(provider2, *mocks2)
+    provider2._vfs.read_image = AsyncMock(return_value=make_image(sci_data))
+    await provider2()
+
+    assert mocks2[0].grab_data.call_count == 1
+    mocks2[1].set_exposure_time.assert_any_call(1.0)
+
+
+@pytest.mark.asyncio
+async def test_call_predicts_exposure_time_from_learned_zero_point() -> None:
+    """After one measurement, the exposure time for a star of another magnitude is predicted correctly."""
+    target_peak = 30000.0
+    bias_data = np.zeros(SHAPE)
+
+    # star of 10 mag gives 15000 ADU in 1s
+    provider = make_provider(target_peak=target_peak, max_iterations=1, magnitude=10.0, band="G")
+    sci_data = make_stellar_image(100.0, 100.0, amplitude=15000.0, background=0.0)
+    mocks = make_camera_mocks(bias_data, sci_data)
+    attach_proxies(provider, *mocks, bias_data, sci_data)
+    await provider()
+
+    # so a star of 11 mag needs about 2*2.512 s
+    provider2 = make_provider(target_peak=target_peak, max_iterations=1, magnitude=11.0, band="G")
+    assert abs(provider2._predict_exposure_time() - 2.0 * 10**0.4) < 0.5
+
+    # but not in another band
+    provider3 = make_provider(target_peak=target_peak, magnitude=11.0, band="R")
+    assert provider3._predict_exposure_time() == provider3.default_exposure_time
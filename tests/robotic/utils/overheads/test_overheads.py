@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from pyobs.robotic.scripts.imaging.imaging import ImagingScript
+from pyobs.robotic.utils.overheads import OverheadModel
+
+
+def test_defaults_until_enough_samples() -> None:
+    model = OverheadModel(readout=5.0, min_samples=3)
+    model.record_readout((1, 1), None, 2.0)
+    model.record_readout((1, 1), None, 2.0)
+    assert model.readout_time((1, 1)) == 5.0
+    model.record_readout((1, 1), None, 2.0)
+    assert model.readout_time((1, 1)) == pytest.approx(2.0)
+
+
+def test_readout_falls_back_to_less_specific_keys() -> None:
+    model = OverheadModel(min_samples=1)
+    model.record_readout((2, 2), None, 1.0)
+    model.record_readout((1, 1), (0, 0, 100, 100), 3.0)
+
+    # exact match, same binning, then any readout
+    assert model.readout_time((1, 1), (0, 0, 100, 100)) == pytest.approx(3.0)
+    assert model.readout_time((2, 2), (0, 0, 100, 100)) == pytest.approx(1.0)
+    assert model.readout_time((4, 4)) == pytest.approx(2.0)
+
+
+def test_invalid_values_are_ignored() -> None:
+    model = OverheadModel(min_samples=1, filter_change=10.0)
+    model.record_filter_change(-1.0)
+    model.record_filter_change(float("nan"))
+    assert model.filter_change_time() == 10.0
+
+
+def test_old_values_fade_out() -> None:
+    model = OverheadModel(min_samples=1, max_samples=10)
+    for _ in range(100):
+        model.record_acquisition(30.0)
+    for _ in range(50):
+        model.record_acquisition(60.0)
+    assert model.acquisition_time() == pytest.approx(60.0, abs=0.5)
+
+
+def test_slew_time_is_fitted_against_distance() -> None:
+    model = OverheadModel(min_samples=3)
+    for distance in [10.0, 20.0, 50.0, 90.0]:
+        model.record_slew(distance, 15.0 + 0.5 * distance)
+
+    assert model.slew_time(30.0) == pytest.approx(30.0)
+    assert model.slew_time(0.0) == pytest.approx(15.0)
+
+    # unknown distance gives average slew
+    assert model.slew_time() == pytest.approx(15.0 + 0.5 * 42.5)
+
+
+def test_distance() -> None:
+    assert OverheadModel.distance(0.0, 0.0, 90.0, 0.0) == pytest.approx(90.0)
+    assert OverheadModel.distance(10.0, 90.0, 200.0, 90.0) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_persisted_and_shared_by_filename(tmp_path: Path) -> None:
+    filename = str(tmp_path / "overheads.json")
+    model = OverheadModel(filename=filename, min_samples=1)
+    model.record_guiding_start(12.0)
+
+    # models using the same file share their statistics
+    assert OverheadModel(filename=filename, min_samples=1).guiding_start_time() == pytest.approx(12.0)
+
+    # and after saving, they can be restored
+    model.save()
+    OverheadModel._shared.clear()
+    assert OverheadModel(filename=filename, min_samples=1).guiding_start_time() == pytest.approx(12.0)
+
+
+def test_reloaded_when_file_changes(tmp_path: Path) -> None:
+    filename = str(tmp_path / "overheads.json")
+    reader = OverheadModel(filename=filename, min_samples=1)
+    assert reader.guiding_start_time() == 10.0
+
+    # another process writes the file
+    OverheadModel._shared.clear()
+    writer = OverheadModel(filename=filename, min_samples=1)
+    writer.record_guiding_start(12.0)
+    writer.save()
+    assert reader.guiding_start_time() == pytest.approx(12.0)
+
+    # unsaved values are not overwritten
+    reader.record_filter_change(3.0)
+    writer.record_guiding_start(14.0)
+    writer.save()
+    os.utime(filename, ns=(0, 1))
+    assert reader.filter_change_time() == pytest.approx(3.0)
+
+
+def test_broken_file_is_ignored(tmp_path: Path) -> None:
+    filename = tmp_path / "overheads.json"
+    filename.write_text("{broken")
+    assert OverheadModel(filename=str(filename), guiding_start=7.0).guiding_start_time() == 7.0
+
+
+def test_imaging_script_uses_overheads() -> None:
+    config = {
+        "camera": "camera",
+        "configuration": {
+            "instrument_configs": [
+                {"exposure_time": 10.0, "count": 2, "optical_filter": "V"},
+                {"exposure_time": 20.0, "count": 1, "optical_filter": "R"},
+            ],
+            "repeats": 2,
+        },
+    }
+
+    # without overhead model, the estimate stays as it was
+    assert ImagingScript.model_validate(config).estimate_duration() == 2 * 40.0 + 60.0 + 30.0
+
+    overheads = {"slew": 50.0, "readout": 3.0, "filter_change": 5.0, "acquisition": 20.0, "guiding_start": 10.0}
+    script = ImagingScript.model_validate({**config, "overheads": overheads})
+    exposures = 2 * (2 * 13.0 + 23.0)
+    filters = 4 * 5.0
+    assert script.estimate_duration() == pytest.approx(50.0 + 20.0 + 10.0 + exposures + filters)
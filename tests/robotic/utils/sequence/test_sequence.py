@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from pyobs.interfaces import DataSequenceState, ICamera, IData, IDataSequence
+from pyobs.robotic.utils.sequence import grab_sequence
+from tests.helpers import isinstance_class, make_proxy_cm
+
+
+def make_comm(camera: MagicMock) -> MagicMock:
+    """Comm whose state subscriptions are stored in comm.callbacks."""
+    comm = MagicMock()
+    comm.callbacks = []
+    comm.proxy = MagicMock(return_value=make_proxy_cm(camera))
+
+    async def subscribe_state(module: str, interface: Any, callback: Any) -> None:
+        comm.callbacks.append(callback)
+        callback(DataSequenceState(count_total=0, count_left=0))
+
+    async def unsubscribe_state(module: str, interface: Any, callback: Any) -> None:
+        comm.callbacks.remove(callback)
+
+    comm.subscribe_state = AsyncMock(side_effect=subscribe_state)
+    comm.unsubscribe_state = AsyncMock(side_effect=unsubscribe_state)
+    return comm
+
+
+def make_camera(sequence: bool = True, stop_after: int | None = None) -> MagicMock:
+    """Camera that runs sequences by pushing states to the callbacks of comm, set later."""
+    interfaces = [ICamera, IData] + ([IDataSequence] if sequence else [])
+    camera = MagicMock(spec=interfaces)
+    camera.__class__ = isinstance_class("Camera", interfaces)
+    camera.grab_data = AsyncMock(return_value="image.fits")
+    camera.abort_sequence = AsyncMock()
+    camera.abort = AsyncMock()
+
+    async def run(count: int) -> None:
+        for left in range(count - 1, -1, -1):
+            await asyncio.sleep(0)
+            if stop_after is not None and count - left > stop_after:
+                break
+            for cb in list(camera.comm.callbacks):
+                cb(DataSequenceState(count_total=count, count_left=left))
+        for cb in list(camera.comm.callbacks):
+            cb(DataSequenceState(count_total=0, count_left=0))
+
+    async def start(count: int, broadcast: bool = True, **kwargs: Any) -> None:
+        for cb in camera.comm.callbacks:
+            cb(DataSequenceState(count_total=count, count_left=count))
+        camera.task = asyncio.create_task(run(count))
+
+    camera.grab_sequence = AsyncMock(side_effect=start)
+    return camera
+
+
+@pytest.mark.asyncio
+async def test_sequence_on_camera() -> None:
+    camera = make_camera()
+    camera.comm = comm = make_comm(camera)
+    progress: list[int] = []
+
+    assert await grab_sequence(comm, "camera", 5, on_progress=progress.append) == 5
+    camera.grab_sequence.assert_awaited_once()
+    camera.grab_data.assert_not_called()
+    assert progress == [1, 2, 3, 4, 5]
+    assert comm.callbacks == []
+
+
+@pytest.mark.asyncio
+async def test_remaining_images_after_early_stop() -> None:
+    camera = make_camera(stop_after=2)
+    camera.comm = comm = make_comm(camera)
+    progress: list[int] = []
+
+    assert await grab_sequence(comm, "camera", 5, on_progress=progress.append) == 5
+    assert camera.grab_data.await_count == 3
+    assert progress == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_single_grabs_without_sequence_support() -> None:
+    camera = make_camera(sequence=False)
+    camera.comm = comm = make_comm(camera)
+
+    assert await grab_sequence(comm, "camera", 3) == 3
+    assert camera.grab_data.await_count == 3
+    comm.subscribe_state.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sequence_aborted_without_progress() -> None:
+    camera = make_camera()
+    camera.comm = comm = make_comm(camera)
+    camera.grab_sequence = AsyncMock()
+
+    assert await grab_sequence(comm, "camera", 2, frame_timeout=0.05) == 2
+    camera.abort_sequence.assert_awaited_once()
+    camera.abort.assert_awaited_once()
+    assert camera.grab_data.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_sequence_aborted_waits_for_camera_to_become_idle() -> None:
+    camera = make_camera()
+    camera.comm = comm = make_comm(camera)
+    events: list[str] = []
+
+    async def start(count: int, broadcast: bool = True, **kwargs: Any) -> None:
+        for cb in comm.callbacks:
+            cb(DataSequenceState(count_total=count, count_left=count))
+
+    async def finish_current_image() -> None:
+        # image still reading out finishes after the abort, then the camera becomes idle
+        await asyncio.sleep(0.02)
+        for state in (DataSequenceState(count_total=3, count_left=2), DataSequenceState(count_total=0, count_left=0)):
+            for cb in list(comm.callbacks):
+                cb(state)
+        events.append("idle")
+
+    async def abort_sequence(**kwargs: Any) -> None:
+        camera.task = asyncio.create_task(finish_current_image())
+
+    async def grab_data(broadcast: bool = True, **kwargs: Any) -> str:
+        events.append("grab")
+        return "image.fits"
+
+    camera.grab_sequence = AsyncMock(side_effect=start)
+    camera.abort_sequence = AsyncMock(side_effect=abort_sequence)
+    camera.grab_data = AsyncMock(side_effect=grab_data)
+
+    assert await grab_sequence(comm, "camera", 3, frame_timeout=0.05) == 3
+    camera.abort.assert_not_called()
+    assert events == ["idle", "grab", "grab"]
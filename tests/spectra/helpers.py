@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import numpy as np
+import numpy.typing as npt
+
+# arc lines in pixels and wavelengths for a dispersion of 5000 + 0.5*x + 1e-5*x^2
+ARC_PIXELS = np.array([20.3, 61.7, 104.2, 150.0, 199.6, 240.1, 288.8, 333.3, 371.9])
+ARC_LINES = 5000.0 + 0.5 * ARC_PIXELS + 1e-5 * ARC_PIXELS**2
+
+
+def make_frame(
+    flux: float = 1000.0, sky: float = 100.0, nx: int = 400, ny: int = 60, noise: bool = True, arc: bool = False
+) -> npt.NDArray[np.float64]:
+    """Raw frame with a slightly tilted trace around row 30, or an arc along the same trace."""
+    rng = np.random.default_rng(42)
+    x = np.arange(nx)
+    trace = 30.0 + 0.01 * (x - nx / 2)
+    profile = np.exp(-0.5 * ((np.arange(ny)[:, None] - trace[None, :]) / 2.0) ** 2) / np.sqrt(2 * np.pi * 2.0**2)
+    if arc:
+        spectrum = 10.0 + np.sum(5000.0 * np.exp(-0.5 * ((x[:, None] - ARC_PIXELS[None, :]) / 1.5) ** 2), axis=1)
+    else:
+        spectrum = np.full(nx, flux)
+    frame = sky + profile * spectrum[None, :]
+    return rng.poisson(frame).astype(np.float64) if noise else frame
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from astropy.io import fits
+
+from pyobs.spectra import Spectrum
+from pyobs.spectra.processors.extraction import ExtractSpectrum
+from pyobs.spectra.processors.wavelength import ArcWavelengthSolution
+from pyobs.vfs import VirtualFileSystem
+from tests.spectra.helpers import ARC_LINES, make_frame
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> Iterator[None]:
+    ArcWavelengthSolution._cache.clear()
+    yield
+    ArcWavelengthSolution._cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_arc_solution_from_raw_frame() -> None:
+    vfs = MagicMock(spec=VirtualFileSystem)
+    vfs.read_fits = AsyncMock(return_value=fits.HDUList([fits.PrimaryHDU(make_frame(arc=True, sky=10.0))]))
+
+    # extract science spectrum, then calibrate with arc along same trace
+    spectrum = await ExtractSpectrum(aperture=14)(Spectrum(data=make_frame()))
+
+    # a rough initial guess with only a linear dispersion, and an extra reference line that is not in the arc
+    lines = list(ARC_LINES) + [5100.0]
+    step = ArcWavelengthSolution(arc="arc.fits", lines=lines, guess=[5001.0, 0.501], degree=2, vfs=vfs)
+    result = await step(spectrum)
+
+    x = np.arange(400)
+    np.testing.assert_allclose(result.wavelength, 5000.0 + 0.5 * x + 1e-5 * x**2, atol=0.05)
+    assert result.header["WAVENLIN"] == len(ARC_LINES)
+    assert result.header["WAVERMS"] < 0.05
+
+    # solution is cached
+    await step(spectrum)
+    vfs.read_fits.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_arc_solution_cached_per_file_and_parameters(tmp_path: Path) -> None:
+    filename = tmp_path / "arc.fits"
+    filename.touch()
+    vfs = MagicMock(spec=VirtualFileSystem)
+    vfs.read_fits = AsyncMock(return_value=fits.HDUList([fits.PrimaryHDU(make_frame(arc=True, sky=10.0))]))
+    vfs.local_path = AsyncMock(return_value=str(filename))
+    spectrum = await ExtractSpectrum(aperture=14)(Spectrum(data=make_frame()))
+
+    def make_step(**kwargs: Any) -> ArcWavelengthSolution:
+        return ArcWavelengthSolution(arc="arc.fits", lines=list(ARC_LINES), guess=[5001.0, 0.501], vfs=vfs, **kwargs)
+
+    await make_step(degree=2)(spectrum)
+    await make_step(degree=2)(spectrum)
+    assert vfs.read_fits.await_count == 1
+
+    # other parameters give another solution
+    linear = await make_step(degree=1)(spectrum)
+    assert vfs.read_fits.await_count == 2
+    assert "WAVEC2" not in linear.header
+
+    # and so does a replaced arc
+    os.utime(filename, (0, 0))
+    await make_step(degree=2)(spectrum)
+    assert vfs.read_fits.await_count == 3
+
+
+def test_requires_lines() -> None:
+    with pytest.raises(ValueError):
+        ArcWavelengthSolution(arc="arc.fits", lines=[5000.0], guess=[5000.0, 0.5])
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from astropy.io import fits
+
+from pyobs.images import Image
+from pyobs.spectra import Spectrum
+from pyobs.spectra.processors.calibration import SpectrumCalibration
+from pyobs.utils.exceptions import SpectrumError
+from pyobs.vfs import VirtualFileSystem
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> Iterator[None]:
+    SpectrumCalibration._cache.clear()
+    yield
+    SpectrumCalibration._cache.clear()
+
+
+def make_vfs() -> MagicMock:
+    masters = {
+        "bias.fits": Image(data=np.full((4, 6), 100.0), header=fits.Header({"EXPTIME": 0.0})),
+        "dark.fits": Image(data=np.full((4, 6), 10.0), header=fits.Header({"EXPTIME": 100.0})),
+        "flat.fits": Image(data=np.full((4, 6), 2.0)),
+    }
+    vfs = MagicMock(spec=VirtualFileSystem)
+    vfs.read_image = AsyncMock(side_effect=lambda filename: masters[filename])
+    return vfs
+
+
+@pytest.mark.asyncio
+async def test_calibration() -> None:
+    vfs = make_vfs()
+    step = SpectrumCalibration(bias="bias.fits", dark="dark.fits", flat="flat.fits", vfs=vfs)
+    spectrum = Spectrum(data=np.full((4, 6), 150.0), header=fits.Header({"EXPTIME": 50.0}))
+
+    result = await step(spectrum)
+    np.testing.assert_allclose(result.data, 45.0)
+    assert result.header["L1DARK"] == "dark.fits"
+
+    # masters are only loaded once
+    await step(spectrum)
+    assert vfs.read_image.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_calibration_shape_mismatch() -> None:
+    step = SpectrumCalibration(bias="bias.fits", vfs=make_vfs())
+    with pytest.raises(SpectrumError):
+        await step(Spectrum(data=np.zeros((5, 5))))
+
+
+@pytest.mark.asyncio
+async def test_replaced_master_is_reloaded(tmp_path: Path) -> None:
+    filename = tmp_path / "bias.fits"
+    filename.touch()
+    vfs = make_vfs()
+    vfs.local_path = AsyncMock(return_value=str(filename))
+    step = SpectrumCalibration(bias="bias.fits", vfs=vfs)
+    spectrum = Spectrum(data=np.full((4, 6), 150.0))
+
+    await step(spectrum)
+    await step(spectrum)
+    assert vfs.read_image.await_count == 1
+
+    os.utime(filename, (0, 0))
+    await step(spectrum)
+    assert vfs.read_image.await_count == 2
+    assert len(SpectrumCalibration._cache) == 1
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from astropy.io import fits
+
+from pyobs.spectra import Spectrum
+from pyobs.spectra.processors.extraction import ExtractSpectrum
+from pyobs.utils.exceptions import SpectrumError
+from tests.spectra.helpers import make_frame
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("optimal", [False, True])
+async def test_extract(optimal: bool) -> None:
+    spectrum = Spectrum(data=make_frame(flux=1000.0, sky=100.0))
+    result = await ExtractSpectrum(aperture=14, background=(15, 25), optimal=optimal)(spectrum)
+
+    # trace is tilted by 0.01 px/px around row 30
+    assert result.trace[0] == pytest.approx(28.0, abs=0.2)
+    assert result.trace[-1] == pytest.approx(32.0, abs=0.2)
+
+    # sky is removed and almost all flux is in the aperture
+    assert np.median(result.flux) == pytest.approx(1000.0, rel=0.03)
+
+    # noise is dominated by sky in aperture, so S/N should be about 1000/sqrt(1000 + 14*100)
+    snr = np.median(result.flux / result.uncertainty)
+    assert snr == pytest.approx(1000 / np.sqrt(2400), rel=0.2)
+    assert result.header["EXTRACT"] == ("optimal" if optimal else "boxcar")
+
+
+@pytest.mark.asyncio
+async def test_extract_transposed() -> None:
+    header = fits.Header({"DISPAXIS": 2})
+    spectrum = Spectrum(data=make_frame(noise=False).T, header=header)
+    result = await ExtractSpectrum(aperture=14)(spectrum)
+    assert len(result.flux) == 400
+    assert np.median(result.flux) == pytest.approx(1000.0, rel=0.01)
+
+
+@pytest.mark.asyncio
+async def test_extract_without_frame() -> None:
+    with pytest.raises(SpectrumError):
+        await ExtractSpectrum()(Spectrum(flux=np.ones(10)))
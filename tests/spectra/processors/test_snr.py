@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from astropy.io import fits
+
+from pyobs.images.meta import ExpTime
+from pyobs.spectra import Spectrum
+from pyobs.spectra.meta import SignalToNoise
+from pyobs.spectra.processors.exptime import SNRExpTimeEstimator
+from pyobs.spectra.processors.misc import EstimateSNR, NormalizeContinuum
+from pyobs.spectra.processors.misc.snr import estimate_snr
+from pyobs.utils.exceptions import SpectrumError
+
+
+def make_spectrum(snr: float = 50.0) -> Spectrum:
+    rng = np.random.default_rng(1)
+    x = np.arange(2000)
+    continuum = 1000.0 + 0.2 * x
+    flux = continuum + rng.normal(0.0, 1000.0 / snr, len(x))
+    return Spectrum(flux=flux, header=fits.Header({"EXPTIME": 60.0}))
+
+
+def test_der_snr() -> None:
+    spectrum = make_spectrum(snr=50.0)
+    assert estimate_snr(spectrum) == pytest.approx(50.0 * 1.2, rel=0.1)
+
+
+@pytest.mark.asyncio
+async def test_snr_from_uncertainty() -> None:
+    spectrum = make_spectrum()
+    spectrum.uncertainty = np.full(2000, 100.0)
+    result = await EstimateSNR()(spectrum)
+    assert result.get_meta(SignalToNoise).snr == pytest.approx(12.0, rel=0.05)
+    assert result.header["SNR"] == pytest.approx(12.0, rel=0.05)
+
+
+@pytest.mark.asyncio
+async def test_normalize_ignores_lines() -> None:
+    spectrum = make_spectrum(snr=200.0)
+    flux = spectrum.flux.copy()
+    flux[500:520] *= 0.3
+    spectrum.flux = flux
+
+    result = await NormalizeContinuum(degree=2)(spectrum)
+    assert np.median(result.flux) == pytest.approx(1.0, abs=0.01)
+    assert np.median(result.flux[500:520]) == pytest.approx(0.3, abs=0.02)
+
+
+@pytest.mark.asyncio
+async def test_exptime_estimator() -> None:
+    spectrum = make_spectrum()
+    spectrum.set_meta(SignalToNoise(50.0))
+
+    result = await SNRExpTimeEstimator(target_snr=100.0, max_exp_time=600.0)(spectrum)
+    assert result.get_meta(ExpTime).exptime == pytest.approx(240.0)
+    assert result.header["SNRDONE"] is False
+
+    result = await SNRExpTimeEstimator(target_snr=100.0, max_exp_time=200.0)(spectrum)
+    assert result.get_meta(ExpTime).exptime == pytest.approx(200.0)
+
+    with pytest.raises(SpectrumError):
+        await SNRExpTimeEstimator(target_snr=100.0)(Spectrum(flux=np.ones(10)))
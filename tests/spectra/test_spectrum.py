@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import numpy as np
+from astropy.io import fits
+
+from pyobs.spectra import Spectrum
+from pyobs.spectra.meta import SignalToNoise
+
+
+def test_roundtrip() -> None:
+    header = fits.Header({"EXPTIME": 10.0})
+    spectrum = Spectrum(
+        data=np.ones((5, 10), dtype=np.float32),
+        header=header,
+        flux=np.arange(10, dtype=np.float32),
+        uncertainty=np.ones(10, dtype=np.float32),
+        wavelength=np.linspace(5000, 6000, 10),
+    )
+    result = Spectrum.from_bytes(spectrum.to_bytes())
+
+    assert result.data.shape == (5, 10)
+    np.testing.assert_array_equal(result.flux, spectrum.flux)
+    np.testing.assert_array_equal(result.uncertainty, spectrum.uncertainty)
+    np.testing.assert_allclose(result.wavelength, spectrum.wavelength)
+    assert result.exposure_time == 10.0
+    assert result.safe_trace is None
+
+
+def test_one_dimensional_primary_is_flux() -> None:
+    hdulist = fits.HDUList([fits.PrimaryHDU(data=np.arange(10.0))])
+    spectrum = Spectrum.from_hdulist(hdulist)
+    assert spectrum.safe_data is None
+    assert len(spectrum.flux) == 10
+
+
+def test_copy_keeps_meta() -> None:
+    spectrum = Spectrum(flux=np.ones(5))
+    spectrum.set_meta(SignalToNoise(42.0))
+    copy = spectrum.copy()
+    copy.header["TEST"] = 1
+
+    assert copy.get_meta(SignalToNoise).snr == 42.0
+    assert "TEST" not in spectrum.header
+    assert spectrum.get_meta_safe(int) is None
@@ -10,6 +10,7 @@ from pyobs.events import (
     FilterChangedEvent,
     FocusFoundEvent,
     GoodWeatherEvent,
+    LogBatchEvent,
     LogEvent,
     ModeChangedEvent,
     ModuleClosedEvent,
@@ -23,6 +24,7 @@ from pyobs.events import (
     OffsetsRaDecEvent,
     RoofClosingEvent,
     RoofOpenedEvent,
+    ScheduleChangedEvent,
     TaskFailedEvent,
     TaskFinishedEvent,
     TaskStartedEvent,
@@ -242,6 +244,22 @@ def test_log_event_roundtrip() -> None:
     assert result.level == "ERROR"
 
 
+def test_log_batch_event_roundtrip() -> None:
+    entries = [
+        LogEvent(time="2025-01-01", level="INFO", filename="app.py", function="run", line=i, message=str(i))
+        for i in range(3)
+    ]
+    result = EventFactory.from_dict(LogBatchEvent(entries).to_json())
+    assert isinstance(result, LogBatchEvent)
+    assert len(result) == 3
+    assert [e.message for e in result.entries] == ["0", "1", "2"]
+
+
+def test_log_batch_event_invalid_entries() -> None:
+    with pytest.raises(ValueError):
+        LogBatchEvent.from_dict({"entries": [{"level": "INFO"}]})
+
+
 # ── ModeChangedEvent ──────────────────────────────────────────────────────────
 
 
@@ -345,6 +363,14 @@ def test_new_image_roundtrip() -> None:
     assert result.image_type == ImageType.BIAS
 
 
+def test_new_image_roundtrip_with_statistics() -> None:
+    e = NewImageEvent(filename="img.fits", image_type=ImageType.SKYFLAT, statistics={"median": 20000.0, "max": 41000})
+    result = EventFactory.from_dict(e.to_json())
+    assert isinstance(result, NewImageEvent)
+    assert result.statistics == {"median": 20000.0, "max": 41000.0}
+    assert NewImageEvent(filename="img.fits").statistics is None
+
+
 def test_new_image_invalid_filename() -> None:
     with pytest.raises(ValueError):
         NewImageEvent.from_dict({"filename": 123})
@@ -365,6 +391,14 @@ def test_new_spectrum_roundtrip() -> None:
     assert result.filename == "spec.fits"
 
 
+def test_new_spectrum_snr_roundtrip() -> None:
+    e = NewSpectrumEvent(filename="spec.fits", snr=42.5)
+    result = EventFactory.from_dict(e.to_json())
+    assert isinstance(result, NewSpectrumEvent)
+    assert result.snr == 42.5
+    assert NewSpectrumEvent(filename="spec.fits").snr is None
+
+
 def test_new_spectrum_invalid_filename() -> None:
     with pytest.raises(ValueError):
         NewSpectrumEvent.from_dict({"filename": 42})
@@ -399,6 +433,18 @@ def test_offsets_altaz_roundtrip() -> None:
     assert result.az == 0.4
 
 
+# ── ScheduleChangedEvent ──────────────────────────────────────────────────────
+
+
+def test_schedule_changed_roundtrip() -> None:
+    start = Time("2025-11-03T23:00:00", scale="utc")
+    e = ScheduleChangedEvent(start=start)
+    result = EventFactory.from_dict(e.to_json())
+    assert isinstance(result, ScheduleChangedEvent)
+    assert result.start.isot == start.isot
+    assert ScheduleChangedEvent().start is None
+
+
 # ── TaskStartedEvent ──────────────────────────────────────────────────────────
 
 
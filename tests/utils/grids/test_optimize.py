@@ -0,0 +1,97 @@
+from typing import Any
+
+import astropy.units as u
+import numpy as np
+from astroplan import Observer
+from astropy.coordinates import EarthLocation, SkyCoord
+
+from pyobs.utils.grids.filters import AvoidMoon, ConvertGridFrame, ConvertGridToSkyCoord, OptimizeSlewOrder
+from pyobs.utils.grids.grid import Grid, RegularSphericalGrid
+from pyobs.utils.grids.tour import path_cost, plan_tour, slew_times
+from pyobs.utils.time import Time
+
+
+class ListGrid(Grid):
+    pass
+
+
+def _total_slew(points: list[tuple[float, float]], start: tuple[float, float] = (0.0, 90.0)) -> float:
+    az = np.array([start[0]] + [p[0] for p in points])
+    alt = np.array([start[1]] + [p[1] for p in points])
+    return float(np.sum(slew_times(az[:-1], alt[:-1], az[1:], alt[1:])))
+
+
+def test_slew_times() -> None:
+    # shortest way in azimuth
+    assert slew_times(350.0, 50.0, 10.0, 50.0, az_speed=2.0) == 10.0
+    # cable wrap at 0 forces the long way
+    assert slew_times(350.0, 50.0, 10.0, 50.0, az_speed=2.0, cable_wrap=0.0) == 170.0
+    # dome is slower than telescope
+    assert slew_times(0.0, 50.0, 90.0, 50.0, az_speed=10.0, dome_speed=3.0) == 30.0
+    # altitude dominates
+    assert slew_times(0.0, 20.0, 10.0, 80.0, az_speed=1.0, alt_speed=1.0) == 60.0
+
+
+def test_plan_tour() -> None:
+    # points on a line in random order
+    rng = np.random.default_rng(42)
+    x = rng.permutation(np.arange(20.0))
+    x = np.append(0.0, x + 1)
+    costs = np.abs(x[:, None] - x[None, :])
+    path = plan_tour(costs, 0)
+    assert path[0] == 0
+    assert sorted(path) == list(range(21))
+    assert path_cost(costs, path) == 20.0
+
+
+def test_optimize_slew_order() -> None:
+    points = list(RegularSphericalGrid(12, 7))
+    points = [p for p in points if p[1] > 0]
+    shuffled = [points[i] for i in np.random.default_rng(1).permutation(len(points))]
+    grid = OptimizeSlewOrder(ListGrid(points=list(shuffled)))
+    assert len(grid) == len(points)
+    optimized = list(grid)
+
+    assert sorted(optimized) == sorted(points)
+    assert _total_slew(optimized) < _total_slew(points)
+    assert _total_slew(optimized) < 0.5 * _total_slew(shuffled)
+
+
+def test_optimize_slew_order_append_last() -> None:
+    points = [(0.0, 30.0), (10.0, 30.0), (20.0, 30.0)]
+    grid = OptimizeSlewOrder(ListGrid(points=points), start=(0.0, 30.0))
+    yielded = []
+    for p in grid:
+        yielded.append(p)
+        if len(yielded) == 1:
+            grid.append_last()
+            assert len(grid) == 3
+    assert yielded == [(0.0, 30.0), (10.0, 30.0), (20.0, 30.0), (0.0, 30.0)]
+
+
+def test_optimize_slew_order_skycoord(mocker: Any) -> None:
+    mocker.patch("pyobs.utils.time.Time.now", return_value=Time("2020-01-01T00:00:00"))
+    observer = Observer(
+        location=EarthLocation.from_geodetic(lon=20.8108 * u.deg, lat=-32.3758 * u.deg, height=1798 * u.m)
+    )
+    grid = ConvertGridToSkyCoord(grid=RegularSphericalGrid(8, 5), frame="altaz", observer=observer)
+    grid = ConvertGridFrame(grid=grid, frame="icrs", observer=observer)
+    optimized = list(OptimizeSlewOrder(grid=grid, observer=observer))
+    assert len(optimized) == 40
+    assert all(isinstance(p, SkyCoord) for p in optimized)
+
+
+def test_avoidmoon_caches_moon(mocker: Any) -> None:
+    moon = SkyCoord(0.0 * u.deg, 0.0 * u.deg, frame="icrs")
+    get_body = mocker.patch("pyobs.utils.grids.filters.get_body", return_value=moon)
+    points = [SkyCoord(ra * u.deg, 0.0 * u.deg, frame="icrs") for ra in (0.0, 10.0, 90.0, 180.0)]
+    grid = AvoidMoon(ListGrid(points=points), min_moon_distance=20)
+    assert [p.ra.degree for p in grid] == [90.0, 180.0]
+    assert get_body.call_count == 1
+
+
+def test_avoidmoon_all_close(mocker: Any) -> None:
+    moon = SkyCoord(0.0 * u.deg, 0.0 * u.deg, frame="icrs")
+    mocker.patch("pyobs.utils.grids.filters.get_body", return_value=moon)
+    points = [SkyCoord(ra * u.deg, 0.0 * u.deg, frame="icrs") for ra in (0.0, 5.0, 10.0)]
+    assert list(AvoidMoon(ListGrid(points=points), min_moon_distance=20)) == []
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import datetime
+import os
+from typing import Any, ClassVar
+
+import pandas as pd
+import pytest
+
+from pyobs.utils.publisher import CsvPublisher
+from pyobs.vfs import VFSFile, VirtualFileSystem
+
+
+def make_publisher(tmp_path, filename: str = "/local/data.csv", **kwargs) -> CsvPublisher:
+    vfs = VirtualFileSystem(roots={"local": {"class": "pyobs.vfs.LocalFile", "root": str(tmp_path)}})
+    return CsvPublisher(filename, vfs=vfs, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_rewrite(tmp_path) -> None:
+    pub = make_publisher(tmp_path)
+    await pub(a=1, b=2)
+    await pub(a=3, b=4)
+    df = await pub.data()
+    assert list(df["a"]) == [1, 3]
+    assert list(df["b"]) == [2, 4]
+
+
+@pytest.mark.asyncio
+async def test_append(tmp_path) -> None:
+    pub = make_publisher(tmp_path, append=True)
+    await pub(a=1, b=2)
+    await pub(a=3, b=4)
+    with open(tmp_path / "data.csv") as f:
+        assert f.read().splitlines() == ["a,b", "1,2", "3,4"]
+
+    # a new publisher must continue with the existing header
+    pub = make_publisher(tmp_path, append=True)
+    await pub(b=6, a=5)
+    with open(tmp_path / "data.csv") as f:
+        assert f.read().splitlines() == ["a,b", "1,2", "3,4", "5,6"]
+
+
+@pytest.mark.asyncio
+async def test_append_new_columns(tmp_path) -> None:
+    pub = make_publisher(tmp_path, append=True)
+    await pub(a=1)
+    await pub(a=2, b=3)
+    await pub(b=4)
+    df = pd.read_csv(tmp_path / "data.csv")
+    assert list(df.columns) == ["a", "b"]
+    assert len(df) == 3
+    assert df["b"].iloc[2] == 4
+
+
+@pytest.mark.asyncio
+async def test_append_buffered(tmp_path) -> None:
+    pub = make_publisher(tmp_path, append=True, flush_rows=3, flush_interval=1000)
+    await pub(a=1)
+    await pub(a=2)
+    assert not os.path.exists(tmp_path / "data.csv")
+
+    # buffered rows must be visible in data()
+    assert list((await pub.data())["a"]) == [1, 2]
+
+    # third row flushes
+    await pub(a=3)
+    assert len(pd.read_csv(tmp_path / "data.csv")) == 3
+
+    # more rows end up in cache
+    await pub(a=4)
+    assert list((await pub.data())["a"]) == [1, 2, 3, 4]
+
+    # close flushes
+    await pub.close()
+    assert len(pd.read_csv(tmp_path / "data.csv")) == 4
+
+
+@pytest.mark.asyncio
+async def test_append_rotation(tmp_path) -> None:
+    pub = make_publisher(tmp_path, "/local/data-{date}.csv", append=True)
+    await pub(a=1)
+    date = datetime.datetime.now(datetime.UTC).strftime("%Y-%m-%d")
+    assert os.path.exists(tmp_path / f"data-{date}.csv")
+
+
+@pytest.mark.asyncio
+async def test_data_tail(tmp_path) -> None:
+    with open(tmp_path / "data.csv", "w") as f:
+        f.write("a,b\n")
+        for i in range(100000):
+            f.write(f"{i},{2 * i}\n")
+
+    pub = make_publisher(tmp_path, append=True, flush_rows=10)
+    await pub(a=100000, b=200000)
+    df = await pub.data(tail=5)
+    assert list(df["a"]) == [99996, 99997, 99998, 99999, 100000]
+    assert list(df["b"]) == [199992, 199994, 199996, 199998, 200000]
+
+    # short file
+    with open(tmp_path / "short.csv", "w") as f:
+        f.write("a\n1\n2\n")
+    pub = make_publisher(tmp_path, "/local/short.csv", append=True)
+    assert list((await pub.data(tail=5))["a"]) == [1, 2]
+
+
+class _UploadFile(VFSFile):
+    """Remote file that, like SSH and HTTP files, is only uploaded as a whole when written."""
+
+    files: ClassVar[dict[str, str]] = {}
+
+    def __init__(self, name: str, mode: str = "r", **kwargs: Any):
+        if "r" in mode and name not in self.files:
+            raise FileNotFoundError(name)
+        self.name, self.mode = name, mode
+        self._data = self.files.get(name, "") if "r" in mode else ""
+
+    async def read(self, n: int = -1) -> str:
+        data, self._data = (self._data, "") if n < 0 else (self._data[:n], self._data[n:])
+        return data
+
+    async def write(self, s: str | bytes) -> None:
+        self._data += s if isinstance(s, str) else s.decode()
+
+    async def close(self) -> None:
+        if "w" in self.mode:
+            self.files[self.name] = self._data
+
+
+@pytest.mark.asyncio
+async def test_append_rewrites_files_that_cannot_be_appended_to(mocker) -> None:
+    mocker.patch.object(_UploadFile, "files", {})
+    vfs = VirtualFileSystem(roots={"remote": {"class": "tests.utils.publisher.test_csv._UploadFile"}})
+    assert not vfs.supports_append("/remote/data.csv")
+
+    pub = CsvPublisher("/remote/data.csv", vfs=vfs, append=True)
+    await pub(a=1, b=2)
+    await pub(a=3, b=4)
+
+    df = await vfs.read_csv("/remote/data.csv", index_col=False)
+    assert list(df["a"]) == [1, 3]
+    assert list(df["b"]) == [2, 4]
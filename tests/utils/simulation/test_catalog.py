@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import numpy as np
+
+from pyobs.utils.simulation import SyntheticStarCatalog
+
+
+def test_query_is_deterministic() -> None:
+    cat1 = SyntheticStarCatalog(max_mag=18.0, seed=42)
+    cat2 = SyntheticStarCatalog(max_mag=18.0, seed=42)
+    t1 = cat1.query(120.0, 30.0, 0.2)
+    t2 = cat2.query(120.0, 30.0, 0.2)
+    assert len(t1) > 0
+    np.testing.assert_array_equal(t1["ra"], t2["ra"])
+    np.testing.assert_array_equal(t1["phot_g_mean_mag"], t2["phot_g_mean_mag"])
+
+    # different seed gives different stars
+    t3 = SyntheticStarCatalog(max_mag=18.0, seed=1).query(120.0, 30.0, 0.2)
+    assert len(t3) != len(t1) or not np.array_equal(t1["ra"], t3["ra"])
+
+
+def test_query_cone_and_limits() -> None:
+    cat = SyntheticStarCatalog(max_mag=16.0)
+    table = cat.query(10.0, -45.0, 0.5, max_mag=15.0, limit=50)
+    assert len(table) == 50
+    assert np.all(table["dist"] <= 0.5)
+    assert np.all(table["phot_g_mean_mag"] <= 15.0)
+    assert np.all(np.diff(table["phot_g_mean_mag"]) >= 0)
+
+
+def test_density() -> None:
+    cat = SyntheticStarCatalog(max_mag=14.0)
+    table = cat.query(200.0, 10.0, 1.0, limit=100000)
+    expected = cat.density() * np.pi
+    assert abs(len(table) - expected) < 5 * np.sqrt(expected)
+
+
+def test_query_across_ra_zero_and_pole() -> None:
+    cat = SyntheticStarCatalog(max_mag=14.0)
+    table = cat.query(0.0, 0.0, 1.0, limit=100000)
+    assert np.any(table["ra"] < 1.0) and np.any(table["ra"] > 359.0)
+
+    table = cat.query(0.0, 90.0, 1.0, limit=100000)
+    assert len(table) > 0
+    assert np.all(table["dec"] >= 89.0)
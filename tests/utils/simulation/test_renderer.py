@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import numpy as np
+
+from pyobs.utils.simulation import SkyRenderer
+
+
+def test_noise() -> None:
+    renderer = SkyRenderer(seed=0)
+    data = renderer.noise((200, 300), 100.0, 5.0)
+    assert data.shape == (200, 300)
+    assert abs(np.mean(data) - 100.0) < 0.1
+    assert abs(np.std(data) - 5.0) < 0.1
+
+    # different frames differ
+    assert not np.array_equal(data, renderer.noise((200, 300), 100.0, 5.0))
+
+
+def test_add_stars_conserves_flux() -> None:
+    renderer = SkyRenderer()
+    data = np.zeros((100, 100))
+    renderer.add_stars(data, np.array([30.3, 60.7]), np.array([40.2, 70.5]), np.array([1000.0, 500.0]), fwhm=3.0)
+    assert abs(np.sum(data) - 1500.0) < 1e-6
+    assert np.unravel_index(np.argmax(data), data.shape) == (40, 30)
+
+
+def test_add_stars_at_border() -> None:
+    renderer = SkyRenderer()
+    data = np.zeros((50, 50))
+    renderer.add_stars(data, np.array([0.0, -100.0]), np.array([0.0, 10.0]), np.array([1000.0, 1000.0]), fwhm=2.0)
+    # only the part within the image of the first star
+    assert 250.0 < np.sum(data) < 750.0
+
+
+def test_illumination() -> None:
+    renderer = SkyRenderer()
+    illum = renderer.illumination((101, 101), 0.2)
+    assert illum[50, 50] == 1.0
+    assert abs(illum[0, 0] - 0.8) < 1e-6
+    assert renderer.illumination((101, 101), 0.2) is illum
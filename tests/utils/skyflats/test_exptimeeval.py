@@ -1,6 +1,10 @@
+import astropy.units as u
+import numpy as np
 import pytest
+from astroplan import Observer
 
 from pyobs.robotic.utils.skyflats.exptimeeval import ExpTimeEval
+from pyobs.utils.time import Time
 
 
 def test_parse_config_simple():
@@ -39,3 +43,29 @@ def test_parse_config_full():
     assert pytest.approx(ete(10, binning=(1, 1), filter_name="Red"), 0.1) == 3.69e-6
     assert pytest.approx(ete(10, binning=(1, 1), filter_name="Blue"), 0.1) == 6.09e-7
     assert pytest.approx(ete(10, binning=(2, 2), filter_name="Red"), 0.1) == 1.50e-6
+
+
+def test_vectorised():
+    ete = ExpTimeEval(None, {"Red": "exp(-0.9*(h+3.9))", "Blue": "max(exp(-0.9*(h+5.9)), 1e-6)"})
+    solalt = np.array([-10.0, -5.0, 0.0, 10.0])
+    for filter_name in ["Red", "Blue"]:
+        exptimes = ete(solalt, filter_name=filter_name, binning=(2, 2))
+        assert isinstance(exptimes, np.ndarray)
+        assert exptimes.shape == solalt.shape
+        for h, exptime in zip(solalt, exptimes):
+            assert pytest.approx(ete(float(h), filter_name=filter_name, binning=(2, 2))) == exptime
+
+
+def test_duration_vectorised():
+    observer = Observer(longitude=20.8108 * u.deg, latitude=-32.375823 * u.deg, elevation=1798.0 * u.m)
+    ete = ExpTimeEval(observer, "exp(-1.22034 * (h + 3.16086))")
+    ete.init(Time("2019-11-21T17:10:00Z"), timespan=3600, step=60)
+    start_times = np.array([0.0, 600.0, 1200.0])
+    durations = ete.duration(10, start_time=start_times, readout=2.0)
+    for start, duration in zip(start_times, durations):
+        assert pytest.approx(ete.duration(10, start_time=float(start), readout=2.0)) == duration
+
+
+def test_unsupported_expression():
+    with pytest.raises(ValueError):
+        ExpTimeEval(None, "fac(h)")
@@ -376,7 +376,7 @@ async def test_testing_transitions_to_running_when_good() -> None:
 
     ff._set_window.assert_awaited_once_with("camera", testing=True)
     ff._take_image.assert_awaited_once_with("camera", broadcast=False)
-    ff._analyse_image.assert_awaited_once_with("test.fits")
+    ff._analyse_image.assert_awaited_once_with("test.fits", "camera")
     assert ff._state == FlatFielder.State.RUNNING
 
 
@@ -739,3 +739,21 @@ async def test_abort_sets_event() -> None:
     assert not ff._abort.is_set()
     await ff.abort()
     assert ff._abort.is_set()
+
+
+@pytest.mark.asyncio
+async def test_analyse_image_uses_camera_statistics(mocker) -> None:
+    vfs = AsyncMock(spec=VirtualFileSystem)
+    ff = make_flatfielder(vfs=vfs, target_count=1000, min_counts=100)
+    ff._bias_level = 0
+    ff._exptime = 1.0
+    wait = mocker.patch(
+        "pyobs.robotic.utils.skyflats.flatfielder.wait_for_image_statistics",
+        AsyncMock(return_value={"median": 500.0}),
+    )
+
+    assert await ff._analyse_image("file.fits", "camera") is False
+    wait.assert_awaited_once_with(ff.comm, "camera", "file.fits")
+    vfs.read_image.assert_not_called()
+    assert ff._median == 500.0
+    assert ff._exptime == pytest.approx(2.0)
@@ -38,8 +38,8 @@ async def test_scheduler():
 
     # test start/end times
     assert scheduler[0].start == 1160
-    assert pytest.approx(scheduler[0].end, 0.01) == 1200.46
+    assert pytest.approx(scheduler[0].end, 0.01) == 1200.22
     assert scheduler[1].start == 1270
-    assert pytest.approx(scheduler[1].end, 0.01) == 1310.59
-    assert scheduler[2].start == 1330
-    assert pytest.approx(scheduler[2].end, 0.01) == 1370.59
+    assert pytest.approx(scheduler[1].end, 0.01) == 1310.25
+    assert scheduler[2].start == 1340
+    assert pytest.approx(scheduler[2].end, 0.01) == 1380.64
@@ -89,3 +89,34 @@ def test_add_evicts_expired_values() -> None:
     time.sleep(0.15)
     avg.add(1.0)
     assert avg.average() == pytest.approx(1.0)
+
+
+def test_minimum_maximum_median() -> None:
+    avg = RollingTimeAverage(interval=10.0)
+    assert avg.minimum() is None
+    for value in [3.0, 1.0, 4.0, 1.0, 5.0, 9.0, 2.0]:
+        avg.add(value)
+    assert avg.minimum() == 1.0
+    assert avg.maximum() == 9.0
+    assert avg.median() == 3.0
+
+
+def test_minimum_maximum_expire() -> None:
+    avg = RollingTimeAverage(interval=0.1)
+    avg.add(100.0)
+    avg.add(-100.0)
+    time.sleep(0.15)
+    avg.add(1.0)
+    avg.add(2.0)
+    assert avg.minimum() == 1.0
+    assert avg.maximum() == 2.0
+    assert avg.average() == pytest.approx(1.5)
+
+
+def test_many_values() -> None:
+    avg = RollingTimeAverage(interval=10.0)
+    for i in range(100000):
+        avg.add(float(i % 10))
+    assert avg.average() == pytest.approx(4.5)
+    assert avg.minimum() == 0.0
+    assert avg.maximum() == 9.0
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from pyobs.utils.counter import NightlyCounter
+
+
+@pytest.mark.asyncio
+async def test_in_memory() -> None:
+    counter = NightlyCounter()
+    assert await counter.next("2024-01-01") == 1
+    assert await counter.next("2024-01-01") == 2
+    assert await counter.next("2024-01-02") == 1
+    assert counter.night == "2024-01-02"
+
+
+@pytest.mark.asyncio
+async def test_local_file_survives_restart(tmp_path: Path) -> None:
+    filename = str(tmp_path / "counter.log")
+    counter = NightlyCounter(filename)
+    for _ in range(3):
+        await counter.next("2024-01-01")
+    await counter.close()
+
+    assert await NightlyCounter(filename).next("2024-01-01") == 4
+    assert await NightlyCounter(filename).next("2024-01-02") == 1
+
+
+@pytest.mark.asyncio
+async def test_truncated_line_is_ignored(tmp_path: Path) -> None:
+    filename = tmp_path / "counter.log"
+    filename.write_bytes(b"2024-01-01 5\n2024-01-01 6\n2024-01-0")
+    counter = NightlyCounter(str(filename))
+    assert await counter.next("2024-01-01") == 7
+    await counter.close()
+    assert filename.read_text().splitlines()[-1] == "2024-01-01 7"
+
+
+@pytest.mark.asyncio
+async def test_shared_file(tmp_path: Path) -> None:
+    filename = str(tmp_path / "counter.log")
+    a, b = NightlyCounter(filename), NightlyCounter(filename)
+    values = [await c.next("2024-01-01") for c in (a, b, a, a, b)]
+    assert values == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls(tmp_path: Path) -> None:
+    counter = NightlyCounter(str(tmp_path / "counter.log"), lock=False)
+    values = await asyncio.gather(*[counter.next("2024-01-01") for _ in range(20)])
+    assert sorted(values) == list(range(1, 21))
+    await counter.close()
+
+
+@pytest.mark.asyncio
+async def test_waiting_for_lock_does_not_block_event_loop(tmp_path: Path) -> None:
+    fcntl = pytest.importorskip("fcntl")
+    filename = str(tmp_path / "counter.log")
+    counter = NightlyCounter(filename)
+
+    # another process holds the lock for a while
+    lock_file = open(f"{filename}.lock", "a")
+    fcntl.flock(lock_file, fcntl.LOCK_EX)
+    threading.Timer(0.2, lock_file.close).start()
+
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    assert await counter.next("2024-01-01") == 1
+    ticker.cancel()
+    assert ticks >= 5
+    await counter.close()
+
+
+@pytest.mark.asyncio
+async def test_compaction(tmp_path: Path) -> None:
+    filename = tmp_path / "counter.log"
+    a, b = NightlyCounter(str(filename), compact=10), NightlyCounter(str(filename), compact=10)
+    for _ in range(25):
+        await a.next("2024-01-01")
+    assert len(filename.read_text().splitlines()) <= 11
+
+    # other process follows the replaced file
+    assert await b.next("2024-01-01") == 26
+
+
+@pytest.mark.asyncio
+async def test_vfs_read_once_and_written_in_background() -> None:
+    vfs = MagicMock()
+    vfs.read_yaml = AsyncMock(return_value={"night": "2024-01-01", "obsnum": 3})
+    vfs.write_yaml = AsyncMock()
+    counter = NightlyCounter(vfs=vfs, vfs_filename="/cache.yaml", key="obsnum")
+
+    assert await counter.next("2024-01-01") == 4
+    assert await counter.next("2024-01-01") == 5
+    await counter.flush()
+
+    vfs.read_yaml.assert_awaited_once()
+    vfs.write_yaml.assert_awaited_with("/cache.yaml", {"night": "2024-01-01", "obsnum": 5})
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from pyobs.images import Image
+from pyobs.utils.imagestatistics import ImageStatistics
+
+
+def test_statistics() -> None:
+    data = np.arange(100, dtype=np.uint16).reshape((10, 10))
+    stats = ImageStatistics(["median", "mean", "min", "max", "std", "p90"])(Image(data=data))
+    assert list(stats.keys()) == ["median", "mean", "min", "max", "std", "p90"]
+    assert stats["median"] == pytest.approx(np.median(data))
+    assert stats["mean"] == pytest.approx(49.5)
+    assert stats["min"] == 0.0
+    assert stats["max"] == 99.0
+    assert stats["std"] == pytest.approx(np.std(data))
+    assert stats["p90"] == pytest.approx(np.percentile(data, 90))
+
+
+def test_unknown_statistic() -> None:
+    with pytest.raises(ValueError):
+        ImageStatistics(["mode"])
+    with pytest.raises(ValueError):
+        ImageStatistics(["p101"])
+
+
+def test_trimsec_frame_and_mask() -> None:
+    data = np.zeros((10, 20), dtype=np.float32)
+    data[:, 10:] = 100.0
+    data[0, 10] = 1e6
+    mask = np.zeros_like(data, dtype=bool)
+    mask[0, 10] = True
+    image = Image(data=data, mask=mask)
+    image.header["TRIMSEC"] = "[11:20,1:10]"
+
+    # trimmed to right half, masked hot pixel ignored
+    assert ImageStatistics(["max"])(image) == {"max": 100.0}
+    assert ImageStatistics(["max"], trimsec=False)(Image(data=data)) == {"max": 1e6}
+
+    # frame in percent of trimmed image
+    data[5:, 15:] = 50.0
+    assert ImageStatistics(["max"], frame=(50, 50, 50, 50))(image) == {"max": 50.0}
+
+
+def test_non_finite_pixels_and_headers() -> None:
+    data = np.full((4, 4), 10.0)
+    data[0, 0] = np.nan
+    image = Image(data=data)
+    statistics = ImageStatistics(["median", "p99"])
+    stats = statistics(image)
+    assert stats == {"median": 10.0, "p99": 10.0}
+
+    statistics.add_fits_headers(image, stats)
+    assert image.header["STATMED"] == 10.0
+    assert image.header["STATP99"] == 10.0
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from pyobs.utils.influxdb import InfluxHandler
+
+
+@pytest.fixture
+def client(mocker) -> MagicMock:
+    client = MagicMock()
+    mocker.patch("pyobs.utils.influxdb.InfluxDBClient", return_value=client)
+    return client
+
+
+def make_handler(**kwargs) -> InfluxHandler:
+    return InfluxHandler(
+        url="http://localhost:8086", org="org", bucket="bucket", token="token", module="test", **kwargs
+    )
+
+
+def make_record(msg: str = "hello %s", args: tuple = ("world",)) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+
+
+def written_points(client: MagicMock) -> list:
+    return [p for call in client.write_api.return_value.write.call_args_list for p in call.args[2]]
+
+
+def test_emit_does_not_write_synchronously(client) -> None:
+    block = threading.Event()
+    client.write_api.return_value.write.side_effect = lambda *args: block.wait(5)
+    handler = make_handler(flush_interval=0.01)
+
+    # a blocked server must not block emit()
+    for _ in range(10):
+        handler.emit(make_record())
+    block.set()
+    handler.close()
+
+
+def test_records_are_batched(client) -> None:
+    handler = make_handler(batch_size=100, flush_interval=0.5)
+    for i in range(50):
+        handler.emit(make_record("record %d", (i,)))
+    handler.flush()
+
+    points = written_points(client)
+    assert len(points) == 50
+    assert client.write_api.return_value.write.call_count < 50
+    assert "record 0" in points[0].to_line_protocol()
+    assert handler.stats["written"] == 50
+    handler.close()
+
+
+def test_drop_newest(client) -> None:
+    block = threading.Event()
+    client.write_api.return_value.write.side_effect = lambda *args: block.wait(5)
+    handler = make_handler(queue_size=5, batch_size=1, flush_interval=0.01, overflow="drop_newest")
+
+    # first one is taken by writer thread, which then blocks
+    handler.emit(make_record())
+    while handler.stats["queued"] > 0:
+        pass
+    for _ in range(10):
+        handler.emit(make_record())
+    assert handler.stats["dropped"] == 5
+
+    block.set()
+    handler.close()
+    assert handler.stats["written"] == 6
+
+
+def test_drop_oldest(client) -> None:
+    block = threading.Event()
+    client.write_api.return_value.write.side_effect = lambda *args: block.wait(5)
+    handler = make_handler(queue_size=5, batch_size=1, flush_interval=0.01, overflow="drop_oldest")
+
+    handler.emit(make_record("first", ()))
+    while handler.stats["queued"] > 0:
+        pass
+    for i in range(10):
+        handler.emit(make_record("record %d", (i,)))
+    assert handler.stats["dropped"] == 5
+
+    block.set()
+    handler.close()
+    messages = [p.to_line_protocol() for p in written_points(client)]
+    assert "first" in messages[0]
+    assert "record 9" in messages[-1]
+    assert not any("record 4" in m for m in messages)
+
+
+def test_failed_writes_are_counted(client) -> None:
+    client.write_api.return_value.write.side_effect = ConnectionError()
+    handler = make_handler(flush_interval=0.01)
+    handler.emit(make_record())
+    handler.flush()
+    assert handler.stats["failed"] == 1
+    handler.close()
+
+
+def test_exception_is_added(client) -> None:
+    handler = make_handler(flush_interval=0.01)
+    try:
+        raise ValueError("test")
+    except ValueError:
+        record = logging.LogRecord("test", logging.ERROR, __file__, 1, "error", (), exc_info=sys.exc_info())
+    handler.emit(record)
+    handler.close()
+
+    line = written_points(client)[0].to_line_protocol()
+    assert "exception_type=ValueError" in line
+    assert "traceback=" in line
+
+
+def test_invalid_overflow(client) -> None:
+    with pytest.raises(ValueError):
+        make_handler(overflow="invalid")
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+import pytest
+
+from pyobs.utils.outbox import Outbox, OutboxEntry
+
+
+class _Remote:
+    """Records delivered messages and fails a given number of times."""
+
+    def __init__(self, failures: int = 0, reject: set[str] | None = None):
+        self.failures = failures
+        self.reject = reject or set()
+        self.received: list[OutboxEntry] = []
+
+    async def __call__(self, entry: OutboxEntry) -> None:
+        if entry.payload in self.reject:
+            raise ValueError("rejected")
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("unavailable")
+        self.received.append(entry)
+
+
+@pytest.mark.asyncio
+async def test_delivers_in_order() -> None:
+    remote = _Remote()
+    outbox = Outbox(remote)
+    entries = [outbox.add("msg", i) for i in range(5)]
+    outbox.start()
+
+    assert await outbox.wait(entries[-1], 1.0)
+    assert [e.payload for e in remote.received] == list(range(5))
+    assert len({e.key for e in remote.received}) == 5
+    assert len(outbox) == 0
+    assert outbox.statistics().sent == 5
+    await outbox.close()
+
+
+@pytest.mark.asyncio
+async def test_retries_with_backoff_and_keeps_order() -> None:
+    remote = _Remote(failures=3)
+    outbox = Outbox(remote, min_backoff=0.01, max_backoff=0.02)
+    first = outbox.add("msg", 1)
+    second = outbox.add("msg", 2)
+    outbox.start()
+
+    assert await outbox.wait(second, 1.0)
+    assert await outbox.wait(first, 0.0)
+    assert [e.payload for e in remote.received] == [1, 2]
+    assert remote.received[0].attempts == 3
+    stats = outbox.statistics()
+    assert stats.retries == 3
+    assert stats.last_error == "unavailable"
+    await outbox.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_message_is_dropped() -> None:
+    remote = _Remote(reject={"bad"})
+    outbox = Outbox(remote)
+    bad = outbox.add("msg", "bad")
+    good = outbox.add("msg", "good")
+    outbox.start()
+
+    assert await asyncio.gather(outbox.wait(bad, 1.0), outbox.wait(good, 1.0)) == [False, True]
+    assert [e.payload for e in remote.received] == ["good"]
+    assert outbox.statistics().rejected == 1
+    await outbox.close()
+
+
+@pytest.mark.asyncio
+async def test_coalesces_superseded_messages() -> None:
+    remote = _Remote()
+    outbox = Outbox(remote)
+    old = outbox.add("status", "old", coalesce="status/1")
+    other = outbox.add("status", "other", coalesce="status/2")
+    new = outbox.add("status", "new", coalesce="status/1")
+    outbox.start()
+
+    assert await outbox.wait(old, 1.0) is False
+    assert await asyncio.gather(outbox.wait(other, 1.0), outbox.wait(new, 1.0)) == [True, True]
+    assert [e.payload for e in remote.received] == ["other", "new"]
+    assert outbox.statistics().coalesced == 1
+    await outbox.close()
+
+
+@pytest.mark.asyncio
+async def test_expired_message_is_dropped() -> None:
+    remote = _Remote()
+    outbox = Outbox(remote)
+    outbox.add("msg", "expired", expires=time.time() - 1)
+    entry = outbox.add("msg", "valid", expires=time.time() + 60)
+    outbox.start()
+
+    assert await outbox.wait(entry, 1.0)
+    assert [e.payload for e in remote.received] == ["valid"]
+    assert outbox.statistics().expired == 1
+    await outbox.close()
+
+
+@pytest.mark.asyncio
+async def test_journal_survives_restart(tmp_path: Path) -> None:
+    filename = str(tmp_path / "outbox" / "journal.jsonl")
+
+    # portal is down, so nothing is delivered
+    outbox = Outbox(_Remote(failures=100), filename=filename, min_backoff=10.0)
+    for i in range(3):
+        outbox.add("msg", i)
+    outbox.start()
+    await asyncio.sleep(0.01)
+    await outbox.close()
+
+    # after restart, pending messages are delivered with their original keys
+    remote = _Remote()
+    outbox = Outbox(remote, filename=filename)
+    assert len(outbox) == 3
+    keys = [e.key for e in outbox._entries.values()]
+    outbox.start()
+    for _ in range(100):
+        if len(outbox) == 0:
+            break
+        await asyncio.sleep(0.01)
+    await outbox.close()
+    assert [e.payload for e in remote.received] == [0, 1, 2]
+    assert [e.key for e in remote.received] == keys
+
+    # nothing left after another restart
+    assert len(Outbox(_Remote(), filename=filename)) == 0
+
+
+@pytest.mark.asyncio
+async def test_journal_ignores_truncated_line(tmp_path: Path) -> None:
+    filename = str(tmp_path / "journal.jsonl")
+    outbox = Outbox(_Remote(), filename=filename)
+    outbox.add("msg", "pending")
+    await outbox.close()
+    with open(filename, "a") as f:
+        f.write('{"op": "add", "entry": {"kind": "ms')
+
+    outbox = Outbox(_Remote(), filename=filename)
+    assert [e.payload for e in outbox._entries.values()] == ["pending"]
+    await outbox.close()
+
+
+@pytest.mark.asyncio
+async def test_journal_is_compacted(tmp_path: Path) -> None:
+    filename = str(tmp_path / "journal.jsonl")
+    outbox = Outbox(_Remote(), filename=filename, compact=10)
+    outbox.start()
+    for i in range(20):
+        await outbox.wait(outbox.add("msg", i), 1.0)
+    await outbox.close()
+
+    with open(filename) as f:
+        assert len(f.readlines()) <= 10